@@ -19,4 +19,8 @@
         from core.app import create_admin_user
         create_admin_user()
     
+    # Extrair (ou validar) as perguntas de todos os módulos antes de atender requisições
+    from utils.extractors.manifesto_perguntas import manifesto_perguntas
+    manifesto_perguntas.construir()
+    
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -29,7 +29,8 @@
 
 from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, send_file, session
 from flask_sqlalchemy import SQLAlchemy
-from models.models import db, Usuario, Paciente, DoencaCronica, PacienteDoenca, Sintoma, Pergunta, Medicamento, Consulta, ConsultaResposta, ConsultaRecomendacao
+from sqlalchemy import insert
+from models.models import db, Usuario, Paciente, DoencaCronica, PacienteDoenca, Sintoma, Pergunta, Medicamento, Consulta, ConsultaResposta, ConsultaRecomendacao, ConsultaPontuacao, EstatisticaDiaria
 from services.reports.report_generator import ReportGenerator
 from core.config import Config
 import os
@@ -37,7 +38,18 @@
 import json
 from functools import lru_cache
 from services.triagem.qa_collector import qa_collector
-from utils.extractors.perguntas_extractor import list_modules as list_motor_modulos, extract_questions_for_module
+# O import também registra os eventos que invalidam o índice do catálogo ao gravar medicamentos
+from services.catalogo_medicamentos import assinatura_catalogo
+from services.pontuacao_consultas import obter_pontuacao, registrar_pontuacao
+from services.painel import resumo_painel
+from services.estatisticas_diarias import (
+    FAIXAS_ETARIAS, consultar as consultar_estatisticas, registrar_consulta as registrar_estatistica_diaria
+)
+from utils.extractors.perguntas_extractor import list_modules as list_motor_modulos
+from utils.extractors.manifesto_perguntas import manifesto_perguntas
+from utils.http_cache import json_condicional, max_age_padrao
+from services.triagem.fluxo_adaptativo import fluxo_adaptativo
+from services.triagem.regras_modulos import motor_regras
 
 # Inicialização da aplicação
 # Configurar o caminho correto para os templates
@@ -344,81 +356,18 @@ def index():
     Página inicial do sistema com dashboard e estatísticas
     """
     try:
-        # Estatísticas gerais (otimizadas)
-        total_pacientes = Paciente.query.count()
-        total_medicamentos = Medicamento.query.filter_by(ativo=True).count()  # Apenas ativos
-        
-        # Consultas de hoje (otimizada)
-        hoje = datetime.now().date()
-        consultas_hoje = Consulta.query.filter(
-            db.func.date(Consulta.data) == hoje
-        ).count()
-        
-        # Encaminhamentos (otimizada)
-        encaminhamentos = Consulta.query.filter_by(encaminhamento=True).count()
-        
-        # Consultas dos últimos 30 dias (otimizada)
-        data_30_dias_atras = datetime.now() - timedelta(days=30)
-        consultas_30_dias = Consulta.query.filter(Consulta.data >= data_30_dias_atras).count()
-        
-        # Consultas por dia (últimos 7 dias)
-        consultas_por_dia = []
-        for i in range(7):
-            data = datetime.now() - timedelta(days=i)
-            inicio_dia = data.replace(hour=0, minute=0, second=0, microsecond=0)
-            fim_dia = data.replace(hour=23, minute=59, second=59, microsecond=999999)
-            
-            count = Consulta.query.filter(
-                Consulta.data >= inicio_dia,
-                Consulta.data <= fim_dia
-            ).count()
-            
-            consultas_por_dia.append({
-                'data': data.strftime('%d/%m'),
-                'count': count
-            })
-        
-        consultas_por_dia.reverse()  # Ordenar cronologicamente
-        
-        # Taxa de encaminhamentos
-        total_consultas = Consulta.query.count()
-        taxa_encaminhamento = (encaminhamentos / total_consultas * 100) if total_consultas > 0 else 0
-        
-        # Pacientes por faixa etária
-        faixas_etarias = [
-            {'faixa': '0-18', 'min': 0, 'max': 18},
-            {'faixa': '19-30', 'min': 19, 'max': 30},
-            {'faixa': '31-50', 'min': 31, 'max': 50},
-            {'faixa': '51-65', 'min': 51, 'max': 65},
-            {'faixa': '65+', 'min': 65, 'max': 120}
-        ]
-        
-        pacientes_por_faixa = []
-        for faixa in faixas_etarias:
-            count = Paciente.query.filter(
-                Paciente.idade >= faixa['min'],
-                Paciente.idade <= faixa['max']
-            ).count()
-            pacientes_por_faixa.append({
-                'faixa': faixa['faixa'],
-                'count': count
-            })
-        
-        # Últimas consultas
-        consultas_recentes = Consulta.query.join(Paciente).order_by(
-            Consulta.data.desc()
-        ).limit(5).all()
-        
+        # Números do dashboard (resumo em cache, recalculado em poucas consultas agregadas)
+        resumo = resumo_painel.obter()
         return render_template('index.html', 
-                             total_pacientes=total_pacientes,
-                             total_medicamentos=total_medicamentos,
-                             consultas_hoje=consultas_hoje,
-                             encaminhamentos=encaminhamentos,
-                             consultas_30_dias=consultas_30_dias,
-                             consultas_por_dia=consultas_por_dia,
-                             taxa_encaminhamento=taxa_encaminhamento,
-                             pacientes_por_faixa=pacientes_por_faixa,
-                             consultas_recentes=consultas_recentes)
+                             total_pacientes=resumo['total_pacientes'],
+                             total_medicamentos=resumo['total_medicamentos'],
+                             consultas_hoje=resumo['consultas_hoje'],
+                             encaminhamentos=resumo['total_encaminhamentos'],
+                             consultas_30_dias=resumo['consultas_30_dias'],
+                             consultas_por_dia=resumo['consultas_por_dia'],
+                             taxa_encaminhamento=resumo['taxa_encaminhamento'],
+                             pacientes_por_faixa=resumo['pacientes_por_faixa_inicio'],
+                             consultas_recentes=resumo['consultas_recentes'])
     except Exception as e:
         flash(f'Erro ao carregar dashboard: {str(e)}', 'error')
         return render_template('test.html')
@@ -885,6 +834,69 @@ def iniciar_triagem(paciente_id):
     
     return render_template('iniciar_triagem.html', paciente=paciente, perguntas=perguntas, modulo=modulo)
 
+def _persistir_triagem(paciente, modulo_usado, respostas, ids_por_slug, triagem_result, scoring_result):
+    """
+    Grava a triagem em uma única transação: a consulta e a pontuação com flush
+    (para obter o id), as respostas e recomendações com INSERTs em lote e o
+    incremento das estatísticas diárias.
+    """
+    observacoes_list = [f'MODULO: {modulo_usado}']  # Primeiro item é sempre o módulo
+    observacoes_list.extend(triagem_result.get('observacoes', []))
+    consulta = Consulta(
+        id_paciente=paciente.id,
+        data=datetime.now(),
+        encaminhamento=triagem_result['encaminhamento_medico'],
+        motivo_encaminhamento=triagem_result.get('motivo_encaminhamento'),
+        observacoes='\n'.join(observacoes_list),
+        modulo=modulo_usado
+    )
+    db.session.add(consulta)
+
+    # Gravar a pontuação estruturada (lida depois por telas, relatórios e estatísticas),
+    # com o mesmo encaminhamento da consulta
+    registrar_pontuacao(consulta, modulo_usado, scoring_result,
+                        encaminhamento=triagem_result['encaminhamento_medico'])
+    db.session.flush()
+
+    linhas_respostas = []
+    for resposta_data in respostas:
+        pergunta_id_str = str(resposta_data['pergunta_id'])
+        linhas_respostas.append({
+            'id_consulta': consulta.id,
+            'id_pergunta': int(pergunta_id_str) if pergunta_id_str.isdigit() else ids_por_slug[pergunta_id_str],
+            'resposta': resposta_data['resposta']
+        })
+
+    linhas_recomendacoes = [
+        {'id_consulta': consulta.id, 'tipo': 'medicamento',
+         'descricao': rec['medicamento'], 'justificativa': rec['justificativa']}
+        for rec in triagem_result.get('recomendacoes_medicamentos', [])
+    ] + [
+        {'id_consulta': consulta.id, 'tipo': 'nao_farmacologico',
+         'descricao': rec['descricao'], 'justificativa': rec['justificativa']}
+        for rec in triagem_result.get('recomendacoes_nao_farmacologicas', [])
+    ]
+    if triagem_result['encaminhamento_medico']:
+        linhas_recomendacoes.append({
+            'id_consulta': consulta.id, 'tipo': 'encaminhamento',
+            'descricao': 'Encaminhamento médico',
+            'justificativa': triagem_result.get('motivo_encaminhamento')
+        })
+
+    if linhas_respostas:
+        db.session.execute(insert(ConsultaResposta), linhas_respostas)
+    if linhas_recomendacoes:
+        db.session.execute(insert(ConsultaRecomendacao), linhas_recomendacoes)
+    registrar_estatistica_diaria(
+        consulta, paciente, scoring_result.total_score,
+        recomendacoes_medicamento=len(triagem_result.get('recomendacoes_medicamentos', [])),
+        recomendacoes_nao_farmacologicas=len(triagem_result.get('recomendacoes_nao_farmacologicas', []))
+    )
+    db.session.commit()
+    # As recomendações entram por INSERT em lote, fora dos eventos do ORM que invalidam o painel
+    resumo_painel.invalidar()
+    return consulta
+
 @app.route('/triagem/processar', methods=['POST'])
 @login_required
 def processar_triagem():
@@ -898,60 +910,13 @@ def processar_triagem():
         paciente = Paciente.query.get_or_404(paciente_id)
         paciente_data = paciente.to_dict()
         
-        # Criar consulta
-        consulta = Consulta(
-            id_paciente=paciente_id,
-            data=datetime.now()
-        )
-        db.session.add(consulta)
-        db.session.commit()
-        
-        # Salvar respostas
-        # Persistir respostas dinâmicas (id_pergunta pode ser slug string). Armazenar como texto no campo resposta e usar pergunta_texto separado? 
-        # Para compatibilidade, vamos guardar o id (string) junto com a resposta no campo resposta.
-        for resposta_data in respostas:
-            pergunta_id_str = resposta_data['pergunta_id']
-            resposta_texto = resposta_data['resposta']
-
-            # Tentar converter para inteiro primeiro (para perguntas antigas)
-            try:
-                pergunta_id = int(pergunta_id_str)
-                # Se conseguiu converter, usar o ID numérico
-                resp = ConsultaResposta(
-                    id_consulta=consulta.id,
-                    id_pergunta=pergunta_id,
-                    resposta=resposta_texto
-                )
-                db.session.add(resp)
-            except (ValueError, TypeError):
-                # Se não conseguiu converter, é um ID string (formato: modulo_ordem)
-                # Para perguntas dinâmicas, usar um ID fixo baseado no hash
-                import hashlib
-                pergunta_id_hash = abs(hash(pergunta_id_str)) % 1000000  # ID entre 0 e 999999
-                
-                # Verificar se já existe uma pergunta com esse ID
-                pergunta_existente = Pergunta.query.filter_by(id=pergunta_id_hash).first()
-                
-                if not pergunta_existente:
-                    # Criar nova pergunta com ID baseado no hash
-                    nova_pergunta = Pergunta(
-                        id=pergunta_id_hash,
-                        texto=pergunta_id_str,
-                        tipo='sintoma',  # Usar um tipo válido do ENUM
-                        ordem=999,
-                        ativa=True
-                    )
-                    db.session.add(nova_pergunta)
-                    pergunta_id = pergunta_id_hash
-                else:
-                    pergunta_id = pergunta_id_hash
-                
-                resp = ConsultaResposta(
-                    id_consulta=consulta.id,
-                    id_pergunta=pergunta_id,
-                    resposta=resposta_texto
-                )
-                db.session.add(resp)
+        # Perguntas antigas usam o id numérico; as dos módulos usam o slug estável
+        # (modulo_ordem), resolvido pelo registro de perguntas em uma única etapa.
+        # O registro grava as perguntas novas em transação própria, por isso roda
+        # antes da transação da consulta
+        from services.registro_perguntas import registro_perguntas
+        slugs = [str(r['pergunta_id']) for r in respostas if not str(r['pergunta_id']).isdigit()]
+        ids_por_slug = registro_perguntas.ids(slugs) if slugs else {}
         
         # Processar triagem usando sistema de pontuação
         from utils.scoring.triagem_scoring import scoring_system
@@ -997,49 +962,24 @@ def processar_triagem():
                 'total_score': scoring_result.total_score,
                 'category_scores': scoring_result.category_scores,
                 'risk_level': scoring_result.risk_level,
-                'confidence': scoring_result.confidence
+                'confidence': scoring_result.confidence,
+                'versao_pesos': scoring_result.versao_pesos
             }
         }
         
-        # Atualizar consulta com resultado
-        consulta.encaminhamento = triagem_result['encaminhamento_medico']
-        consulta.motivo_encaminhamento = triagem_result.get('motivo_encaminhamento')
-        
-        # Adicionar o módulo/sintoma principal nas observações de forma destacada
-        modulo_usado = data.get('modulo', 'geral')
-        observacoes_list = [f'MODULO: {modulo_usado}']  # Primeiro item é sempre o módulo
-        observacoes_list.extend(triagem_result.get('observacoes', []))
-        consulta.observacoes = '\n'.join(observacoes_list)
-        
-        # Salvar recomendações
-        for rec in triagem_result.get('recomendacoes_medicamentos', []):
-            recomendacao = ConsultaRecomendacao(
-                id_consulta=consulta.id,
-                tipo='medicamento',
-                descricao=rec['medicamento'],
-                justificativa=rec['justificativa']
-            )
-            db.session.add(recomendacao)
-        
-        for rec in triagem_result.get('recomendacoes_nao_farmacologicas', []):
-            recomendacao = ConsultaRecomendacao(
-                id_consulta=consulta.id,
-                tipo='nao_farmacologico',
-                descricao=rec['descricao'],
-                justificativa=rec['justificativa']
-            )
-            db.session.add(recomendacao)
-        
-        if triagem_result['encaminhamento_medico']:
-            recomendacao = ConsultaRecomendacao(
-                id_consulta=consulta.id,
-                tipo='encaminhamento',
-                descricao='Encaminhamento médico',
-                justificativa=triagem_result.get('motivo_encaminhamento')
-            )
-            db.session.add(recomendacao)
+        # Triagem adaptativa encerrada por sinal de alerta (sessão deste paciente e
+        # módulo): encaminhar com os motivos do módulo, sem indicar medicamentos
+        motivos_alerta = fluxo_adaptativo.sinais_de_alerta(
+            data.get('sessao_adaptativa'), paciente.id, data.get('modulo')
+        )
+        if motivos_alerta:
+            triagem_result['encaminhamento_medico'] = True
+            triagem_result['motivo_encaminhamento'] = 'Sinais de alerta: ' + ' | '.join(motivos_alerta)
+            triagem_result['recomendacoes_medicamentos'] = []
+            triagem_result['recomendacoes_medicamentos_adicionais'] = []
         
-        db.session.commit()
+        consulta = _persistir_triagem(paciente, data.get('modulo', 'geral'), respostas, ids_por_slug,
+                                      triagem_result, scoring_result)
         
         # Retornar resultado
         return jsonify({
@@ -1133,53 +1073,25 @@ def resultado_triagem(consulta_id):
         elif rec.tipo == 'encaminhamento':
             resultado['alert_signs'].append(rec.justificativa or 'Encaminhamento médico necessário')
     
-    # Calcular score e risk_level usando o sistema de pontuação real
-    if respostas_completas:
-        try:
-            # Preparar dados para o sistema de pontuação
-            from utils.scoring.triagem_scoring import scoring_system
-            from utils.extractors.perguntas_extractor import get_patient_profile_from_cadastro
-            
-            # Obter perfil do paciente
-            paciente_data = paciente.to_dict()
-            patient_profile = get_patient_profile_from_cadastro(paciente_data)
-            
-            # Preparar respostas no formato esperado
-            respostas_formatadas = []
-            for resposta in respostas:
-                respostas_formatadas.append({
-                    'pergunta_id': str(resposta.id_pergunta),
-                    'resposta': resposta.resposta
-                })
-            
-            # Detectar o módulo correto baseado nas perguntas
-            modulo_detectado = _detectar_modulo_das_perguntas(respostas)
-            
-            # Calcular pontuação usando o sistema real
-            scoring_result = scoring_system.calculate_score(
-                modulo=modulo_detectado,
-                respostas=respostas_formatadas,
-                paciente_profile=patient_profile
-            )
-            
-            resultado['score'] = scoring_result.total_score
-            resultado['risk_level'] = scoring_result.risk_level
-            resultado['alert_signs'] = []  # Será preenchido se houver sinais de alerta
-            
-            if scoring_result.encaminhamento:
-                resultado['risk_level'] = 'alto'
-                resultado['alert_signs'].append('Pontuação alta ou sinais críticos detectados')
-                
-        except Exception as e:
-            print(f"Erro ao calcular pontuação: {e}")
-            # Fallback para cálculo simples
-            resultado['score'] = len(respostas_completas) * 10
-            if consulta.encaminhamento:
-                resultado['risk_level'] = 'alto'
-            elif resultado['score'] > 50:
-                resultado['risk_level'] = 'medio'
-            else:
-                resultado['risk_level'] = 'baixo'
+    # Pontuação gravada na triagem (consultas não migradas são calculadas em memória)
+    pontuacao = obter_pontuacao(consulta, _detectar_modulo_das_perguntas)
+    if pontuacao is not None:
+        resultado['score'] = pontuacao.pontuacao_total
+        resultado['risk_level'] = pontuacao.nivel_risco
+        resultado['alert_signs'] = []  # Será preenchido se houver sinais de alerta
+        
+        if consulta.encaminhamento:
+            resultado['risk_level'] = 'alto'
+            resultado['alert_signs'].append('Pontuação alta ou sinais críticos detectados')
+    elif respostas_completas:
+        # Fallback para cálculo simples
+        resultado['score'] = len(respostas_completas) * 10
+        if consulta.encaminhamento:
+            resultado['risk_level'] = 'alto'
+        elif resultado['score'] > 50:
+            resultado['risk_level'] = 'medio'
+        else:
+            resultado['risk_level'] = 'baixo'
     
     return render_template('resultado_triagem.html', 
                          consulta=consulta, 
@@ -1320,65 +1232,15 @@ def gerar_relatorio(consulta_id):
             }
         }
         
-        # Tentar extrair dados de pontuação das observações
-        observacoes_texto = consulta.observacoes or ''
-        if 'Pontuação total:' in observacoes_texto:
-            try:
-                import re
-                score_match = re.search(r'Pontuação total: ([\d.]+)', observacoes_texto)
-                if score_match:
-                    triagem_result['scoring_result']['total_score'] = float(score_match.group(1))
-                
-                nivel_match = re.search(r'Nível de risco: (\w+)', observacoes_texto)
-                if nivel_match:
-                    triagem_result['scoring_result']['risk_level'] = nivel_match.group(1).lower()
-                
-                confianca_match = re.search(r'Confiança: ([\d.]+%)', observacoes_texto)
-                if confianca_match:
-                    confianca_str = confianca_match.group(1).replace('%', '')
-                    triagem_result['scoring_result']['confidence'] = float(confianca_str) / 100.0
-            except Exception:
-                pass  # Manter valores padrão se houver erro
-        
-        # Se não há dados de pontuação nas observações, tentar recalcular
-        if triagem_result['scoring_result']['total_score'] == 0.0 and respostas_completas:
-            try:
-                from utils.scoring.triagem_scoring import scoring_system
-                from utils.extractors.perguntas_extractor import get_patient_profile_from_cadastro
-                
-                # Obter perfil do paciente
-                paciente_data_dict = paciente.to_dict()
-                patient_profile = get_patient_profile_from_cadastro(paciente_data_dict)
-                
-                # Preparar respostas no formato esperado
-                respostas_formatadas = []
-                for resposta in respostas_completas:
-                    respostas_formatadas.append({
-                        'pergunta_id': str(resposta['pergunta_id']),
-                        'resposta': resposta['resposta']
-                    })
-                
-                # Detectar módulo
-                modulo_detectado = _detectar_modulo_das_perguntas(consulta.respostas)
-                
-                # Calcular pontuação
-                scoring_result = scoring_system.calculate_score(
-                    modulo=modulo_detectado,
-                    respostas=respostas_formatadas,
-                    paciente_profile=patient_profile
-                )
-                
-                # Atualizar resultado com dados reais
-                triagem_result['scoring_result'] = {
-                    'total_score': scoring_result.total_score,
-                    'risk_level': scoring_result.risk_level,
-                    'confidence': scoring_result.confidence,
-                    'category_scores': scoring_result.category_scores
-                }
-                
-            except Exception as e:
-                print(f"Erro ao recalcular pontuação: {e}")
-                # Manter valores padrão
+        # Pontuação gravada na triagem (consultas não migradas são calculadas em memória)
+        pontuacao = obter_pontuacao(consulta, _detectar_modulo_das_perguntas)
+        if pontuacao is not None:
+            triagem_result['scoring_result'] = {
+                'total_score': pontuacao.pontuacao_total,
+                'risk_level': pontuacao.nivel_risco,
+                'confidence': pontuacao.confianca,
+                'category_scores': pontuacao.pontuacoes_categoria
+            }
         
         # Gerar PDF
         filename = f"relatorio_consulta_{consulta_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
@@ -1412,53 +1274,8 @@ def estatisticas_avancadas():
 @admin_required
 def admin():
     """Painel administrativo"""
-    from datetime import timedelta
-    from sqlalchemy import func
-    
-    # Estatísticas gerais
-    total_pacientes = Paciente.query.count()
-    total_consultas = Consulta.query.count()
-    total_medicamentos = Medicamento.query.filter_by(ativo=True).count()
-    total_encaminhamentos = Consulta.query.filter_by(encaminhamento=True).count()
-    
-    # Pacientes por gênero
-    total_pacientes_masculino = Paciente.query.filter_by(sexo='M').count()
-    total_pacientes_feminino = Paciente.query.filter_by(sexo='F').count()
-    
-    # Medicamentos mais recomendados
-    # CORREÇÃO: Extrair nome base antes de agrupar para evitar duplicações
-    medicamentos_raw = db.session.query(
-        ConsultaRecomendacao.descricao
-    ).filter(
-        ConsultaRecomendacao.tipo == 'medicamento'
-    ).all()
-    
-    # Processar medicamentos para extrair nome base e contar
-    medicamentos_dict = {}
-    for m in medicamentos_raw:
-        # Extrair nome base (antes do primeiro " - " ou " | ")
-        nome_base = m.descricao.split(' - ')[0].split(' | ')[0].strip()
-        
-        if nome_base in medicamentos_dict:
-            medicamentos_dict[nome_base] += 1
-        else:
-            medicamentos_dict[nome_base] = 1
-    
-    # Ordenar por contagem e pegar top 5
-    medicamentos_ordenados = sorted(
-        medicamentos_dict.items(), 
-        key=lambda x: x[1], 
-        reverse=True
-    )[:5]
-    
-    # Converter para formato esperado pelo template
-    medicamentos_recomendados = [
-        {'descricao': nome, 'count': count} 
-        for nome, count in medicamentos_ordenados
-    ]
-    
-    # Taxa de encaminhamentos
-    taxa_encaminhamento = (total_encaminhamentos / total_consultas * 100) if total_consultas > 0 else 0
+    # Números do painel (o mesmo resumo em cache do dashboard)
+    resumo = resumo_painel.obter()
     
     # Eficácia das recomendações (baseado em feedback se implementado)
     eficacia_recomendacoes = {
@@ -1467,91 +1284,36 @@ def admin():
         'pouco_eficaz': 5
     }
     
-    # Consultas por mês (últimos 6 meses)
-    from datetime import datetime, timedelta
-    import calendar
-    
-    consultas_por_mes = []
-    hoje = datetime.now()
-    
-    for i in range(5, -1, -1):  # Últimos 6 meses
-        # Calcular o mês
-        mes_data = hoje - timedelta(days=30 * i)
-        mes_inicio = mes_data.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        
-        # Último dia do mês
-        ultimo_dia = calendar.monthrange(mes_inicio.year, mes_inicio.month)[1]
-        mes_fim = mes_inicio.replace(day=ultimo_dia, hour=23, minute=59, second=59)
-        
-        # Contar consultas do mês
-        count = Consulta.query.filter(
-            Consulta.data >= mes_inicio,
-            Consulta.data <= mes_fim
-        ).count()
-        
-        # Nome do mês em português
-        meses_pt = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 
-                    'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-        mes_nome = meses_pt[mes_inicio.month - 1]
-        
-        consultas_por_mes.append({
-            'mes': f'{mes_nome}/{mes_inicio.year}',
-            'count': count
-        })
-    
-    # Pacientes por faixa etária
-    faixas_etarias = [
-        {'faixa': '0-18 anos', 'min': 0, 'max': 18},
-        {'faixa': '19-35 anos', 'min': 19, 'max': 35},
-        {'faixa': '36-60 anos', 'min': 36, 'max': 60},
-        {'faixa': '60+ anos', 'min': 61, 'max': 150}
-    ]
-    
-    pacientes_por_faixa = []
-    for faixa in faixas_etarias:
-        count = Paciente.query.filter(
-            Paciente.idade >= faixa['min'],
-            Paciente.idade <= faixa['max']
-        ).count()
-        pacientes_por_faixa.append({
-            'faixa': faixa['faixa'],
-            'count': count
-        })
-    
-    # Consultas recentes
-    consultas_recentes = Consulta.query.join(Paciente).order_by(Consulta.data.desc()).limit(5).all()
-    
     return render_template('admin.html', 
-                         total_pacientes=total_pacientes,
-                         total_consultas=total_consultas,
-                         total_medicamentos=total_medicamentos,
-                         total_encaminhamentos=total_encaminhamentos,
-                         total_pacientes_masculino=total_pacientes_masculino,
-                         total_pacientes_feminino=total_pacientes_feminino,
-                         medicamentos_recomendados=medicamentos_recomendados,
-                         taxa_encaminhamento=taxa_encaminhamento,
+                         total_pacientes=resumo['total_pacientes'],
+                         total_consultas=resumo['total_consultas'],
+                         total_medicamentos=resumo['total_medicamentos'],
+                         total_encaminhamentos=resumo['total_encaminhamentos'],
+                         total_pacientes_masculino=resumo['total_pacientes_masculino'],
+                         total_pacientes_feminino=resumo['total_pacientes_feminino'],
+                         medicamentos_recomendados=resumo['medicamentos_recomendados'],
+                         taxa_encaminhamento=resumo['taxa_encaminhamento'],
                          eficacia_recomendacoes=eficacia_recomendacoes,
-                         consultas_recentes=consultas_recentes,
-                         consultas_por_mes=consultas_por_mes,
-                         pacientes_por_faixa=pacientes_por_faixa)
+                         consultas_recentes=resumo['consultas_recentes'],
+                         consultas_por_mes=resumo['consultas_por_mes'],
+                         pacientes_por_faixa=resumo['pacientes_por_faixa_admin'])
 
 
 
 @app.route('/api/perguntas')
 def api_perguntas():
-    """API para buscar perguntas ativas"""
+    """API para buscar perguntas ativas (ETag pelo conteúdo)"""
     perguntas = get_perguntas_ativas()
-    return jsonify([p.to_dict() for p in perguntas])
+    return json_condicional(lambda: [p.to_dict() for p in perguntas], max_age=max_age_padrao())
 
 @app.route('/api/triagem/modulos')
 def api_triagem_modulos():
-    """Lista módulos disponíveis no motor_de_perguntas"""
-    mods = list_motor_modulos()
-    return jsonify(mods)
+    """Lista módulos disponíveis no motor_de_perguntas (ETag pelo conteúdo)"""
+    return json_condicional(list_motor_modulos, max_age=max_age_padrao())
 
 @app.route('/api/triagem/perguntas')
 def api_triagem_perguntas():
-    """Retorna perguntas do módulo informado (slug) extraídas via AST"""
+    """Retorna perguntas do módulo informado (slug), servidas pelo manifesto pré-compilado"""
     slug = request.args.get('modulo', '').strip()
     paciente_id = request.args.get('paciente_id', type=int)
     filter_unnecessary = request.args.get('filter_unnecessary', 'true').lower() == 'true'
@@ -1566,60 +1328,136 @@ def api_triagem_perguntas():
             paciente = Paciente.query.get_or_404(paciente_id)
             paciente_data = paciente.to_dict()
             
-            # Extrair perguntas filtradas
-            questions = extract_questions_for_module(slug, filter_unnecessary=True)
+            # Perguntas filtradas, já com scoring_info (peso, categoria, critica, indication)
+            questions = manifesto_perguntas.perguntas(slug, filtrar=True)
             
             # Adicionar informações do perfil do paciente para uso no frontend
             from utils.extractors.perguntas_extractor import get_patient_profile_from_cadastro
             patient_profile = get_patient_profile_from_cadastro(paciente_data)
             
-            # Adicionar informações de pontuação para cada pergunta
-            for question in questions:
-                question['scoring_info'] = {
-                    'peso': question.get('peso', 1.0),
-                    'categoria': question.get('categoria', 'sintoma'),
-                    'critica': question.get('critica', False),
-                    'indication': question.get('indication', 'nao_farmacologico')
-                }
-            
-            return jsonify({
+            # Resposta depende do paciente: revalidar sempre (no-cache), mas sem reenviar o corpo
+            return json_condicional(lambda: {
                 'success': True, 
                 'modulo': slug, 
-                'perguntas': questions,
+                'perguntas': list(questions),
                 'patient_profile': patient_profile,
                 'filtered': True
-            })
+            }, versao=(manifesto_perguntas.assinatura(slug, True), patient_profile))
         else:
             # Comportamento original - sem filtro
-            questions = extract_questions_for_module(slug, filter_unnecessary=False)
-            return jsonify({
+            return json_condicional(lambda: {
                 'success': True, 
                 'modulo': slug, 
-                'perguntas': questions,
+                'perguntas': list(manifesto_perguntas.perguntas(slug, filtrar=False)),
                 'filtered': False
-            })
+            }, versao=manifesto_perguntas.assinatura(slug, False), max_age=max_age_padrao())
             
     except FileNotFoundError:
         return jsonify({'success': False, 'error': 'Módulo não encontrado'}), 404
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/triagem/adaptativa/iniciar', methods=['POST'])
+@login_required
+def api_triagem_adaptativa_iniciar():
+    """Inicia uma triagem adaptativa e retorna a primeira pergunta"""
+    data = request.get_json(silent=True) or {}
+    slug = str(data.get('modulo', '')).strip()
+    paciente_id = data.get('paciente_id')
+    
+    if not slug or not paciente_id:
+        return jsonify({'success': False, 'error': 'Parâmetros modulo e paciente_id são obrigatórios'}), 400
+    
+    try:
+        paciente = Paciente.query.get_or_404(paciente_id)
+        from utils.extractors.perguntas_extractor import get_patient_profile_from_cadastro
+        patient_profile = get_patient_profile_from_cadastro(paciente.to_dict())
+        
+        estado = fluxo_adaptativo.iniciar(slug, patient_profile, paciente_id=paciente.id)
+        return jsonify({'success': True, **estado})
+    except FileNotFoundError:
+        return jsonify({'success': False, 'error': 'Módulo não encontrado'}), 404
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/triagem/adaptativa/responder', methods=['POST'])
+@login_required
+def api_triagem_adaptativa_responder():
+    """Registra uma resposta da triagem adaptativa e retorna a próxima pergunta (ou o encerramento)"""
+    data = request.get_json(silent=True) or {}
+    
+    if not data.get('sessao_id') or not data.get('pergunta_id') or 'resposta' not in data:
+        return jsonify({'success': False, 'error': 'Parâmetros sessao_id, pergunta_id e resposta são obrigatórios'}), 400
+    
+    try:
+        estado = fluxo_adaptativo.responder(data['sessao_id'], data['pergunta_id'], data['resposta'])
+        return jsonify({'success': True, **estado})
+    except KeyError as e:
+        return jsonify({'success': False, 'error': e.args[0]}), 404
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/triagem/regras')
+@login_required
+def api_triagem_regras():
+    """Representação declarativa (perguntas, condições e desfechos) das regras do módulo"""
+    slug = request.args.get('modulo', '').strip()
+    if not slug:
+        return jsonify({'success': False, 'error': 'Parâmetro modulo é obrigatório'}), 400
+    
+    try:
+        return json_condicional(
+            lambda: {'success': True, 'regras': motor_regras.regras(slug).to_dict()},
+            versao=manifesto_perguntas.assinatura(slug, True)
+        )
+    except FileNotFoundError:
+        return jsonify({'success': False, 'error': 'Módulo não encontrado'}), 404
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/triagem/regras/avaliar', methods=['POST'])
+@login_required
+def api_triagem_regras_avaliar():
+    """Reavalia em lote as regras dos módulos sobre as respostas gravadas das consultas"""
+    data = request.get_json(silent=True) or {}
+    ids = data.get('consulta_ids')
+    
+    if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+        return jsonify({'success': False, 'error': 'consulta_ids deve ser uma lista de inteiros'}), 400
+    
+    try:
+        avaliacoes = motor_regras.avaliar_consultas(ids)
+        return jsonify({
+            'success': True,
+            'avaliacoes': {str(id_consulta): a.to_dict() for id_consulta, a in avaliacoes.items()},
+            'sem_modulo': [i for i in ids if i not in avaliacoes]
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/sintomas')
 def api_sintomas():
-    """API para buscar sintomas"""
-    sintomas = Sintoma.query.all()
-    return jsonify([s.to_dict() for s in sintomas])
+    """API para buscar sintomas (ETag pelo conteúdo)"""
+    return json_condicional(lambda: [s.to_dict() for s in Sintoma.query.all()], max_age=max_age_padrao())
 
 @app.route('/api/medicamentos')
 def api_medicamentos():
     """
     API para buscar medicamentos ativos
     
-    Otimização: Limita resultados para evitar sobrecarga
+    Otimizações:
+    - Limita resultados para evitar sobrecarga
+    - ETag pela assinatura do catálogo (quantidade de ativos + maior updated_at):
+      revalidações sem mudança respondem 304 sem ler nem serializar os medicamentos
     """
-    # Limitar resultados para evitar sobrecarga da API
-    medicamentos = Medicamento.query.filter_by(ativo=True).limit(1000).all()
-    return jsonify([m.to_dict() for m in medicamentos])
+    def gerar():
+        # Limitar resultados para evitar sobrecarga da API
+        medicamentos = Medicamento.query.filter_by(ativo=True).limit(1000).all()
+        return [m.to_dict() for m in medicamentos]
+    
+    return json_condicional(gerar, versao=assinatura_catalogo())
 
 @app.route('/api/triagem/medicamentos_adicionais/<int:consulta_id>')
 def api_medicamentos_adicionais(consulta_id):
@@ -1696,8 +1534,14 @@ def api_estatisticas_consultas():
         tipo_media = request.args.get('tipo_media', 'simples')  # simples ou movel
         janela_media = int(request.args.get('janela_media', '7'))  # Janela para média móvel (padrão: 7 dias)
         
-        # Query base
-        query = Consulta.query
+        # Consultas e encaminhamentos por dia, agregados no banco
+        dia = db.func.date(Consulta.data)
+        query = db.session.query(
+            dia,
+            db.func.count(Consulta.id),
+            db.func.sum(db.case((Consulta.encaminhamento == True, 1), else_=0))
+        )
+        fim = None
         
         # Aplicar filtros de data
         if data_inicio and data_fim:
@@ -1728,46 +1572,45 @@ def api_estatisticas_consultas():
             
             query = query.filter(Consulta.data >= inicio)
         
-        # Buscar consultas
-        consultas = query.order_by(Consulta.data.asc()).all()  # Ordenar crescente para cálculos
-        
-        # Preparar dados por dia
-        consultas_por_dia = {}
-        for consulta in consultas:
-            data_str = consulta.data.strftime('%Y-%m-%d')
-            if data_str not in consultas_por_dia:
-                consultas_por_dia[data_str] = {
-                    'data': consulta.data.strftime('%d/%m'),
-                    'data_completa': data_str,
-                    'count': 0,
-                    'encaminhamentos': 0
-                }
-            consultas_por_dia[data_str]['count'] += 1
-            if consulta.encaminhamento:
-                consultas_por_dia[data_str]['encaminhamentos'] += 1
-        
-        # Ordenar por data
-        dados_ordenados = sorted(consultas_por_dia.values(), key=lambda x: x['data_completa'])
+        por_dia = {str(d)[:10]: (count, encaminhamentos or 0) for d, count, encaminhamentos in query.group_by(dia)}
+        
+        # Série com todos os dias do período (dias sem consultas entram com zero)
+        dados_ordenados = []
+        data_atual = inicio.date()
+        ultimo_dia = (fim or datetime.now()).date()
+        while data_atual <= ultimo_dia:
+            data_str = data_atual.strftime('%Y-%m-%d')
+            count, encaminhamentos = por_dia.get(data_str, (0, 0))
+            dados_ordenados.append({
+                'data': data_atual.strftime('%d/%m'),
+                'data_completa': data_str,
+                'count': count,
+                'encaminhamentos': encaminhamentos
+            })
+            data_atual += timedelta(days=1)
         
         # Calcular média
         valores = [d['count'] for d in dados_ordenados]
+        total_consultas = sum(valores)
         media_dados = []
         
         if tipo_media == 'simples':
             # Média simples: mesmo valor para todos os pontos
-            media_simples = sum(valores) / len(valores) if len(valores) > 0 else 0
+            media_simples = total_consultas / len(valores) if len(valores) > 0 else 0
             media_dados = [round(media_simples, 2) for _ in valores]
         
         elif tipo_media == 'movel':
-            # Média móvel: média dos últimos N dias
+            # Média móvel dos últimos N dias por somas acumuladas; nos primeiros
+            # pontos, média dos valores disponíveis até ali
+            janela_media = max(janela_media, 1)
+            acumulado = [0]
+            for valor in valores:
+                acumulado.append(acumulado[-1] + valor)
             for i in range(len(valores)):
                 if i < janela_media - 1:
-                    # Para os primeiros pontos, usa média dos valores disponíveis até ali
-                    media_dados.append(round(sum(valores[:i+1]) / (i+1), 2))
+                    media_dados.append(round(acumulado[i + 1] / (i + 1), 2))
                 else:
-                    # Média móvel dos últimos N dias
-                    janela = valores[i-janela_media+1:i+1]
-                    media_dados.append(round(sum(janela) / janela_media, 2))
+                    media_dados.append(round((acumulado[i + 1] - acumulado[i + 1 - janela_media]) / janela_media, 2))
         
         # Adicionar média aos dados
         for i, dado in enumerate(dados_ordenados):
@@ -1776,7 +1619,7 @@ def api_estatisticas_consultas():
         return jsonify({
             'success': True,
             'periodo': periodo,
-            'total_consultas': len(consultas),
+            'total_consultas': total_consultas,
             'tipo_media': tipo_media,
             'janela_media': janela_media,
             'media_geral': round(sum(valores) / len(valores), 2) if len(valores) > 0 else 0,
@@ -1797,10 +1640,9 @@ def api_estatisticas_medicamentos():
         data_inicio = request.args.get('data_inicio')
         data_fim = request.args.get('data_fim')
         
-        # Query base
-        query = ConsultaRecomendacao.query.join(Consulta).filter(
-            ConsultaRecomendacao.tipo == 'medicamento'
-        )
+        # Consultas do período (as recomendações são buscadas pelo índice
+        # (id_consulta, tipo) a partir delas)
+        consultas_periodo = db.session.query(Consulta.id)
         
         # Aplicar filtros de data
         if data_inicio and data_fim:
@@ -1808,7 +1650,7 @@ def api_estatisticas_medicamentos():
                 inicio = datetime.strptime(data_inicio, '%Y-%m-%d')
                 fim = datetime.strptime(data_fim, '%Y-%m-%d')
                 fim = fim.replace(hour=23, minute=59, second=59)
-                query = query.filter(Consulta.data >= inicio, Consulta.data <= fim)
+                consultas_periodo = consultas_periodo.filter(Consulta.data >= inicio, Consulta.data <= fim)
             except ValueError:
                 return jsonify({'success': False, 'error': 'Formato de data inválido'}), 400
         else:
@@ -1825,7 +1667,12 @@ def api_estatisticas_medicamentos():
             else:
                 inicio = hoje - timedelta(days=30)
             
-            query = query.filter(Consulta.data >= inicio)
+            consultas_periodo = consultas_periodo.filter(Consulta.data >= inicio)
+        
+        query = ConsultaRecomendacao.query.filter(
+            ConsultaRecomendacao.tipo == 'medicamento',
+            ConsultaRecomendacao.id_consulta.in_(consultas_periodo)
+        )
         
         # Buscar medicamentos
         medicamentos_raw = query.all()
@@ -1945,15 +1792,16 @@ def api_estatisticas_desempenho():
         else:
             inicio = hoje - timedelta(days=30)
         
-        # Métricas
-        total_consultas = Consulta.query.filter(Consulta.data >= inicio).count()
-        total_encaminhamentos = Consulta.query.filter(
-            Consulta.data >= inicio,
-            Consulta.encaminhamento == True
-        ).count()
-        total_pacientes_atendidos = db.session.query(Consulta.id_paciente).filter(
+        # Métricas (estatísticas diárias; pacientes distintos vêm das consultas)
+        total_consultas, total_encaminhamentos, total_recomendacoes = (int(valor or 0) for valor in consultar_estatisticas(
+            db.func.sum(EstatisticaDiaria.consultas),
+            db.func.sum(db.case((EstatisticaDiaria.encaminhamento == True, EstatisticaDiaria.consultas), else_=0)),
+            db.func.sum(EstatisticaDiaria.recomendacoes_medicamento),
+            inicio=inicio
+        ).one())
+        total_pacientes_atendidos = db.session.query(db.func.count(db.distinct(Consulta.id_paciente))).filter(
             Consulta.data >= inicio
-        ).distinct().count()
+        ).scalar()
         
         # Taxa de encaminhamentos
         taxa_encaminhamento = (total_encaminhamentos / total_consultas * 100) if total_consultas > 0 else 0
@@ -1965,14 +1813,6 @@ def api_estatisticas_desempenho():
         dias = (hoje - inicio).days + 1
         media_consultas_dia = total_consultas / dias if dias > 0 else 0
         
-        # Medicamentos mais recomendados
-        medicamentos_raw = db.session.query(ConsultaRecomendacao.descricao).join(Consulta).filter(
-            Consulta.data >= inicio,
-            ConsultaRecomendacao.tipo == 'medicamento'
-        ).all()
-        
-        total_recomendacoes = len(medicamentos_raw)
-        
         return jsonify({
             'success': True,
             'periodo': periodo,
@@ -1990,6 +1830,19 @@ def api_estatisticas_desempenho():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def _modulos_disponiveis(inicio, *condicoes, **filtros):
+    """Módulos (sintomas) com consultas no período, para os filtros das estatísticas"""
+    query = consultar_estatisticas(EstatisticaDiaria.modulo, inicio=inicio, **filtros)
+    return sorted(modulo for (modulo,) in query.filter(EstatisticaDiaria.modulo != '', *condicoes).distinct())
+
+def _consultas_por(coluna, inicio, *condicoes, **filtros):
+    """Consultas com módulo no período, por uma dimensão das estatísticas diárias"""
+    query = consultar_estatisticas(coluna, db.func.sum(EstatisticaDiaria.consultas), inicio=inicio, **filtros)
+    return {
+        valor: int(total)
+        for valor, total in query.filter(EstatisticaDiaria.modulo != '', *condicoes).group_by(coluna)
+    }
+
 @app.route('/api/estatisticas/sintomas-faixa-etaria')
 @login_required
 def api_estatisticas_sintomas_faixa_etaria():
@@ -2019,67 +1872,14 @@ def api_estatisticas_sintomas_faixa_etaria():
         # Parâmetro de filtro de gênero
         genero = request.args.get('genero', 'todos')
         
-        # Query base: buscar consultas com pacientes
-        query = db.session.query(
-            Consulta.observacoes,
-            Paciente.idade,
-            Paciente.sexo
-        ).join(
-            Paciente, Consulta.id_paciente == Paciente.id
-        ).filter(
-            Consulta.data >= inicio
-        )
+        sintomas_disponiveis = _modulos_disponiveis(inicio, genero=genero)
         
-        # Aplicar filtro de gênero
-        if genero != 'todos':
-            query = query.filter(Paciente.sexo == genero)
-        
-        consultas_data = query.all()
-        
-        # Extrair sintomas das observações
-        sintomas_disponiveis = set()
-        dados_sintomas = []
-        
-        for observacoes, idade, sexo in consultas_data:
-            if not observacoes:
-                continue
-            
-            # Primeira linha das observações contém o módulo/sintoma
-            linhas = observacoes.split('\n')
-            if linhas and linhas[0].startswith('MODULO:'):
-                sintoma_consulta = linhas[0].replace('MODULO:', '').strip()
-                sintomas_disponiveis.add(sintoma_consulta)
-                
-                # Se filtro de sintoma está ativo e não corresponde, pular
-                if sintoma != 'todos' and sintoma_consulta != sintoma:
-                    continue
-                
-                dados_sintomas.append({
-                    'sintoma': sintoma_consulta,
-                    'idade': idade
-                })
-        
-        # Definir faixas etárias
-        faixas_etarias = [
-            {'nome': '0-17 anos', 'min': 0, 'max': 17},
-            {'nome': '18-34 anos', 'min': 18, 'max': 34},
-            {'nome': '35-54 anos', 'min': 35, 'max': 54},
-            {'nome': '55+ anos', 'min': 55, 'max': 150}
-        ]
-        
-        # Agrupar por faixa etária
-        distribuicao = {}
-        for faixa in faixas_etarias:
-            distribuicao[faixa['nome']] = 0
-        
-        total_ocorrencias = 0
-        for dado in dados_sintomas:
-            idade = dado['idade']
-            for faixa in faixas_etarias:
-                if faixa['min'] <= idade <= faixa['max']:
-                    distribuicao[faixa['nome']] += 1
-                    total_ocorrencias += 1
-                    break
+        # Agrupar por faixa etária (estatísticas diárias)
+        contagens = _consultas_por(EstatisticaDiaria.faixa_etaria, inicio, sintoma=sintoma, genero=genero)
+        distribuicao = {
+            f'{nome} anos': contagens.get(nome, 0) for nome, _, _ in FAIXAS_ETARIAS
+        }
+        total_ocorrencias = sum(distribuicao.values())
         
         # Preparar dados para o gráfico
         dados_grafico = []
@@ -2101,7 +1901,7 @@ def api_estatisticas_sintomas_faixa_etaria():
             'periodo': periodo,
             'total_ocorrencias': total_ocorrencias,
             'dados': dados_grafico,
-            'sintomas_disponiveis': sorted(list(sintomas_disponiveis)),
+            'sintomas_disponiveis': sintomas_disponiveis,
             'validacao': {
                 'consistente': consistente,
                 'soma_faixas': soma_faixas,
@@ -2141,74 +1941,16 @@ def api_estatisticas_sintomas_genero():
         # Parâmetro de filtro de faixa etária
         faixa_etaria = request.args.get('faixa_etaria', 'todos')
         
-        # Query base: buscar consultas com pacientes
-        query = db.session.query(
-            Consulta.observacoes,
-            Paciente.sexo,
-            Paciente.idade
-        ).join(
-            Paciente, Consulta.id_paciente == Paciente.id
-        ).filter(
-            Consulta.data >= inicio
-        )
-        
-        # Aplicar filtro de faixa etária
-        if faixa_etaria != 'todos':
-            faixas = {
-                '0-17': (0, 17),
-                '18-34': (18, 34),
-                '35-54': (35, 54),
-                '55+': (55, 150)
-            }
-            if faixa_etaria in faixas:
-                min_idade, max_idade = faixas[faixa_etaria]
-                query = query.filter(
-                    Paciente.idade >= min_idade,
-                    Paciente.idade <= max_idade
-                )
-        
-        consultas_data = query.all()
-        
-        # Extrair sintomas das observações
-        sintomas_disponiveis = set()
-        dados_sintomas = []
-        
-        for observacoes, sexo, idade in consultas_data:
-            if not observacoes:
-                continue
-            
-            # Primeira linha das observações contém o módulo/sintoma
-            linhas = observacoes.split('\n')
-            if linhas and linhas[0].startswith('MODULO:'):
-                sintoma_consulta = linhas[0].replace('MODULO:', '').strip()
-                sintomas_disponiveis.add(sintoma_consulta)
-                
-                # Se filtro de sintoma está ativo e não corresponde, pular
-                if sintoma != 'todos' and sintoma_consulta != sintoma:
-                    continue
-                
-                dados_sintomas.append({
-                    'sintoma': sintoma_consulta,
-                    'sexo': sexo
-                })
+        sintomas_disponiveis = _modulos_disponiveis(inicio, faixa=faixa_etaria)
         
-        # Agrupar por gênero
+        # Agrupar por gênero (estatísticas diárias)
+        contagens = _consultas_por(EstatisticaDiaria.sexo, inicio, sintoma=sintoma, faixa=faixa_etaria)
         distribuicao = {
-            'Masculino': 0,
-            'Feminino': 0,
-            'Outro': 0
+            'Masculino': contagens.get('M', 0),
+            'Feminino': contagens.get('F', 0),
+            'Outro': contagens.get('O', 0)
         }
-        
-        total_ocorrencias = 0
-        for dado in dados_sintomas:
-            sexo = dado['sexo']
-            if sexo == 'M':
-                distribuicao['Masculino'] += 1
-            elif sexo == 'F':
-                distribuicao['Feminino'] += 1
-            elif sexo == 'O':
-                distribuicao['Outro'] += 1
-            total_ocorrencias += 1
+        total_ocorrencias = sum(contagens.values())
         
         # Preparar dados para o gráfico
         dados_grafico = []
@@ -2227,8 +1969,7 @@ def api_estatisticas_sintomas_genero():
         consistente = (soma_generos == total_ocorrencias)
         
         # Verificar se há dados sem gênero (NULL)
-        total_consultas = len(consultas_data)
-        consultas_com_sintoma = len([d for d in consultas_data if d[0] and 'MODULO:' in d[0]])
+        consultas_com_sintoma = sum(_consultas_por(EstatisticaDiaria.modulo, inicio, faixa=faixa_etaria).values())
         dados_sem_genero = consultas_com_sintoma - total_ocorrencias
         
         return jsonify({
@@ -2237,7 +1978,7 @@ def api_estatisticas_sintomas_genero():
             'periodo': periodo,
             'total_ocorrencias': total_ocorrencias,
             'dados': dados_grafico,
-            'sintomas_disponiveis': sorted(list(sintomas_disponiveis)),
+            'sintomas_disponiveis': sintomas_disponiveis,
             'validacao': {
                 'consistente': consistente,
                 'soma_generos': soma_generos,
@@ -2285,69 +2026,12 @@ def api_estatisticas_sintomas_localizacao():
         # Parâmetro de filtro de gênero
         genero = request.args.get('genero', 'todos')
         
-        # Query base: buscar consultas com pacientes e localização
-        query = db.session.query(
-            Consulta.observacoes,
-            Paciente.bairro,
-            Paciente.cidade,
-            Paciente.sexo
-        ).join(
-            Paciente, Consulta.id_paciente == Paciente.id
-        ).filter(
-            Consulta.data >= inicio
-        )
-        
-        # Aplicar filtro de gênero
-        if genero != 'todos':
-            query = query.filter(Paciente.sexo == genero)
-        
-        # Filtrar apenas pacientes com localização preenchida
-        if agrupamento == 'bairro':
-            query = query.filter(Paciente.bairro.isnot(None), Paciente.bairro != '')
-        else:  # cidade
-            query = query.filter(Paciente.cidade.isnot(None), Paciente.cidade != '')
-        
-        consultas_data = query.all()
-        
-        # Extrair sintomas das observações
-        sintomas_disponiveis = set()
-        dados_sintomas = []
-        
-        for observacoes, bairro, cidade, sexo in consultas_data:
-            if not observacoes:
-                continue
-            
-            # Primeira linha das observações contém o módulo/sintoma
-            linhas = observacoes.split('\n')
-            if linhas and linhas[0].startswith('MODULO:'):
-                sintoma_consulta = linhas[0].replace('MODULO:', '').strip()
-                sintomas_disponiveis.add(sintoma_consulta)
-                
-                # Se filtro de sintoma está ativo e não corresponde, pular
-                if sintoma != 'todos' and sintoma_consulta != sintoma:
-                    continue
-                
-                # Determinar localização baseado no agrupamento
-                localizacao = bairro if agrupamento == 'bairro' else cidade
-                
-                dados_sintomas.append({
-                    'sintoma': sintoma_consulta,
-                    'localizacao': localizacao
-                })
-        
-        # Agrupar por localização
-        distribuicao = {}
-        total_ocorrencias = 0
-        
-        for dado in dados_sintomas:
-            localizacao = dado['localizacao']
-            if not localizacao:
-                continue
-            
-            if localizacao not in distribuicao:
-                distribuicao[localizacao] = 0
-            distribuicao[localizacao] += 1
-            total_ocorrencias += 1
+        # Agrupar por localização (estatísticas diárias), apenas pacientes com localização preenchida
+        coluna_localizacao = EstatisticaDiaria.bairro if agrupamento == 'bairro' else EstatisticaDiaria.cidade
+        com_localizacao = coluna_localizacao != ''
+        sintomas_disponiveis = _modulos_disponiveis(inicio, com_localizacao, genero=genero)
+        distribuicao = _consultas_por(coluna_localizacao, inicio, com_localizacao, sintoma=sintoma, genero=genero)
+        total_ocorrencias = sum(distribuicao.values())
         
         # Ordenar por quantidade (maior para menor) e limitar aos top 15
         distribuicao_ordenada = sorted(distribuicao.items(), key=lambda x: x[1], reverse=True)[:15]
@@ -2367,7 +2051,9 @@ def api_estatisticas_sintomas_localizacao():
         consistente = (soma_localizacoes == total_ocorrencias)
         
         # Contar dados sem localização
-        total_consultas_com_sintoma = len([d for d in consultas_data if d[0] and 'MODULO:' in d[0]])
+        total_consultas_com_sintoma = sum(
+            _consultas_por(EstatisticaDiaria.modulo, inicio, com_localizacao, genero=genero).values()
+        )
         dados_sem_localizacao = total_consultas_com_sintoma - total_ocorrencias
         
         return jsonify({
@@ -2377,7 +2063,7 @@ def api_estatisticas_sintomas_localizacao():
             'agrupamento': agrupamento,
             'total_ocorrencias': total_ocorrencias,
             'dados': dados_grafico,
-            'sintomas_disponiveis': sorted(list(sintomas_disponiveis)),
+            'sintomas_disponiveis': sintomas_disponiveis,
             'validacao': {
                 'consistente': consistente,
                 'soma_localizacoes': soma_localizacoes,
@@ -2445,15 +2131,17 @@ def api_estatisticas_medicamentos_por_sintoma():
         # Query base: buscar consultas com sintoma específico e paciente
         query_consultas = db.session.query(
             Consulta.id,
-            Consulta.observacoes,
+            ConsultaPontuacao.pontuacao_total,
             Consulta.encaminhamento,
             Paciente.sexo,
             Paciente.idade
         ).join(
             Paciente, Consulta.id_paciente == Paciente.id
+        ).outerjoin(
+            ConsultaPontuacao, ConsultaPontuacao.id_consulta == Consulta.id
         ).filter(
             Consulta.data >= inicio,
-            Consulta.observacoes.like(f'MODULO: {sintoma}%')
+            Consulta.modulo == sintoma
         )
         
         # Aplicar filtros de gênero e faixa etária
@@ -2507,7 +2195,7 @@ def api_estatisticas_medicamentos_por_sintoma():
         # Criar dicionário de consultas para acesso rápido
         consultas_dict = {
             c[0]: {
-                'observacoes': c[1],
+                'pontuacao_total': c[1],
                 'encaminhamento': c[2],
                 'sexo': c[3],
                 'idade': c[4]
@@ -2515,6 +2203,18 @@ def api_estatisticas_medicamentos_por_sintoma():
             for c in consultas_data
         }
         
+        # Consultas ainda sem ConsultaPontuacao (não migradas): pontuação calculada
+        # em memória, como nas telas de consulta
+        ids_sem_pontuacao = {
+            consulta_id for consulta_id, _ in recomendacoes_data
+            if consulta_id in consultas_dict and consultas_dict[consulta_id]['pontuacao_total'] is None
+        }
+        if ids_sem_pontuacao:
+            for consulta in Consulta.query.filter(Consulta.id.in_(ids_sem_pontuacao)):
+                pontuacao = obter_pontuacao(consulta, _detectar_modulo_das_perguntas)
+                if pontuacao is not None:
+                    consultas_dict[consulta.id]['pontuacao_total'] = pontuacao.pontuacao_total
+        
         # Processar dados: extrair medicamentos e calcular scores
         medicamentos_dict = {}
         
@@ -2528,14 +2228,9 @@ def api_estatisticas_medicamentos_por_sintoma():
             # Extrair nome base do medicamento (antes do primeiro " - " ou " | ")
             nome_base = medicamento_desc.split(' - ')[0].split(' | ')[0].strip()
             
-            # Extrair score da triagem das observações
-            score_triagem = 0.0
-            observacoes = consulta_info['observacoes']
-            if observacoes:
-                import re
-                score_match = re.search(r'Pontuação total: ([\d.]+)', observacoes)
-                if score_match:
-                    score_triagem = float(score_match.group(1))
+            # Score da triagem gravado em ConsultaPontuacao (ou calculado acima);
+            # consultas sem respostas ficam com 0, como antes
+            score_triagem = consulta_info['pontuacao_total'] or 0.0
             
             encaminhamento = consulta_info['encaminhamento']
             
@@ -2639,41 +2334,9 @@ def api_estatisticas_sintomas_comuns():
         else:
             inicio = hoje - timedelta(days=30)
         
-        # Query: buscar consultas com sintomas
-        query = db.session.query(
-            Consulta.observacoes,
-            Paciente.sexo
-        ).join(
-            Paciente, Consulta.id_paciente == Paciente.id
-        ).filter(
-            Consulta.data >= inicio,
-            Consulta.observacoes.isnot(None)
-        )
-        
-        # Aplicar filtro de gênero
-        if genero != 'todos':
-            query = query.filter(Paciente.sexo == genero)
-        
-        consultas_data = query.all()
-        
-        # Extrair e contar sintomas
-        sintomas_dict = {}
-        total_consultas = 0
-        
-        for observacoes, sexo in consultas_data:
-            if not observacoes:
-                continue
-            
-            # Primeira linha das observações contém o módulo/sintoma
-            linhas = observacoes.split('\n')
-            if linhas and linhas[0].startswith('MODULO:'):
-                sintoma = linhas[0].replace('MODULO:', '').strip()
-                
-                if sintoma not in sintomas_dict:
-                    sintomas_dict[sintoma] = 0
-                
-                sintomas_dict[sintoma] += 1
-                total_consultas += 1
+        # Contar consultas por sintoma (estatísticas diárias)
+        sintomas_dict = _consultas_por(EstatisticaDiaria.modulo, inicio, genero=genero)
+        total_consultas = sum(sintomas_dict.values())
         
         # Ordenar por frequência (maior para menor)
         sintomas_ordenados = sorted(
@@ -2726,39 +2389,12 @@ def api_estatisticas_tipos_recomendacoes():
         else:
             inicio = hoje - timedelta(days=30)
         
-        # Query base
-        query = db.session.query(
-            ConsultaRecomendacao.tipo,
-            Consulta.observacoes,
-            Paciente.sexo
-        ).join(
-            Consulta, ConsultaRecomendacao.id_consulta == Consulta.id
-        ).join(
-            Paciente, Consulta.id_paciente == Paciente.id
-        ).filter(
-            Consulta.data >= inicio,
-            ConsultaRecomendacao.tipo.in_(['medicamento', 'nao_farmacologico'])
-        )
-        
-        # Filtrar por sintoma se especificado
-        if sintoma != 'todos':
-            query = query.filter(Consulta.observacoes.like(f'MODULO: {sintoma}%'))
-        
-        # Aplicar filtro de gênero
-        if genero != 'todos':
-            query = query.filter(Paciente.sexo == genero)
-        
-        recomendacoes_data = query.all()
-        
-        # Contar tipos
-        farmacologica = 0
-        nao_farmacologica = 0
-        
-        for tipo, observacoes, sexo in recomendacoes_data:
-            if tipo == 'medicamento':
-                farmacologica += 1
-            elif tipo == 'nao_farmacologico':
-                nao_farmacologica += 1
+        # Contar tipos (estatísticas diárias)
+        farmacologica, nao_farmacologica = (int(valor or 0) for valor in consultar_estatisticas(
+            db.func.sum(EstatisticaDiaria.recomendacoes_medicamento),
+            db.func.sum(EstatisticaDiaria.recomendacoes_nao_farmacologicas),
+            inicio=inicio, sintoma=sintoma, genero=genero
+        ).one())
         
         total = farmacologica + nao_farmacologica
         
@@ -2810,48 +2446,15 @@ def api_estatisticas_encaminhamentos_tempo():
         else:
             inicio = hoje - timedelta(days=30)
         
-        # Query base
-        query = db.session.query(
-            Consulta.data,
-            Consulta.encaminhamento,
-            Paciente.sexo,
-            Paciente.idade
-        ).join(
-            Paciente, Consulta.id_paciente == Paciente.id
-        ).filter(
-            Consulta.data >= inicio
-        )
-        
-        # Aplicar filtros
-        if genero != 'todos':
-            query = query.filter(Paciente.sexo == genero)
-        
-        if faixa_etaria != 'todos':
-            faixas = {
-                '0-17': (0, 17),
-                '18-34': (18, 34),
-                '35-54': (35, 54),
-                '55+': (55, 150)
-            }
-            if faixa_etaria in faixas:
-                min_idade, max_idade = faixas[faixa_etaria]
-                query = query.filter(
-                    Paciente.idade >= min_idade,
-                    Paciente.idade <= max_idade
-                )
-        
-        consultas_data = query.all()
-        
-        # Agrupar por data
+        # Agrupar por data (estatísticas diárias)
         dados_por_data = {}
-        for data, encaminhamento, sexo, idade in consultas_data:
-            data_str = data.strftime('%Y-%m-%d')
-            if data_str not in dados_por_data:
-                dados_por_data[data_str] = {'total': 0, 'encaminhamentos': 0}
-            
-            dados_por_data[data_str]['total'] += 1
-            if encaminhamento:
-                dados_por_data[data_str]['encaminhamentos'] += 1
+        for dia, total, encaminhamentos in consultar_estatisticas(
+            EstatisticaDiaria.dia,
+            db.func.sum(EstatisticaDiaria.consultas),
+            db.func.sum(db.case((EstatisticaDiaria.encaminhamento == True, EstatisticaDiaria.consultas), else_=0)),
+            inicio=inicio, genero=genero, faixa=faixa_etaria
+        ).group_by(EstatisticaDiaria.dia):
+            dados_por_data[dia.strftime('%Y-%m-%d')] = {'total': int(total), 'encaminhamentos': int(encaminhamentos)}
         
         # Preparar dados para o gráfico
         dados_grafico = []
@@ -3014,8 +2617,7 @@ def api_estatisticas_recomendacoes_nao_farmacologicas():
         # Query base
         query = db.session.query(
             ConsultaRecomendacao.descricao,
-            Consulta.observacoes,
-            Paciente.sexo
+            db.func.count(ConsultaRecomendacao.id)
         ).join(
             Consulta, ConsultaRecomendacao.id_consulta == Consulta.id
         ).join(
@@ -3027,17 +2629,17 @@ def api_estatisticas_recomendacoes_nao_farmacologicas():
         
         # Filtrar por sintoma se especificado
         if sintoma != 'todos':
-            query = query.filter(Consulta.observacoes.like(f'MODULO: {sintoma}%'))
+            query = query.filter(Consulta.modulo == sintoma)
         
         # Aplicar filtro de gênero
         if genero != 'todos':
             query = query.filter(Paciente.sexo == genero)
         
-        recomendacoes_data = query.all()
+        recomendacoes_data = query.group_by(ConsultaRecomendacao.descricao).all()
         
         # Contar recomendações (normalizar descrições similares)
         recomendacoes_dict = {}
-        for descricao, observacoes, sexo in recomendacoes_data:
+        for descricao, count in recomendacoes_data:
             # Normalizar: remover espaços extras, converter para minúsculas para agrupar similares
             descricao_normalizada = descricao.strip().lower()
             
@@ -3048,7 +2650,7 @@ def api_estatisticas_recomendacoes_nao_farmacologicas():
                     'count': 0
                 }
             
-            recomendacoes_dict[descricao_normalizada]['count'] += 1
+            recomendacoes_dict[descricao_normalizada]['count'] += count
         
         # Ordenar por frequência
         recomendacoes_ordenadas = sorted(
@@ -3167,4 +2769,7 @@ def _detectar_modulo_das_perguntas(respostas):
         # Criar usuário administrador padrão
         create_admin_user()
     
+    # Extrair (ou validar) as perguntas de todos os módulos antes de atender requisições
+    manifesto_perguntas.construir()
+    
     app.run(debug=Config.DEBUG, host='0.0.0.0', port=5000)
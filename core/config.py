@@ -15,6 +15,11 @@
 - APP_NAME: Nome da aplicação
 - APP_VERSION: Versão da aplicação
 - ITEMS_PER_PAGE: Itens por página na paginação
+- TFIDF_MODO: Motor da busca semântica (auto/sklearn/leve)
+- SINONIMOS_ATIVOS: expande sintomas com data/sinonimos.json na busca de medicamentos
+- CONTRAINDICACOES_AVANCADAS: avalia data/contraindicacoes.json por grupo de risco
+- HTTP_CACHE_MAX_AGE: max-age (s) dos endpoints de catálogo com ETag
+- PAINEL_CACHE_TTL: validade (s) do resumo em cache do dashboard e do painel admin
 """
 
 import os
@@ -38,3 +43,23 @@ class Config:
     APP_NAME = 'Pharm-Assist - Sistema de Triagem Farmaceutica'
     APP_VERSION = '1.0.0'
     ITEMS_PER_PAGE = 20
+    
+    # Busca semântica: 'auto' usa o scikit-learn se instalado; 'leve' usa só
+    # NumPy (menos memória residente e inicialização mais rápida)
+    TFIDF_MODO = os.environ.get('TFIDF_MODO', 'auto')
+    
+    # Expansão de sintomas por data/sinonimos.json. Desligada por padrão: o
+    # arquivo nunca foi aplicado e ligá-lo muda os medicamentos recomendados
+    SINONIMOS_ATIVOS = os.environ.get('SINONIMOS_ATIVOS', 'False').lower() == 'true'
+    
+    # Regras de data/contraindicacoes.json por grupo de risco. Desligadas por
+    # padrão: nunca foram aplicadas e o resultado ainda não é usado adiante
+    CONTRAINDICACOES_AVANCADAS = os.environ.get('CONTRAINDICACOES_AVANCADAS', 'False').lower() == 'true'
+    
+    # Endpoints de catálogo (módulos, perguntas, sintomas) respondem com ETag;
+    # durante este intervalo o navegador reutiliza a cópia sem revalidar
+    HTTP_CACHE_MAX_AGE = int(os.environ.get('HTTP_CACHE_MAX_AGE', 300))
+    
+    # Resumo do dashboard/painel admin: recalculado no máximo uma vez por
+    # intervalo, ou logo após uma gravação de paciente, consulta ou medicamento
+    PAINEL_CACHE_TTL = int(os.environ.get('PAINEL_CACHE_TTL', 30))
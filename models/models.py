@@ -14,6 +14,9 @@
 - Consulta: Registro de consultas de triagem
 - ConsultaResposta: Respostas do questionário
 - ConsultaRecomendacao: Recomendações geradas pela triagem
+- ConsultaPontuacao: Resultado estruturado da pontuação da triagem
+- EstatisticaDiaria: Contagens diárias agregadas das consultas
+- SessaoTriagem: Sessões da triagem adaptativa, compartilhadas entre processos
 
 Otimizações implementadas:
 - Índices para consultas frequentes
@@ -197,6 +200,8 @@ class Pergunta(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     texto = db.Column(db.Text, nullable=False)
+    # Identificador estável das perguntas dos módulos (modulo_ordem); nulo nas perguntas fixas
+    slug = db.Column(db.String(100), unique=True, index=True)
     tipo = db.Column(db.Enum('sintoma', 'habito', 'historico', 'geral'), nullable=False)
     ordem = db.Column(db.Integer, default=0)
     ativa = db.Column(db.Boolean, default=True)
@@ -206,6 +211,7 @@ def to_dict(self):
         return {
             'id': self.id,
             'texto': self.texto,
+            'slug': self.slug,
             'tipo': self.tipo,
             'ordem': self.ordem,
             'ativa': self.ativa
@@ -225,11 +231,13 @@ class Medicamento(db.Model):
     - tipo: Tipo do medicamento (farmacologico/fitoterapico)
     - ativo: Status do medicamento (ativo/inativo)
     - created_at: Data de criação do registro
+    - updated_at: Data da última alteração (marca d'água do snapshot do catálogo)
     
     Otimizações:
     - Índices para busca por nome
     - Índice para filtro por tipo
     - Índice para filtro por status ativo
+    - Índice em updated_at para a atualização incremental do catálogo
     """
     __tablename__ = 'medicamentos'
     
@@ -243,8 +251,9 @@ class Medicamento(db.Model):
     tipo = db.Column(db.Enum('farmacologico', 'fitoterapico'), nullable=False, index=True)  # Índice para filtros
     ativo = db.Column(db.Boolean, default=True, index=True)                 # Índice para filtros
     
-    # Timestamp para auditoria
+    # Timestamps para auditoria
     created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     def to_dict(self):
         return {
@@ -263,16 +272,25 @@ class Consulta(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     id_paciente = db.Column(db.Integer, db.ForeignKey('pacientes.id', ondelete='CASCADE'), nullable=False)
-    data = db.Column(db.DateTime, default=datetime.utcnow)
+    data = db.Column(db.DateTime, default=datetime.utcnow, index=True)  # Índice para filtros por período
     encaminhamento = db.Column(db.Boolean, default=False)
     motivo_encaminhamento = db.Column(db.Text)
     observacoes = db.Column(db.Text)
+    modulo = db.Column(db.String(50))  # Módulo de triagem (também na linha "MODULO:" das observações)
     created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
     
+    # Índices compostos: estatísticas por módulo no período e histórico do paciente
+    # (também atende os joins/filtros só por id_paciente)
+    __table_args__ = (
+        db.Index('ix_consultas_modulo_data', 'modulo', 'data'),
+        db.Index('ix_consultas_paciente_data', 'id_paciente', 'data'),
+    )
+    
     # Relacionamentos
     paciente = relationship('Paciente', back_populates='consultas')
     respostas = relationship('ConsultaResposta', back_populates='consulta')
     recomendacoes = relationship('ConsultaRecomendacao', back_populates='consulta')
+    pontuacao = relationship('ConsultaPontuacao', back_populates='consulta', uselist=False, cascade='all, delete-orphan')
     
     def to_dict(self):
         return {
@@ -282,6 +300,7 @@ def to_dict(self):
             'encaminhamento': self.encaminhamento,
             'motivo_encaminhamento': self.motivo_encaminhamento,
             'observacoes': self.observacoes,
+            'modulo': self.modulo,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
@@ -289,7 +308,7 @@ class ConsultaResposta(db.Model):
     __tablename__ = 'consulta_respostas'
     
     id = db.Column(db.Integer, primary_key=True)
-    id_consulta = db.Column(db.Integer, db.ForeignKey('consultas.id', ondelete='CASCADE'), nullable=False)
+    id_consulta = db.Column(db.Integer, db.ForeignKey('consultas.id', ondelete='CASCADE'), nullable=False, index=True)
     id_pergunta = db.Column(db.Integer, db.ForeignKey('perguntas.id', ondelete='CASCADE'), nullable=False)
     resposta = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
@@ -317,6 +336,11 @@ class ConsultaRecomendacao(db.Model):
     justificativa = db.Column(db.Text)
     created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
     
+    # Índice para as recomendações de cada consulta, filtradas ou não por tipo
+    __table_args__ = (
+        db.Index('ix_consulta_recomendacoes_consulta_tipo', 'id_consulta', 'tipo'),
+    )
+    
     # Relacionamentos
     consulta = relationship('Consulta', back_populates='recomendacoes')
     
@@ -328,3 +352,129 @@ def to_dict(self):
             'descricao': self.descricao,
             'justificativa': self.justificativa
         }
+
+class ConsultaPontuacao(db.Model):
+    """
+    Resultado estruturado da pontuação de uma consulta (1:1 com Consulta)
+    
+    Gravado uma única vez em processar_triagem e lido diretamente pelas telas,
+    relatórios e estatísticas, sem reprocessar as observações em texto nem
+    recalcular a pontuação.
+    
+    Campos:
+    - id_consulta: Consulta pontuada (única)
+    - modulo: Módulo de triagem usado
+    - pontuacao_total: Pontuação total
+    - nivel_risco: baixo/medio/alto
+    - confianca: Confiança do cálculo (0.0 a 1.0)
+    - pontuacao_<categoria>: Pontuação por categoria de pergunta
+    - encaminhamento: Encaminhamento indicado por esta pontuação
+    - versao_pesos: Versão de data/pesos_pontuacao.json usada (nula se desconhecida)
+    - origem: triagem (gravada na hora), observacoes ou recalculo (migração/backfill)
+      ou reprocessamento (utils/reprocessar_pontuacoes.py)
+    """
+    __tablename__ = 'consulta_pontuacoes'
+    
+    CATEGORIAS = ('sintoma', 'gravidade', 'duracao', 'historico', 'perfil')
+    
+    id = db.Column(db.Integer, primary_key=True)
+    id_consulta = db.Column(db.Integer, db.ForeignKey('consultas.id', ondelete='CASCADE'), nullable=False, unique=True)
+    modulo = db.Column(db.String(50), index=True)
+    pontuacao_total = db.Column(db.Float, nullable=False, default=0.0)
+    nivel_risco = db.Column(db.Enum('baixo', 'medio', 'alto'), nullable=False, index=True)
+    confianca = db.Column(db.Float, nullable=False, default=0.0)
+    pontuacao_sintoma = db.Column(db.Float, nullable=False, default=0.0)
+    pontuacao_gravidade = db.Column(db.Float, nullable=False, default=0.0)
+    pontuacao_duracao = db.Column(db.Float, nullable=False, default=0.0)
+    pontuacao_historico = db.Column(db.Float, nullable=False, default=0.0)
+    pontuacao_perfil = db.Column(db.Float, nullable=False, default=0.0)
+    encaminhamento = db.Column(db.Boolean, default=False)
+    versao_pesos = db.Column(db.Integer, index=True)
+    origem = db.Column(db.Enum('triagem', 'observacoes', 'recalculo', 'reprocessamento'), nullable=False, default='triagem')
+    created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
+    
+    # Relacionamentos
+    consulta = relationship('Consulta', back_populates='pontuacao')
+    
+    @property
+    def pontuacoes_categoria(self):
+        return {categoria: getattr(self, f'pontuacao_{categoria}') or 0.0 for categoria in self.CATEGORIAS}
+    
+    def to_dict(self):
+        """Mesmo formato de ``scoring_result`` usado em processar_triagem"""
+        return {
+            'total_score': self.pontuacao_total,
+            'category_scores': self.pontuacoes_categoria,
+            'risk_level': self.nivel_risco,
+            'confidence': self.confianca,
+            'encaminhamento': bool(self.encaminhamento),
+            'modulo': self.modulo,
+            'versao_pesos': self.versao_pesos,
+            'origem': self.origem
+        }
+
+class EstatisticaDiaria(db.Model):
+    """
+    Contagens diárias das consultas para o módulo de estatísticas
+    
+    Uma linha por dia × módulo × sexo × faixa etária × cidade × bairro ×
+    encaminhamento, atualizada na mesma transação de processar_triagem
+    (services/estatisticas_diarias.py) e reconstruível por
+    utils/reconstruir_estatisticas_diarias.py. Valores desconhecidos das
+    dimensões são gravados como '' para que a chave única valha para todas.
+    
+    Campos:
+    - dia, modulo, sexo, faixa_etaria ('0-17', '18-34', '35-54', '55+'),
+      cidade, bairro, encaminhamento: dimensões (chave única)
+    - consultas: Número de consultas
+    - soma_pontuacao: Soma das pontuações totais das consultas
+    - recomendacoes_medicamento / recomendacoes_nao_farmacologicas: Número de
+      recomendações de cada tipo
+    """
+    __tablename__ = 'estatisticas_diarias'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    dia = db.Column(db.Date, nullable=False, index=True)
+    modulo = db.Column(db.String(50), nullable=False, default='')
+    sexo = db.Column(db.String(1), nullable=False, default='')
+    faixa_etaria = db.Column(db.String(10), nullable=False, default='')
+    cidade = db.Column(db.String(100), nullable=False, default='')
+    bairro = db.Column(db.String(100), nullable=False, default='')
+    encaminhamento = db.Column(db.Boolean, nullable=False, default=False)
+    consultas = db.Column(db.Integer, nullable=False, default=0)
+    soma_pontuacao = db.Column(db.Float, nullable=False, default=0.0)
+    recomendacoes_medicamento = db.Column(db.Integer, nullable=False, default=0)
+    recomendacoes_nao_farmacologicas = db.Column(db.Integer, nullable=False, default=0)
+    
+    DIMENSOES = ('dia', 'modulo', 'sexo', 'faixa_etaria', 'cidade', 'bairro', 'encaminhamento')
+    
+    __table_args__ = (
+        db.UniqueConstraint(*DIMENSOES, name='uq_estatisticas_diarias_chave'),
+        db.Index('ix_estatisticas_diarias_modulo_dia', 'modulo', 'dia'),
+    )
+
+class SessaoTriagem(db.Model):
+    """
+    Sessão da triagem adaptativa (services/triagem/fluxo_adaptativo.py)
+    
+    Guardada no banco para que qualquer processo da aplicação (ex.: workers do
+    gunicorn) continue a sessão iniciada por outro. O estado das regras é
+    recalculado a partir do perfil e das respostas a cada passo.
+    
+    Campos:
+    - id: Identificador aleatório da sessão (devolvido ao cliente)
+    - modulo: Módulo do motor_de_perguntas
+    - id_paciente: Paciente da triagem (nulo em sessões sem cadastro)
+    - perfil: Perfil do paciente usado pelas regras (JSON)
+    - respostas: pergunta_id -> resposta original, na ordem em que foram dadas (JSON)
+    - atualizada_em: Último passo; sessões paradas há mais que o TTL expiram
+    """
+    __tablename__ = 'sessoes_triagem'
+    
+    id = db.Column(db.String(32), primary_key=True)
+    modulo = db.Column(db.String(50), nullable=False)
+    id_paciente = db.Column(db.Integer, db.ForeignKey('pacientes.id', ondelete='CASCADE'))
+    perfil = db.Column(db.JSON, nullable=False, default=dict)
+    respostas = db.Column(db.JSON, nullable=False, default=dict)
+    created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
+    atualizada_em = db.Column(db.TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
@@ -7,4 +7,13 @@
 - reports/: Geração de relatórios
 - auth/: Autenticação e autorização
 - recomendacoes_farmacologicas.py: Sistema de recomendações
+- catalogo_medicamentos.py: Snapshot em memória e índice TF-IDF do catálogo de medicamentos
+- sinonimos.py: Índice invertido de sinônimos clínicos
+- contraindicacoes.py: Triagem de contraindicações (Aho-Corasick)
+- classes_terapeuticas.py: Máscara de classes terapêuticas por medicamento
+- tabelas_recomendacoes.py: Tabelas fixas de recomendações (data/recomendacoes_fixas.json)
+- pontuacao_consultas.py: Gravação e leitura da pontuação estruturada das consultas
+- registro_perguntas.py: Registro slug -> id das perguntas dinâmicas dos módulos
+- estatisticas_diarias.py: Contagens diárias agregadas lidas pelas estatísticas
+- painel.py: Resumo em cache do dashboard e do painel administrativo
 """
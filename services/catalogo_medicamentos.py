@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Catálogo de Medicamentos
+========================
+
+Mantém o índice TF-IDF do catálogo de medicamentos ativos ajustado uma única
+vez e reutilizado em todas as buscas semânticas. O índice só é reconstruído
+quando o catálogo muda (cadastro, edição, desativação, reativação, exclusão ou
+reimportação), o que é detectado por:
+
+- um contador de versão incrementado pelos eventos do SQLAlchemy sobre
+  ``Medicamento`` neste processo;
+- uma assinatura dos textos indexados, que cobre alterações feitas por outros
+  processos (ex.: ``utils/import_medicamentos_anvisa.py``).
+
+Com o índice pronto, cada consulta custa apenas um ``transform`` e dois
+produtos esparsos sobre os termos dela. Os scores são os mesmos de um
+``TfidfVectorizer`` ajustado sobre ``[consulta] + catálogo`` a cada busca, como
+era feito antes: o índice guarda contagens e normas, e só os pesos dos termos
+da consulta (e a norma dos documentos que os contêm) são corrigidos por
+consulta (ver ``utils/tfidf_leve.py``). A busca devolve posições estáveis no
+catálogo junto com os scores, e o top-k sai de ``numpy.argpartition``: O(n)
+para selecionar mais O(k log k) para ordenar.
+
+O motor TF-IDF é escolhido por ``Config.TFIDF_MODO``: ``sklearn`` (importado
+só no primeiro ajuste do índice), ``leve`` (``utils/tfidf_leve.py``, apenas
+NumPy, para baixo consumo de memória) ou ``auto`` (scikit-learn se estiver
+instalado, senão o leve).
+
+O próprio catálogo ativo também fica em memória (``SnapshotCatalogo``), como
+registros leves com ``__slots__`` contendo apenas as colunas usadas pelo motor
+de recomendações (sem ``descricao``). O snapshot é atualizado de forma
+incremental a partir da marca d'água ``Medicamento.updated_at``: uma consulta
+agregada barata decide se algo mudou e só as linhas alteradas são relidas.
+"""
+
+import importlib.util
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import case, event, func
+
+from core.config import Config
+from models.models import db, Medicamento
+from services.classes_terapeuticas import classificar_indicacao
+from utils.texto import normalizar_texto
+from utils.tfidf_leve import IndiceTfidfLeve, pesos_idf
+
+logger = logging.getLogger(__name__)
+
+_lock_versao = threading.Lock()
+_versao_catalogo = 0
+
+
+def versao_catalogo() -> int:
+    """Retorna a versão atual do catálogo neste processo"""
+    return _versao_catalogo
+
+
+def invalidar_catalogo() -> int:
+    """Incrementa a versão do catálogo, invalidando índices e caches derivados"""
+    global _versao_catalogo
+    with _lock_versao:
+        _versao_catalogo += 1
+        return _versao_catalogo
+
+
+def assinatura_catalogo() -> Tuple[int, Optional[str]]:
+    """
+    Assinatura do catálogo ativo no banco: quantidade de ativos e maior ``updated_at``.
+
+    Diferente de ``versao_catalogo``, é a mesma em todos os processos, então
+    serve de versão para ETags HTTP.
+    """
+    total, ultima_alteracao = db.session.query(
+        func.count(Medicamento.id), func.max(Medicamento.updated_at)
+    ).filter(Medicamento.ativo.is_(True)).one()
+    return int(total or 0), ultima_alteracao.isoformat() if ultima_alteracao else None
+
+
+@event.listens_for(Medicamento, 'after_insert')
+@event.listens_for(Medicamento, 'after_update')
+@event.listens_for(Medicamento, 'after_delete')
+def _ao_alterar_medicamento(mapper, connection, target):
+    """Invalida o catálogo sempre que um medicamento é gravado ou removido"""
+    invalidar_catalogo()
+
+
+class MotorTfidfSklearn:
+    """TF-IDF sobre as contagens do scikit-learn; o import pesado acontece só na construção"""
+
+    def __init__(self, documentos: List[str]):
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        self.vectorizer = CountVectorizer(
+            lowercase=True,
+            stop_words=None,
+            ngram_range=(1, 2),
+            min_df=1,
+            max_df=1.0,
+            token_pattern=r'\b\w+\b'
+        )
+        contagens = self.vectorizer.fit_transform(documentos).astype(np.float64).tocsr()
+        self._analisar = self.vectorizer.build_analyzer()
+
+        # Mesmos pesos do TF-IDF leve (ajuste sobre [consulta] + documentos)
+        frequencia_documentos = np.bincount(contagens.indices, minlength=contagens.shape[1])
+        self.idf, self.idf_consulta, self.idf_fora_vocabulario = pesos_idf(frequencia_documentos, len(documentos))
+        self.delta_norma = self.idf ** 2 - self.idf_consulta ** 2
+
+        pesos = contagens.multiply(self.idf).tocsr()
+        self._normas2 = np.asarray(pesos.multiply(pesos).sum(axis=1)).ravel()
+        self._contagens_t = contagens.T.tocsr()
+        self._contagens2_t = contagens.multiply(contagens).T.tocsr()
+
+    def _norma2_fora_vocabulario(self, consulta: str) -> float:
+        vocabulario = self.vectorizer.vocabulary_
+        fora = Counter(termo for termo in self._analisar(consulta) if termo not in vocabulario)
+        return sum(n * n for n in fora.values()) * self.idf_fora_vocabulario ** 2
+
+    def similaridades(self, consultas: List[str]) -> np.ndarray:
+        """Matriz (consultas x documentos) de similaridades de cosseno"""
+        contagens = self.vectorizer.transform(consultas).astype(np.float64).tocsr()
+        pesos = contagens.multiply(self.idf_consulta).tocsr()
+        presentes = (contagens > 0).astype(np.float64)
+
+        produto = (pesos.multiply(self.idf_consulta).tocsr() @ self._contagens_t).toarray()
+        # Cada documento perde, na norma, a queda de peso dos termos que tem em comum com a consulta
+        correcao = (presentes.multiply(self.delta_norma).tocsr() @ self._contagens2_t).toarray()
+        normas = np.sqrt(
+            np.asarray(pesos.multiply(pesos).sum(axis=1)).ravel()
+            + np.fromiter((self._norma2_fora_vocabulario(c) for c in consultas), dtype=np.float64, count=len(consultas))
+        )
+
+        resultado = np.zeros_like(produto)
+        linhas, documentos = np.nonzero(produto)
+        resultado[linhas, documentos] = produto[linhas, documentos] / (
+            normas[linhas] * np.sqrt(self._normas2[documentos] - correcao[linhas, documentos])
+        )
+        return resultado
+
+
+def resolver_modo_tfidf(modo: Optional[str] = None) -> str:
+    """Resolve o modo configurado ('auto', 'sklearn' ou 'leve') para o motor efetivo"""
+    modo = (modo or Config.TFIDF_MODO or 'auto').lower()
+    if modo == 'leve':
+        return 'leve'
+    if importlib.util.find_spec('sklearn') is not None:
+        return 'sklearn'
+    if modo == 'sklearn':
+        logger.warning("TFIDF_MODO=sklearn, mas o scikit-learn não está instalado; usando o TF-IDF leve")
+    return 'leve'
+
+
+def criar_motor_tfidf(documentos: List[str], modo: Optional[str] = None):
+    """Ajusta um motor TF-IDF sobre documentos já normalizados"""
+    if resolver_modo_tfidf(modo) == 'sklearn':
+        return MotorTfidfSklearn(documentos)
+    return IndiceTfidfLeve(documentos)
+
+
+class RegistroMedicamento:
+    """Registro leve de um medicamento do catálogo (somente leitura para o motor)"""
+
+    __slots__ = (
+        'id', 'nome_comercial', 'nome_generico', 'indicacao', 'contraindicacao', 'tipo', 'ativo',
+        'texto_busca', 'classes_terapeuticas', 'prioridade_ajustada', 'alertas_contraindicacao',
+    )
+
+    def __init__(self, id, nome_comercial, nome_generico, indicacao, contraindicacao=None,
+                 tipo=None, ativo=True):
+        self.id = id
+        self.nome_comercial = nome_comercial
+        self.nome_generico = nome_generico
+        self.indicacao = indicacao
+        self.contraindicacao = contraindicacao
+        self.tipo = tipo
+        self.ativo = ativo
+        # Texto indexado pela busca semântica: nome comercial, genérico e indicação
+        self.texto_busca = f"{nome_comercial} {nome_generico or ''} {indicacao}" if indicacao else None
+        self.classes_terapeuticas = classificar_indicacao(indicacao)
+        self.prioridade_ajustada = 0
+        self.alertas_contraindicacao = ()
+
+    def avaliado(self, prioridade_ajustada: int, alertas: List[str]) -> 'RegistroMedicamento':
+        """
+        Cópia com o resultado da validação de contraindicações de um paciente.
+
+        Os registros do snapshot são compartilhados entre requisições, então o
+        resultado por paciente nunca é gravado no registro original.
+        """
+        copia = object.__new__(RegistroMedicamento)
+        for campo in RegistroMedicamento.__slots__:
+            setattr(copia, campo, getattr(self, campo))
+        copia.prioridade_ajustada = prioridade_ajustada
+        copia.alertas_contraindicacao = alertas
+        return copia
+
+    def __repr__(self):
+        return f'<RegistroMedicamento {self.id} {self.nome_comercial!r}>'
+
+
+class CatalogoAtivo:
+    """Fotografia imutável do catálogo ativo, compartilhada entre requisições"""
+
+    __slots__ = ('ativos', 'com_indicacao', 'textos', 'geracao')
+
+    def __init__(self, ativos: Tuple[RegistroMedicamento, ...], geracao: int):
+        self.ativos = ativos
+        self.com_indicacao = tuple(m for m in ativos if m.texto_busca)
+        # Tupla: o índice TF-IDF reconhece o mesmo snapshot por identidade
+        self.textos = tuple(m.texto_busca for m in self.com_indicacao)
+        self.geracao = geracao
+
+
+class SnapshotCatalogo:
+    """
+    Catálogo ativo em memória, atualizado incrementalmente.
+
+    A cada ``obter()``, se a versão local do catálogo mudou ou se passou
+    ``INTERVALO_VERIFICACAO`` desde a última verificação, uma consulta agregada
+    (quantidade de ativos e maior ``updated_at``) é comparada com a marca
+    d'água. Só as linhas com ``updated_at`` na marca ou depois dela são
+    relidas; se a quantidade de ativos não fechar depois disso (exclusões ou
+    alterações feitas sem atualizar ``updated_at``), o catálogo é recarregado
+    inteiro. Uma recarga completa também ocorre a cada
+    ``INTERVALO_RECARGA_COMPLETA``.
+    """
+
+    INTERVALO_VERIFICACAO = 5.0
+    INTERVALO_RECARGA_COMPLETA = 3600.0
+
+    _COLUNAS = (
+        Medicamento.id, Medicamento.nome_comercial, Medicamento.nome_generico, Medicamento.indicacao,
+        Medicamento.contraindicacao, Medicamento.tipo, Medicamento.ativo, Medicamento.updated_at,
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._registros: Dict[int, RegistroMedicamento] = {}
+        self._catalogo: Optional[CatalogoAtivo] = None
+        self._marca_dagua: Optional[datetime] = None
+        self._versao: Optional[int] = None
+        self._verificado_em = 0.0
+        self._recarregado_em = 0.0
+        self.recargas_completas = 0
+        self.atualizacoes_incrementais = 0
+
+    def invalidar(self):
+        """Descarta o snapshot; o próximo uso recarrega o catálogo inteiro"""
+        with self._lock:
+            self._catalogo = None
+
+    def obter(self) -> CatalogoAtivo:
+        """Retorna o catálogo ativo, consultando o banco só quando necessário"""
+        catalogo = self._catalogo
+        agora = time.monotonic()
+        if (catalogo is not None and self._versao == versao_catalogo()
+                and agora - self._verificado_em < self.INTERVALO_VERIFICACAO):
+            return catalogo
+
+        with self._lock:
+            versao = versao_catalogo()
+            if (self._catalogo is not None and self._versao == versao
+                    and agora - self._verificado_em < self.INTERVALO_VERIFICACAO):
+                return self._catalogo
+
+            if self._catalogo is None or agora - self._recarregado_em >= self.INTERVALO_RECARGA_COMPLETA:
+                self._recarregar_tudo()
+            else:
+                self._atualizar_incremental()
+
+            self._versao = versao
+            self._verificado_em = time.monotonic()
+            return self._catalogo
+
+    @staticmethod
+    def _registro(linha) -> RegistroMedicamento:
+        return RegistroMedicamento(
+            linha.id, linha.nome_comercial, linha.nome_generico, linha.indicacao,
+            linha.contraindicacao, linha.tipo, linha.ativo
+        )
+
+    def _publicar(self):
+        ativos = tuple(self._registros[i] for i in sorted(self._registros))
+        geracao = self._catalogo.geracao + 1 if self._catalogo is not None else 1
+        self._catalogo = CatalogoAtivo(ativos, geracao)
+
+    def _recarregar_tudo(self):
+        """Lê todas as linhas ativas (apenas as colunas usadas pelo motor)"""
+        linhas = db.session.query(*self._COLUNAS).filter(Medicamento.ativo.is_(True)).all()
+        self._registros = {linha.id: self._registro(linha) for linha in linhas}
+        self._marca_dagua = max((linha.updated_at for linha in linhas if linha.updated_at), default=None)
+        self._publicar()
+        self._recarregado_em = time.monotonic()
+        self.recargas_completas += 1
+        logger.info(f"Snapshot do catálogo carregado com {len(self._registros)} medicamentos ativos")
+
+    def _atualizar_incremental(self):
+        """Relê apenas as linhas alteradas desde a marca d'água"""
+        total_ativos, ultima_alteracao = db.session.query(
+            func.sum(case((Medicamento.ativo.is_(True), 1), else_=0)),
+            func.max(Medicamento.updated_at),
+        ).one()
+        total_ativos = int(total_ativos or 0)
+
+        if ultima_alteracao == self._marca_dagua and total_ativos == len(self._registros):
+            return
+
+        if ultima_alteracao is not None and self._marca_dagua is not None:
+            # ">=": linhas gravadas no mesmo instante da marca d'água são relidas
+            linhas = db.session.query(*self._COLUNAS).filter(Medicamento.updated_at >= self._marca_dagua).all()
+            for linha in linhas:
+                if linha.ativo:
+                    self._registros[linha.id] = self._registro(linha)
+                else:
+                    self._registros.pop(linha.id, None)
+
+            if len(self._registros) == total_ativos:
+                self._marca_dagua = ultima_alteracao
+                self._publicar()
+                self.atualizacoes_incrementais += 1
+                logger.info(f"Snapshot do catálogo atualizado: {len(linhas)} linhas relidas")
+                return
+
+        self._recarregar_tudo()
+
+    def estatisticas(self) -> Dict[str, object]:
+        """Tamanho do snapshot e contadores de atualização"""
+        catalogo = self._catalogo
+        return {
+            'medicamentos_ativos': len(catalogo.ativos) if catalogo else 0,
+            'com_indicacao': len(catalogo.com_indicacao) if catalogo else 0,
+            'geracao': catalogo.geracao if catalogo else 0,
+            'marca_dagua': self._marca_dagua.isoformat() if self._marca_dagua else None,
+            'recargas_completas': self.recargas_completas,
+            'atualizacoes_incrementais': self.atualizacoes_incrementais,
+        }
+
+
+class IndiceTfidfCatalogo:
+    """Índice TF-IDF pré-ajustado sobre os textos do catálogo de medicamentos"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (versao, assinatura, motor, posicoes, textos_indexados)
+        self._estado: Optional[tuple] = None
+        self.reconstrucoes = 0
+
+    @staticmethod
+    def _assinatura(textos: List[str]) -> Tuple[int, int]:
+        return len(textos), hash(tuple(textos))
+
+    def invalidar(self):
+        """Descarta o índice atual; o próximo uso o reconstrói"""
+        with self._lock:
+            self._estado = None
+
+    def _construir(self, textos: List[str], versao: int, assinatura: Tuple[int, int]) -> tuple:
+        """Normaliza e ajusta o vetorizador sobre os textos do catálogo"""
+        posicoes = []
+        documentos = []
+        for posicao, texto in enumerate(textos):
+            texto_normalizado = normalizar_texto(texto)
+            if texto_normalizado:
+                posicoes.append(posicao)
+                documentos.append(texto_normalizado)
+
+        motor = criar_motor_tfidf(documentos) if documentos else None
+
+        self.reconstrucoes += 1
+        logger.info(
+            f"Índice TF-IDF do catálogo reconstruído com {len(documentos)} documentos "
+            f"(versão {versao}, motor {type(motor).__name__})"
+        )
+        return (versao, assinatura, motor, np.asarray(posicoes, dtype=np.int64), textos)
+
+    def garantir_atualizado(self, textos: List[str]) -> tuple:
+        """Retorna o estado do índice, reconstruindo-o apenas se o catálogo mudou"""
+        estado = self._estado
+        # Mesma tupla do snapshot já indexada: nada a verificar
+        if estado is not None and isinstance(textos, tuple) and estado[4] is textos:
+            return estado
+
+        versao = versao_catalogo()
+        assinatura = self._assinatura(textos)
+        if estado is not None and estado[0] == versao and estado[1] == assinatura:
+            return estado
+
+        with self._lock:
+            estado = self._estado
+            if estado is None or estado[0] != versao or estado[1] != assinatura:
+                estado = self._construir(textos, versao, assinatura)
+                self._estado = estado
+        return estado
+
+    def buscar(self, consulta: str, textos: List[str], limiar: float = 0.0,
+               limite: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Busca os textos do catálogo mais semelhantes à consulta.
+
+        Args:
+            consulta: Texto da consulta (sintoma e sinônimos)
+            textos: Textos do catálogo, na mesma forma usada para indexação
+            limiar: Score mínimo para um resultado ser retornado
+            limite: Número máximo de resultados (top-k); None retorna todos
+
+        Returns:
+            Lista de tuplas (posicao_em_textos, score_similaridade) ordenada por relevância
+        """
+        _, _, motor, posicoes, _ = self.garantir_atualizado(textos)
+        if motor is None:
+            return []
+
+        consulta_normalizada = normalizar_texto(consulta)
+        if not consulta_normalizada:
+            return []
+
+        similaridades = motor.similaridades([consulta_normalizada])[0]
+        return self.selecionar_top_k(similaridades, posicoes, limiar, limite)
+
+    def buscar_lote(self, consultas: List[str], textos: List[str], limiar: float = 0.0,
+                    limite: Optional[int] = None) -> List[List[Tuple[int, float]]]:
+        """
+        Busca várias consultas com um único produto de matrizes esparsas.
+
+        Returns:
+            Uma lista de resultados (posicao_em_textos, score) por consulta, na ordem recebida
+        """
+        _, _, motor, posicoes, _ = self.garantir_atualizado(textos)
+        if motor is None or not consultas:
+            return [[] for _ in consultas]
+
+        consultas_normalizadas = [normalizar_texto(consulta) for consulta in consultas]
+        similaridades = motor.similaridades(consultas_normalizadas)
+
+        return [
+            self.selecionar_top_k(similaridades[i], posicoes, limiar, limite) if consulta else []
+            for i, consulta in enumerate(consultas_normalizadas)
+        ]
+
+    @staticmethod
+    def selecionar_top_k(similaridades: np.ndarray, posicoes: np.ndarray, limiar: float = 0.0,
+                         limite: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Seleciona os k maiores scores acima do limiar sem ordenar o vetor inteiro"""
+        # Arredondar: empates não podem depender do ruído de ponto flutuante de cada
+        # motor (a ordem das somas difere entre scikit-learn e o TF-IDF leve)
+        similaridades = np.round(similaridades, 12)
+        candidatos = np.flatnonzero(similaridades >= limiar)
+        if limite is not None and len(candidatos) > limite:
+            melhores = np.argpartition(similaridades[candidatos], -limite)[-limite:]
+            candidatos = candidatos[melhores]
+
+        # Ordenação estável por score decrescente (empates mantêm a ordem do catálogo)
+        ordem = np.lexsort((candidatos, -similaridades[candidatos]))
+        candidatos = candidatos[ordem]
+        return [(int(posicoes[i]), float(similaridades[i])) for i in candidatos]
+
+
+# Instâncias globais do snapshot e do índice
+snapshot_catalogo = SnapshotCatalogo()
+indice_catalogo = IndiceTfidfCatalogo()
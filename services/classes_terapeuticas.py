@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classes Terapêuticas
+====================
+
+Classifica a indicação de cada medicamento, uma única vez, em uma máscara de
+bits de classes terapêuticas (antitussígeno, expectorante, antipirético...).
+Os geradores ``_recomendar_para_*`` filtram candidatos com testes bit a bit em
+vez de varrer listas de palavras-chave na indicação a cada triagem.
+
+A classificação depende apenas do texto da indicação, então é memorizada por
+texto: cada indicação distinta do catálogo é analisada uma vez por processo.
+"""
+
+from enum import IntFlag
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+
+class ClasseTerapeutica(IntFlag):
+    """Classes terapêuticas reconhecidas pelos geradores de recomendações"""
+    NENHUMA = 0
+    TOSSE = 1 << 0
+    ANTITUSSIGENO = 1 << 1
+    EXPECTORANTE = 1 << 2
+    ANTIALERGICO = 1 << 3
+    ANTIPIRETICO = 1 << 4
+    ANALGESICO = 1 << 5
+    ANTIDIARREICO = 1 << 6
+    PROBIOTICO = 1 << 7
+    ANALGESICO_TOPICO = 1 << 8
+    ANTIACIDO = 1 << 9
+    LAXANTE = 1 << 10
+    TOPICO_HEMORROIDAS = 1 << 11
+    DESCONGESTIONANTE = 1 << 12
+    ANTIHISTAMINICO = 1 << 13
+    ANTIFUNGICO = 1 << 14
+    ANTIFUNGICO_SISTEMICO = 1 << 15
+    ANTIFUNGICO_UNHA = 1 << 16
+    ANTIFUNGICO_INFLAMACAO = 1 << 17
+
+
+# Palavras-chave procuradas na indicação (em minúsculas) para cada classe
+PALAVRAS_CHAVE_CLASSES: Dict[ClasseTerapeutica, List[str]] = {
+    ClasseTerapeutica.TOSSE: ['tosse', 'expectorante', 'antitussígeno', 'mucolítico'],
+    ClasseTerapeutica.ANTITUSSIGENO: ['antitussígeno', 'antitussigeno', 'dextrometorfano', 'clobutinol'],
+    ClasseTerapeutica.EXPECTORANTE: ['expectorante', 'guaifenesina', 'ambroxol', 'mucolítico'],
+    ClasseTerapeutica.ANTIALERGICO: ['antialérgico', 'antialergico', 'loratadina', 'desloratadina', 'dexclorfeniramina'],
+    ClasseTerapeutica.ANTIPIRETICO: ['antipirético', 'antipiretico', 'paracetamol', 'ibuprofeno', 'dipirona'],
+    ClasseTerapeutica.ANALGESICO: ['analgésico', 'analgesico', 'paracetamol', 'ibuprofeno', 'dipirona', 'naproxeno'],
+    ClasseTerapeutica.ANTIDIARREICO: ['antidiarreico', 'loperamida', 'racecadotril'],
+    ClasseTerapeutica.PROBIOTICO: ['probiótico', 'probiotico', 'lactobacillus', 'bifidobacterium'],
+    ClasseTerapeutica.ANALGESICO_TOPICO: ['analgésico tópico', 'anestésico tópico', 'benzocaína', 'lidocaína'],
+    ClasseTerapeutica.ANTIACIDO: ['antiácido', 'antiacido', 'hidróxido de alumínio', 'hidróxido de magnésio'],
+    ClasseTerapeutica.LAXANTE: ['laxante', 'purgativo', 'lactulose', 'sorbitol'],
+    ClasseTerapeutica.TOPICO_HEMORROIDAS: ['hemorroida', 'hemorroidas', 'anal', 'retal'],
+    ClasseTerapeutica.DESCONGESTIONANTE: ['descongestionante', 'pseudoefedrina', 'fenilefrina'],
+    ClasseTerapeutica.ANTIHISTAMINICO: ['antihistamínico', 'antihistaminico', 'loratadina', 'cetirizina'],
+    ClasseTerapeutica.ANTIFUNGICO: ['antifúngico', 'antifungico', 'clotrimazol', 'miconazol', 'cetoconazol'],
+    ClasseTerapeutica.ANTIFUNGICO_SISTEMICO: ['terbinafina', 'fluconazol', 'itraconazol', 'griseofulvina'],
+    ClasseTerapeutica.ANTIFUNGICO_UNHA: ['unha', 'onicomicose', 'terbinafina', 'ciclopirox'],
+    ClasseTerapeutica.ANTIFUNGICO_INFLAMACAO: ['clotrimazol + hidrocortisona', 'miconazol + hidrocortisona', 'fungicort'],
+}
+
+_TABELA_CLASSES = [(int(classe), tuple(palavras)) for classe, palavras in PALAVRAS_CHAVE_CLASSES.items()]
+
+
+@lru_cache(maxsize=65536)
+def classificar_indicacao(indicacao: Optional[str]) -> int:
+    """Retorna a máscara de classes terapêuticas de uma indicação"""
+    if not indicacao:
+        return 0
+
+    indicacao_lower = indicacao.lower()
+    mascara = 0
+    for classe, palavras in _TABELA_CLASSES:
+        if any(palavra in indicacao_lower for palavra in palavras):
+            mascara |= classe
+    return mascara
+
+
+def mascara_medicamento(medicamento) -> int:
+    """Máscara de classes de um medicamento (pré-calculada no registro, se houver)"""
+    mascara = getattr(medicamento, 'classes_terapeuticas', None)
+    if mascara is None:
+        mascara = classificar_indicacao(medicamento.indicacao)
+    return mascara
+
+
+def filtrar_por_classe(medicamentos: Iterable, classe: int) -> List:
+    """Filtra medicamentos que pertencem a qualquer uma das classes informadas"""
+    classe = int(classe)
+    return [m for m in medicamentos if mascara_medicamento(m) & classe]
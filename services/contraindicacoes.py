@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Triagem de Contraindicações
+===========================
+
+Compila as regras de ``data/contraindicacoes.json`` em um autômato
+Aho-Corasick. Cada padrão carrega o grupo de risco (gestantes, idosos,
+crianças), o tipo de regra (contraindicado ou cuidado especial) e sua posição
+na lista original, de modo que o nome comercial e o nome genérico de cada
+medicamento são percorridos uma única vez para obter todas as ocorrências.
+A triagem de uma lista de candidatos fica linear no tamanho dos textos.
+
+O autômato é mantido em cache e recompilado automaticamente quando o JSON
+muda em disco.
+
+A validação só roda com ``Config.CONTRAINDICACOES_AVANCADAS``. Antes deste
+módulo as regras eram procuradas em ``services/data/``, que não existe, e
+nunca eram aplicadas; desligado, o validador mantém esse comportamento.
+Ligado, os grupos saem de ``grupos_de_risco`` (chaves ``idade``/``gestante``
+ou as do perfil do cadastro), e os ajustes de prioridade e alertas ficam nos
+registros avaliados, ainda sem uso na ordenação ou nas observações.
+"""
+
+import json
+import logging
+import os
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from core.config import Config
+from utils.recarregamento import RecursoArquivo
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAMINHO_CONTRAINDICACOES = os.path.join(BASE_DIR, 'data', 'contraindicacoes.json')
+
+# Grupos de risco na ordem em que os alertas são emitidos
+GRUPOS_RISCO = ('gestantes', 'idosos', 'criancas')
+NOMES_GRUPOS = {'gestantes': 'gestantes', 'idosos': 'idosos', 'criancas': 'crianças'}
+
+# Tipo de regra -> (penalidade de prioridade, prefixo do alerta)
+TIPOS_REGRA = {
+    'contraindicados': (-2, 'CONTRAINDICADO'),
+    'cuidado_especial': (-1, 'CUIDADO ESPECIAL'),
+}
+
+
+class AutomatoAhoCorasick:
+    """Autômato Aho-Corasick para busca simultânea de vários padrões"""
+
+    def __init__(self):
+        self._transicoes: List[Dict[str, int]] = [{}]
+        self._falha: List[int] = [0]
+        self._saidas: List[List[object]] = [[]]
+        self._compilado = False
+
+    def adicionar(self, padrao: str, valor: object):
+        """Adiciona um padrão e o valor retornado quando ele ocorre"""
+        if not padrao:
+            return
+        estado = 0
+        for caractere in padrao:
+            proximo = self._transicoes[estado].get(caractere)
+            if proximo is None:
+                proximo = len(self._transicoes)
+                self._transicoes[estado][caractere] = proximo
+                self._transicoes.append({})
+                self._falha.append(0)
+                self._saidas.append([])
+            estado = proximo
+        self._saidas[estado].append(valor)
+        self._compilado = False
+
+    def compilar(self):
+        """Calcula os links de falha (BFS) e propaga as saídas"""
+        fila = deque()
+        for proximo in self._transicoes[0].values():
+            self._falha[proximo] = 0
+            fila.append(proximo)
+
+        while fila:
+            estado = fila.popleft()
+            for caractere, proximo in self._transicoes[estado].items():
+                fila.append(proximo)
+                falha = self._falha[estado]
+                while falha and caractere not in self._transicoes[falha]:
+                    falha = self._falha[falha]
+                self._falha[proximo] = self._transicoes[falha].get(caractere, 0)
+                self._saidas[proximo] = self._saidas[proximo] + self._saidas[self._falha[proximo]]
+
+        self._compilado = True
+
+    def buscar(self, texto: str) -> Set[object]:
+        """Retorna os valores de todos os padrões que ocorrem no texto"""
+        if not self._compilado:
+            self.compilar()
+
+        encontrados = set()
+        transicoes = self._transicoes
+        falha = self._falha
+        saidas = self._saidas
+        estado = 0
+        for caractere in texto:
+            while estado and caractere not in transicoes[estado]:
+                estado = falha[estado]
+            estado = transicoes[estado].get(caractere, 0)
+            if saidas[estado]:
+                encontrados.update(saidas[estado])
+        return encontrados
+
+
+def _compilar_regras(caminho: str) -> AutomatoAhoCorasick:
+    """Lê as regras de contraindicação e compila o autômato"""
+    with open(caminho, 'r', encoding='utf-8') as f:
+        regras = json.load(f)
+
+    automato = AutomatoAhoCorasick()
+    total = 0
+    for grupo in GRUPOS_RISCO:
+        regras_grupo = regras.get(grupo, {})
+        for tipo in TIPOS_REGRA:
+            for posicao, termo in enumerate(regras_grupo.get(tipo, [])):
+                # A posição preserva a regra "primeiro termo da lista" por tipo
+                automato.adicionar(termo.lower(), (grupo, tipo, posicao, termo))
+                total += 1
+    automato.compilar()
+
+    logger.info(f"Regras de contraindicação compiladas: {total} padrões")
+    return automato
+
+
+def grupos_de_risco(perfil_paciente: Optional[Dict]) -> Tuple[str, ...]:
+    """Identifica os grupos de risco do paciente (aceita o perfil do cadastro ou do motor)"""
+    if not perfil_paciente:
+        return ()
+
+    idade = perfil_paciente.get('idade', perfil_paciente.get('age_years')) or 0
+    gestante = perfil_paciente.get('gestante', perfil_paciente.get('is_pregnant_or_lactating', False))
+
+    grupos = []
+    if gestante:
+        grupos.append('gestantes')
+    if idade >= 65:
+        grupos.append('idosos')
+    if idade < 18:
+        grupos.append('criancas')
+    return tuple(grupos)
+
+
+class ValidadorContraindicacoes:
+    """Triagem de medicamentos contra as regras de contraindicação por grupo de risco"""
+
+    def __init__(self, caminho: str = CAMINHO_CONTRAINDICACOES, ativo: Optional[bool] = None):
+        self.ativo = Config.CONTRAINDICACOES_AVANCADAS if ativo is None else ativo
+        self._recurso = RecursoArquivo(caminho, _compilar_regras)
+
+    @property
+    def disponivel(self) -> bool:
+        return self._recurso.obter() is not None
+
+    def avaliar(self, nome_comercial: str, nome_generico: Optional[str],
+                grupos: Iterable[str]) -> Tuple[int, List[str]]:
+        """
+        Avalia um medicamento para os grupos de risco informados.
+
+        Returns:
+            Tupla (ajuste_prioridade, alertas)
+        """
+        automato = self._recurso.obter() if self.ativo else None
+        if automato is None or not grupos:
+            return 0, []
+
+        texto = f"{(nome_comercial or '').lower()}\n{(nome_generico or '').lower()}"
+        ocorrencias = automato.buscar(texto)
+        if not ocorrencias:
+            return 0, []
+
+        # Para cada (grupo, tipo) vale apenas o primeiro termo da lista original
+        primeiros: Dict[Tuple[str, str], Tuple[int, str]] = {}
+        for grupo, tipo, posicao, termo in ocorrencias:
+            atual = primeiros.get((grupo, tipo))
+            if atual is None or posicao < atual[0]:
+                primeiros[(grupo, tipo)] = (posicao, termo)
+
+        ajuste = 0
+        alertas = []
+        for grupo in grupos:
+            for tipo, (penalidade, prefixo) in TIPOS_REGRA.items():
+                encontrado = primeiros.get((grupo, tipo))
+                if encontrado:
+                    alertas.append(f"{prefixo} para {NOMES_GRUPOS[grupo]}: {encontrado[1]}")
+                    ajuste += penalidade
+        return ajuste, alertas
+
+
+# Instância global do validador
+validador_contraindicacoes = ValidadorContraindicacoes()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Estatísticas Diárias Agregadas
+==============================
+
+Mantém ``EstatisticaDiaria``: contagens de consultas por dia × módulo × sexo
+× faixa etária × cidade × bairro × encaminhamento, com a soma das pontuações
+e o número de recomendações de cada tipo. Os endpoints de
+``/api/estatisticas/*`` que só dependem dessas dimensões respondem a partir
+dela, com custo proporcional ao número de dias do período e não ao número de
+consultas.
+
+- ``registrar_consulta``: incrementa a linha da consulta (upsert), na
+  transação da própria triagem;
+- ``reconstruir``: refaz as linhas a partir das consultas com um único
+  ``INSERT ... SELECT ... GROUP BY`` (``utils/reconstruir_estatisticas_diarias.py``);
+- ``consultar``: query sobre as linhas do período com os filtros comuns das
+  estatísticas.
+
+Sexo, idade, cidade e bairro são os do paciente no momento da triagem; a
+reconstrução usa os do cadastro atual. Os períodos são contados em dias
+inteiros (``dia >= inicio.date()``).
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import case, delete, func, insert, select
+
+from models.models import db, Consulta, ConsultaPontuacao, ConsultaRecomendacao, EstatisticaDiaria, Paciente
+
+logger = logging.getLogger(__name__)
+
+# Mesmas faixas dos filtros e gráficos de faixa etária das estatísticas
+FAIXAS_ETARIAS = (
+    ('0-17', 0, 17),
+    ('18-34', 18, 34),
+    ('35-54', 35, 54),
+    ('55+', 55, 150),
+)
+
+
+def faixa_etaria(idade: Optional[int]) -> str:
+    """Faixa etária da idade ('' fora das faixas)"""
+    for nome, minimo, maximo in FAIXAS_ETARIAS:
+        if idade is not None and minimo <= idade <= maximo:
+            return nome
+    return ''
+
+
+def _faixa_etaria_sql(idade):
+    return case(*[(idade.between(minimo, maximo), nome) for nome, minimo, maximo in FAIXAS_ETARIAS], else_='')
+
+
+def _comando_upsert(linha: dict):
+    """INSERT da linha que soma as métricas à linha existente da mesma chave"""
+    tabela = EstatisticaDiaria.__table__
+    metricas = ('consultas', 'soma_pontuacao', 'recomendacoes_medicamento', 'recomendacoes_nao_farmacologicas')
+    dialeto = db.engine.dialect.name
+    if dialeto in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects.mysql import insert as insert_mysql
+        comando = insert_mysql(tabela).values(**linha)
+        # A chave única uq_estatisticas_diarias_chave dispara o ON DUPLICATE KEY
+        return comando.on_duplicate_key_update({m: tabela.c[m] + comando.inserted[m] for m in metricas})
+    if dialeto == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as insert_dialeto
+    elif dialeto == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as insert_dialeto
+    else:
+        return None
+    comando = insert_dialeto(tabela).values(**linha)
+    return comando.on_conflict_do_update(
+        index_elements=list(EstatisticaDiaria.DIMENSOES),
+        set_={m: tabela.c[m] + comando.excluded[m] for m in metricas}
+    )
+
+
+def registrar_consulta(consulta: Consulta, paciente: Paciente, pontuacao_total: float,
+                       recomendacoes_medicamento: int, recomendacoes_nao_farmacologicas: int):
+    """Soma a consulta às estatísticas do dia (sem commit; roda na transação da triagem)"""
+    chave = {
+        'dia': (consulta.data or datetime.now()).date(),
+        'modulo': consulta.modulo or '',
+        'sexo': paciente.sexo or '',
+        'faixa_etaria': faixa_etaria(paciente.idade),
+        'cidade': paciente.cidade or '',
+        'bairro': paciente.bairro or '',
+        'encaminhamento': bool(consulta.encaminhamento),
+    }
+    metricas = {
+        'consultas': 1,
+        'soma_pontuacao': float(pontuacao_total or 0.0),
+        'recomendacoes_medicamento': recomendacoes_medicamento,
+        'recomendacoes_nao_farmacologicas': recomendacoes_nao_farmacologicas,
+    }
+    comando = _comando_upsert({**chave, **metricas})
+    if comando is not None:
+        db.session.execute(comando)
+        return
+
+    # Outros bancos: leitura com bloqueio da linha e incremento
+    linha = EstatisticaDiaria.query.filter_by(**chave).with_for_update().first()
+    if linha is None:
+        db.session.add(EstatisticaDiaria(**chave, **metricas))
+    else:
+        for campo, valor in metricas.items():
+            setattr(linha, campo, getattr(linha, campo) + valor)
+
+
+def reconstruir(desde: Optional[date] = None) -> int:
+    """
+    Refaz as estatísticas (todas ou a partir de ``desde``) a partir das consultas.
+
+    Returns:
+        Número de linhas gravadas
+    """
+    recomendacoes = select(
+        ConsultaRecomendacao.id_consulta,
+        func.sum(case((ConsultaRecomendacao.tipo == 'medicamento', 1), else_=0)).label('medicamento'),
+        func.sum(case((ConsultaRecomendacao.tipo == 'nao_farmacologico', 1), else_=0)).label('nao_farmacologico'),
+    ).group_by(ConsultaRecomendacao.id_consulta).subquery()
+
+    dimensoes = (
+        func.date(Consulta.data),
+        func.coalesce(Consulta.modulo, ''),
+        func.coalesce(Paciente.sexo, ''),
+        _faixa_etaria_sql(Paciente.idade),
+        func.coalesce(Paciente.cidade, ''),
+        func.coalesce(Paciente.bairro, ''),
+        func.coalesce(Consulta.encaminhamento, False),
+    )
+    consulta_agregada = select(
+        *dimensoes,
+        func.count(Consulta.id),
+        func.coalesce(func.sum(ConsultaPontuacao.pontuacao_total), 0.0),
+        func.coalesce(func.sum(recomendacoes.c.medicamento), 0),
+        func.coalesce(func.sum(recomendacoes.c.nao_farmacologico), 0),
+    ).join(
+        Paciente, Consulta.id_paciente == Paciente.id
+    ).outerjoin(
+        ConsultaPontuacao, ConsultaPontuacao.id_consulta == Consulta.id
+    ).outerjoin(
+        recomendacoes, recomendacoes.c.id_consulta == Consulta.id
+    ).where(
+        Consulta.data.is_not(None)
+    ).group_by(*dimensoes)
+
+    remocao = delete(EstatisticaDiaria)
+    if desde is not None:
+        consulta_agregada = consulta_agregada.where(Consulta.data >= datetime.combine(desde, datetime.min.time()))
+        remocao = remocao.where(EstatisticaDiaria.dia >= desde)
+
+    colunas = list(EstatisticaDiaria.DIMENSOES) + [
+        'consultas', 'soma_pontuacao', 'recomendacoes_medicamento', 'recomendacoes_nao_farmacologicas'
+    ]
+    db.session.execute(remocao)
+    resultado = db.session.execute(insert(EstatisticaDiaria).from_select(colunas, consulta_agregada))
+    logger.info(f"Estatísticas diárias reconstruídas ({resultado.rowcount} linhas)")
+    return resultado.rowcount
+
+
+def consultar(*colunas, inicio: Optional[datetime] = None, sintoma: str = 'todos',
+              genero: str = 'todos', faixa: str = 'todos'):
+    """
+    Query sobre as estatísticas diárias com os filtros das telas de estatística.
+
+    ``faixa`` usa os nomes de ``FAIXAS_ETARIAS``; valores desconhecidos não filtram.
+    """
+    query = db.session.query(*colunas)
+    if inicio is not None:
+        query = query.filter(EstatisticaDiaria.dia >= inicio.date())
+    if sintoma != 'todos':
+        query = query.filter(EstatisticaDiaria.modulo == sintoma)
+    if genero != 'todos':
+        query = query.filter(EstatisticaDiaria.sexo == genero)
+    if faixa in {nome for nome, _, _ in FAIXAS_ETARIAS}:
+        query = query.filter(EstatisticaDiaria.faixa_etaria == faixa)
+    return query
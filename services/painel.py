@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Resumo do Painel
+================
+
+Calcula de uma vez os números do dashboard (``index()``) e do painel
+administrativo (``admin()``) e os mantém em cache por alguns segundos
+(``Config.PAINEL_CACHE_TTL``). Em vez de um ``COUNT`` por dia, mês ou faixa
+etária, o resumo sai de poucas consultas agregadas:
+
+- consultas: total, encaminhamentos, hoje, últimos 30 dias, últimos 7 dias e
+  últimos 6 meses, com ``SUM(CASE ...)`` sobre ``EstatisticaDiaria`` (linhas
+  por dia, não por consulta; os períodos são contados em dias inteiros);
+- pacientes: total, por sexo e pelas faixas etárias das duas telas;
+- medicamentos ativos;
+- recomendações de medicamento das consultas dos últimos 6 meses agrupadas por
+  descrição (mais recomendados), pelos índices de ``consultas.data`` e
+  ``consulta_recomendacoes (id_consulta, tipo)``;
+- as 5 consultas mais recentes, já como registros leves (sem objetos do ORM
+  presos à sessão da requisição que calculou o resumo).
+
+As consultas SQL saem de ``ResumoPainel.queries``, que
+``utils/verificar_plano_consultas.py`` também usa para conferir os planos.
+
+O cache é invalidado por um contador de geração: commits que gravam
+pacientes, consultas ou medicamentos pelo ORM incrementam o contador, e
+``_persistir_triagem`` chama ``invalidar()`` explicitamente porque as
+recomendações da triagem entram por INSERT em lote. A geração é local ao
+processo; em outros processos o TTL limita a defasagem.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, case, event, func, select
+from sqlalchemy.orm import Session
+
+from core.config import Config
+from models.models import db, Consulta, ConsultaRecomendacao, EstatisticaDiaria, Medicamento, Paciente
+from utils.cache import CacheLRU
+
+logger = logging.getLogger(__name__)
+
+MESES_PT = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+
+# Faixas etárias de cada tela (as do dashboard se sobrepõem em 65, como antes)
+FAIXAS_INICIO = (
+    ('0-18', 0, 18),
+    ('19-30', 19, 30),
+    ('31-50', 31, 50),
+    ('51-65', 51, 65),
+    ('65+', 65, 120),
+)
+FAIXAS_ADMIN = (
+    ('0-18 anos', 0, 18),
+    ('19-35 anos', 19, 35),
+    ('36-60 anos', 36, 60),
+    ('60+ anos', 61, 150),
+)
+
+# Modelos cujas gravações alteram o resumo
+MODELOS_PAINEL = (Paciente, Consulta, Medicamento)
+
+
+@dataclass(frozen=True)
+class PacienteRecente:
+    id: int
+    nome: str
+    idade: Optional[int]
+
+
+@dataclass(frozen=True)
+class ConsultaRecente:
+    """Consulta da lista de recentes com os campos usados pelos templates"""
+    id: int
+    data: Optional[datetime]
+    encaminhamento: bool
+    paciente: PacienteRecente
+
+
+def _contar(condicao):
+    return func.coalesce(func.sum(case((condicao, 1), else_=0)), 0)
+
+
+def _somar_consultas(condicao=None):
+    """Soma de ``EstatisticaDiaria.consultas`` (das linhas que atendem a condição)"""
+    if condicao is None:
+        return func.coalesce(func.sum(EstatisticaDiaria.consultas), 0)
+    return func.coalesce(func.sum(case((condicao, EstatisticaDiaria.consultas), else_=0)), 0)
+
+
+def _inicio_do_mes(dia: date, deslocamento: int = 0) -> datetime:
+    """Início do mês de ``dia`` deslocado em ``deslocamento`` meses"""
+    ano, mes = divmod(dia.year * 12 + dia.month - 1 + deslocamento, 12)
+    return datetime(ano, mes + 1, 1)
+
+
+class ResumoPainel:
+    """Resumo do dashboard calculado em poucas consultas e mantido em cache"""
+
+    DIAS_GRAFICO = 7
+    MESES_GRAFICO = 6
+    TOTAL_RECENTES = 5
+
+    def __init__(self, ttl_segundos: float = None):
+        self._cache = CacheLRU(tamanho_maximo=2, ttl_segundos=ttl_segundos or Config.PAINEL_CACHE_TTL)
+        self._lock_geracao = threading.Lock()
+        self._lock_calculo = threading.Lock()
+        self._geracao = 0
+
+    def invalidar(self):
+        """Descarta o resumo em cache (chamar depois do commit que o alterou)"""
+        with self._lock_geracao:
+            self._geracao += 1
+        self._cache.limpar()
+
+    def obter(self) -> Dict[str, Any]:
+        """Resumo atual, recalculado se expirou, foi invalidado ou o dia mudou"""
+        chave = (self._geracao, date.today())
+        resumo = self._cache.obter(chave)
+        if resumo is not None:
+            return resumo
+        with self._lock_calculo:
+            # Outra requisição pode ter calculado enquanto esta esperava
+            resumo = self._cache.obter(chave)
+            if resumo is None:
+                resumo = self._calcular(datetime.now())
+                self._cache.definir(chave, resumo)
+        return resumo
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Uso do cache do resumo"""
+        return {**self._cache.estatisticas(), 'geracao': self._geracao}
+
+    def _periodos(self, agora: datetime):
+        """Dias do gráfico semanal e (início, fim) dos meses do gráfico mensal"""
+        hoje = agora.date()
+        dias = [hoje - timedelta(days=i) for i in range(self.DIAS_GRAFICO - 1, -1, -1)]
+        meses = [_inicio_do_mes(hoje, -i) for i in range(self.MESES_GRAFICO - 1, -1, -1)]
+        return dias, list(zip(meses, meses[1:] + [_inicio_do_mes(hoje, 1)]))
+
+    def queries(self, agora: datetime) -> Dict[str, Any]:
+        """Consultas SQL do resumo, por nome (também conferidas por ``verificar_plano_consultas``)"""
+        dias, meses = self._periodos(agora)
+        dia = EstatisticaDiaria.dia
+        faixas = FAIXAS_INICIO + FAIXAS_ADMIN
+        return {
+            'contagens_consultas': db.session.query(
+                _somar_consultas(),
+                _somar_consultas(EstatisticaDiaria.encaminhamento == True),
+                _somar_consultas(dia >= (agora - timedelta(days=30)).date()),
+                *[_somar_consultas(dia == d) for d in dias],
+                *[_somar_consultas(and_(dia >= inicio.date(), dia < fim.date())) for inicio, fim in meses]
+            ),
+            'contagens_pacientes': db.session.query(
+                func.count(Paciente.id),
+                _contar(Paciente.sexo == 'M'),
+                _contar(Paciente.sexo == 'F'),
+                *[_contar(Paciente.idade.between(minimo, maximo)) for _, minimo, maximo in faixas]
+            ),
+            'medicamentos_ativos': db.session.query(func.count(Medicamento.id)).filter(Medicamento.ativo == True),
+            # IN (subquery) em vez de JOIN: o planejador parte de consultas.data e
+            # busca as recomendações pelo índice (id_consulta, tipo)
+            'medicamentos_recomendados': db.session.query(
+                ConsultaRecomendacao.descricao, func.count(ConsultaRecomendacao.id)
+            ).filter(
+                ConsultaRecomendacao.id_consulta.in_(select(Consulta.id).where(Consulta.data >= meses[0][0])),
+                ConsultaRecomendacao.tipo == 'medicamento'
+            ).group_by(ConsultaRecomendacao.descricao),
+            'consultas_recentes': db.session.query(
+                Consulta.id, Consulta.data, Consulta.encaminhamento, Paciente.id, Paciente.nome, Paciente.idade
+            ).join(
+                Paciente, Consulta.id_paciente == Paciente.id
+            ).order_by(Consulta.data.desc()).limit(self.TOTAL_RECENTES),
+        }
+
+    def _calcular(self, agora: datetime) -> Dict[str, Any]:
+        queries = self.queries(agora)
+        resumo = {}
+        resumo.update(self._resumo_consultas(agora, queries['contagens_consultas']))
+        resumo.update(self._resumo_pacientes(queries['contagens_pacientes']))
+        resumo['total_medicamentos'] = queries['medicamentos_ativos'].scalar()
+        resumo['medicamentos_recomendados'] = self._medicamentos_recomendados(queries['medicamentos_recomendados'])
+        resumo['consultas_recentes'] = [
+            ConsultaRecente(id_consulta, data, bool(encaminhamento), PacienteRecente(id_paciente, nome, idade))
+            for id_consulta, data, encaminhamento, id_paciente, nome, idade in queries['consultas_recentes']
+        ]
+        resumo['calculado_em'] = agora
+        logger.debug("Resumo do painel recalculado")
+        return resumo
+
+    def _resumo_consultas(self, agora: datetime, query) -> Dict[str, Any]:
+        dias, meses = self._periodos(agora)
+        total, encaminhamentos, ultimos_30_dias, *contagens = (int(valor) for valor in query.one())
+        por_dia, por_mes = contagens[:len(dias)], contagens[len(dias):]
+
+        return {
+            'total_consultas': total,
+            'total_encaminhamentos': encaminhamentos,
+            'taxa_encaminhamento': (encaminhamentos / total * 100) if total > 0 else 0,
+            'consultas_hoje': por_dia[-1],
+            'consultas_30_dias': ultimos_30_dias,
+            'consultas_por_dia': [
+                {'data': dia.strftime('%d/%m'), 'count': count} for dia, count in zip(dias, por_dia)
+            ],
+            'consultas_por_mes': [
+                {'mes': f'{MESES_PT[inicio.month - 1]}/{inicio.year}', 'count': count}
+                for (inicio, _), count in zip(meses, por_mes)
+            ],
+        }
+
+    def _resumo_pacientes(self, query) -> Dict[str, Any]:
+        faixas = FAIXAS_INICIO + FAIXAS_ADMIN
+        total, masculino, feminino, *contagens = query.one()
+        por_faixa = [{'faixa': nome, 'count': count} for (nome, _, _), count in zip(faixas, contagens)]
+        return {
+            'total_pacientes': total,
+            'total_pacientes_masculino': masculino,
+            'total_pacientes_feminino': feminino,
+            'pacientes_por_faixa_inicio': por_faixa[:len(FAIXAS_INICIO)],
+            'pacientes_por_faixa_admin': por_faixa[len(FAIXAS_INICIO):],
+        }
+
+    def _medicamentos_recomendados(self, query) -> List[Dict[str, Any]]:
+        """Top 5 por nome base (descrição antes do primeiro " - " ou " | ")"""
+        por_nome = {}
+        for descricao, count in query:
+            nome_base = descricao.split(' - ')[0].split(' | ')[0].strip()
+            por_nome[nome_base] = por_nome.get(nome_base, 0) + count
+        mais_recomendados = sorted(por_nome.items(), key=lambda x: x[1], reverse=True)[:5]
+        return [{'descricao': nome, 'count': count} for nome, count in mais_recomendados]
+
+
+# Instância global
+resumo_painel = ResumoPainel()
+
+
+@event.listens_for(Session, 'after_flush')
+def _marcar_alteracao_painel(session, contexto_flush):
+    """Marca a sessão quando o flush grava um modelo que aparece no painel"""
+    if any(isinstance(obj, MODELOS_PAINEL) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info['painel_alterado'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidar_painel_apos_commit(session):
+    if session.info.pop('painel_alterado', False):
+        resumo_painel.invalidar()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_marca_painel(session):
+    session.info.pop('painel_alterado', None)
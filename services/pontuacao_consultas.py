@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pontuação das Consultas
+=======================
+
+Grava e lê o resultado estruturado da pontuação de cada consulta
+(``ConsultaPontuacao``). A pontuação é registrada uma única vez, em
+``processar_triagem``; telas, relatórios e estatísticas leem as colunas
+tipadas em vez de extrair "Pontuação total", "Nível de risco" e "Confiança"
+das observações com expressões regulares ou de recalcular a pontuação a cada
+visualização.
+
+Consultas antigas sem pontuação gravada são preenchidas por
+``utils/migrar_pontuacoes_consultas.py``; até lá, ``obter_pontuacao`` calcula
+a pontuação em memória a cada acesso, sem gravar (telas e relatórios são
+GETs e não escrevem no banco).
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional
+
+from models.models import db, Consulta, ConsultaPontuacao
+from utils.extractors.perguntas_extractor import get_patient_profile_from_cadastro
+from utils.scoring.triagem_scoring import ScoringResult, scoring_system
+
+logger = logging.getLogger(__name__)
+
+
+def registrar_pontuacao(consulta: Consulta, modulo: Optional[str], scoring_result: ScoringResult,
+                        origem: str = 'triagem', encaminhamento: Optional[bool] = None) -> ConsultaPontuacao:
+    """
+    Associa à consulta a pontuação calculada (sem commit).
+
+    Args:
+        consulta: Consulta pontuada
+        modulo: Módulo de triagem usado no cálculo
+        scoring_result: Resultado de ``TriagemScoring.calculate_score``
+        origem: 'triagem', 'observacoes', 'recalculo' ou 'reprocessamento'
+        encaminhamento: Decisão final de encaminhamento, quando difere da pontuação
+                        (ex.: sinal de alerta da triagem adaptativa)
+    """
+    pontuacao = _preencher_pontuacao(consulta.pontuacao or ConsultaPontuacao(), modulo, scoring_result, origem)
+    if encaminhamento is not None:
+        pontuacao.encaminhamento = bool(encaminhamento)
+    consulta.pontuacao = pontuacao
+    db.session.add(pontuacao)
+    return pontuacao
+
+
+def _preencher_pontuacao(pontuacao: ConsultaPontuacao, modulo: Optional[str], scoring_result: ScoringResult,
+                         origem: str) -> ConsultaPontuacao:
+    categorias = scoring_result.category_scores or {}
+    pontuacao.modulo = modulo
+    pontuacao.pontuacao_total = float(scoring_result.total_score)
+    pontuacao.nivel_risco = scoring_result.risk_level
+    pontuacao.confianca = float(scoring_result.confidence)
+    pontuacao.encaminhamento = bool(scoring_result.encaminhamento)
+    pontuacao.versao_pesos = scoring_result.versao_pesos
+    for categoria in ConsultaPontuacao.CATEGORIAS:
+        setattr(pontuacao, f'pontuacao_{categoria}', float(categorias.get(categoria, 0.0)))
+    pontuacao.origem = origem
+    return pontuacao
+
+
+def modulo_das_observacoes(observacoes: Optional[str]) -> Optional[str]:
+    """Lê o módulo gravado na primeira linha das observações (MODULO: x)"""
+    if observacoes and 'MODULO:' in observacoes:
+        return observacoes.split('MODULO:')[1].split('\n')[0].strip() or None
+    return None
+
+
+def modulo_da_consulta(consulta: Consulta) -> Optional[str]:
+    """Módulo da consulta (coluna ``modulo`` ou, em consultas não migradas, a linha MODULO das observações)"""
+    return consulta.modulo or modulo_das_observacoes(consulta.observacoes)
+
+
+def respostas_formatadas(consulta: Consulta, modulo: Optional[str]) -> List[Dict[str, str]]:
+    """Reconstrói as respostas no formato {'pergunta_id', 'resposta'} do motor"""
+    respostas = []
+    for resposta in consulta.respostas:
+        pergunta_id = str(resposta.id_pergunta)
+        # Perguntas dinâmicas guardam o slug (modulo_ordem) no texto
+        if modulo and resposta.pergunta and resposta.pergunta.texto.startswith(f"{modulo}_"):
+            pergunta_id = resposta.pergunta.texto
+        respostas.append({'pergunta_id': pergunta_id, 'resposta': resposta.resposta})
+    return respostas
+
+
+def calcular_pontuacao_consulta(consulta: Consulta, modulo: str) -> ScoringResult:
+    """Recalcula a pontuação de uma consulta a partir das respostas gravadas"""
+    perfil = get_patient_profile_from_cadastro(consulta.paciente.to_dict())
+    return scoring_system.calculate_score(
+        modulo=modulo,
+        respostas=respostas_formatadas(consulta, modulo),
+        paciente_profile=perfil
+    )
+
+
+def obter_pontuacao(consulta: Consulta,
+                    detectar_modulo: Optional[Callable] = None) -> Optional[ConsultaPontuacao]:
+    """
+    Retorna a pontuação gravada da consulta.
+
+    Consultas anteriores à tabela de pontuações (e ainda não migradas) têm a
+    pontuação recalculada em um ``ConsultaPontuacao`` transitório, com origem
+    'recalculo', que não é adicionado à sessão: a gravação fica a cargo de
+    ``utils/migrar_pontuacoes_consultas.py``.
+
+    Args:
+        consulta: Consulta desejada
+        detectar_modulo: Função (respostas) -> módulo, usada quando as observações
+                         não registram o módulo
+    """
+    if consulta.pontuacao is not None:
+        return consulta.pontuacao
+    if not consulta.respostas:
+        return None
+
+    try:
+        modulo = modulo_da_consulta(consulta)
+        if not modulo and detectar_modulo:
+            modulo = detectar_modulo(consulta.respostas)
+        scoring_result = calcular_pontuacao_consulta(consulta, modulo or 'geral')
+        return _preencher_pontuacao(
+            ConsultaPontuacao(id_consulta=consulta.id), modulo, scoring_result, origem='recalculo'
+        )
+    except Exception as e:
+        logger.error(f"Erro ao calcular pontuação da consulta {consulta.id}: {e}")
+        return None
@@ -9,15 +9,18 @@
 """
 
 from typing import Dict, List, Tuple, Optional, Union
-from dataclasses import dataclass
-import re
-import json
-import os
+from dataclasses import dataclass, replace
 import logging
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from unidecode import unidecode
 from models.models import Medicamento, db
+from services.catalogo_medicamentos import (
+    indice_catalogo, snapshot_catalogo, versao_catalogo, criar_motor_tfidf, RegistroMedicamento
+)
+from services.sinonimos import servico_sinonimos
+from services.contraindicacoes import validador_contraindicacoes, grupos_de_risco
+from services.tabelas_recomendacoes import obter_tabelas
+from services.classes_terapeuticas import ClasseTerapeutica, filtrar_por_classe, mascara_medicamento
+from utils.texto import normalizar_texto
+from utils.cache import CacheLRU
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -34,38 +37,69 @@ class RecomendacaoFarmacologica:
     observacoes: str
     prioridade: int  # 1-5 (1 = alta prioridade)
     categoria: str  # 'sintomatico', 'terapeutico', 'preventivo'
+    
+    def copiar(self) -> 'RecomendacaoFarmacologica':
+        """Cópia rasa barata (sem passar pelo __init__), usada para modelos e cache"""
+        nova = object.__new__(RecomendacaoFarmacologica)
+        nova.__dict__.update(self.__dict__)
+        return nova
 
 class SistemaRecomendacoesFarmacologicas:
     """Sistema de recomendações farmacológicas baseado em indicações"""
     
+    # Máximo de medicamentos retornados pela busca semântica (top-k)
+    LIMITE_RESULTADOS_SEMANTICOS = 50
+    
+    # Cache de recomendações: o TTL limita a defasagem quando o catálogo é
+    # alterado por outro processo (a versão do catálogo é local ao processo)
+    TAMANHO_CACHE_RECOMENDACOES = 512
+    TTL_CACHE_RECOMENDACOES = 300
+    
     def __init__(self):
         self.palavras_chave_sintomas = self._carregar_palavras_chave()
-        self.medicamentos_cache = None
         self.tfidf_vectorizer = None
         self.medicamentos_tfidf_matrix = None
         self.medicamentos_textos = []
+        self._carregar_modelos_recomendacoes()
+        self.cache_recomendacoes = CacheLRU(
+            tamanho_maximo=self.TAMANHO_CACHE_RECOMENDACOES,
+            ttl_segundos=self.TTL_CACHE_RECOMENDACOES
+        )
+    
+    def _carregar_modelos_recomendacoes(self):
+        """Materializa as tabelas fixas em modelos imutáveis, copiados a cada requisição"""
+        tabelas = obter_tabelas()
+        
+        def construir(recomendacoes) -> Tuple[RecomendacaoFarmacologica, ...]:
+            return tuple(
+                RecomendacaoFarmacologica(
+                    medicamento=rec['medicamento'],
+                    principio_ativo=rec['principio_ativo'],
+                    indicacao=rec['indicacao'],
+                    posologia=rec['posologia'],
+                    contraindicacoes="Verificar bula",
+                    observacoes=rec['observacoes'],
+                    prioridade=rec['prioridade'],
+                    categoria=rec['categoria']
+                )
+                for rec in recomendacoes
+            )
+        
+        self._modelos_fixos = {modulo: construir(recs) for modulo, recs in tabelas.fixas.items()}
+        self._modelos_gerais = {modulo: construir(recs) for modulo, recs in tabelas.gerais.items()}
+        self._palavras_busca_gerais = {
+            modulo: tuple(palavra.lower() for palavra in palavras)
+            for modulo, palavras in tabelas.palavras_busca_gerais.items()
+        }
+    
+    @property
+    def medicamentos_cache(self) -> Tuple[RegistroMedicamento, ...]:
+        """Medicamentos ativos do snapshot em memória do catálogo"""
+        return snapshot_catalogo.obter().ativos
     
     def normalizar_texto(self, texto: str) -> str:
         """Normaliza texto removendo acentos, pontuação e convertendo para minúsculas"""
-        if not texto:
-            return ""
-        
-        # Remove acentos usando unidecode
-        texto_normalizado = unidecode(texto)
-        
-        # Converte para minúsculas
-        texto_normalizado = texto_normalizado.lower()
-        
-        # Remove pontuação e caracteres especiais, mantendo apenas letras, números e espaços
-        texto_normalizado = re.sub(r'[^a-zA-Z0-9\s]', ' ', texto_normalizado)
-        
-        # Remove espaços múltiplos
-        texto_normalizado = re.sub(r'\s+', ' ', texto_normalizado)
-        
-        # Remove espaços no início e fim
-        texto_normalizado = texto_normalizado.strip()
-        
-        return texto_normalizado
+        return normalizar_texto(texto)
     
     def expandir_sintomas(self, sintomas: List[str]) -> List[str]:
         """
@@ -77,55 +111,12 @@ def expandir_sintomas(self, sintomas: List[str]) -> List[str]:
         Returns:
             Lista expandida com sintomas originais e seus sinônimos
         """
-        sintomas_expandidos = set()
-        
         try:
-            # Carregar dicionário de sinônimos
-            caminho_sinonimos = os.path.join(os.path.dirname(__file__), 'data', 'sinonimos.json')
-            
-            if os.path.exists(caminho_sinonimos):
-                with open(caminho_sinonimos, 'r', encoding='utf-8') as f:
-                    sinonimos = json.load(f)
-                
-                # Adicionar sintomas originais
-                for sintoma in sintomas:
-                    sintoma_normalizado = self.normalizar_texto(sintoma)
-                    sintomas_expandidos.add(sintoma_normalizado)
-                    
-                    # Buscar sinônimos para o sintoma
-                    for termo_principal, lista_sinonimos in sinonimos.items():
-                        termo_principal_normalizado = self.normalizar_texto(termo_principal)
-                        
-                        # Se o sintoma corresponde ao termo principal
-                        if sintoma_normalizado == termo_principal_normalizado:
-                            for sinonimo in lista_sinonimos:
-                                sinonimo_normalizado = self.normalizar_texto(sinonimo)
-                                sintomas_expandidos.add(sinonimo_normalizado)
-                        
-                        # Se o sintoma corresponde a algum sinônimo
-                        for sinonimo in lista_sinonimos:
-                            sinonimo_normalizado = self.normalizar_texto(sinonimo)
-                            if sintoma_normalizado == sinonimo_normalizado:
-                                # Adicionar o termo principal e outros sinônimos
-                                sintomas_expandidos.add(termo_principal_normalizado)
-                                for outro_sinonimo in lista_sinonimos:
-                                    outro_sinonimo_normalizado = self.normalizar_texto(outro_sinonimo)
-                                    sintomas_expandidos.add(outro_sinonimo_normalizado)
-                                break
-            else:
-                # Se arquivo não existe, retornar sintomas originais normalizados
-                for sintoma in sintomas:
-                    sintoma_normalizado = self.normalizar_texto(sintoma)
-                    sintomas_expandidos.add(sintoma_normalizado)
-                    
+            return servico_sinonimos.expandir(sintomas)
         except Exception as e:
             # Em caso de erro, retornar sintomas originais normalizados
-            print(f"Erro ao carregar sinônimos: {e}")
-            for sintoma in sintomas:
-                sintoma_normalizado = self.normalizar_texto(sintoma)
-                sintomas_expandidos.add(sintoma_normalizado)
-        
-        return list(sintomas_expandidos)
+            logger.error(f"Erro ao expandir sinônimos: {e}")
+            return list({self.normalizar_texto(sintoma) for sintoma in sintomas})
     
     def buscar_por_semelhanca(self, sintoma: str, lista_indicacoes: List[str]) -> List[Tuple[str, float]]:
         """
@@ -153,29 +144,13 @@ def buscar_por_semelhanca(self, sintoma: str, lista_indicacoes: List[str]) -> Li
         if not indicacoes_validas:
             return []
         
-        # Preparar textos para TF-IDF (sintoma + indicações)
-        textos = [sintoma_normalizado] + [ind for _, ind in indicacoes_validas]
-        
         try:
-            # Criar vetorizador TF-IDF
-            vectorizer = TfidfVectorizer(
-                lowercase=True,
-                stop_words=None,  # Não usar stop words em português por enquanto
-                ngram_range=(1, 2),  # Unigramas e bigramas
-                min_df=1,  # Mínimo 1 documento
-                max_df=1.0,  # Máximo 100% dos documentos
-                token_pattern=r'\b\w+\b'  # Padrão para tokens
-            )
+            # Ajustar o TF-IDF (scikit-learn ou motor leve, conforme TFIDF_MODO); os
+            # motores já pesam o sintoma como se ele fizesse parte do ajuste
+            motor = criar_motor_tfidf([ind for _, ind in indicacoes_validas])
             
-            # Calcular matriz TF-IDF
-            tfidf_matrix = vectorizer.fit_transform(textos)
-            
-            # Calcular similaridade de cosseno entre o sintoma e as indicações
-            sintoma_vector = tfidf_matrix[0:1]  # Primeiro vetor é o sintoma
-            indicacoes_vectors = tfidf_matrix[1:]  # Resto são as indicações
-            
-            # Calcular similaridades
-            similaridades = cosine_similarity(sintoma_vector, indicacoes_vectors).flatten()
+            # Similaridade de cosseno entre o sintoma e as indicações
+            similaridades = motor.similaridades([sintoma_normalizado])[0]
             
             # Criar lista de resultados com scores
             resultados = []
@@ -268,97 +243,121 @@ def _carregar_palavras_chave(self) -> Dict[str, List[str]]:
             ]
         }
     
+    def _carregar_catalogo_ativo(self) -> Tuple[Tuple[RegistroMedicamento, ...], Tuple[RegistroMedicamento, ...], Tuple[str, ...]]:
+        """
+        Obtém os medicamentos ativos e os textos usados na busca semântica.
+        
+        Os dados vêm do snapshot em memória do catálogo, que só consulta o
+        banco quando o catálogo mudou.
+        
+        Returns:
+            Tupla (medicamentos_ativos, medicamentos_com_indicacao, textos_indexados)
+        """
+        catalogo = snapshot_catalogo.obter()
+        return catalogo.ativos, catalogo.com_indicacao, catalogo.textos
+    
+    def _busca_semantica_avulsa(self, sintomas_para_busca: str, indicacoes_medicamentos: List[str],
+                                limiar_confianca: float) -> List[Tuple[int, float]]:
+        """Fallback sem o índice pré-ajustado, no mesmo formato (posição, score)"""
+        posicao_por_texto = {}
+        for posicao, texto in enumerate(indicacoes_medicamentos):
+            posicao_por_texto.setdefault(texto, posicao)
+        return [
+            (posicao_por_texto[texto], score)
+            for texto, score in self.buscar_por_semelhanca(sintomas_para_busca, indicacoes_medicamentos)
+            if score >= limiar_confianca
+        ][:self.LIMITE_RESULTADOS_SEMANTICOS]
+    
     def buscar_medicamentos_por_sintoma(self, sintoma: str, modulo: str, limiar_confianca: float = 0.25) -> Union[List[Medicamento], Dict[str, str]]:
         """Busca medicamentos que tenham indicações relacionadas ao sintoma usando busca semântica"""
         logger.info(f"Iniciando busca de medicamentos para sintoma: '{sintoma}' no módulo: '{modulo}'")
         
-        medicamentos_relevantes = []
-        scores_similaridade = []
-        
         try:
             # Buscar medicamentos do banco de dados
-            medicamentos_ativos = Medicamento.query.filter_by(ativo=True).all()
+            medicamentos_ativos, medicamentos_com_indicacao, indicacoes_medicamentos = self._carregar_catalogo_ativo()
             
             if not medicamentos_ativos:
                 logger.warning("Nenhum medicamento ativo encontrado no banco, usando fallback")
                 # Fallback para medicamentos simulados
                 return self._get_medicamentos_simulados_por_modulo(modulo)
             
-            # Preparar lista de indicações para busca semântica
-            indicacoes_medicamentos = []
-            medicamentos_com_indicacao = []
-            
-            for medicamento in medicamentos_ativos:
-                if medicamento.indicacao:
-                    # Combinar nome comercial, genérico e indicação para busca mais abrangente
-                    texto_completo = f"{medicamento.nome_comercial} {medicamento.nome_generico or ''} {medicamento.indicacao}"
-                    indicacoes_medicamentos.append(texto_completo)
-                    medicamentos_com_indicacao.append(medicamento)
+            # Expandir sintomas com sinônimos clínicos
+            sintomas_expandidos = self.expandir_sintomas([sintoma])
+            logger.info(f"Sinônimos expandidos: {sintomas_expandidos}")
             
             if not indicacoes_medicamentos:
                 logger.info("Nenhuma indicação encontrada, usando busca por palavras-chave")
                 # Se não há indicações, usar busca por palavras-chave
-                sintomas_expandidos = self.expandir_sintomas([sintoma])
-                logger.info(f"Sinônimos expandidos: {sintomas_expandidos}")
                 return self._buscar_medicamentos_por_palavras_chave(medicamentos_ativos, modulo, sintomas_expandidos)
             
-            # Expandir sintomas com sinônimos clínicos
-            sintomas_expandidos = self.expandir_sintomas([sintoma])
-            logger.info(f"Sinônimos expandidos: {sintomas_expandidos}")
-            
             # Usar busca semântica com sintomas expandidos
             # Criar uma string combinada com todos os sintomas expandidos para busca
             sintomas_para_busca = " ".join(sintomas_expandidos)
-            resultados_semanticos = self.buscar_por_semelhanca(sintomas_para_busca, indicacoes_medicamentos)
-            
-            # Aplicar limiar de similaridade configurável
-            limiar_similaridade = limiar_confianca
-            
-            for indicacao_completa, score in resultados_semanticos:
-                if score >= limiar_similaridade:
-                    # Encontrar o medicamento correspondente
-                    for i, med in enumerate(medicamentos_com_indicacao):
-                        texto_med = f"{med.nome_comercial} {med.nome_generico or ''} {med.indicacao}"
-                        if texto_med == indicacao_completa:
-                            medicamentos_relevantes.append(med)
-                            scores_similaridade.append(score)
-                            logger.info(f"Medicamento encontrado: {med.nome_comercial} (score: {score:.3f})")
-                            break
-            
-            # Se não encontrou medicamentos com busca semântica, tentar busca por palavras-chave
-            if not medicamentos_relevantes:
-                logger.info("Nenhum medicamento encontrado com busca semântica, tentando busca por palavras-chave")
-                medicamentos_relevantes = self._buscar_medicamentos_por_palavras_chave(medicamentos_ativos, modulo, sintomas_expandidos)
-            
-            # Se ainda não encontrou, buscar por módulo geral
-            if not medicamentos_relevantes:
-                logger.info("Nenhum medicamento encontrado com busca por palavras-chave, tentando busca geral por módulo")
-                medicamentos_relevantes = self._buscar_medicamentos_gerais_por_modulo(modulo, medicamentos_ativos)
-            
-            # Verificar se nenhum medicamento atinge o limiar de confiança
-            if not medicamentos_relevantes or (scores_similaridade and max(scores_similaridade) < limiar_confianca):
-                logger.warning(f"Nenhum medicamento atingiu o limiar de confiança de {limiar_confianca}")
-                return {
-                    "status": "baixa_confianca",
-                    "mensagem": "Encaminhar ao farmacêutico"
-                }
-            
-            # Ordenar por relevância (medicamentos com indicações mais específicas primeiro)
-            medicamentos_relevantes.sort(key=lambda m: self._calcular_relevancia_medicamento(m, modulo))
+            try:
+                # Índice pré-ajustado: só é reconstruído quando o catálogo muda
+                resultados_semanticos = indice_catalogo.buscar(
+                    sintomas_para_busca, indicacoes_medicamentos,
+                    limiar=limiar_confianca, limite=self.LIMITE_RESULTADOS_SEMANTICOS
+                )
+            except Exception as e:
+                logger.error(f"Erro no índice TF-IDF do catálogo, usando busca avulsa: {e}")
+                resultados_semanticos = self._busca_semantica_avulsa(sintomas_para_busca, indicacoes_medicamentos, limiar_confianca)
             
-            logger.info(f"Encontrados {len(medicamentos_relevantes)} medicamentos relevantes")
+            return self._selecionar_medicamentos_relevantes(
+                modulo, limiar_confianca, medicamentos_ativos, medicamentos_com_indicacao,
+                sintomas_expandidos, resultados_semanticos
+            )
             
         except Exception as e:
             logger.error(f"Erro ao buscar medicamentos do banco: {e}")
             # Fallback para medicamentos simulados
-            medicamentos_relevantes = self._get_medicamentos_simulados_por_modulo(modulo)
+            return self._get_medicamentos_simulados_por_modulo(modulo)
+    
+    def _selecionar_medicamentos_relevantes(self, modulo: str, limiar_confianca: float,
+                                            medicamentos_ativos: List[Medicamento],
+                                            medicamentos_com_indicacao: List[Medicamento],
+                                            sintomas_expandidos: List[str],
+                                            resultados_semanticos: List[Tuple[int, float]]) -> Union[List[Medicamento], Dict[str, str]]:
+        """Converte os resultados da busca semântica na lista final (com fallbacks e ordenação)"""
+        medicamentos_relevantes = []
+        scores_similaridade = []
+        
+        # Os resultados já trazem a posição do medicamento na lista indexada
+        for posicao, score in resultados_semanticos:
+            med = medicamentos_com_indicacao[posicao]
+            medicamentos_relevantes.append(med)
+            scores_similaridade.append(score)
+            logger.info(f"Medicamento encontrado: {med.nome_comercial} (score: {score:.3f})")
+        
+        # Se não encontrou medicamentos com busca semântica, tentar busca por palavras-chave
+        if not medicamentos_relevantes:
+            logger.info("Nenhum medicamento encontrado com busca semântica, tentando busca por palavras-chave")
+            medicamentos_relevantes = self._buscar_medicamentos_por_palavras_chave(medicamentos_ativos, modulo, sintomas_expandidos)
         
+        # Se ainda não encontrou, buscar por módulo geral
+        if not medicamentos_relevantes:
+            logger.info("Nenhum medicamento encontrado com busca por palavras-chave, tentando busca geral por módulo")
+            medicamentos_relevantes = self._buscar_medicamentos_gerais_por_modulo(modulo, medicamentos_ativos)
+        
+        # Verificar se nenhum medicamento atinge o limiar de confiança
+        if not medicamentos_relevantes or (scores_similaridade and max(scores_similaridade) < limiar_confianca):
+            logger.warning(f"Nenhum medicamento atingiu o limiar de confiança de {limiar_confianca}")
+            return {
+                "status": "baixa_confianca",
+                "mensagem": "Encaminhar ao farmacêutico"
+            }
+        
+        # Ordenar por relevância (medicamentos com indicações mais específicas primeiro)
+        medicamentos_relevantes.sort(key=lambda m: self._calcular_relevancia_medicamento(m, modulo))
+        
+        logger.info(f"Encontrados {len(medicamentos_relevantes)} medicamentos relevantes")
         return medicamentos_relevantes
     
     def _buscar_medicamentos_por_palavras_chave(self, medicamentos_ativos: List[Medicamento], modulo: str, sintomas_expandidos: List[str] = None) -> List[Medicamento]:
         """Busca medicamentos usando palavras-chave incluindo sinônimos"""
         medicamentos_relevantes = []
-        palavras_chave = self.palavras_chave_sintomas.get(modulo, [])
+        # Copiar a lista para não acumular sinônimos em palavras_chave_sintomas
+        palavras_chave = list(self.palavras_chave_sintomas.get(modulo, []))
         
         # Adicionar sinônimos às palavras-chave se fornecidos
         if sintomas_expandidos:
@@ -413,126 +412,37 @@ def _validar_contraindicacoes_avancadas(self, medicamentos: List[Medicamento], p
         
         Args:
             medicamentos: Lista de medicamentos a serem validados
-            perfil_paciente: Dicionário com informações do paciente (idade, gestante, etc.)
+            perfil_paciente: Dicionário com informações do paciente (idade/age_years, gestante, etc.)
         
         Returns:
             Lista de medicamentos com validações aplicadas
         """
         try:
-            # Carregar regras de contraindicação
-            contraindicacoes_path = os.path.join(os.path.dirname(__file__), 'data', 'contraindicacoes.json')
+            if not validador_contraindicacoes.ativo:
+                return medicamentos
             
-            if not os.path.exists(contraindicacoes_path):
+            if not validador_contraindicacoes.disponivel:
                 logger.warning("Arquivo de contraindicações não encontrado, pulando validação avançada")
                 return medicamentos
             
-            with open(contraindicacoes_path, 'r', encoding='utf-8') as f:
-                regras_contraindicacao = json.load(f)
+            grupos = grupos_de_risco(perfil_paciente)
+            if not grupos:
+                return medicamentos
             
             medicamentos_validados = []
-            
             for medicamento in medicamentos:
-                medicamento_validado = medicamento
-                alertas_aplicados = []
-                prioridade_ajustada = 0
-                
-                # Verificar contraindicações por grupo de risco
-                if perfil_paciente:
-                    # Verificar gestantes
-                    if perfil_paciente.get('gestante', False):
-                        contraindicados_gestantes = regras_contraindicacao.get('gestantes', {}).get('contraindicados', [])
-                        cuidado_especial_gestantes = regras_contraindicacao.get('gestantes', {}).get('cuidado_especial', [])
-                        
-                        nome_medicamento = medicamento.nome_comercial.lower()
-                        principio_ativo = (medicamento.nome_generico or '').lower()
-                        
-                        # Verificar contraindicações absolutas
-                        for contraindicado in contraindicados_gestantes:
-                            if (contraindicado.lower() in nome_medicamento or 
-                                contraindicado.lower() in principio_ativo):
-                                alertas_aplicados.append(f"CONTRAINDICADO para gestantes: {contraindicado}")
-                                prioridade_ajustada -= 2
-                                logger.warning(f"Medicamento {medicamento.nome_comercial} contraindicado para gestantes")
-                                break
-                        
-                        # Verificar cuidados especiais
-                        for cuidado in cuidado_especial_gestantes:
-                            if (cuidado.lower() in nome_medicamento or 
-                                cuidado.lower() in principio_ativo):
-                                alertas_aplicados.append(f"CUIDADO ESPECIAL para gestantes: {cuidado}")
-                                prioridade_ajustada -= 1
-                                logger.info(f"Medicamento {medicamento.nome_comercial} requer cuidado especial para gestantes")
-                                break
-                    
-                    # Verificar idosos (assumindo idade >= 65)
-                    if perfil_paciente.get('idade', 0) >= 65:
-                        contraindicados_idosos = regras_contraindicacao.get('idosos', {}).get('contraindicados', [])
-                        cuidado_especial_idosos = regras_contraindicacao.get('idosos', {}).get('cuidado_especial', [])
-                        
-                        nome_medicamento = medicamento.nome_comercial.lower()
-                        principio_ativo = (medicamento.nome_generico or '').lower()
-                        
-                        # Verificar contraindicações absolutas
-                        for contraindicado in contraindicados_idosos:
-                            if (contraindicado.lower() in nome_medicamento or 
-                                contraindicado.lower() in principio_ativo):
-                                alertas_aplicados.append(f"CONTRAINDICADO para idosos: {contraindicado}")
-                                prioridade_ajustada -= 2
-                                logger.warning(f"Medicamento {medicamento.nome_comercial} contraindicado para idosos")
-                                break
-                        
-                        # Verificar cuidados especiais
-                        for cuidado in cuidado_especial_idosos:
-                            if (cuidado.lower() in nome_medicamento or 
-                                cuidado.lower() in principio_ativo):
-                                alertas_aplicados.append(f"CUIDADO ESPECIAL para idosos: {cuidado}")
-                                prioridade_ajustada -= 1
-                                logger.info(f"Medicamento {medicamento.nome_comercial} requer cuidado especial para idosos")
-                                break
-                    
-                    # Verificar crianças (assumindo idade < 18)
-                    if perfil_paciente.get('idade', 0) < 18:
-                        contraindicados_criancas = regras_contraindicacao.get('criancas', {}).get('contraindicados', [])
-                        cuidado_especial_criancas = regras_contraindicacao.get('criancas', {}).get('cuidado_especial', [])
-                        
-                        nome_medicamento = medicamento.nome_comercial.lower()
-                        principio_ativo = (medicamento.nome_generico or '').lower()
-                        
-                        # Verificar contraindicações absolutas
-                        for contraindicado in contraindicados_criancas:
-                            if (contraindicado.lower() in nome_medicamento or 
-                                contraindicado.lower() in principio_ativo):
-                                alertas_aplicados.append(f"CONTRAINDICADO para crianças: {contraindicado}")
-                                prioridade_ajustada -= 2
-                                logger.warning(f"Medicamento {medicamento.nome_comercial} contraindicado para crianças")
-                                break
-                        
-                        # Verificar cuidados especiais
-                        for cuidado in cuidado_especial_criancas:
-                            if (cuidado.lower() in nome_medicamento or 
-                                cuidado.lower() in principio_ativo):
-                                alertas_aplicados.append(f"CUIDADO ESPECIAL para crianças: {cuidado}")
-                                prioridade_ajustada -= 1
-                                logger.info(f"Medicamento {medicamento.nome_comercial} requer cuidado especial para crianças")
-                                break
-                
-                # Aplicar ajustes de prioridade se necessário
-                if prioridade_ajustada != 0:
-                    # Adicionar atributo de prioridade ajustada ao medicamento
-                    if not hasattr(medicamento, 'prioridade_ajustada'):
-                        medicamento.prioridade_ajustada = 0
-                    medicamento.prioridade_ajustada += prioridade_ajustada
+                # Autômato compilado: nome e princípio ativo são percorridos uma única vez
+                prioridade_ajustada, alertas_aplicados = validador_contraindicacoes.avaliar(
+                    medicamento.nome_comercial, medicamento.nome_generico, grupos
+                )
                 
-                # Adicionar alertas ao medicamento
+                # Os registros do snapshot são compartilhados entre pacientes:
+                # o resultado vai para uma cópia, nunca para o registro original
+                medicamentos_validados.append(medicamento.avaliado(prioridade_ajustada, alertas_aplicados))
                 if alertas_aplicados:
-                    if not hasattr(medicamento, 'alertas_contraindicacao'):
-                        medicamento.alertas_contraindicacao = []
-                    medicamento.alertas_contraindicacao.extend(alertas_aplicados)
                     logger.info(f"Alertas aplicados ao medicamento {medicamento.nome_comercial}: {alertas_aplicados}")
-                
-                medicamentos_validados.append(medicamento)
             
-            logger.info(f"Validação de contraindicações concluída para {len(medicamentos_validados)} medicamentos")
+            logger.info(f"Validação de contraindicações concluída para {len(medicamentos)} medicamentos")
             return medicamentos_validados
             
         except Exception as e:
@@ -541,62 +451,55 @@ def _validar_contraindicacoes_avancadas(self, medicamentos: List[Medicamento], p
     
     def _get_medicamentos_simulados(self) -> List[Medicamento]:
         """Retorna medicamentos simulados quando o banco não está disponível"""
-        class MedicamentoSimulado:
-            def __init__(self, nome_comercial, nome_generico, indicacao, contraindicacao=None):
-                self.nome_comercial = nome_comercial
-                self.nome_generico = nome_generico
-                self.indicacao = indicacao
-                self.contraindicacao = contraindicacao
-                self.ativo = True
-        
+        # Registros sem id, no mesmo formato do snapshot do catálogo
         return [
             # Medicamentos para tosse
-            MedicamentoSimulado("Vick 44", "Dextrometorfano", "Tosse seca e irritativa, antitussígeno"),
-            MedicamentoSimulado("Mucosolvan", "Ambroxol", "Tosse produtiva, expectorante, mucolítico"),
-            MedicamentoSimulado("Claritin", "Loratadina", "Tosse alérgica, antialérgico, antihistamínico"),
-            MedicamentoSimulado("Bisolvon", "Bromexina", "Tosse com secreção, mucolítico, expectorante"),
-            MedicamentoSimulado("Benalet", "Clobutinol", "Antitussígeno para tosse seca"),
-            MedicamentoSimulado("Xarope de Guaifenesina", "Guaifenesina", "Expectorante para tosse"),
+            RegistroMedicamento(None, "Vick 44", "Dextrometorfano", "Tosse seca e irritativa, antitussígeno"),
+            RegistroMedicamento(None, "Mucosolvan", "Ambroxol", "Tosse produtiva, expectorante, mucolítico"),
+            RegistroMedicamento(None, "Claritin", "Loratadina", "Tosse alérgica, antialérgico, antihistamínico"),
+            RegistroMedicamento(None, "Bisolvon", "Bromexina", "Tosse com secreção, mucolítico, expectorante"),
+            RegistroMedicamento(None, "Benalet", "Clobutinol", "Antitussígeno para tosse seca"),
+            RegistroMedicamento(None, "Xarope de Guaifenesina", "Guaifenesina", "Expectorante para tosse"),
             
             # Medicamentos para febre
-            MedicamentoSimulado("Tylenol", "Paracetamol", "Febre e dor, antipirético, analgésico"),
-            MedicamentoSimulado("Advil", "Ibuprofeno", "Febre e inflamação, antipirético, anti-inflamatório"),
-            MedicamentoSimulado("Novalgina", "Dipirona", "Febre e dor, antipirético, analgésico"),
-            MedicamentoSimulado("Aspirina", "Ácido Acetilsalicílico", "Febre e dor, antipirético"),
+            RegistroMedicamento(None, "Tylenol", "Paracetamol", "Febre e dor, antipirético, analgésico"),
+            RegistroMedicamento(None, "Advil", "Ibuprofeno", "Febre e inflamação, antipirético, anti-inflamatório"),
+            RegistroMedicamento(None, "Novalgina", "Dipirona", "Febre e dor, antipirético, analgésico"),
+            RegistroMedicamento(None, "Aspirina", "Ácido Acetilsalicílico", "Febre e dor, antipirético"),
             
             # Medicamentos para dor de cabeça
-            MedicamentoSimulado("Dorflex", "Dipirona + Orfenadrina", "Dor de cabeça, analgésico, relaxante muscular"),
-            MedicamentoSimulado("Voltaren", "Diclofenaco", "Dor de cabeça, anti-inflamatório"),
+            RegistroMedicamento(None, "Dorflex", "Dipirona + Orfenadrina", "Dor de cabeça, analgésico, relaxante muscular"),
+            RegistroMedicamento(None, "Voltaren", "Diclofenaco", "Dor de cabeça, anti-inflamatório"),
             
             # Medicamentos para diarreia
-            MedicamentoSimulado("Imodium", "Loperamida", "Diarreia aguda, antidiarreico"),
-            MedicamentoSimulado("Floratil", "Saccharomyces boulardii", "Diarreia, probiótico"),
-            MedicamentoSimulado("Smecta", "Diosmectita", "Diarreia e cólicas"),
+            RegistroMedicamento(None, "Imodium", "Loperamida", "Diarreia aguda, antidiarreico"),
+            RegistroMedicamento(None, "Floratil", "Saccharomyces boulardii", "Diarreia, probiótico"),
+            RegistroMedicamento(None, "Smecta", "Diosmectita", "Diarreia e cólicas"),
             
             # Medicamentos para dor de garganta
-            MedicamentoSimulado("Strepsils", "Benzocaína + Amilmetacresol", "Dor de garganta, analgésico tópico"),
-            MedicamentoSimulado("Cepacol", "Benzocaína + Cetylpiridinium", "Dor de garganta, anestésico tópico"),
+            RegistroMedicamento(None, "Strepsils", "Benzocaína + Amilmetacresol", "Dor de garganta, analgésico tópico"),
+            RegistroMedicamento(None, "Cepacol", "Benzocaína + Cetylpiridinium", "Dor de garganta, anestésico tópico"),
             
             # Medicamentos para azia
-            MedicamentoSimulado("Pepsamar", "Hidróxido de Alumínio + Magnésio", "Azia e queimação, antiácido"),
-            MedicamentoSimulado("Omeprazol", "Omeprazol", "Inibidor de bomba de prótons"),
+            RegistroMedicamento(None, "Pepsamar", "Hidróxido de Alumínio + Magnésio", "Azia e queimação, antiácido"),
+            RegistroMedicamento(None, "Omeprazol", "Omeprazol", "Inibidor de bomba de prótons"),
             
             # Medicamentos para constipação
-            MedicamentoSimulado("Lactulona", "Lactulose", "Constipação, laxante"),
-            MedicamentoSimulado("Bisacodil", "Bisacodil", "Laxante estimulante"),
+            RegistroMedicamento(None, "Lactulona", "Lactulose", "Constipação, laxante"),
+            RegistroMedicamento(None, "Bisacodil", "Bisacodil", "Laxante estimulante"),
             
             # Medicamentos para hemorroidas
-            MedicamentoSimulado("Proctyl", "Hidrocortisona + Lidocaína", "Hemorroidas, anti-inflamatório tópico"),
-            MedicamentoSimulado("Anusol", "Óxido de Zinco + Bálsamo", "Hemorroidas e fissuras"),
+            RegistroMedicamento(None, "Proctyl", "Hidrocortisona + Lidocaína", "Hemorroidas, anti-inflamatório tópico"),
+            RegistroMedicamento(None, "Anusol", "Óxido de Zinco + Bálsamo", "Hemorroidas e fissuras"),
             
             # Medicamentos para dor lombar
-            MedicamentoSimulado("Ciclobenzaprina", "Ciclobenzaprina", "Relaxante muscular"),
-            MedicamentoSimulado("Tramadol", "Tramadol", "Analgésico para dor intensa"),
+            RegistroMedicamento(None, "Ciclobenzaprina", "Ciclobenzaprina", "Relaxante muscular"),
+            RegistroMedicamento(None, "Tramadol", "Tramadol", "Analgésico para dor intensa"),
             
             # Medicamentos para congestão nasal
-            MedicamentoSimulado("Sorine", "Cloridrato de Naftazolina", "Congestão nasal, descongestionante"),
-            MedicamentoSimulado("Allegra", "Fexofenadina", "Congestão nasal alérgica, antihistamínico"),
-            MedicamentoSimulado("Rinosoro", "Soro Fisiológico", "Lavagem nasal")
+            RegistroMedicamento(None, "Sorine", "Cloridrato de Naftazolina", "Congestão nasal, descongestionante"),
+            RegistroMedicamento(None, "Allegra", "Fexofenadina", "Congestão nasal alérgica, antihistamínico"),
+            RegistroMedicamento(None, "Rinosoro", "Soro Fisiológico", "Lavagem nasal")
         ]
     
     def _get_medicamentos_simulados_por_modulo(self, modulo: str) -> List[Medicamento]:
@@ -627,57 +530,13 @@ def _buscar_medicamentos_gerais_por_modulo(self, modulo: str, medicamentos_ativo
         
         if medicamentos_ativos is None:
             try:
-                medicamentos_ativos = Medicamento.query.filter_by(ativo=True).all()
+                medicamentos_ativos = self.medicamentos_cache
             except Exception:
                 return self._get_medicamentos_simulados_por_modulo(modulo)
         
-        # Mapeamento de módulos para medicamentos gerais
-        medicamentos_por_modulo = {
-            'tosse': [
-                'dextrometorfano', 'guaifenesina', 'ambroxol', 'loratadina', 
-                'vick', 'mucosolvan', 'claritin', 'xarope', 'antitussígeno'
-            ],
-            'febre': [
-                'paracetamol', 'ibuprofeno', 'dipirona', 'tylenol', 'advil',
-                'antipirético', 'analgésico', 'febre'
-            ],
-            'dor_cabeca': [
-                'paracetamol', 'ibuprofeno', 'naproxeno', 'tylenol', 'advil',
-                'analgésico', 'dor de cabeça', 'cefaleia'
-            ],
-            'diarreia': [
-                'loperamida', 'imodium', 'probiótico', 'lactobacillus', 'floratil',
-                'antidiarreico', 'diarreia'
-            ],
-            'dor_garganta': [
-                'benzocaína', 'lidocaína', 'strepsils', 'anestésico', 'garganta',
-                'faringite', 'amigdalite'
-            ],
-            'azia_ma_digestao': [
-                'hidróxido', 'antiácido', 'pepsamar', 'azia', 'refluxo',
-                'gastrite', 'digestão'
-            ],
-            'constipacao': [
-                'lactulose', 'laxante', 'lactulona', 'constipação', 'prisão de ventre'
-            ],
-            'hemorroidas': [
-                'hidrocortisona', 'proctyl', 'hemorroida', 'anal', 'retal'
-            ],
-            'dor_lombar': [
-                'ibuprofeno', 'paracetamol', 'dor lombar', 'lombalgia', 'muscular'
-            ],
-            'espirro_congestao_nasal': [
-                'naftazolina', 'sorine', 'descongestionante', 'nasal', 'rinite'
-            ],
-            'infeccoes_fungicas': [
-                'clotrimazol', 'terbinafina', 'cetoconazol', 'miconazol', 'antifungico', 
-                'micose', 'fungo', 'candidíase', 'pé de atleta', 'intertrigo', 'unha'
-            ]
-        }
-        
-        palavras_busca = medicamentos_por_modulo.get(modulo, [])
+        palavras_busca = self._palavras_busca_gerais.get(modulo, ())
         
-        for medicamento in self.medicamentos_cache:
+        for medicamento in medicamentos_ativos:
             if not medicamento.indicacao and not medicamento.nome_comercial:
                 continue
                 
@@ -685,11 +544,11 @@ def _buscar_medicamentos_gerais_por_modulo(self, modulo: str, medicamentos_ativo
             nome_lower = medicamento.nome_comercial.lower()
             generico_lower = (medicamento.nome_generico or "").lower()
             
-            # Verificar se contém alguma palavra de busca
+            # Verificar se contém alguma palavra de busca (já em minúsculas)
             for palavra in palavras_busca:
-                if (palavra.lower() in indicacao_lower or 
-                    palavra.lower() in nome_lower or 
-                    palavra.lower() in generico_lower):
+                if (palavra in indicacao_lower or 
+                    palavra in nome_lower or 
+                    palavra in generico_lower):
                     medicamentos_gerais.append(medicamento)
                     break
         
@@ -854,6 +713,26 @@ def analisar_respostas_para_sintomas(self, respostas: List[Dict[str, str]], modu
         
         return sintomas_identificados
     
+    @staticmethod
+    def _faixa_perfil(paciente_profile: Optional[Dict]) -> Optional[tuple]:
+        """
+        Reduz o perfil do paciente à faixa que de fato altera as recomendações
+        (criança / adolescente / adulto / idoso / idoso frágil, gestante-lactante).
+        """
+        if not paciente_profile:
+            return None
+        idade = paciente_profile.get('age_years', 0) or 0
+        return (
+            grupos_de_risco(paciente_profile),
+            bool(paciente_profile.get('is_frail_elderly', False)),
+            bool(paciente_profile.get('is_pregnant_or_lactating', False)),
+            idade < 12,
+        )
+    
+    def estatisticas_cache(self) -> Dict[str, Union[int, float]]:
+        """Estatísticas do cache de recomendações (acertos, falhas, itens)"""
+        return self.cache_recomendacoes.estatisticas()
+    
     def gerar_recomendacoes(self, modulo: str, respostas: List[Dict[str, str]] = None, 
                            scoring_result = None, paciente_profile: Dict = None) -> List[RecomendacaoFarmacologica]:
         """Gera recomendações farmacológicas baseadas no módulo, respostas e perfil do paciente"""
@@ -863,8 +742,117 @@ def gerar_recomendacoes(self, modulo: str, respostas: List[Dict[str, str]] = Non
         if respostas:
             sintomas_identificados = self.analisar_respostas_para_sintomas(respostas, modulo)
         
-        # Buscar medicamentos do banco de dados
-        resultado_busca = self.buscar_medicamentos_por_sintoma(modulo, modulo)
+        # Triagens do mesmo módulo costumam repetir sintomas e faixa de perfil;
+        # a versão do catálogo na chave invalida o cache quando medicamentos mudam
+        chave = (
+            modulo,
+            frozenset(sintomas_identificados.items()),
+            self._faixa_perfil(paciente_profile),
+            versao_catalogo(),
+        )
+        recomendacoes = self.cache_recomendacoes.obter(chave)
+        if recomendacoes is None:
+            recomendacoes = self._gerar_recomendacoes_sem_cache(modulo, sintomas_identificados, scoring_result, paciente_profile)
+            self.cache_recomendacoes.definir(chave, tuple(recomendacoes))
+        
+        # Cópias para que ajustes feitos pelo chamador não alterem o cache
+        return [rec.copiar() for rec in recomendacoes]
+    
+    def gerar_recomendacoes_batch(self, itens: List[Dict], tamanho_lote: Optional[int] = None,
+                                  limiar_confianca: float = 0.25) -> List[List[RecomendacaoFarmacologica]]:
+        """
+        Gera recomendações para várias consultas de uma vez.
+        
+        O catálogo é carregado uma única vez e as consultas de cada lote são
+        vetorizadas juntas, com a similaridade de cosseno calculada em um único
+        produto de matrizes. Contraindicações e modificadores de perfil são
+        aplicados por item.
+        
+        Args:
+            itens: Lista de dicionários com 'modulo' e, opcionalmente, 'respostas',
+                   'scoring_result' e 'paciente_profile'
+            tamanho_lote: Itens por lote (limita a memória da matriz de similaridade);
+                          None processa tudo em um único lote
+            limiar_confianca: Limiar de similaridade da busca semântica
+            
+        Returns:
+            Lista de recomendações por item, na mesma ordem da entrada
+        """
+        if not itens:
+            return []
+        
+        try:
+            catalogo = self._carregar_catalogo_ativo()
+        except Exception as e:
+            logger.error(f"Erro ao carregar catálogo para o lote: {e}")
+            catalogo = None
+        
+        tamanho_lote = tamanho_lote or len(itens)
+        resultados = []
+        
+        for inicio in range(0, len(itens), tamanho_lote):
+            lote = itens[inicio:inicio + tamanho_lote]
+            buscas = self._buscar_medicamentos_lote([item['modulo'] for item in lote], catalogo, limiar_confianca)
+            
+            for item in lote:
+                modulo = item['modulo']
+                respostas = item.get('respostas')
+                try:
+                    sintomas_identificados = self.analisar_respostas_para_sintomas(respostas, modulo) if respostas else {}
+                    resultados.append(self._gerar_recomendacoes_sem_cache(
+                        modulo, sintomas_identificados, item.get('scoring_result'),
+                        item.get('paciente_profile'), resultado_busca=buscas[modulo]
+                    ))
+                except Exception as e:
+                    # Um item inválido não interrompe o lote: usar as recomendações fixas
+                    logger.error(f"Erro ao gerar recomendações do item {len(resultados)} ({modulo}): {e}")
+                    resultados.append(self._gerar_recomendacoes_fixas_por_modulo(modulo))
+            
+            logger.info(f"Lote de recomendações processado: {inicio + len(lote)}/{len(itens)} itens")
+        
+        return resultados
+    
+    def _buscar_medicamentos_lote(self, modulos: List[str], catalogo: Optional[tuple],
+                                  limiar_confianca: float) -> Dict[str, Union[List[Medicamento], Dict[str, str]]]:
+        """Executa a busca de medicamentos para vários módulos com um único produto de matrizes"""
+        modulos_unicos = list(dict.fromkeys(modulos))
+        
+        if not catalogo or not catalogo[0] or not catalogo[2]:
+            # Sem catálogo indexável: mesmos fallbacks da busca individual
+            return {modulo: self.buscar_medicamentos_por_sintoma(modulo, modulo, limiar_confianca) for modulo in modulos_unicos}
+        
+        medicamentos_ativos, medicamentos_com_indicacao, indicacoes_medicamentos = catalogo
+        expansoes = {modulo: self.expandir_sintomas([modulo]) for modulo in modulos_unicos}
+        consultas = [" ".join(expansoes[modulo]) for modulo in modulos_unicos]
+        
+        try:
+            resultados_lote = indice_catalogo.buscar_lote(
+                consultas, indicacoes_medicamentos,
+                limiar=limiar_confianca, limite=self.LIMITE_RESULTADOS_SEMANTICOS
+            )
+        except Exception as e:
+            logger.error(f"Erro no índice TF-IDF do catálogo, usando busca avulsa: {e}")
+            resultados_lote = [
+                self._busca_semantica_avulsa(consulta, indicacoes_medicamentos, limiar_confianca)
+                for consulta in consultas
+            ]
+        
+        return {
+            modulo: self._selecionar_medicamentos_relevantes(
+                modulo, limiar_confianca, medicamentos_ativos, medicamentos_com_indicacao,
+                expansoes[modulo], resultados
+            )
+            for modulo, resultados in zip(modulos_unicos, resultados_lote)
+        }
+    
+    def _gerar_recomendacoes_sem_cache(self, modulo: str, sintomas_identificados: Dict[str, bool],
+                                       scoring_result, paciente_profile: Optional[Dict],
+                                       resultado_busca=None) -> List[RecomendacaoFarmacologica]:
+        """Executa o pipeline completo de recomendações (sem consultar o cache)"""
+        
+        # Buscar medicamentos do banco de dados (o lote já traz a busca pronta)
+        if resultado_busca is None:
+            resultado_busca = self.buscar_medicamentos_por_sintoma(modulo, modulo)
         
         # Verificar se houve baixa confiança
         if isinstance(resultado_busca, dict) and resultado_busca.get('status') == 'baixa_confianca':
@@ -904,750 +892,8 @@ def gerar_recomendacoes(self, modulo: str, respostas: List[Dict[str, str]] = Non
         return recomendacoes[:12]
     
     def _gerar_recomendacoes_fixas_por_modulo(self, modulo: str) -> List[RecomendacaoFarmacologica]:
-        """Gera 6 medicamentos fixos para cada módulo"""
-        recomendacoes_fixas = {
-            'tosse': [
-                {
-                    'medicamento': 'Vick 44',
-                    'principio_ativo': 'Dextrometorfano',
-                    'indicacao': 'Tosse seca e irritativa',
-                    'posologia': '1 comprimido a cada 6-8 horas',
-                    'observacoes': 'Não associar com expectorantes',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Mucosolvan',
-                    'principio_ativo': 'Ambroxol',
-                    'indicacao': 'Tosse produtiva',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Aumentar ingestão de líquidos',
-                    'prioridade': 2,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Claritin',
-                    'principio_ativo': 'Loratadina',
-                    'indicacao': 'Tosse alérgica',
-                    'posologia': '1 comprimido ao dia',
-                    'observacoes': 'Evitar exposição a alérgenos',
-                    'prioridade': 3,
-                    'categoria': 'terapeutico'
-                },
-                {
-                    'medicamento': 'Bisolvon',
-                    'principio_ativo': 'Bromexina',
-                    'indicacao': 'Tosse com secreção',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Tomar com bastante água',
-                    'prioridade': 4,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Xarope de Guaifenesina',
-                    'principio_ativo': 'Guaifenesina',
-                    'indicacao': 'Expectorante para tosse',
-                    'posologia': '1 colher de sopa a cada 6 horas',
-                    'observacoes': 'Aumentar ingestão de líquidos',
-                    'prioridade': 5,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Benalet',
-                    'principio_ativo': 'Clobutinol',
-                    'indicacao': 'Antitussígeno para tosse seca',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Não usar por mais de 7 dias',
-                    'prioridade': 6,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Xarope de Mel',
-                    'principio_ativo': 'Mel de Abelha',
-                    'indicacao': 'Tosse seca e irritativa',
-                    'posologia': '1 colher de sopa a cada 4-6 horas',
-                    'observacoes': 'Natural, seguro para crianças',
-                    'prioridade': 7,
-                    'categoria': 'natural'
-                },
-                {
-                    'medicamento': 'Xarope de Guaco',
-                    'principio_ativo': 'Mikania glomerata',
-                    'indicacao': 'Expectorante natural',
-                    'posologia': '1 colher de sopa a cada 6 horas',
-                    'observacoes': 'Fitoterápico, sem contraindicações',
-                    'prioridade': 8,
-                    'categoria': 'fitoterapico'
-                },
-                {
-                    'medicamento': 'Xarope de Eucalipto',
-                    'principio_ativo': 'Eucalyptus globulus',
-                    'indicacao': 'Tosse com secreção',
-                    'posologia': '1 colher de sopa a cada 6 horas',
-                    'observacoes': 'Ação expectorante e antisséptica',
-                    'prioridade': 9,
-                    'categoria': 'fitoterapico'
-                },
-                {
-                    'medicamento': 'Xarope de Alcaçuz',
-                    'principio_ativo': 'Glycyrrhiza glabra',
-                    'indicacao': 'Tosse seca e irritativa',
-                    'posologia': '1 colher de sopa a cada 6 horas',
-                    'observacoes': 'Ação anti-inflamatória',
-                    'prioridade': 10,
-                    'categoria': 'fitoterapico'
-                },
-                {
-                    'medicamento': 'Xarope de Propolis',
-                    'principio_ativo': 'Própolis',
-                    'indicacao': 'Tosse e irritação da garganta',
-                    'posologia': '1 colher de sopa a cada 6 horas',
-                    'observacoes': 'Ação antisséptica e cicatrizante',
-                    'prioridade': 11,
-                    'categoria': 'natural'
-                },
-                {
-                    'medicamento': 'Xarope de Gengibre',
-                    'principio_ativo': 'Zingiber officinale',
-                    'indicacao': 'Tosse e inflamação',
-                    'posologia': '1 colher de sopa a cada 6 horas',
-                    'observacoes': 'Ação anti-inflamatória e expectorante',
-                    'prioridade': 12,
-                    'categoria': 'fitoterapico'
-                }
-            ],
-            'febre': [
-                {
-                    'medicamento': 'Tylenol',
-                    'principio_ativo': 'Paracetamol',
-                    'indicacao': 'Febre e dor',
-                    'posologia': '1 comprimido a cada 6-8 horas',
-                    'observacoes': 'Monitorar temperatura',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Advil',
-                    'principio_ativo': 'Ibuprofeno',
-                    'indicacao': 'Febre e inflamação',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Tomar com alimentos',
-                    'prioridade': 2,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Novalgina',
-                    'principio_ativo': 'Dipirona',
-                    'indicacao': 'Febre e dor',
-                    'posologia': '1 comprimido a cada 6-8 horas',
-                    'observacoes': 'Pode causar sonolência',
-                    'prioridade': 3,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Aspirina',
-                    'principio_ativo': 'Ácido Acetilsalicílico',
-                    'indicacao': 'Febre e dor',
-                    'posologia': '1 comprimido a cada 6-8 horas',
-                    'observacoes': 'Evitar em crianças e gestantes',
-                    'prioridade': 4,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Dorflex',
-                    'principio_ativo': 'Dipirona + Orfenadrina',
-                    'indicacao': 'Febre com dor muscular',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Relaxante muscular',
-                    'prioridade': 5,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Cimegripe',
-                    'principio_ativo': 'Paracetamol + Fenilefrina',
-                    'indicacao': 'Febre com congestão nasal',
-                    'posologia': '1 comprimido a cada 6 horas',
-                    'observacoes': 'Descongestionante nasal',
-                    'prioridade': 6,
-                    'categoria': 'sintomatico'
-                }
-            ],
-            'dor_cabeca': [
-                {
-                    'medicamento': 'Tylenol',
-                    'principio_ativo': 'Paracetamol',
-                    'indicacao': 'Dor de cabeça leve a moderada',
-                    'posologia': '1 comprimido a cada 6-8 horas',
-                    'observacoes': 'Repouso em ambiente escuro',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Advil',
-                    'principio_ativo': 'Ibuprofeno',
-                    'indicacao': 'Dor de cabeça com inflamação',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Tomar com alimentos',
-                    'prioridade': 2,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Aspirina',
-                    'principio_ativo': 'Ácido Acetilsalicílico',
-                    'indicacao': 'Dor de cabeça tensional',
-                    'posologia': '1 comprimido a cada 6-8 horas',
-                    'observacoes': 'Evitar em crianças',
-                    'prioridade': 3,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Dorflex',
-                    'principio_ativo': 'Dipirona + Orfenadrina',
-                    'indicacao': 'Dor de cabeça com tensão muscular',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Relaxante muscular',
-                    'prioridade': 4,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Cefalium',
-                    'principio_ativo': 'Paracetamol + Cafeína',
-                    'indicacao': 'Dor de cabeça com cansaço',
-                    'posologia': '1 comprimido a cada 6 horas',
-                    'observacoes': 'Cafeína pode causar insônia',
-                    'prioridade': 5,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Neosaldina',
-                    'principio_ativo': 'Dipirona + Cafeína + Isometepteno',
-                    'indicacao': 'Enxaqueca e dor de cabeça',
-                    'posologia': '1 comprimido a cada 6-8 horas',
-                    'observacoes': 'Vasoconstritor',
-                    'prioridade': 6,
-                    'categoria': 'sintomatico'
-                }
-            ],
-            'diarreia': [
-                {
-                    'medicamento': 'Imodium',
-                    'principio_ativo': 'Loperamida',
-                    'indicacao': 'Diarreia aguda',
-                    'posologia': '1 comprimido após cada evacuação líquida',
-                    'observacoes': 'Hidratação adequada é essencial',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Floratil',
-                    'principio_ativo': 'Saccharomyces boulardii',
-                    'indicacao': 'Diarreia - adjuvante',
-                    'posologia': '1 cápsula ao dia',
-                    'observacoes': 'Tomar longe das refeições',
-                    'prioridade': 2,
-                    'categoria': 'terapeutico'
-                },
-                {
-                    'medicamento': 'Racecadotril',
-                    'principio_ativo': 'Racecadotril',
-                    'indicacao': 'Antidiarreico',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Reduz secreção intestinal',
-                    'prioridade': 3,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Enterogermina',
-                    'principio_ativo': 'Bacillus clausii',
-                    'indicacao': 'Probiótico para diarreia',
-                    'posologia': '1 frasco ao dia',
-                    'observacoes': 'Restaura flora intestinal',
-                    'prioridade': 4,
-                    'categoria': 'terapeutico'
-                },
-                {
-                    'medicamento': 'Smecta',
-                    'principio_ativo': 'Diosmectita',
-                    'indicacao': 'Diarreia e cólicas',
-                    'posologia': '1 sachê a cada 8 horas',
-                    'observacoes': 'Protege mucosa intestinal',
-                    'prioridade': 5,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Carbomix',
-                    'principio_ativo': 'Carvão Ativado',
-                    'indicacao': 'Diarreia por intoxicação',
-                    'posologia': '2 comprimidos a cada 6 horas',
-                    'observacoes': 'Adsorve toxinas',
-                    'prioridade': 6,
-                    'categoria': 'terapeutico'
-                }
-            ],
-            'dor_garganta': [
-                {
-                    'medicamento': 'Strepsils',
-                    'principio_ativo': 'Benzocaína + Amilmetacresol',
-                    'indicacao': 'Dor de garganta',
-                    'posologia': '1 pastilha a cada 2-3 horas',
-                    'observacoes': 'Fazer gargarejos',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Neo-Saldan',
-                    'principio_ativo': 'Benzocaína + Ciprofloxacino',
-                    'indicacao': 'Dor de garganta com infecção',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Só com prescrição médica',
-                    'prioridade': 2,
-                    'categoria': 'terapeutico'
-                },
-                {
-                    'medicamento': 'Cepacol',
-                    'principio_ativo': 'Benzocaína + Cetylpiridinium',
-                    'indicacao': 'Dor de garganta e mau hálito',
-                    'posologia': '1 pastilha a cada 2-3 horas',
-                    'observacoes': 'Antisséptico bucal',
-                    'prioridade': 3,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Benzetacil',
-                    'principio_ativo': 'Benzilpenicilina',
-                    'indicacao': 'Infecção de garganta',
-                    'posologia': '1 injeção intramuscular',
-                    'observacoes': 'Só com prescrição médica',
-                    'prioridade': 4,
-                    'categoria': 'terapeutico'
-                },
-                {
-                    'medicamento': 'Amoxicilina',
-                    'principio_ativo': 'Amoxicilina',
-                    'indicacao': 'Infecção bacteriana de garganta',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Só com prescrição médica',
-                    'prioridade': 5,
-                    'categoria': 'terapeutico'
-                },
-                {
-                    'medicamento': 'Ibuprofeno',
-                    'principio_ativo': 'Ibuprofeno',
-                    'indicacao': 'Anti-inflamatório para garganta',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Tomar com alimentos',
-                    'prioridade': 6,
-                    'categoria': 'sintomatico'
-                }
-            ],
-            'azia_ma_digestao': [
-                {
-                    'medicamento': 'Pepsamar',
-                    'principio_ativo': 'Hidróxido de Alumínio + Magnésio',
-                    'indicacao': 'Azia e queimação',
-                    'posologia': '1 comprimido após as refeições',
-                    'observacoes': 'Evitar refeições grandes',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Digiazia',
-                    'principio_ativo': 'Ácido Cítrico + Bicarbonato',
-                    'indicacao': 'Azia e má digestão',
-                    'posologia': '1 comprimido após as refeições',
-                    'observacoes': 'Efervescente',
-                    'prioridade': 2,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Omeprazol',
-                    'principio_ativo': 'Omeprazol',
-                    'indicacao': 'Inibidor de bomba de prótons',
-                    'posologia': '1 comprimido ao dia',
-                    'observacoes': 'Tomar em jejum',
-                    'prioridade': 3,
-                    'categoria': 'terapeutico'
-                },
-                {
-                    'medicamento': 'Ranitidina',
-                    'principio_ativo': 'Ranitidina',
-                    'indicacao': 'Antagonista H2',
-                    'posologia': '1 comprimido a cada 12 horas',
-                    'observacoes': 'Reduz produção de ácido',
-                    'prioridade': 4,
-                    'categoria': 'terapeutico'
-                },
-                {
-                    'medicamento': 'Simeticona',
-                    'principio_ativo': 'Simeticona',
-                    'indicacao': 'Gases e flatulência',
-                    'posologia': '1 comprimido após as refeições',
-                    'observacoes': 'Antiflatulento',
-                    'prioridade': 5,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Domperidona',
-                    'principio_ativo': 'Domperidona',
-                    'indicacao': 'Náuseas e vômitos',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Procinético',
-                    'prioridade': 6,
-                    'categoria': 'terapeutico'
-                }
-            ],
-            'constipacao': [
-                {
-                    'medicamento': 'Lactulona',
-                    'principio_ativo': 'Lactulose',
-                    'indicacao': 'Constipação',
-                    'posologia': '1 colher de sopa ao dia',
-                    'observacoes': 'Aumentar ingestão de fibras e água',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Amitiza',
-                    'principio_ativo': 'Lubiprostona',
-                    'indicacao': 'Constipação crônica',
-                    'posologia': '1 comprimido ao dia',
-                    'observacoes': 'Só com prescrição médica',
-                    'prioridade': 2,
-                    'categoria': 'terapeutico'
-                },
-                {
-                    'medicamento': 'Bisacodil',
-                    'principio_ativo': 'Bisacodil',
-                    'indicacao': 'Laxante estimulante',
-                    'posologia': '1 comprimido ao dia',
-                    'observacoes': 'Tomar à noite',
-                    'prioridade': 3,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Plantago',
-                    'principio_ativo': 'Psyllium',
-                    'indicacao': 'Laxante de volume',
-                    'posologia': '1 colher de sopa ao dia',
-                    'observacoes': 'Tomar com muita água',
-                    'prioridade': 4,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Dulcolax',
-                    'principio_ativo': 'Bisacodil',
-                    'indicacao': 'Laxante para constipação',
-                    'posologia': '1 comprimido ao dia',
-                    'observacoes': 'Pode causar cólicas',
-                    'prioridade': 5,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Enema',
-                    'principio_ativo': 'Fosfato de Sódio',
-                    'indicacao': 'Constipação severa',
-                    'posologia': '1 aplicação',
-                    'observacoes': 'Uso ocasional',
-                    'prioridade': 6,
-                    'categoria': 'sintomatico'
-                }
-            ],
-            'hemorroidas': [
-                {
-                    'medicamento': 'Proctyl',
-                    'principio_ativo': 'Hidrocortisona + Lidocaína',
-                    'indicacao': 'Hemorroidas',
-                    'posologia': 'Aplicar 2-3 vezes ao dia',
-                    'observacoes': 'Aplicar após higiene local',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Pomada de Hamamélis',
-                    'principio_ativo': 'Hamamélis',
-                    'indicacao': 'Hemorroidas externas',
-                    'posologia': 'Aplicar 2-3 vezes ao dia',
-                    'observacoes': 'Fitoterápico',
-                    'prioridade': 2,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Anusol',
-                    'principio_ativo': 'Óxido de Zinco + Bálsamo',
-                    'indicacao': 'Hemorroidas e fissuras',
-                    'posologia': 'Aplicar 2-3 vezes ao dia',
-                    'observacoes': 'Protege a pele',
-                    'prioridade': 3,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Venalot',
-                    'principio_ativo': 'Diosmina + Hesperidina',
-                    'indicacao': 'Circulação venosa',
-                    'posologia': '1 comprimido a cada 12 horas',
-                    'observacoes': 'Melhora circulação',
-                    'prioridade': 4,
-                    'categoria': 'terapeutico'
-                },
-                {
-                    'medicamento': 'Daflon',
-                    'principio_ativo': 'Diosmina',
-                    'indicacao': 'Insuficiência venosa',
-                    'posologia': '1 comprimido a cada 12 horas',
-                    'observacoes': 'Flebotônico',
-                    'prioridade': 5,
-                    'categoria': 'terapeutico'
-                },
-                {
-                    'medicamento': 'Ibuprofeno',
-                    'principio_ativo': 'Ibuprofeno',
-                    'indicacao': 'Anti-inflamatório para dor',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Tomar com alimentos',
-                    'prioridade': 6,
-                    'categoria': 'sintomatico'
-                }
-            ],
-            'dor_lombar': [
-                {
-                    'medicamento': 'Advil',
-                    'principio_ativo': 'Ibuprofeno',
-                    'indicacao': 'Dor lombar',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Repouso e calor local',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Tylenol',
-                    'principio_ativo': 'Paracetamol',
-                    'indicacao': 'Dor lombar leve',
-                    'posologia': '1 comprimido a cada 6-8 horas',
-                    'observacoes': 'Analgésico simples',
-                    'prioridade': 2,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Dorflex',
-                    'principio_ativo': 'Dipirona + Orfenadrina',
-                    'indicacao': 'Dor lombar com espasmo',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Relaxante muscular',
-                    'prioridade': 3,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Voltaren',
-                    'principio_ativo': 'Diclofenaco',
-                    'indicacao': 'Anti-inflamatório para dor',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Tomar com alimentos',
-                    'prioridade': 4,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Ciclobenzaprina',
-                    'principio_ativo': 'Ciclobenzaprina',
-                    'indicacao': 'Relaxante muscular',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Só com prescrição médica',
-                    'prioridade': 5,
-                    'categoria': 'terapeutico'
-                },
-                {
-                    'medicamento': 'Tramadol',
-                    'principio_ativo': 'Tramadol',
-                    'indicacao': 'Analgésico para dor intensa',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Só com prescrição médica',
-                    'prioridade': 6,
-                    'categoria': 'terapeutico'
-                }
-            ],
-            'espirro_congestao_nasal': [
-                {
-                    'medicamento': 'Sorine',
-                    'principio_ativo': 'Cloridrato de Naftazolina',
-                    'indicacao': 'Congestão nasal',
-                    'posologia': '2-3 jatos em cada narina a cada 12 horas',
-                    'observacoes': 'Não usar por mais de 3 dias',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Allegra',
-                    'principio_ativo': 'Fexofenadina',
-                    'indicacao': 'Congestão nasal alérgica',
-                    'posologia': '1 comprimido ao dia',
-                    'observacoes': 'Pode causar sonolência',
-                    'prioridade': 2,
-                    'categoria': 'terapeutico'
-                },
-                {
-                    'medicamento': 'Claritin',
-                    'principio_ativo': 'Loratadina',
-                    'indicacao': 'Antihistamínico para alergia',
-                    'posologia': '1 comprimido ao dia',
-                    'observacoes': 'Não causa sonolência',
-                    'prioridade': 3,
-                    'categoria': 'terapeutico'
-                },
-                {
-                    'medicamento': 'Rinosoro',
-                    'principio_ativo': 'Soro Fisiológico',
-                    'indicacao': 'Lavagem nasal',
-                    'posologia': 'Aplicar várias vezes ao dia',
-                    'observacoes': 'Higiene nasal',
-                    'prioridade': 4,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Nasonex',
-                    'principio_ativo': 'Mometasona',
-                    'indicacao': 'Spray nasal anti-inflamatório',
-                    'posologia': '2 jatos em cada narina ao dia',
-                    'observacoes': 'Só com prescrição médica',
-                    'prioridade': 5,
-                    'categoria': 'terapeutico'
-                },
-                {
-                    'medicamento': 'Benadryl',
-                    'principio_ativo': 'Difenidramina',
-                    'indicacao': 'Antihistamínico sedativo',
-                    'posologia': '1 comprimido a cada 6 horas',
-                    'observacoes': 'Causa sonolência',
-                    'prioridade': 6,
-                    'categoria': 'terapeutico'
-                }
-            ],
-            'infeccoes_fungicas': [
-                {
-                    'medicamento': 'Canesten',
-                    'principio_ativo': 'Clotrimazol',
-                    'indicacao': 'Micoses superficiais (pé de atleta, candidíase)',
-                    'posologia': 'Aplicar 2-3 vezes ao dia por 2-4 semanas',
-                    'observacoes': 'Manter área limpa e seca',
-                    'prioridade': 1,
-                    'categoria': 'antifungico'
-                },
-                {
-                    'medicamento': 'Lamisil',
-                    'principio_ativo': 'Terbinafina',
-                    'indicacao': 'Micoses de unhas e pele',
-                    'posologia': 'Aplicar 1-2 vezes ao dia por 1-2 semanas',
-                    'observacoes': 'Não usar em gestantes',
-                    'prioridade': 2,
-                    'categoria': 'antifungico'
-                },
-                {
-                    'medicamento': 'Nizoral',
-                    'principio_ativo': 'Cetoconazol',
-                    'indicacao': 'Micoses superficiais e candidíase',
-                    'posologia': 'Aplicar 1-2 vezes ao dia por 2-4 semanas',
-                    'observacoes': 'Evitar exposição solar',
-                    'prioridade': 3,
-                    'categoria': 'antifungico'
-                },
-                {
-                    'medicamento': 'Daktarin',
-                    'principio_ativo': 'Miconazol',
-                    'indicacao': 'Micoses superficiais e intertrigo',
-                    'posologia': 'Aplicar 2 vezes ao dia por 2-4 semanas',
-                    'observacoes': 'Adequado para áreas úmidas',
-                    'prioridade': 4,
-                    'categoria': 'antifungico'
-                },
-                {
-                    'medicamento': 'Fungicort',
-                    'principio_ativo': 'Clotrimazol + Hidrocortisona',
-                    'indicacao': 'Micoses com inflamação',
-                    'posologia': 'Aplicar 2-3 vezes ao dia por 1-2 semanas',
-                    'observacoes': 'Não usar por mais de 2 semanas',
-                    'prioridade': 5,
-                    'categoria': 'antifungico'
-                },
-                {
-                    'medicamento': 'Pomada de Enxofre',
-                    'principio_ativo': 'Enxofre',
-                    'indicacao': 'Micoses superficiais leves',
-                    'posologia': 'Aplicar 1-2 vezes ao dia por 2-4 semanas',
-                    'observacoes': 'Produto natural, menos agressivo',
-                    'prioridade': 6,
-                    'categoria': 'natural'
-                },
-                {
-                    'medicamento': 'Creme de Aloe Vera',
-                    'principio_ativo': 'Aloe Vera',
-                    'indicacao': 'Alívio de sintomas de micoses',
-                    'posologia': 'Aplicar 2-3 vezes ao dia',
-                    'observacoes': 'Ação calmante e hidratante',
-                    'prioridade': 7,
-                    'categoria': 'natural'
-                },
-                {
-                    'medicamento': 'Óleo de Melaleuca',
-                    'principio_ativo': 'Melaleuca alternifolia',
-                    'indicacao': 'Micoses superficiais',
-                    'posologia': 'Aplicar 2-3 gotas 2 vezes ao dia',
-                    'observacoes': 'Diluir em óleo carreador',
-                    'prioridade': 8,
-                    'categoria': 'fitoterapico'
-                },
-                {
-                    'medicamento': 'Pomada de Calêndula',
-                    'principio_ativo': 'Calendula officinalis',
-                    'indicacao': 'Micoses com irritação',
-                    'posologia': 'Aplicar 2-3 vezes ao dia',
-                    'observacoes': 'Ação anti-inflamatória',
-                    'prioridade': 9,
-                    'categoria': 'fitoterapico'
-                },
-                {
-                    'medicamento': 'Creme de Própolis',
-                    'principio_ativo': 'Própolis',
-                    'indicacao': 'Micoses superficiais',
-                    'posologia': 'Aplicar 2-3 vezes ao dia',
-                    'observacoes': 'Ação antisséptica natural',
-                    'prioridade': 10,
-                    'categoria': 'natural'
-                },
-                {
-                    'medicamento': 'Pomada de Iodo',
-                    'principio_ativo': 'Iodo',
-                    'indicacao': 'Micoses superficiais',
-                    'posologia': 'Aplicar 1-2 vezes ao dia',
-                    'observacoes': 'Ação antisséptica e antifúngica',
-                    'prioridade': 11,
-                    'categoria': 'antifungico'
-                },
-                {
-                    'medicamento': 'Creme de Bicarbonato',
-                    'principio_ativo': 'Bicarbonato de Sódio',
-                    'indicacao': 'Alívio de sintomas de micoses',
-                    'posologia': 'Aplicar pasta 2 vezes ao dia',
-                    'observacoes': 'Misturar com água até formar pasta',
-                    'prioridade': 12,
-                    'categoria': 'natural'
-                }
-            ]
-        }
-        
-        recomendacoes_modulo = recomendacoes_fixas.get(modulo, [])
-        recomendacoes = []
-        
-        for rec_data in recomendacoes_modulo:
-            recomendacoes.append(RecomendacaoFarmacologica(
-                medicamento=rec_data['medicamento'],
-                principio_ativo=rec_data['principio_ativo'],
-                indicacao=rec_data['indicacao'],
-                posologia=rec_data['posologia'],
-                contraindicacoes="Verificar bula",
-                observacoes=rec_data['observacoes'],
-                prioridade=rec_data['prioridade'],
-                categoria=rec_data['categoria']
-            ))
-        
-        return recomendacoes
+        """Gera 6 medicamentos fixos para cada módulo (cópias dos modelos pré-construídos)"""
+        return [modelo.copiar() for modelo in self._modelos_fixos.get(modulo, ())]
     
     def _gerar_recomendacoes_inteligentes(self, modulo: str, sintomas: Dict[str, bool], 
                                          medicamentos: List[Medicamento], scoring_result) -> List[RecomendacaoFarmacologica]:
@@ -1715,218 +961,30 @@ def _gerar_recomendacoes_gerais_por_modulo(self, modulo: str, medicamentos: List
         """Gera recomendações gerais quando não há correspondência específica"""
         recomendacoes = []
         
-        # Mapeamento de recomendações gerais por módulo
-        recomendacoes_gerais = {
-            'tosse': [
-                {
-                    'medicamento': 'Vick 44',
-                    'principio_ativo': 'Dextrometorfano',
-                    'indicacao': 'Tosse seca e irritativa',
-                    'posologia': '1 comprimido a cada 6-8 horas',
-                    'observacoes': 'Não associar com expectorantes',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Mucosolvan',
-                    'principio_ativo': 'Ambroxol',
-                    'indicacao': 'Tosse produtiva',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Aumentar ingestão de líquidos',
-                    'prioridade': 2,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Claritin',
-                    'principio_ativo': 'Loratadina',
-                    'indicacao': 'Tosse alérgica',
-                    'posologia': '1 comprimido ao dia',
-                    'observacoes': 'Evitar exposição a alérgenos',
-                    'prioridade': 3,
-                    'categoria': 'terapeutico'
-                }
-            ],
-            'febre': [
-                {
-                    'medicamento': 'Tylenol',
-                    'principio_ativo': 'Paracetamol',
-                    'indicacao': 'Febre e dor',
-                    'posologia': '1 comprimido a cada 6-8 horas',
-                    'observacoes': 'Monitorar temperatura',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Advil',
-                    'principio_ativo': 'Ibuprofeno',
-                    'indicacao': 'Febre e inflamação',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Tomar com alimentos',
-                    'prioridade': 2,
-                    'categoria': 'sintomatico'
-                }
-            ],
-            'dor_cabeca': [
-                {
-                    'medicamento': 'Tylenol',
-                    'principio_ativo': 'Paracetamol',
-                    'indicacao': 'Dor de cabeça leve a moderada',
-                    'posologia': '1 comprimido a cada 6-8 horas',
-                    'observacoes': 'Repouso em ambiente escuro',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Advil',
-                    'principio_ativo': 'Ibuprofeno',
-                    'indicacao': 'Dor de cabeça com inflamação',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Tomar com alimentos',
-                    'prioridade': 2,
-                    'categoria': 'sintomatico'
-                }
-            ],
-            'diarreia': [
-                {
-                    'medicamento': 'Imodium',
-                    'principio_ativo': 'Loperamida',
-                    'indicacao': 'Diarreia aguda',
-                    'posologia': '1 comprimido após cada evacuação líquida',
-                    'observacoes': 'Hidratação adequada é essencial',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Floratil',
-                    'principio_ativo': 'Saccharomyces boulardii',
-                    'indicacao': 'Diarreia - adjuvante',
-                    'posologia': '1 cápsula ao dia',
-                    'observacoes': 'Tomar longe das refeições',
-                    'prioridade': 2,
-                    'categoria': 'terapeutico'
-                }
-            ],
-            'dor_garganta': [
-                {
-                    'medicamento': 'Strepsils',
-                    'principio_ativo': 'Benzocaína + Amilmetacresol',
-                    'indicacao': 'Dor de garganta',
-                    'posologia': '1 pastilha a cada 2-3 horas',
-                    'observacoes': 'Fazer gargarejos',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Neo-Saldan',
-                    'principio_ativo': 'Benzocaína + Cloridrato de Ciprofloxacino',
-                    'indicacao': 'Dor de garganta com infecção',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Só com prescrição médica',
-                    'prioridade': 2,
-                    'categoria': 'terapeutico'
-                }
-            ],
-            'azia_ma_digestao': [
-                {
-                    'medicamento': 'Pepsamar',
-                    'principio_ativo': 'Hidróxido de Alumínio + Magnésio',
-                    'indicacao': 'Azia e queimação',
-                    'posologia': '1 comprimido após as refeições',
-                    'observacoes': 'Evitar refeições grandes',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                }
-            ],
-            'constipacao': [
-                {
-                    'medicamento': 'Lactulona',
-                    'principio_ativo': 'Lactulose',
-                    'indicacao': 'Constipação',
-                    'posologia': '1 colher de sopa ao dia',
-                    'observacoes': 'Aumentar ingestão de fibras e água',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                }
-            ],
-            'hemorroidas': [
-                {
-                    'medicamento': 'Proctyl',
-                    'principio_ativo': 'Hidrocortisona + Lidocaína',
-                    'indicacao': 'Hemorroidas',
-                    'posologia': 'Aplicar 2-3 vezes ao dia',
-                    'observacoes': 'Aplicar após higiene local',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                }
-            ],
-            'dor_lombar': [
-                {
-                    'medicamento': 'Advil',
-                    'principio_ativo': 'Ibuprofeno',
-                    'indicacao': 'Dor lombar',
-                    'posologia': '1 comprimido a cada 8 horas',
-                    'observacoes': 'Repouso e calor local',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                }
-            ],
-            'espirro_congestao_nasal': [
-                {
-                    'medicamento': 'Sorine',
-                    'principio_ativo': 'Cloridrato de Naftazolina',
-                    'indicacao': 'Congestão nasal',
-                    'posologia': '2-3 jatos em cada narina a cada 12 horas',
-                    'observacoes': 'Não usar por mais de 3 dias',
-                    'prioridade': 1,
-                    'categoria': 'sintomatico'
-                },
-                {
-                    'medicamento': 'Allegra',
-                    'principio_ativo': 'Fexofenadina',
-                    'indicacao': 'Congestão nasal alérgica',
-                    'posologia': '1 comprimido ao dia',
-                    'observacoes': 'Pode causar sonolência',
-                    'prioridade': 2,
-                    'categoria': 'terapeutico'
-                }
-            ]
-        }
-        
-        # Buscar medicamentos do banco que correspondam às recomendações gerais
-        recomendacoes_modulo = recomendacoes_gerais.get(modulo, [])
+        # Modelos pré-construídos a partir de data/recomendacoes_fixas.json
+        recomendacoes_modulo = self._modelos_gerais.get(modulo, ())
         
         for rec_geral in recomendacoes_modulo:
             # Tentar encontrar o medicamento no banco
+            medicamento_lower = rec_geral.medicamento.lower()
+            principio_lower = rec_geral.principio_ativo.lower()
             medicamento_encontrado = None
             for med in medicamentos:
-                if (rec_geral['medicamento'].lower() in med.nome_comercial.lower() or
-                    rec_geral['principio_ativo'].lower() in (med.nome_generico or "").lower()):
+                if (medicamento_lower in med.nome_comercial.lower() or
+                    principio_lower in (med.nome_generico or "").lower()):
                     medicamento_encontrado = med
                     break
             
             if medicamento_encontrado:
-                recomendacoes.append(RecomendacaoFarmacologica(
+                recomendacoes.append(replace(
+                    rec_geral,
                     medicamento=medicamento_encontrado.nome_comercial,
-                    principio_ativo=medicamento_encontrado.nome_generico or rec_geral['principio_ativo'],
-                    indicacao=rec_geral['indicacao'],
-                    posologia=rec_geral['posologia'],
-                    contraindicacoes=medicamento_encontrado.contraindicacao or "Verificar bula",
-                    observacoes=rec_geral['observacoes'],
-                    prioridade=rec_geral['prioridade'],
-                    categoria=rec_geral['categoria']
+                    principio_ativo=medicamento_encontrado.nome_generico or rec_geral.principio_ativo,
+                    contraindicacoes=medicamento_encontrado.contraindicacao or "Verificar bula"
                 ))
             else:
                 # Usar recomendação geral mesmo sem encontrar no banco
-                recomendacoes.append(RecomendacaoFarmacologica(
-                    medicamento=rec_geral['medicamento'],
-                    principio_ativo=rec_geral['principio_ativo'],
-                    indicacao=rec_geral['indicacao'],
-                    posologia=rec_geral['posologia'],
-                    contraindicacoes="Verificar bula",
-                    observacoes=rec_geral['observacoes'],
-                    prioridade=rec_geral['prioridade'],
-                    categoria=rec_geral['categoria']
-                ))
+                recomendacoes.append(rec_geral.copiar())
         
         return recomendacoes
     
@@ -1936,7 +994,7 @@ def _recomendar_para_tosse(self, sintomas: Dict[str, bool], medicamentos: List[M
         recomendacoes = []
         
         # Buscar medicamentos específicos para tosse
-        medicamentos_tosse = [m for m in medicamentos if self._medicamento_para_tosse(m)]
+        medicamentos_tosse = filtrar_por_classe(medicamentos, ClasseTerapeutica.TOSSE)
         
         # Ajustar prioridade baseada na gravidade
         prioridade_base = 1
@@ -1949,7 +1007,7 @@ def _recomendar_para_tosse(self, sintomas: Dict[str, bool], medicamentos: List[M
         
         if sintomas['tosse_seca']:
             # Antitussígenos
-            antitussigenos = [m for m in medicamentos_tosse if self._e_antitussigeno(m)]
+            antitussigenos = filtrar_por_classe(medicamentos_tosse, ClasseTerapeutica.ANTITUSSIGENO)
             for med in antitussigenos[:2]:  # Máximo 2 antitussígenos
                 observacoes = "Não associar com expectorantes"
                 if sintomas.get('duracao_longa', False):
@@ -1968,7 +1026,7 @@ def _recomendar_para_tosse(self, sintomas: Dict[str, bool], medicamentos: List[M
         
         if sintomas['tosse_produtiva']:
             # Expectorantes e mucolíticos
-            expectorantes = [m for m in medicamentos_tosse if self._e_expectorante(m)]
+            expectorantes = filtrar_por_classe(medicamentos_tosse, ClasseTerapeutica.EXPECTORANTE)
             for med in expectorantes[:2]:
                 observacoes = "Aumentar ingestão de líquidos"
                 if sintomas.get('gravidade_alta', False):
@@ -1987,7 +1045,7 @@ def _recomendar_para_tosse(self, sintomas: Dict[str, bool], medicamentos: List[M
         
         if sintomas['alergia']:
             # Antialérgicos
-            antialergicos = [m for m in medicamentos_tosse if self._e_antialergico(m)]
+            antialergicos = filtrar_por_classe(medicamentos_tosse, ClasseTerapeutica.ANTIALERGICO)
             for med in antialergicos[:1]:
                 recomendacoes.append(RecomendacaoFarmacologica(
                     medicamento=med.nome_comercial,
@@ -2015,7 +1073,7 @@ def _recomendar_para_febre(self, sintomas: Dict[str, bool], medicamentos: List[M
         
         if sintomas['febre']:
             # Antipiréticos
-            antipireticos = [m for m in medicamentos if self._e_antipiretico(m)]
+            antipireticos = filtrar_por_classe(medicamentos, ClasseTerapeutica.ANTIPIRETICO)
             for med in antipireticos[:2]:
                 recomendacoes.append(RecomendacaoFarmacologica(
                     medicamento=med.nome_comercial,
@@ -2037,7 +1095,7 @@ def _recomendar_para_dor_cabeca(self, sintomas: Dict[str, bool], medicamentos: L
         
         if sintomas['dor_cabeca']:
             # Analgésicos
-            analgesicos = [m for m in medicamentos if self._e_analgesico(m)]
+            analgesicos = filtrar_por_classe(medicamentos, ClasseTerapeutica.ANALGESICO)
             for med in analgesicos[:2]:
                 recomendacoes.append(RecomendacaoFarmacologica(
                     medicamento=med.nome_comercial,
@@ -2059,7 +1117,7 @@ def _recomendar_para_diarreia(self, sintomas: Dict[str, bool], medicamentos: Lis
         
         if sintomas['diarreia']:
             # Antidiarreicos
-            antidiarreicos = [m for m in medicamentos if self._e_antidiarreico(m)]
+            antidiarreicos = filtrar_por_classe(medicamentos, ClasseTerapeutica.ANTIDIARREICO)
             for med in antidiarreicos[:1]:
                 recomendacoes.append(RecomendacaoFarmacologica(
                     medicamento=med.nome_comercial,
@@ -2073,7 +1131,7 @@ def _recomendar_para_diarreia(self, sintomas: Dict[str, bool], medicamentos: Lis
                 ))
             
             # Probióticos
-            probioticos = [m for m in medicamentos if self._e_probiotico(m)]
+            probioticos = filtrar_por_classe(medicamentos, ClasseTerapeutica.PROBIOTICO)
             for med in probioticos[:1]:
                 recomendacoes.append(RecomendacaoFarmacologica(
                     medicamento=med.nome_comercial,
@@ -2095,7 +1153,7 @@ def _recomendar_para_dor_garganta(self, sintomas: Dict[str, bool], medicamentos:
         
         if sintomas['dor_garganta']:
             # Analgésicos tópicos
-            analgesicos_topicos = [m for m in medicamentos if self._e_analgesico_topico(m)]
+            analgesicos_topicos = filtrar_por_classe(medicamentos, ClasseTerapeutica.ANALGESICO_TOPICO)
             for med in analgesicos_topicos[:2]:
                 recomendacoes.append(RecomendacaoFarmacologica(
                     medicamento=med.nome_comercial,
@@ -2117,7 +1175,7 @@ def _recomendar_para_azia(self, sintomas: Dict[str, bool], medicamentos: List[Me
         
         if sintomas['azia']:
             # Antiácidos
-            antiacidos = [m for m in medicamentos if self._e_antiacido(m)]
+            antiacidos = filtrar_por_classe(medicamentos, ClasseTerapeutica.ANTIACIDO)
             for med in antiacidos[:2]:
                 recomendacoes.append(RecomendacaoFarmacologica(
                     medicamento=med.nome_comercial,
@@ -2139,7 +1197,7 @@ def _recomendar_para_constipacao(self, sintomas: Dict[str, bool], medicamentos:
         
         if sintomas['constipacao']:
             # Laxantes
-            laxantes = [m for m in medicamentos if self._e_laxante(m)]
+            laxantes = filtrar_por_classe(medicamentos, ClasseTerapeutica.LAXANTE)
             for med in laxantes[:2]:
                 recomendacoes.append(RecomendacaoFarmacologica(
                     medicamento=med.nome_comercial,
@@ -2161,7 +1219,7 @@ def _recomendar_para_hemorroidas(self, sintomas: Dict[str, bool], medicamentos:
         
         if sintomas['hemorroidas']:
             # Medicamentos tópicos
-            topicos = [m for m in medicamentos if self._e_topico_hemorroidas(m)]
+            topicos = filtrar_por_classe(medicamentos, ClasseTerapeutica.TOPICO_HEMORROIDAS)
             for med in topicos[:2]:
                 recomendacoes.append(RecomendacaoFarmacologica(
                     medicamento=med.nome_comercial,
@@ -2183,7 +1241,7 @@ def _recomendar_para_dor_lombar(self, sintomas: Dict[str, bool], medicamentos: L
         
         if sintomas['dor_lombar']:
             # Analgésicos e anti-inflamatórios
-            analgesicos = [m for m in medicamentos if self._e_analgesico(m)]
+            analgesicos = filtrar_por_classe(medicamentos, ClasseTerapeutica.ANALGESICO)
             for med in analgesicos[:2]:
                 recomendacoes.append(RecomendacaoFarmacologica(
                     medicamento=med.nome_comercial,
@@ -2205,7 +1263,7 @@ def _recomendar_para_congestao_nasal(self, sintomas: Dict[str, bool], medicament
         
         if sintomas['congestao_nasal']:
             # Descongestionantes
-            descongestionantes = [m for m in medicamentos if self._e_descongestionante(m)]
+            descongestionantes = filtrar_por_classe(medicamentos, ClasseTerapeutica.DESCONGESTIONANTE)
             for med in descongestionantes[:2]:
                 recomendacoes.append(RecomendacaoFarmacologica(
                     medicamento=med.nome_comercial,
@@ -2220,7 +1278,7 @@ def _recomendar_para_congestao_nasal(self, sintomas: Dict[str, bool], medicament
         
         if sintomas['alergia']:
             # Antihistamínicos
-            antihistaminicos = [m for m in medicamentos if self._e_antihistaminico(m)]
+            antihistaminicos = filtrar_por_classe(medicamentos, ClasseTerapeutica.ANTIHISTAMINICO)
             for med in antihistaminicos[:1]:
                 recomendacoes.append(RecomendacaoFarmacologica(
                     medicamento=med.nome_comercial,
@@ -2242,7 +1300,7 @@ def _recomendar_para_infeccoes_fungicas(self, sintomas: Dict[str, bool], medicam
         
         # Antifúngicos tópicos para casos leves
         if sintomas.get('coceira', False) or sintomas.get('descamacao', False):
-            antifungicos = [m for m in medicamentos if self._e_antifungico(m)]
+            antifungicos = filtrar_por_classe(medicamentos, ClasseTerapeutica.ANTIFUNGICO)
             for med in antifungicos[:3]:
                 recomendacoes.append(RecomendacaoFarmacologica(
                     medicamento=med.nome_comercial,
@@ -2257,7 +1315,7 @@ def _recomendar_para_infeccoes_fungicas(self, sintomas: Dict[str, bool], medicam
         
         # Casos mais graves ou duração longa
         if sintomas.get('duracao_longa', False) or sintomas.get('area_extensa', False):
-            antifungicos_sistemicos = [m for m in medicamentos if self._e_antifungico_sistemico(m)]
+            antifungicos_sistemicos = filtrar_por_classe(medicamentos, ClasseTerapeutica.ANTIFUNGICO_SISTEMICO)
             for med in antifungicos_sistemicos[:2]:
                 recomendacoes.append(RecomendacaoFarmacologica(
                     medicamento=med.nome_comercial,
@@ -2272,7 +1330,7 @@ def _recomendar_para_infeccoes_fungicas(self, sintomas: Dict[str, bool], medicam
         
         # Unhas afetadas
         if sintomas.get('unha_afetada', False):
-            antifungicos_unha = [m for m in medicamentos if self._e_antifungico_unha(m)]
+            antifungicos_unha = filtrar_por_classe(medicamentos, ClasseTerapeutica.ANTIFUNGICO_UNHA)
             for med in antifungicos_unha[:2]:
                 recomendacoes.append(RecomendacaoFarmacologica(
                     medicamento=med.nome_comercial,
@@ -2287,7 +1345,7 @@ def _recomendar_para_infeccoes_fungicas(self, sintomas: Dict[str, bool], medicam
         
         # Inflamação associada
         if sintomas.get('vermelhidao', False):
-            antifungicos_inflamacao = [m for m in medicamentos if self._e_antifungico_inflamacao(m)]
+            antifungicos_inflamacao = filtrar_por_classe(medicamentos, ClasseTerapeutica.ANTIFUNGICO_INFLAMACAO)
             for med in antifungicos_inflamacao[:1]:
                 recomendacoes.append(RecomendacaoFarmacologica(
                     medicamento=med.nome_comercial,
@@ -2302,132 +1360,78 @@ def _recomendar_para_infeccoes_fungicas(self, sintomas: Dict[str, bool], medicam
         
         return recomendacoes
     
-    # Métodos auxiliares para classificar medicamentos
+    # Métodos auxiliares para classificar medicamentos (máscara de classes pré-calculada)
     def _medicamento_para_tosse(self, medicamento: Medicamento) -> bool:
         """Verifica se o medicamento é indicado para tosse"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['tosse', 'expectorante', 'antitussígeno', 'mucolítico'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.TOSSE)
     
     def _e_antitussigeno(self, medicamento: Medicamento) -> bool:
         """Verifica se é antitussígeno"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['antitussígeno', 'antitussigeno', 'dextrometorfano', 'clobutinol'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.ANTITUSSIGENO)
     
     def _e_expectorante(self, medicamento: Medicamento) -> bool:
         """Verifica se é expectorante"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['expectorante', 'guaifenesina', 'ambroxol', 'mucolítico'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.EXPECTORANTE)
     
     def _e_antialergico(self, medicamento: Medicamento) -> bool:
         """Verifica se é antialérgico"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['antialérgico', 'antialergico', 'loratadina', 'desloratadina', 'dexclorfeniramina'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.ANTIALERGICO)
     
     def _e_antipiretico(self, medicamento: Medicamento) -> bool:
         """Verifica se é antipirético"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['antipirético', 'antipiretico', 'paracetamol', 'ibuprofeno', 'dipirona'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.ANTIPIRETICO)
     
     def _e_analgesico(self, medicamento: Medicamento) -> bool:
         """Verifica se é analgésico"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['analgésico', 'analgesico', 'paracetamol', 'ibuprofeno', 'dipirona', 'naproxeno'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.ANALGESICO)
     
     def _e_antidiarreico(self, medicamento: Medicamento) -> bool:
         """Verifica se é antidiarreico"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['antidiarreico', 'loperamida', 'racecadotril'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.ANTIDIARREICO)
     
     def _e_probiotico(self, medicamento: Medicamento) -> bool:
         """Verifica se é probiótico"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['probiótico', 'probiotico', 'lactobacillus', 'bifidobacterium'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.PROBIOTICO)
     
     def _e_analgesico_topico(self, medicamento: Medicamento) -> bool:
         """Verifica se é analgésico tópico"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['analgésico tópico', 'anestésico tópico', 'benzocaína', 'lidocaína'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.ANALGESICO_TOPICO)
     
     def _e_antiacido(self, medicamento: Medicamento) -> bool:
         """Verifica se é antiácido"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['antiácido', 'antiacido', 'hidróxido de alumínio', 'hidróxido de magnésio'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.ANTIACIDO)
     
     def _e_laxante(self, medicamento: Medicamento) -> bool:
         """Verifica se é laxante"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['laxante', 'purgativo', 'lactulose', 'sorbitol'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.LAXANTE)
     
     def _e_topico_hemorroidas(self, medicamento: Medicamento) -> bool:
         """Verifica se é tópico para hemorroidas"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['hemorroida', 'hemorroidas', 'anal', 'retal'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.TOPICO_HEMORROIDAS)
     
     def _e_descongestionante(self, medicamento: Medicamento) -> bool:
         """Verifica se é descongestionante"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['descongestionante', 'pseudoefedrina', 'fenilefrina'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.DESCONGESTIONANTE)
     
     def _e_antihistaminico(self, medicamento: Medicamento) -> bool:
         """Verifica se é antihistamínico"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['antihistamínico', 'antihistaminico', 'loratadina', 'cetirizina'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.ANTIHISTAMINICO)
     
     def _e_antifungico(self, medicamento: Medicamento) -> bool:
         """Verifica se é antifúngico tópico"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['antifúngico', 'antifungico', 'clotrimazol', 'miconazol', 'cetoconazol'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.ANTIFUNGICO)
     
     def _e_antifungico_sistemico(self, medicamento: Medicamento) -> bool:
         """Verifica se é antifúngico sistêmico"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['terbinafina', 'fluconazol', 'itraconazol', 'griseofulvina'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.ANTIFUNGICO_SISTEMICO)
     
     def _e_antifungico_unha(self, medicamento: Medicamento) -> bool:
         """Verifica se é antifúngico para unhas"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['unha', 'onicomicose', 'terbinafina', 'ciclopirox'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.ANTIFUNGICO_UNHA)
     
     def _e_antifungico_inflamacao(self, medicamento: Medicamento) -> bool:
         """Verifica se é antifúngico com anti-inflamatório"""
-        if not medicamento.indicacao:
-            return False
-        indicacao = medicamento.indicacao.lower()
-        return any(palavra in indicacao for palavra in ['clotrimazol + hidrocortisona', 'miconazol + hidrocortisona', 'fungicort'])
+        return bool(mascara_medicamento(medicamento) & ClasseTerapeutica.ANTIFUNGICO_INFLAMACAO)
     
     def _gerar_posologia(self, medicamento: Medicamento, tipo: str) -> str:
         """Gera posologia baseada no tipo de medicamento"""
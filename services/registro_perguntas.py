@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro das Perguntas Dinâmicas
+================================
+
+As respostas da triagem referenciam perguntas dos módulos pelo slug estável
+``modulo_ordem`` (ex.: ``febre_3``). Cada slug tem uma única linha em
+``perguntas``, localizada pela coluna ``Pergunta.slug`` (índice único).
+
+O mapa slug -> id é carregado uma vez por processo e mantido em memória.
+Slugs desconhecidos de uma triagem são resolvidos juntos: uma consulta para
+os que já existem no banco e um único ``INSERT`` (ignorando conflitos) para os
+novos. Esse ``INSERT`` roda em transação própria, já confirmada, de modo que
+um id guardado no mapa nunca pertence a uma linha desfeita por rollback.
+
+Substitui os ids derivados de ``hash()``. Como o hash de strings muda a cada
+processo, eles criavam linhas diferentes para a mesma pergunta em cada worker
+ou reinício. As duplicatas antigas são unificadas por
+``utils/migrar_registro_perguntas.py``.
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable
+
+from sqlalchemy import insert, select
+
+from models.models import db, Pergunta
+
+logger = logging.getLogger(__name__)
+
+
+class RegistroPerguntas:
+    """Mapa slug -> Pergunta.id, carregado uma vez e completado em lote"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._carregado = False
+
+    def _carregar(self):
+        self._ids.update(db.session.execute(
+            select(Pergunta.slug, Pergunta.id).where(Pergunta.slug.is_not(None))
+        ).all())
+        self._carregado = True
+        logger.info(f"Registro de perguntas carregado ({len(self._ids)} slugs)")
+
+    def _inserir(self, slugs: list):
+        """INSERT em lote dos slugs novos, ignorando os que outro processo inseriu antes"""
+        linhas = [
+            {'slug': slug, 'texto': slug, 'tipo': 'sintoma', 'ordem': 999, 'ativa': True}
+            for slug in slugs
+        ]
+        dialeto = db.engine.dialect.name
+        if dialeto == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as insert_sqlite
+            comando = insert_sqlite(Pergunta).on_conflict_do_nothing(index_elements=['slug'])
+        elif dialeto == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as insert_postgresql
+            comando = insert_postgresql(Pergunta).on_conflict_do_nothing(index_elements=['slug'])
+        elif dialeto in ('mysql', 'mariadb'):
+            comando = insert(Pergunta).prefix_with('IGNORE')
+        else:
+            comando = insert(Pergunta)
+        with db.engine.begin() as conexao:
+            conexao.execute(comando, linhas)
+
+    def ids(self, slugs: Iterable[str]) -> Dict[str, int]:
+        """Ids das perguntas dos slugs informados, criando as que faltam"""
+        slugs = list(dict.fromkeys(slugs))
+        with self._lock:
+            if not self._carregado:
+                self._carregar()
+            faltantes = [slug for slug in slugs if slug not in self._ids]
+            if faltantes:
+                self._inserir(faltantes)
+                with db.engine.connect() as conexao:
+                    self._ids.update(conexao.execute(
+                        select(Pergunta.slug, Pergunta.id).where(Pergunta.slug.in_(faltantes))
+                    ).all())
+                logger.info(f"{len(faltantes)} perguntas registradas: {', '.join(faltantes)}")
+            return {slug: self._ids[slug] for slug in slugs}
+
+    def limpar(self):
+        """Descarta o mapa (ex.: depois da migração que unifica duplicatas)"""
+        with self._lock:
+            self._ids.clear()
+            self._carregado = False
+
+
+# Instância global
+registro_perguntas = RegistroPerguntas()
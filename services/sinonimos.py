@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serviço de Sinônimos Clínicos
+=============================
+
+Carrega ``data/sinonimos.json`` uma única vez, normaliza todos os termos e
+monta um índice invertido ``termo normalizado -> grupo de sinônimos``. Cada
+expansão de sintoma passa a ser uma busca O(1) em dicionário. O arquivo é
+recarregado automaticamente quando seu ``mtime`` muda.
+
+A expansão só usa o arquivo com ``Config.SINONIMOS_ATIVOS``. Antes deste
+serviço o arquivo era procurado em ``services/data/``, que não existe, então
+os sintomas nunca eram expandidos; desligado, o serviço mantém esse
+comportamento e devolve apenas os sintomas normalizados.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, FrozenSet, List, Optional
+
+from core.config import Config
+from utils.recarregamento import RecursoArquivo
+from utils.texto import normalizar_texto
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAMINHO_SINONIMOS = os.path.join(BASE_DIR, 'data', 'sinonimos.json')
+
+
+def _compilar_indice(caminho: str) -> Dict[str, FrozenSet[str]]:
+    """Lê o dicionário de sinônimos e monta o índice invertido normalizado"""
+    with open(caminho, 'r', encoding='utf-8') as f:
+        sinonimos = json.load(f)
+
+    indice: Dict[str, FrozenSet[str]] = {}
+    for termo_principal, lista_sinonimos in sinonimos.items():
+        grupo = frozenset(
+            termo for termo in (normalizar_texto(t) for t in [termo_principal] + list(lista_sinonimos))
+            if termo
+        )
+        # Um termo pode aparecer em mais de um grupo: a expansão é a união deles
+        for termo in grupo:
+            indice[termo] = indice.get(termo, frozenset()) | grupo
+
+    logger.info(f"Índice de sinônimos montado com {len(indice)} termos")
+    return indice
+
+
+class ServicoSinonimos:
+    """Expansão de sintomas por sinônimos clínicos com índice invertido"""
+
+    def __init__(self, caminho: str = CAMINHO_SINONIMOS, ativo: Optional[bool] = None):
+        self.ativo = Config.SINONIMOS_ATIVOS if ativo is None else ativo
+        self._recurso = RecursoArquivo(caminho, _compilar_indice, padrao={})
+        if self.ativo:
+            # Carrega na inicialização para não pagar o custo na primeira triagem
+            self._recurso.obter()
+
+    def _indice(self) -> Dict[str, FrozenSet[str]]:
+        return self._recurso.obter() if self.ativo else {}
+
+    def sinonimos_de(self, termo: str) -> FrozenSet[str]:
+        """Retorna o grupo de sinônimos de um termo (vazio se desconhecido ou desligado)"""
+        return self._indice().get(normalizar_texto(termo), frozenset())
+
+    def expandir(self, sintomas: List[str]) -> List[str]:
+        """
+        Expande uma lista de sintomas incluindo seus sinônimos clínicos.
+
+        Args:
+            sintomas: Lista de sintomas originais
+
+        Returns:
+            Lista ordenada com sintomas originais normalizados e seus sinônimos
+        """
+        indice = self._indice()
+        sintomas_expandidos = set()
+        for sintoma in sintomas:
+            sintoma_normalizado = normalizar_texto(sintoma)
+            sintomas_expandidos.add(sintoma_normalizado)
+            sintomas_expandidos.update(indice.get(sintoma_normalizado, ()))
+        return sorted(sintomas_expandidos)
+
+
+# Instância global do serviço
+servico_sinonimos = ServicoSinonimos()
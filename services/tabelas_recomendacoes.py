@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tabelas de Recomendações por Módulo
+===================================
+
+Carrega e valida, uma única vez por processo, as tabelas fixas de
+``data/recomendacoes_fixas.json``:
+
+- fixas: recomendações de fallback do sistema de recomendações (por módulo)
+- gerais: recomendações gerais casadas com o catálogo quando não há correspondência
+- palavras_busca_gerais: palavras usadas na busca ampla por módulo
+- fixas_texto / fixas_texto_padrao: fallback textual do ``TriagemScoring``
+
+As estruturas retornadas são imutáveis (tuplas e ``MappingProxyType``), para
+que possam ser compartilhadas entre requisições sem cópia defensiva.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAMINHO_TABELAS = os.path.join(BASE_DIR, 'data', 'recomendacoes_fixas.json')
+
+CAMPOS_RECOMENDACAO = {
+    'medicamento': str,
+    'principio_ativo': str,
+    'indicacao': str,
+    'posologia': str,
+    'observacoes': str,
+    'prioridade': int,
+    'categoria': str,
+}
+
+
+@dataclass(frozen=True)
+class TabelasRecomendacoes:
+    """Tabelas fixas de recomendações, já validadas e congeladas"""
+    versao: int
+    fixas: Mapping[str, Tuple[Mapping[str, object], ...]]
+    gerais: Mapping[str, Tuple[Mapping[str, object], ...]]
+    palavras_busca_gerais: Mapping[str, Tuple[str, ...]]
+    fixas_texto: Mapping[str, Tuple[str, ...]]
+    fixas_texto_padrao: Tuple[str, ...]
+
+
+def _validar_recomendacoes(secao: str, dados: dict) -> Mapping[str, Tuple[Mapping[str, object], ...]]:
+    """Valida uma seção de recomendações estruturadas e a congela"""
+    if not isinstance(dados, dict):
+        raise ValueError(f"Seção '{secao}' deve ser um objeto módulo -> lista")
+
+    resultado = {}
+    for modulo, recomendacoes in dados.items():
+        if not isinstance(recomendacoes, list):
+            raise ValueError(f"{secao}.{modulo} deve ser uma lista")
+        itens = []
+        for posicao, rec in enumerate(recomendacoes):
+            for campo, tipo in CAMPOS_RECOMENDACAO.items():
+                if not isinstance(rec.get(campo), tipo):
+                    raise ValueError(f"{secao}.{modulo}[{posicao}].{campo} ausente ou não é {tipo.__name__}")
+            itens.append(MappingProxyType({campo: rec[campo] for campo in CAMPOS_RECOMENDACAO}))
+        resultado[modulo] = tuple(itens)
+    return MappingProxyType(resultado)
+
+
+def _validar_listas_texto(secao: str, dados: dict) -> Mapping[str, Tuple[str, ...]]:
+    """Valida uma seção módulo -> lista de textos e a congela"""
+    if not isinstance(dados, dict):
+        raise ValueError(f"Seção '{secao}' deve ser um objeto módulo -> lista")
+
+    resultado = {}
+    for modulo, textos in dados.items():
+        if not isinstance(textos, list) or not all(isinstance(t, str) for t in textos):
+            raise ValueError(f"{secao}.{modulo} deve ser uma lista de textos")
+        resultado[modulo] = tuple(textos)
+    return MappingProxyType(resultado)
+
+
+def carregar_tabelas(caminho: str = CAMINHO_TABELAS) -> TabelasRecomendacoes:
+    """Lê e valida o arquivo de tabelas de recomendações"""
+    with open(caminho, 'r', encoding='utf-8') as f:
+        dados = json.load(f)
+
+    padrao = dados.get('fixas_texto_padrao', [])
+    if not isinstance(padrao, list) or not all(isinstance(t, str) for t in padrao):
+        raise ValueError("fixas_texto_padrao deve ser uma lista de textos")
+
+    tabelas = TabelasRecomendacoes(
+        versao=int(dados.get('versao', 1)),
+        fixas=_validar_recomendacoes('fixas', dados.get('fixas', {})),
+        gerais=_validar_recomendacoes('gerais', dados.get('gerais', {})),
+        palavras_busca_gerais=_validar_listas_texto('palavras_busca_gerais', dados.get('palavras_busca_gerais', {})),
+        fixas_texto=_validar_listas_texto('fixas_texto', dados.get('fixas_texto', {})),
+        fixas_texto_padrao=tuple(padrao),
+    )
+    logger.info(f"Tabelas de recomendações carregadas (versão {tabelas.versao}, {len(tabelas.fixas)} módulos)")
+    return tabelas
+
+
+@lru_cache(maxsize=1)
+def obter_tabelas() -> TabelasRecomendacoes:
+    """Tabelas carregadas uma única vez por processo"""
+    return carregar_tabelas()
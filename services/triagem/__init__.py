@@ -4,4 +4,6 @@
 
 Este pacote contém o motor de perguntas e a lógica de triagem:
 - motor_de_perguntas/: Módulos de perguntas por sintoma
+- regras_modulos: Regras declarativas compiladas dos módulos e avaliação no servidor
+- fluxo_adaptativo: Triagem passo a passo com encerramento antecipado por sinais de alerta
 """
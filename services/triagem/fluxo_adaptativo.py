@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Triagem Adaptativa com Encerramento Antecipado por Sinais de Alerta
+===================================================================
+
+API passo a passo da triagem: o servidor guarda as respostas de cada sessão
+e, depois de cada resposta, reavalia os sinais de alerta do módulo
+(``RegrasModulo``, compiladas de ``has_red_flags`` / ``check_red_flags`` por
+``regras_modulos``):
+
+- a triagem termina assim que um sinal de alerta é certo, ou seja, quando as
+  respostas já dadas bastam para a regra ser verdadeira, quaisquer que sejam
+  as demais. Nesse caso o encaminhamento é indicado com os motivos da regra;
+- perguntas que não podem mais mudar o resultado são puladas: as que só
+  alimentam regras já decididas e que não são usadas pelas orientações do
+  módulo (``suggest_*``);
+- cada passo devolve a próxima pergunta e a pontuação parcial
+  (``TriagemScoring.calculate_score`` sobre as respostas até ali).
+
+As perguntas escondidas pelo filtro (dados do cadastro) são preenchidas pelo
+perfil do paciente quando alimentam um campo do perfil; as demais valem
+``False``/``0``, como no fluxo web, que não as pergunta.
+
+As sessões ficam na tabela ``sessoes_triagem`` (``SessaoTriagem``), para que
+qualquer processo da aplicação (ex.: workers do gunicorn) continue a sessão
+iniciada por outro; a cada passo, o estado das regras é refeito a partir do
+perfil e das respostas gravados. Sessões paradas há mais que o TTL expiram.
+
+``processar_triagem`` só encaminha por sinal de alerta quando recebe
+``sessao_adaptativa``: a sessão precisa ser do mesmo paciente e módulo e as
+respostas gravadas nela precisam tornar o sinal certo (``sinais_de_alerta``).
+Triagens enviadas sem sessão seguem apenas a pontuação.
+"""
+
+import logging
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from models.models import db, SessaoTriagem
+from services.triagem.regras_modulos import RegrasModulo, motor_regras
+from utils.extractors.manifesto_perguntas import manifesto_perguntas
+from utils.extractors.perguntas_extractor import get_patient_profile_from_cadastro
+from utils.scoring.triagem_scoring import scoring_system
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SessaoAdaptativa:
+    """Estado de uma triagem adaptativa em andamento"""
+    id: str
+    modulo: str
+    paciente_id: Optional[int]
+    perfil: Dict[str, object]
+    regras: RegrasModulo
+    valores: Dict[str, object] = field(default_factory=dict)
+    respostas: Dict[str, str] = field(default_factory=dict)   # pergunta_id -> resposta original
+    motivos: List[str] = field(default_factory=list)
+    encaminhar: bool = False
+    concluida: bool = False
+
+    def respostas_motor(self) -> List[Dict[str, str]]:
+        """Respostas no formato de processar_triagem / calculate_score, na ordem do módulo"""
+        return [
+            {'pergunta_id': p.id, 'resposta': self.respostas[p.id]}
+            for p in self.regras.perguntas if p.id in self.respostas
+        ]
+
+
+class FluxoAdaptativo:
+    """Conduz as sessões de triagem adaptativa sobre as regras compiladas dos módulos"""
+
+    def __init__(self, ttl_segundos: float = 4 * 3600):
+        self.ttl_segundos = ttl_segundos
+        self._tabela_pronta = False
+        self._lock_tabela = threading.Lock()
+
+    def _garantir_tabela(self):
+        """Cria ``sessoes_triagem`` em bancos anteriores à tabela (uma vez por processo)"""
+        if self._tabela_pronta:
+            return
+        with self._lock_tabela:
+            if not self._tabela_pronta:
+                SessaoTriagem.__table__.create(db.engine, checkfirst=True)
+                self._tabela_pronta = True
+
+    def _limite_expiracao(self) -> datetime:
+        return datetime.utcnow() - timedelta(seconds=self.ttl_segundos)
+
+    def iniciar(self, modulo: str, perfil: Dict[str, object], paciente_id: Optional[int] = None) -> Dict[str, object]:
+        """Abre uma sessão e devolve a primeira pergunta"""
+        self._garantir_tabela()
+        regras = motor_regras.regras(modulo)
+        sessao = SessaoAdaptativa(uuid.uuid4().hex, modulo, paciente_id, perfil, regras,
+                                  valores=regras.valores_iniciais(perfil))
+        estado = self._estado(sessao)
+        try:
+            # Descarta as sessões expiradas junto com a gravação da nova
+            SessaoTriagem.query.filter(
+                SessaoTriagem.atualizada_em < self._limite_expiracao()
+            ).delete(synchronize_session=False)
+            db.session.add(SessaoTriagem(id=sessao.id, modulo=modulo, id_paciente=paciente_id,
+                                         perfil=perfil, respostas={}))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return estado
+
+    def iniciar_para_paciente(self, modulo: str, paciente) -> Dict[str, object]:
+        """Abre uma sessão a partir de um ``Paciente`` ou do dicionário do cadastro"""
+        dados = paciente.to_dict() if hasattr(paciente, 'to_dict') else dict(paciente)
+        return self.iniciar(modulo, get_patient_profile_from_cadastro(dados), paciente_id=dados.get('id'))
+
+    def _registro(self, sessao_id: Optional[str], bloquear: bool = False) -> Optional[SessaoTriagem]:
+        if not sessao_id:
+            return None
+        self._garantir_tabela()
+        query = SessaoTriagem.query.filter(
+            SessaoTriagem.id == str(sessao_id), SessaoTriagem.atualizada_em >= self._limite_expiracao()
+        )
+        return (query.with_for_update() if bloquear else query).first()
+
+    @staticmethod
+    def _restaurar(registro: SessaoTriagem) -> SessaoAdaptativa:
+        """Refaz o estado das regras a partir do perfil e das respostas gravados"""
+        regras = motor_regras.regras(registro.modulo)
+        perfil = dict(registro.perfil or {})
+        sessao = SessaoAdaptativa(registro.id, registro.modulo, registro.id_paciente, perfil, regras,
+                                  valores=regras.valores_iniciais(perfil))
+        for pergunta_id, resposta in (registro.respostas or {}).items():
+            pergunta = regras.pergunta(pergunta_id)
+            if pergunta is None:
+                continue
+            if pergunta.variavel:
+                sessao.valores[pergunta.variavel] = pergunta.converter(resposta)
+            sessao.respostas[pergunta.id] = resposta
+        return sessao
+
+    def obter_sessao(self, sessao_id: Optional[str]) -> Optional[SessaoAdaptativa]:
+        registro = self._registro(sessao_id)
+        return self._restaurar(registro) if registro is not None else None
+
+    def sinais_de_alerta(self, sessao_id: Optional[str], paciente_id: Optional[int],
+                         modulo: Optional[str]) -> List[str]:
+        """
+        Motivos do encaminhamento certo de uma sessão, se ela for do paciente e do
+        módulo informados; lista vazia caso contrário (ou sem sessão)
+        """
+        sessao = self.obter_sessao(sessao_id)
+        if sessao is None or sessao.paciente_id != paciente_id or sessao.modulo != modulo:
+            return []
+        avaliacao = sessao.regras.avaliar(sessao.valores)
+        return list(avaliacao.motivos) if avaliacao.encaminhar else []
+
+    def responder(self, sessao_id: str, pergunta_id: str, resposta) -> Dict[str, object]:
+        """
+        Registra uma resposta (ou corrige uma anterior) e devolve o novo estado.
+
+        Raises:
+            KeyError: sessão inexistente/expirada ou pergunta que não é do módulo
+            ValueError: resposta inválida para o tipo da pergunta
+        """
+        try:
+            registro = self._registro(sessao_id, bloquear=True)
+            if registro is None:
+                raise KeyError('Sessão de triagem não encontrada ou expirada')
+            sessao = self._restaurar(registro)
+            pergunta = sessao.regras.pergunta(pergunta_id)
+            if pergunta is None:
+                raise KeyError(f"Pergunta {pergunta_id} não pertence ao módulo {sessao.modulo}")
+
+            valor = pergunta.converter(resposta)
+            if pergunta.variavel:
+                sessao.valores[pergunta.variavel] = valor
+            sessao.respostas[pergunta.id] = str(resposta).strip()
+            estado = self._estado(sessao)
+
+            # Novo dicionário: o JSON só é regravado quando o atributo é substituído
+            registro.respostas = dict(sessao.respostas)
+            registro.atualizada_em = datetime.utcnow()
+            db.session.commit()
+            return estado
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def _estado(self, sessao: SessaoAdaptativa) -> Dict[str, object]:
+        """Reavalia as regras e monta a resposta do passo"""
+        regras = sessao.regras
+        avaliacao = regras.avaliar(sessao.valores)
+
+        sessao.motivos = avaliacao.motivos
+        sessao.encaminhar = bool(avaliacao.encaminhar)
+        necessarias = avaliacao.pendentes | regras.variaveis_orientacao
+
+        restantes = []
+        if not sessao.encaminhar:
+            restantes = [
+                p for p in regras.perguntas_visiveis
+                if p.id not in sessao.respostas and p.variavel is not None
+                and p.variavel not in sessao.valores and p.variavel in necessarias
+            ]
+        sessao.concluida = not restantes
+
+        respostas = sessao.respostas_motor()
+        pontuacao = scoring_system.calculate_score(sessao.modulo, respostas, sessao.perfil)
+        estado = {
+            'sessao_id': sessao.id,
+            'modulo': sessao.modulo,
+            'concluida': sessao.concluida,
+            'encaminhar': sessao.encaminhar,
+            'motivos': avaliacao.motivos,
+            'proxima_pergunta': None,
+            'pontuacao': {
+                'total_score': pontuacao.total_score,
+                'risk_level': pontuacao.risk_level,
+                'encaminhamento': pontuacao.encaminhamento,
+                'confidence': pontuacao.confidence,
+                'versao_pesos': pontuacao.versao_pesos,
+            },
+            'progresso': {
+                'respondidas': len(sessao.respostas),
+                'restantes_max': len(restantes),
+                'total_modulo': len(regras.perguntas_visiveis),
+            },
+        }
+        if restantes:
+            por_id = {p['id']: p for p in manifesto_perguntas.perguntas(sessao.modulo, filtrar=True)}
+            estado['proxima_pergunta'] = por_id.get(restantes[0].id)
+        else:
+            estado['respostas'] = respostas
+            estado['resultado'] = avaliacao.resultado
+        return estado
+
+
+# Instância global
+fluxo_adaptativo = FluxoAdaptativo()
@@ -283,6 +283,8 @@ def run_cli():
 def iniciar_triagem(paciente):
     """
     Fluxo de perguntas e decisões para azia e má digestão.
-    Será implementado conforme diretrizes da ANVISA.
+    Inicia a triagem adaptativa (services.triagem.fluxo_adaptativo) com as regras
+    compiladas deste módulo e retorna a primeira pergunta.
     """
-    raise NotImplementedError("Fluxo de azia_ma_digestao ainda não implementado")
+    from services.triagem.fluxo_adaptativo import fluxo_adaptativo
+    return fluxo_adaptativo.iniciar_para_paciente("azia_ma_digestao", paciente)
@@ -220,6 +220,8 @@ def run_cli():
 def iniciar_triagem(paciente):
     """
     Fluxo de perguntas e decisões para constipação.
-    Será implementado conforme diretrizes da ANVISA.
+    Inicia a triagem adaptativa (services.triagem.fluxo_adaptativo) com as regras
+    compiladas deste módulo e retorna a primeira pergunta.
     """
-    raise NotImplementedError("Fluxo de constipacao ainda não implementado")
+    from services.triagem.fluxo_adaptativo import fluxo_adaptativo
+    return fluxo_adaptativo.iniciar_para_paciente("constipacao", paciente)
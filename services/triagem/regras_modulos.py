@@ -0,0 +1,817 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Regras Declarativas dos Módulos de Triagem
+==========================================
+
+Os módulos de ``motor_de_perguntas`` descrevem a triagem de forma imperativa:
+``run_cli`` faz as perguntas com ``input()``, ``has_red_flags`` acumula os
+motivos de encaminhamento e ``triage`` monta o ``TriageResult``. Este módulo
+compila esse código (pelo AST, sem executá-lo) em uma representação
+declarativa, avaliável no servidor a partir das respostas gravadas:
+
+- perguntas: variável de ``run_cli`` que recebe a resposta, texto, conversão
+  (``ask_bool``, ``int(input())``, ``float(input())``), id ``modulo_N`` da
+  variante filtrada do manifesto e campo do perfil que a pergunta alimenta;
+- entradas: para cada parâmetro de ``has_red_flags``, a origem de cada campo
+  do dataclass (variável de ``run_cli`` ou constante/valor padrão);
+- sinais de alerta: um ``RegraAlerta`` por ``if condição: reasons.append(motivo)``,
+  com a condição em árvore (``ou``, ``e``, ``nao``, ``comparar``,
+  ``variavel``, ``valor``) já expressa sobre as variáveis das perguntas;
+- desfechos: o ``TriageResult`` de encaminhamento e o de autocuidado. As
+  orientações do autocuidado (``suggest_*``) são funções puras que montam
+  texto; elas ficam registradas como chamada (função e argumentos) e são
+  executadas com os dataclasses preenchidos.
+
+As condições são avaliadas em lógica de três valores: com respostas faltando,
+``or``/``and``/``not`` são decididos quando possível e o restante fica
+indeterminado. A mesma avaliação serve à triagem adaptativa
+(``fluxo_adaptativo``) e à reavaliação de consultas gravadas
+(``MotorRegras.avaliar_consultas``).
+
+``verificar_regras`` confere a representação com as perguntas extraídas pelo
+manifesto e, opcionalmente, com o próprio ``triage`` do módulo em entradas
+aleatórias (``python utils/verificar_regras_modulos.py``).
+"""
+
+import ast
+import dataclasses
+import importlib
+import logging
+import operator
+import os
+import random
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+
+from models.models import db, Consulta, ConsultaPontuacao, ConsultaResposta, Paciente, Pergunta
+from utils.extractors.manifesto_perguntas import manifesto_perguntas
+from utils.extractors.perguntas_extractor import (
+    MOTOR_DIR, find_run_cli_function, get_patient_profile_from_cadastro,
+    is_unnecessary_question, iter_question_calls
+)
+
+logger = logging.getLogger(__name__)
+
+PACOTE_MOTOR = 'services.triagem.motor_de_perguntas'
+FUNCOES_SINAIS_ALERTA = ('has_red_flags', 'check_red_flags')
+RESPOSTAS_SIM = frozenset({'s', 'sim', 'y', 'yes', 'true', '1'})
+RESPOSTAS_NAO = frozenset({'n', 'nao', 'não', 'no', 'false', '0'})
+
+OPERADORES = {
+    'Lt': operator.lt, 'LtE': operator.le, 'Gt': operator.gt, 'GtE': operator.ge,
+    'Eq': operator.eq, 'NotEq': operator.ne,
+    'In': lambda a, b: a in b, 'NotIn': lambda a, b: a not in b,
+    'Is': operator.is_, 'IsNot': operator.is_not,
+}
+
+_DESCONHECIDO = object()
+
+
+# ==============================
+# CONDIÇÕES
+# ==============================
+
+@dataclass(frozen=True)
+class Condicao:
+    """
+    Nó da árvore de condição.
+
+    tipo: 'ou', 'e', 'nao' (filhos), 'comparar' (filhos = operandos, operadores),
+    'variavel' (alvo = variável de run_cli) ou 'valor' (constante)
+    """
+    tipo: str
+    filhos: Tuple['Condicao', ...] = ()
+    operadores: Tuple[str, ...] = ()
+    alvo: Optional[str] = None
+    valor: object = None
+    fonte: str = ''
+
+    def variaveis(self) -> FrozenSet[str]:
+        if self.tipo == 'variavel':
+            return frozenset({self.alvo})
+        return frozenset().union(*(filho.variaveis() for filho in self.filhos))
+
+    def _operando(self, valores: Dict[str, object]):
+        if self.tipo == 'valor':
+            return self.valor
+        if self.tipo == 'variavel':
+            return valores.get(self.alvo, _DESCONHECIDO)
+        resultado = self.avaliar(valores)
+        return _DESCONHECIDO if resultado is None else resultado
+
+    def avaliar(self, valores: Dict[str, object]) -> Optional[bool]:
+        """True/False se decidida com os valores conhecidos; None se indeterminada"""
+        if self.tipo in ('variavel', 'valor'):
+            valor = self._operando(valores)
+            return None if valor is _DESCONHECIDO else bool(valor)
+
+        if self.tipo == 'nao':
+            valor = self.filhos[0].avaliar(valores)
+            return None if valor is None else not valor
+
+        if self.tipo == 'comparar':
+            # a < b < c equivale a (a < b) e (b < c)
+            operandos = [filho._operando(valores) for filho in self.filhos]
+            resultado = True
+            for esquerda, nome, direita in zip(operandos, self.operadores, operandos[1:]):
+                if esquerda is _DESCONHECIDO or direita is _DESCONHECIDO:
+                    resultado = None
+                elif not OPERADORES[nome](esquerda, direita):
+                    return False
+            return resultado
+
+        valores_filhos = [filho.avaliar(valores) for filho in self.filhos]
+        decisivo = self.tipo == 'ou'  # 'ou' decide com um True; 'e' decide com um False
+        if decisivo in valores_filhos:
+            return decisivo
+        if None in valores_filhos:
+            return None
+        return not decisivo
+
+    def to_dict(self) -> Dict[str, object]:
+        if self.tipo == 'variavel':
+            return {'variavel': self.alvo, 'campo': self.fonte}
+        if self.tipo == 'valor':
+            return {'valor': list(self.valor) if isinstance(self.valor, (tuple, frozenset)) else self.valor}
+        if self.tipo == 'comparar':
+            return {'comparar': [filho.to_dict() for filho in self.filhos], 'operadores': list(self.operadores)}
+        if self.tipo == 'nao':
+            return {'nao': self.filhos[0].to_dict()}
+        return {self.tipo: [filho.to_dict() for filho in self.filhos]}
+
+
+# ==============================
+# REPRESENTAÇÃO DOS MÓDULOS
+# ==============================
+
+@dataclass(frozen=True)
+class PerguntaRegra:
+    """Pergunta de run_cli ligada à variável que recebe a resposta"""
+    variavel: Optional[str]
+    texto: str
+    conversao: str               # 'bool', 'int', 'float' ou 'str'
+    id: Optional[str] = None     # modulo_N da variante filtrada (None se oculta)
+    campo_perfil: Optional[str] = None  # campo do PatientProfile alimentado (para preenchimento)
+
+    def converter(self, resposta) -> object:
+        """Converte a resposta (como enviada pelo cliente web) para o tipo usado em run_cli"""
+        texto = str(resposta).strip().lower()
+        if self.conversao == 'bool':
+            if texto in RESPOSTAS_SIM:
+                return True
+            if texto in RESPOSTAS_NAO:
+                return False
+            raise ValueError(f"Resposta inválida para '{self.texto}': use sim ou não")
+        if self.conversao in ('int', 'float'):
+            try:
+                numero = float(texto.replace(',', '.'))
+            except ValueError:
+                raise ValueError(f"Resposta numérica inválida para '{self.texto}'")
+            return int(numero) if self.conversao == 'int' else numero
+        return str(resposta).strip()
+
+
+@dataclass(frozen=True)
+class RegraAlerta:
+    """``if condição: reasons.append(motivo)`` de has_red_flags"""
+    motivo: str
+    condicao: Condicao
+
+    @property
+    def variaveis(self) -> FrozenSet[str]:
+        return self.condicao.variaveis()
+
+
+@dataclass(frozen=True)
+class Orientacao:
+    """Chamada a uma função de orientação do módulo (suggest_*) no desfecho de autocuidado"""
+    funcao: str
+    argumentos: Tuple[Tuple, ...]   # ('parametro', p) | ('campo', p, campo) | ('valor', v)
+    indice: Optional[int] = None    # posição no retorno, quando a função devolve uma tupla
+
+
+@dataclass(frozen=True)
+class ModeloTexto:
+    """f-string do desfecho de encaminhamento (``{why}`` vira ``{motivos}``)"""
+    modelo: str
+
+
+@dataclass(frozen=True)
+class Desfecho:
+    """Argumentos do ``TriageResult`` de um ramo de ``triage``"""
+    acao: str
+    campos: Tuple[Tuple[str, object], ...]   # (campo, str | None | ModeloTexto | Orientacao)
+
+
+@dataclass
+class AvaliacaoRegras:
+    """Resultado da avaliação das regras de um módulo sobre um conjunto de respostas"""
+    modulo: str
+    encaminhar: Optional[bool]            # None: ainda indeterminado (respostas faltando)
+    motivos: List[str]
+    pendentes: FrozenSet[str]             # variáveis das regras indeterminadas
+    acao: Optional[str] = None            # 'ENCAMINHAR', 'AUTOCUIDADO' ou None
+    resultado: Dict[str, Optional[str]] = field(default_factory=dict)
+    respostas_invalidas: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'modulo': self.modulo,
+            'encaminhar': self.encaminhar,
+            'motivos': self.motivos,
+            'pendentes': sorted(self.pendentes),
+            'acao': self.acao,
+            'resultado': self.resultado,
+            'respostas_invalidas': self.respostas_invalidas,
+        }
+
+
+@dataclass(frozen=True)
+class RegrasModulo:
+    """Perguntas, entradas, sinais de alerta e desfechos de um módulo de triagem"""
+    modulo: str
+    assinatura: str
+    perguntas: Tuple[PerguntaRegra, ...]
+    entradas: Dict[str, Dict[str, Tuple[str, object]]]   # parâmetro -> campo -> ('variavel'|'constante', alvo)
+    classes: Dict[str, str]                              # parâmetro -> dataclass
+    sinais_alerta: Tuple[RegraAlerta, ...]
+    separador_motivos: str
+    desfechos: Dict[str, Desfecho]                       # 'encaminhar' e 'autocuidado'
+    variaveis_orientacao: FrozenSet[str]                 # lidas pelas funções de orientação
+    globais: Dict[str, object] = field(repr=False, compare=False, default_factory=dict)
+
+    @property
+    def perguntas_visiveis(self) -> Tuple[PerguntaRegra, ...]:
+        return tuple(p for p in self.perguntas if p.id is not None)
+
+    def pergunta(self, pergunta_id: str) -> Optional[PerguntaRegra]:
+        return next((p for p in self.perguntas if p.id == pergunta_id), None)
+
+    # ------------------------------------------------------------ valores
+
+    def valores_iniciais(self, perfil: Dict[str, object]) -> Dict[str, object]:
+        """
+        Valores das perguntas ocultas pelo filtro: dados do cadastro quando a
+        pergunta alimenta um campo do perfil; senão False/0, como no fluxo web,
+        que não as pergunta.
+        """
+        valores = {}
+        for pergunta in self.perguntas:
+            if pergunta.id is None and pergunta.variavel:
+                if pergunta.campo_perfil in perfil:
+                    valores[pergunta.variavel] = perfil[pergunta.campo_perfil]
+                else:
+                    valores[pergunta.variavel] = {'bool': False, 'int': 0, 'float': 0.0}.get(pergunta.conversao, '')
+        return valores
+
+    def valores_das_respostas(self, respostas: Iterable[Dict[str, object]],
+                              perfil: Dict[str, object]) -> Tuple[Dict[str, object], List[str]]:
+        """Valores das variáveis a partir de respostas {'pergunta_id', 'resposta'}; devolve também os ids inválidos"""
+        valores = self.valores_iniciais(perfil)
+        por_id = {p.id: p for p in self.perguntas_visiveis}
+        invalidas = []
+        for resposta in respostas:
+            pergunta = por_id.get(str(resposta.get('pergunta_id')))
+            if pergunta is None or not pergunta.variavel:
+                continue
+            try:
+                valores[pergunta.variavel] = pergunta.converter(resposta.get('resposta', ''))
+            except ValueError:
+                invalidas.append(pergunta.id)
+        return valores, invalidas
+
+    # ----------------------------------------------------------- avaliação
+
+    def _instancia(self, parametro: str, valores: Dict[str, object]):
+        classe = self.globais[self.classes[parametro]]
+        argumentos = {}
+        for campo, (tipo, alvo) in self.entradas[parametro].items():
+            if tipo == 'constante':
+                argumentos[campo] = alvo
+            elif alvo in valores:
+                argumentos[campo] = valores[alvo]
+            else:
+                raise KeyError(alvo)
+        return classe(**argumentos)
+
+    def executar_triage(self, valores: Dict[str, object]):
+        """Executa o ``triage`` original do módulo com todos os valores (referência das regras)"""
+        return self.globais['triage'](*(self._instancia(p, valores) for p in self.entradas))
+
+    def _orientacao(self, orientacao: Orientacao, valores: Dict[str, object]) -> Optional[str]:
+        argumentos = []
+        try:
+            for argumento in orientacao.argumentos:
+                if argumento[0] == 'valor':
+                    argumentos.append(argumento[1])
+                elif argumento[0] == 'parametro':
+                    argumentos.append(self._instancia(argumento[1], valores))
+                else:
+                    tipo, alvo = self.entradas[argumento[1]][argumento[2]]
+                    argumentos.append(alvo if tipo == 'constante' else valores[alvo])
+        except KeyError:
+            return None  # Orientação depende de resposta ainda não dada
+        retorno = self.globais[orientacao.funcao](*argumentos)
+        return retorno[orientacao.indice] if orientacao.indice is not None else retorno
+
+    def _resultado(self, desfecho: Desfecho, motivos: List[str], valores: Dict[str, object]) -> Dict[str, Optional[str]]:
+        resultado = {}
+        for campo, valor in desfecho.campos:
+            if isinstance(valor, ModeloTexto):
+                valor = valor.modelo.replace('{motivos}', self.separador_motivos.join(motivos))
+            elif isinstance(valor, Orientacao):
+                valor = self._orientacao(valor, valores)
+            resultado[campo] = valor
+        return resultado
+
+    def avaliar(self, valores: Dict[str, object]) -> AvaliacaoRegras:
+        """Avalia os sinais de alerta e, se decidido, o desfecho de ``triage``"""
+        motivos, pendentes = [], set()
+        for regra in self.sinais_alerta:
+            resultado = regra.condicao.avaliar(valores)
+            if resultado:
+                motivos.append(regra.motivo)
+            elif resultado is None:
+                pendentes |= regra.variaveis
+
+        avaliacao = AvaliacaoRegras(self.modulo, None, motivos, frozenset(pendentes))
+        if motivos:
+            avaliacao.encaminhar, desfecho = True, self.desfechos['encaminhar']
+        elif not pendentes:
+            avaliacao.encaminhar, desfecho = False, self.desfechos['autocuidado']
+        else:
+            return avaliacao
+        avaliacao.acao = desfecho.acao
+        avaliacao.resultado = self._resultado(desfecho, motivos, valores)
+        return avaliacao
+
+    def avaliar_respostas(self, respostas: Iterable[Dict[str, object]], perfil: Dict[str, object]) -> AvaliacaoRegras:
+        valores, invalidas = self.valores_das_respostas(respostas, perfil)
+        avaliacao = self.avaliar(valores)
+        avaliacao.respostas_invalidas = invalidas
+        return avaliacao
+
+    def to_dict(self) -> Dict[str, object]:
+        """Representação declarativa em JSON"""
+        def desfecho_dict(desfecho: Desfecho):
+            campos = {}
+            for campo, valor in desfecho.campos:
+                if isinstance(valor, ModeloTexto):
+                    valor = {'modelo': valor.modelo}
+                elif isinstance(valor, Orientacao):
+                    valor = {'funcao': valor.funcao, 'argumentos': [list(a) for a in valor.argumentos],
+                             'indice': valor.indice}
+                campos[campo] = valor
+            return {'acao': desfecho.acao, 'campos': campos}
+
+        return {
+            'modulo': self.modulo,
+            'assinatura': self.assinatura,
+            'perguntas': [dataclasses.asdict(p) for p in self.perguntas],
+            'entradas': {
+                parametro: {
+                    campo: {tipo: alvo} for campo, (tipo, alvo) in campos.items()
+                } for parametro, campos in self.entradas.items()
+            },
+            'sinais_alerta': [{'motivo': r.motivo, 'condicao': r.condicao.to_dict()} for r in self.sinais_alerta],
+            'separador_motivos': self.separador_motivos,
+            'desfechos': {nome: desfecho_dict(d) for nome, d in self.desfechos.items()},
+            'variaveis_orientacao': sorted(self.variaveis_orientacao),
+        }
+
+
+# ==============================
+# COMPILAÇÃO
+# ==============================
+
+def _conversao(stmt: ast.stmt, call: ast.Call) -> str:
+    if isinstance(call.func, ast.Name) and call.func.id == 'ask_bool':
+        return 'bool'
+    valor = getattr(stmt, 'value', None)
+    if isinstance(valor, ast.Call) and isinstance(valor.func, ast.Name) and valor.func.id in ('int', 'float'):
+        return valor.func.id
+    return 'str'
+
+
+def _variavel(stmt: ast.stmt) -> Optional[str]:
+    if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+        return stmt.targets[0].id
+    return None
+
+
+def _valor_padrao(classe, campo: str):
+    for f in dataclasses.fields(classe):
+        if f.name == campo:
+            if f.default is not dataclasses.MISSING:
+                return f.default
+            if f.default_factory is not dataclasses.MISSING:
+                return f.default_factory()
+    raise ValueError(f"{classe.__name__}.{campo} sem valor em run_cli nem padrão")
+
+
+class _Compilador:
+    """Traduz o AST de um módulo de motor_de_perguntas em ``RegrasModulo``"""
+
+    def __init__(self, modulo: str):
+        self.modulo = modulo
+        self.caminho = os.path.join(MOTOR_DIR, f'{modulo}.py')
+        with open(self.caminho, 'r', encoding='utf-8') as f:
+            self.arvore = ast.parse(f.read(), filename=self.caminho)
+        self.objeto = importlib.import_module(f'{PACOTE_MOTOR}.{modulo}')
+        self.funcoes = {no.name: no for no in self.arvore.body if isinstance(no, ast.FunctionDef)}
+        self.funcao_alerta = next((self.funcoes[n] for n in FUNCOES_SINAIS_ALERTA if n in self.funcoes), None)
+        self.run_cli = find_run_cli_function(self.arvore)
+        if self.funcao_alerta is None or self.run_cli is None or 'triage' not in self.funcoes:
+            raise ValueError(f"Módulo {modulo} sem run_cli, triage ou função de sinais de alerta")
+        self.entradas: Dict[str, Dict[str, Tuple[str, object]]] = {}
+
+    def erro(self, no: ast.AST, mensagem: str) -> ValueError:
+        return ValueError(f"{self.modulo}.py:{getattr(no, 'lineno', '?')}: {mensagem}: {ast.unparse(no)}")
+
+    # ---------------------------------------------------------- perguntas
+
+    def perguntas(self) -> List[PerguntaRegra]:
+        """Perguntas em ordem, com a mesma numeração da variante filtrada do manifesto"""
+        perguntas, ordem = [], 0
+        for stmt, call, texto in iter_question_calls(self.run_cli):
+            pergunta_id = None
+            if not is_unnecessary_question(texto):
+                ordem += 1
+                pergunta_id = f"{self.modulo}_{ordem}"
+            perguntas.append(PerguntaRegra(_variavel(stmt), texto, _conversao(stmt, call), pergunta_id))
+        return perguntas
+
+    # ----------------------------------------------------------- entradas
+
+    def compilar_entradas(self, perguntas: List[PerguntaRegra]) -> Dict[str, str]:
+        """Liga os campos dos parâmetros de has_red_flags às variáveis de run_cli"""
+        # Constantes de run_cli (ex.: gest = False antes de uma pergunta condicional)
+        constantes = {
+            stmt.targets[0].id: stmt.value.value for stmt in self.run_cli.body
+            if _variavel(stmt) and isinstance(stmt.value, ast.Constant)
+        }
+        variaveis_perguntas = {p.variavel for p in perguntas}
+
+        # Construtores dos dataclasses: classe -> campo -> variável de run_cli
+        construtores = {}
+        for stmt in self.run_cli.body:
+            if _variavel(stmt) and isinstance(stmt.value, ast.Call) and isinstance(stmt.value.func, ast.Name):
+                classe = getattr(self.objeto, stmt.value.func.id, None)
+                if isinstance(classe, type) and dataclasses.is_dataclass(classe):
+                    nomes_campos = [f.name for f in dataclasses.fields(classe)]
+                    argumentos = {
+                        nomes_campos[i]: arg.id for i, arg in enumerate(stmt.value.args) if isinstance(arg, ast.Name)
+                    }
+                    argumentos.update(
+                        (kw.arg, kw.value.id) for kw in stmt.value.keywords if isinstance(kw.value, ast.Name)
+                    )
+                    construtores[classe.__name__] = argumentos
+
+        classes = {}
+        for argumento in self.funcao_alerta.args.args:
+            nome_classe = ast.unparse(argumento.annotation) if argumento.annotation else ''
+            classe = getattr(self.objeto, nome_classe, None)
+            if nome_classe not in construtores or classe is None:
+                raise self.erro(argumento, "parâmetro sem construtor em run_cli")
+            campos = {}
+            for f in dataclasses.fields(classe):
+                variavel = construtores[nome_classe].get(f.name)
+                if variavel is None:
+                    campos[f.name] = ('constante', _valor_padrao(classe, f.name))
+                elif variavel in constantes and variavel not in variaveis_perguntas:
+                    campos[f.name] = ('constante', constantes[variavel])
+                else:
+                    campos[f.name] = ('variavel', variavel)
+            self.entradas[argumento.arg] = campos
+            classes[argumento.arg] = nome_classe
+        return classes
+
+    # ---------------------------------------------------------- condições
+
+    def condicao(self, no: ast.expr) -> Condicao:
+        fonte = ast.unparse(no)
+        if isinstance(no, ast.BoolOp):
+            tipo = 'ou' if isinstance(no.op, ast.Or) else 'e'
+            return Condicao(tipo, tuple(self.condicao(v) for v in no.values), fonte=fonte)
+        if isinstance(no, ast.UnaryOp) and isinstance(no.op, ast.Not):
+            return Condicao('nao', (self.condicao(no.operand),), fonte=fonte)
+        if isinstance(no, ast.Compare):
+            return Condicao('comparar', tuple(self.condicao(v) for v in [no.left, *no.comparators]),
+                            operadores=tuple(type(op).__name__ for op in no.ops), fonte=fonte)
+        if isinstance(no, ast.Attribute) and isinstance(no.value, ast.Name) and no.value.id in self.entradas:
+            campos = self.entradas[no.value.id]
+            if no.attr not in campos:
+                raise self.erro(no, "campo inexistente")
+            tipo, alvo = campos[no.attr]
+            if tipo == 'constante':
+                return Condicao('valor', valor=alvo, fonte=fonte)
+            return Condicao('variavel', alvo=alvo, fonte=fonte)
+        try:
+            valor = ast.literal_eval(no)
+        except ValueError:
+            raise self.erro(no, "expressão não suportada nas regras")
+        if isinstance(valor, (list, set)):
+            valor = tuple(valor) if isinstance(valor, list) else frozenset(valor)
+        return Condicao('valor', valor=valor, fonte=fonte)
+
+    def sinais_alerta(self) -> Tuple[List[RegraAlerta], str]:
+        regras, separador = [], ' | '
+        for stmt in self.funcao_alerta.body:
+            if isinstance(stmt, ast.If) and not stmt.orelse and stmt.body and all(
+                    isinstance(b, ast.Expr) and isinstance(b.value, ast.Call)
+                    and isinstance(b.value.func, ast.Attribute) and b.value.func.attr == 'append'
+                    for b in stmt.body):
+                condicao = self.condicao(stmt.test)
+                for b in stmt.body:
+                    argumento = b.value.args[0]
+                    if not isinstance(argumento, ast.Constant):
+                        raise self.erro(argumento, "motivo não constante")
+                    regras.append(RegraAlerta(argumento.value, condicao))
+            elif isinstance(stmt, ast.If):
+                # if reasons: return True, " | ".join(reasons)
+                for sub in ast.walk(stmt):
+                    if (isinstance(sub, ast.Call) and isinstance(sub.func, ast.Attribute) and sub.func.attr == 'join'
+                            and isinstance(sub.func.value, ast.Constant)):
+                        separador = sub.func.value.value
+        return regras, separador
+
+    # ----------------------------------------------------------- desfechos
+
+    def _argumento(self, no: ast.expr, parametros: Dict[str, str]) -> tuple:
+        if isinstance(no, ast.Name) and no.id in parametros:
+            return ('parametro', parametros[no.id])
+        if isinstance(no, ast.Attribute) and isinstance(no.value, ast.Name) and no.value.id in parametros:
+            return ('campo', parametros[no.value.id], no.attr)
+        try:
+            return ('valor', ast.literal_eval(no))
+        except ValueError:
+            raise self.erro(no, "argumento de orientação não suportado")
+
+    def _desfecho(self, chamada: ast.Call, atribuicoes: Dict[str, Orientacao], motivo: Optional[str]) -> Desfecho:
+        campos, acao = [], None
+        for kw in chamada.keywords:
+            valor = kw.value
+            if isinstance(valor, ast.Constant):
+                if kw.arg == 'action':
+                    acao = valor.value
+                campos.append((kw.arg, valor.value))
+            elif isinstance(valor, ast.JoinedStr):
+                partes = []
+                for parte in valor.values:
+                    if isinstance(parte, ast.Constant):
+                        partes.append(parte.value)
+                    elif isinstance(parte, ast.FormattedValue) and isinstance(parte.value, ast.Name) \
+                            and parte.value.id == motivo:
+                        partes.append('{motivos}')
+                    else:
+                        raise self.erro(parte, "interpolação não suportada no desfecho")
+                campos.append((kw.arg, ModeloTexto(''.join(partes))))
+            elif isinstance(valor, ast.Name) and valor.id in atribuicoes:
+                campos.append((kw.arg, atribuicoes[valor.id]))
+            else:
+                raise self.erro(valor, "campo do desfecho não suportado")
+        if acao is None:
+            raise self.erro(chamada, "desfecho sem action constante")
+        return Desfecho(acao, tuple(campos))
+
+    def desfechos(self) -> Tuple[Dict[str, Desfecho], FrozenSet[Tuple[str, str]]]:
+        """Ramos de triage: encaminhamento (if red) e autocuidado (retorno final)"""
+        triage = self.funcoes['triage']
+        # Parâmetros de triage -> parâmetros de has_red_flags, pela posição na chamada
+        parametros, motivo, atribuicoes = {}, None, {}
+        desfechos, campos_lidos = {}, set()
+        for stmt in triage.body:
+            if isinstance(stmt, ast.Assign) and isinstance(stmt.value, ast.Call) \
+                    and isinstance(stmt.value.func, ast.Name) and stmt.value.func.id in FUNCOES_SINAIS_ALERTA:
+                for arg_triage, arg_alerta in zip(stmt.value.args, self.funcao_alerta.args.args):
+                    parametros[arg_triage.id] = arg_alerta.arg
+                alvo = stmt.targets[0]
+                if isinstance(alvo, ast.Tuple) and len(alvo.elts) == 2:
+                    motivo = alvo.elts[1].id
+            elif isinstance(stmt, ast.Assign) and isinstance(stmt.value, ast.Call) and isinstance(stmt.value.func, ast.Name):
+                funcao = stmt.value.func.id
+                argumentos = tuple(self._argumento(a, parametros) for a in stmt.value.args)
+                campos_lidos |= self._campos_orientacao(funcao, argumentos)
+                alvo = stmt.targets[0]
+                if isinstance(alvo, ast.Tuple):
+                    for i, elemento in enumerate(alvo.elts):
+                        atribuicoes[elemento.id] = Orientacao(funcao, argumentos, i)
+                else:
+                    atribuicoes[alvo.id] = Orientacao(funcao, argumentos)
+            elif isinstance(stmt, ast.If) and isinstance(stmt.body[-1], ast.Return):
+                desfechos['encaminhar'] = self._desfecho(stmt.body[-1].value, atribuicoes, motivo)
+            elif isinstance(stmt, ast.Return):
+                desfechos['autocuidado'] = self._desfecho(stmt.value, atribuicoes, motivo)
+        if set(desfechos) != {'encaminhar', 'autocuidado'}:
+            raise self.erro(triage, "triage sem os ramos de encaminhamento e autocuidado")
+        return desfechos, frozenset(campos_lidos)
+
+    def _campos_orientacao(self, funcao: str, argumentos: Tuple[tuple, ...]) -> set:
+        """(parâmetro, campo) lidos por uma função de orientação"""
+        campos = set()
+        no_funcao = self.funcoes.get(funcao)
+        for i, argumento in enumerate(argumentos):
+            if argumento[0] == 'campo':
+                campos.add((argumento[1], argumento[2]))
+            elif argumento[0] == 'parametro':
+                if no_funcao is None or i >= len(no_funcao.args.args):
+                    campos |= {(argumento[1], c) for c in self.entradas[argumento[1]]}
+                    continue
+                nome_local = no_funcao.args.args[i].arg
+                campos |= {
+                    (argumento[1], sub.attr) for sub in ast.walk(no_funcao)
+                    if isinstance(sub, ast.Attribute) and isinstance(sub.value, ast.Name) and sub.value.id == nome_local
+                }
+        return campos
+
+    # ------------------------------------------------------------- módulo
+
+    def compilar(self) -> RegrasModulo:
+        perguntas = self.perguntas()
+        classes = self.compilar_entradas(perguntas)
+
+        # Campo do perfil alimentado por cada variável (preenchimento pelo cadastro)
+        parametro_perfil = next((p for p, c in classes.items() if c == 'PatientProfile'), None)
+        perfil_por_variavel = {}
+        if parametro_perfil:
+            for campo, (tipo, alvo) in self.entradas[parametro_perfil].items():
+                if tipo == 'variavel':
+                    perfil_por_variavel.setdefault(alvo, campo)
+        perguntas = [dataclasses.replace(p, campo_perfil=perfil_por_variavel.get(p.variavel)) for p in perguntas]
+
+        regras, separador = self.sinais_alerta()
+        desfechos, campos_orientacao = self.desfechos()
+        variaveis_orientacao = frozenset(
+            self.entradas[p][c][1] for p, c in campos_orientacao
+            if c in self.entradas[p] and self.entradas[p][c][0] == 'variavel'
+        )
+
+        return RegrasModulo(
+            modulo=self.modulo,
+            assinatura=manifesto_perguntas.assinatura(self.modulo, True),
+            perguntas=tuple(perguntas),
+            entradas=self.entradas,
+            classes=classes,
+            sinais_alerta=tuple(regras),
+            separador_motivos=separador,
+            desfechos=desfechos,
+            variaveis_orientacao=variaveis_orientacao,
+            globais=vars(self.objeto),
+        )
+
+
+def compilar_regras(modulo: str) -> RegrasModulo:
+    """
+    Compila o módulo de motor_de_perguntas a partir do código-fonte.
+
+    Raises:
+        ValueError: se o módulo usa uma construção fora do subconjunto suportado
+    """
+    return _Compilador(modulo).compilar()
+
+
+# ==============================
+# VERIFICAÇÃO
+# ==============================
+
+def _valor_aleatorio(pergunta: PerguntaRegra, gerador: random.Random):
+    if pergunta.conversao == 'bool':
+        return gerador.random() < 0.2
+    if pergunta.conversao == 'float':
+        return gerador.choice([36.0, 37.5, 38.0, 38.5, 39.0, 39.5, 40.0, 41.0])
+    return gerador.choice([0, 1, 2, 3, 5, 7, 10, 14, 18, 21, 36, 45, 60, 65, 75, 240, 720])
+
+
+def verificar_regras(regras: RegrasModulo, amostras: int = 0, semente: int = 0) -> Dict[str, List[str]]:
+    """
+    Confere as regras com as perguntas extraídas pelo manifesto e, com
+    ``amostras`` > 0, com ``triage`` do próprio módulo em entradas aleatórias.
+
+    Returns:
+        {'erros': [...], 'avisos': [...]}
+    """
+    erros, avisos = [], []
+    for filtrar, perguntas_regra in ((False, regras.perguntas), (True, regras.perguntas_visiveis)):
+        extraidas = manifesto_perguntas.perguntas(regras.modulo, filtrar=filtrar)
+        if len(extraidas) != len(perguntas_regra):
+            erros.append(f"{len(extraidas)} perguntas extraídas (filtrar={filtrar}) e {len(perguntas_regra)} nas regras")
+        for extraida, pergunta in zip(extraidas, perguntas_regra):
+            if extraida['texto'] != pergunta.texto:
+                erros.append(f"{extraida['id']}: texto '{extraida['texto']}' != '{pergunta.texto}'")
+            elif filtrar and extraida['id'] != pergunta.id:
+                erros.append(f"{pergunta.texto}: id {extraida['id']} != {pergunta.id}")
+            elif (extraida['tipo'] == 'boolean') != (pergunta.conversao == 'bool'):
+                erros.append(f"{extraida['id']}: tipo {extraida['tipo']} e conversão {pergunta.conversao}")
+
+    variaveis_perguntas = {p.variavel for p in regras.perguntas if p.variavel}
+    for parametro, campos in regras.entradas.items():
+        for campo, (tipo, alvo) in campos.items():
+            if tipo == 'variavel' and alvo not in variaveis_perguntas:
+                erros.append(f"{parametro}.{campo}: variável '{alvo}' sem pergunta em run_cli")
+
+    usadas = regras.variaveis_orientacao.union(*(r.variaveis for r in regras.sinais_alerta))
+    for pergunta in regras.perguntas_visiveis:
+        if pergunta.variavel not in usadas:
+            avisos.append(f"{pergunta.id} ('{pergunta.texto}') não é usada por nenhuma regra ou orientação")
+
+    if amostras:
+        gerador = random.Random(semente)
+        for _ in range(amostras):
+            valores = {p.variavel: _valor_aleatorio(p, gerador) for p in regras.perguntas if p.variavel}
+            esperado = regras.executar_triage(valores)
+            avaliacao = regras.avaliar(valores)
+            obtido = {'action': avaliacao.acao, **avaliacao.resultado}
+            divergentes = [c for c, v in obtido.items() if getattr(esperado, c, None) != v]
+            if divergentes:
+                erros.append(f"Divergência com triage() em {', '.join(divergentes)} para {valores}")
+                break
+    return {'erros': erros, 'avisos': avisos}
+
+
+# ==============================
+# MOTOR
+# ==============================
+
+class MotorRegras:
+    """Regras compiladas sob demanda e avaliação de respostas e consultas gravadas"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._regras: Dict[str, RegrasModulo] = {}
+
+    def regras(self, modulo: str) -> RegrasModulo:
+        """
+        Regras do módulo, recompiladas quando o módulo ou os pesos mudam.
+
+        Raises:
+            FileNotFoundError: se o módulo não existir
+        """
+        assinatura = manifesto_perguntas.assinatura(modulo, True)
+        regras = self._regras.get(modulo)
+        if regras is not None and regras.assinatura == assinatura:
+            return regras
+        with self._lock:
+            regras = self._regras.get(modulo)
+            if regras is None or regras.assinatura != assinatura:
+                regras = compilar_regras(modulo)
+                self._regras[modulo] = regras
+                erros = verificar_regras(regras)['erros']
+                if erros:
+                    logger.error(f"Regras de {modulo} não conferem com as perguntas extraídas: {'; '.join(erros)}")
+                logger.info(f"Regras de {modulo} compiladas: {len(regras.perguntas_visiveis)} perguntas, "
+                            f"{len(regras.sinais_alerta)} sinais de alerta")
+            return regras
+
+    def avaliar_respostas(self, modulo: str, respostas: Iterable[Dict[str, object]],
+                          perfil: Dict[str, object]) -> AvaliacaoRegras:
+        """Avalia respostas no formato {'pergunta_id', 'resposta'} do motor"""
+        return self.regras(modulo).avaliar_respostas(respostas, perfil)
+
+    def avaliar_consultas(self, ids_consulta: Iterable[int], tamanho_lote: int = 500) -> Dict[int, AvaliacaoRegras]:
+        """
+        Avalia as consultas gravadas a partir das respostas, em duas consultas
+        SQL por lote. Consultas sem módulo de motor_de_perguntas (ex.: 'geral')
+        ficam fora do resultado.
+        """
+        from services.pontuacao_consultas import modulo_das_observacoes
+
+        ids = list(dict.fromkeys(ids_consulta))
+        modulos_existentes = set(manifesto_perguntas.modulos())
+        avaliacoes = {}
+        for inicio in range(0, len(ids), tamanho_lote):
+            lote = ids[inicio:inicio + tamanho_lote]
+            linhas = db.session.query(
+                Consulta.id, Consulta.observacoes, Paciente.idade, Paciente.sexo,
+                func.coalesce(ConsultaPontuacao.modulo, Consulta.modulo)
+            ).join(
+                Paciente, Consulta.id_paciente == Paciente.id
+            ).outerjoin(
+                ConsultaPontuacao, ConsultaPontuacao.id_consulta == Consulta.id
+            ).filter(Consulta.id.in_(lote)).all()
+
+            respostas = defaultdict(list)
+            for id_consulta, resposta, texto in db.session.query(
+                ConsultaResposta.id_consulta, ConsultaResposta.resposta, Pergunta.texto
+            ).join(
+                Pergunta, Pergunta.id == ConsultaResposta.id_pergunta
+            ).filter(
+                ConsultaResposta.id_consulta.in_(lote)
+            ).order_by(ConsultaResposta.id_consulta, ConsultaResposta.id):
+                respostas[id_consulta].append({'pergunta_id': texto, 'resposta': resposta or ''})
+
+            for id_consulta, observacoes, idade, sexo, modulo in linhas:
+                modulo = modulo or modulo_das_observacoes(observacoes)
+                if modulo not in modulos_existentes:
+                    continue
+                perfil = get_patient_profile_from_cadastro({'idade': idade or 0, 'sexo': sexo})
+                avaliacoes[id_consulta] = self.regras(modulo).avaliar_respostas(respostas[id_consulta], perfil)
+        return avaliacoes
+
+
+# Instância global
+motor_regras = MotorRegras()
@@ -5,5 +5,11 @@
 Este pacote contém utilitários e helpers do sistema:
 - scoring/: Sistema de pontuação
 - extractors/: Extratores de dados
+- benchmarks/: Medições de desempenho
+- texto.py: Normalização de texto
+- recarregamento.py: Recarga de arquivos de dados por mtime
+- cache.py: Cache LRU/TTL em memória
+- http_cache.py: Respostas JSON com ETag/304 e Cache-Control
+- tfidf_leve.py: TF-IDF/cosseno apenas com NumPy (sem scikit-learn)
 - Scripts de importação e manutenção
 """
@@ -0,0 +1,10 @@
+"""
+Benchmarks - Medições de desempenho
+===================================
+
+Este pacote contém scripts de medição de desempenho dos caminhos críticos:
+- tabelas_recomendacoes.py: Custo por chamada das tabelas fixas de recomendações
+- inicializacao_tfidf.py: Inicialização e memória dos motores TF-IDF (sklearn x leve)
+- fuzzing_triagem.py: Encaminhamento dos módulos x pontuação em combinações de respostas (multiprocessing)
+- persistencia_triagem.py: Triagens por segundo com 1/4/16 clientes, gravação anterior x transação única em lote
+"""
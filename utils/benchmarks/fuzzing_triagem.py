@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fuzzing das Respostas da Triagem: Módulos x Pontuação
+=====================================================
+
+Gera combinações de respostas para cada módulo de ``motor_de_perguntas`` e
+decide o encaminhamento de cada combinação por três caminhos:
+
+- a lógica do próprio módulo (``triage`` / ``has_red_flags``), executada com
+  os dataclasses preenchidos;
+- ``TriagemScoring.calculate_score``: perguntas ``critica`` respondidas com
+  "sim" ou pontuação acima do limiar de encaminhamento;
+- as regras declarativas compiladas (``RegrasModulo.avaliar``).
+
+São relatadas as taxas de divergência entre a pontuação e o módulo, em dois
+sentidos. No primeiro, o módulo encaminha e a pontuação não: são listados os
+motivos do módulo sem pergunta crítica correspondente. No segundo, a pontuação
+encaminha e o módulo não: são listadas as perguntas críticas ou o limiar
+responsáveis. Também são relatadas a vazão em avaliações por segundo e a
+divergência das regras declarativas, que deve ser sempre zero.
+
+Modos de geração:
+
+- aleatório: cada pergunta booleana é "sim" com probabilidade ``--prob-sim``;
+  as numéricas sorteiam valores em torno dos limites usados nas regras
+  (ex.: ``duration_days > 3`` gera 2, 3 e 4);
+- exaustivo (``--exaustivo K``): todas as combinações com até K respostas
+  diferentes da linha de base ("não" e o menor valor numérico), para cada
+  perfil de paciente.
+
+As combinações são divididas em tarefas e avaliadas em um ``multiprocessing.Pool``.
+Com ``--falhar-acima``, a saída é 1 quando a divergência de algum módulo passa
+do limite (uso em CI).
+
+Uso:
+    python utils/benchmarks/fuzzing_triagem.py [--modulo febre] [--casos 20000] [--exaustivo 2]
+                                               [--processos 4] [--falhar-acima 0.10] [--json saida.json]
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, RAIZ)
+
+# (idade em anos, sexo) do cadastro, convertidos por get_patient_profile_from_cadastro
+PERFIS = ((4, 'M'), (16, 'F'), (30, 'F'), (45, 'M'), (80, 'F'))
+TAMANHO_TAREFA = 2000
+EXEMPLOS_POR_MODULO = 3
+
+_regras = {}
+
+
+def _inicializar_processo(modulos):
+    """Compila as regras uma vez por processo"""
+    logging.disable(logging.WARNING)
+    from services.triagem.regras_modulos import motor_regras
+    for modulo in modulos:
+        _regras[modulo] = motor_regras.regras(modulo)
+
+
+# ==============================
+# GERAÇÃO DAS RESPOSTAS
+# ==============================
+
+def dominio(regras, pergunta):
+    """Valores candidatos de uma pergunta: 'sim'/'nao' ou valores nos limites das regras"""
+    if pergunta.conversao == 'bool':
+        return ('nao', 'sim')
+
+    passo = 0.5 if pergunta.conversao == 'float' else 1
+    limites = set()
+
+    def visitar(condicao):
+        if condicao.tipo == 'comparar' and any(f.tipo == 'variavel' and f.alvo == pergunta.variavel
+                                               for f in condicao.filhos):
+            for filho in condicao.filhos:
+                if filho.tipo == 'valor' and isinstance(filho.valor, (int, float)) and not isinstance(filho.valor, bool):
+                    limites.update((filho.valor - passo, filho.valor, filho.valor + passo))
+        for filho in condicao.filhos:
+            visitar(filho)
+
+    for regra in regras.sinais_alerta:
+        visitar(regra.condicao)
+    valores = sorted(v for v in limites if v >= 0) or [0, 1, 3, 7, 30]
+    return tuple(str(int(v)) if pergunta.conversao == 'int' else str(v) for v in valores)
+
+
+def _respostas_aleatorias(regras, dominios, gerador, prob_sim):
+    respostas = []
+    for pergunta in regras.perguntas_visiveis:
+        valores = dominios[pergunta.id]
+        if pergunta.conversao == 'bool':
+            resposta = 'sim' if gerador.random() < prob_sim else 'nao'
+        else:
+            resposta = gerador.choice(valores)
+        respostas.append({'pergunta_id': pergunta.id, 'resposta': resposta})
+    return respostas
+
+
+def _combinacoes_exaustivas(regras, dominios, k):
+    """Todas as combinações com até k respostas fora da linha de base, para cada perfil"""
+    perguntas = regras.perguntas_visiveis
+    base = [dominios[p.id][0] for p in perguntas]
+    for idade, sexo in PERFIS:
+        for quantidade in range(k + 1):
+            for indices in itertools.combinations(range(len(perguntas)), quantidade):
+                for valores in itertools.product(*(dominios[perguntas[i].id][1:] for i in indices)):
+                    respostas = list(base)
+                    for i, valor in zip(indices, valores):
+                        respostas[i] = valor
+                    yield (idade, sexo), [
+                        {'pergunta_id': p.id, 'resposta': r} for p, r in zip(perguntas, respostas)
+                    ]
+
+
+def contar_exaustivas(regras, dominios, k) -> int:
+    tamanhos = [len(dominios[p.id]) - 1 for p in regras.perguntas_visiveis]
+    total = 0
+    for quantidade in range(k + 1):
+        for indices in itertools.combinations(range(len(tamanhos)), quantidade):
+            produto = 1
+            for i in indices:
+                produto *= tamanhos[i]
+            total += produto
+    return total * len(PERFIS)
+
+
+# ==============================
+# AVALIAÇÃO
+# ==============================
+
+def _avaliar_tarefa(tarefa):
+    """Avalia um lote de combinações (executado nos processos do pool)"""
+    from utils.extractors.perguntas_extractor import get_patient_profile_from_cadastro
+    from utils.scoring.triagem_scoring import scoring_system
+
+    modo, modulo = tarefa[0], tarefa[1]
+    regras = _regras[modulo]
+    dominios = {p.id: dominio(regras, p) for p in regras.perguntas_visiveis}
+    perfis = {perfil: get_patient_profile_from_cadastro({'idade': perfil[0], 'sexo': perfil[1]}) for perfil in PERFIS}
+
+    if modo == 'aleatorio':
+        _, _, semente, quantidade, prob_sim = tarefa
+        gerador = random.Random(semente)
+        casos = (
+            (gerador.choice(PERFIS), _respostas_aleatorias(regras, dominios, gerador, prob_sim))
+            for _ in range(quantidade)
+        )
+    else:
+        _, _, k, inicio, fim = tarefa
+        casos = itertools.islice(_combinacoes_exaustivas(regras, dominios, k), inicio, fim)
+
+    criticas = {
+        pergunta_id for pergunta_id, peso in scoring_system.tabela_pesos.question_weights.items() if peso.critical
+    }
+    resultado = {
+        'modulo': modulo, 'casos': 0, 'encaminha_modulo': 0, 'encaminha_pontuacao': 0,
+        'so_modulo': 0, 'so_pontuacao': 0, 'divergencias_regras': 0,
+        'motivos_sem_critica': Counter(), 'causas_pontuacao': Counter(),
+        'tempo_modulo': 0.0, 'tempo_pontuacao': 0.0, 'exemplos': [],
+    }
+    for perfil_cadastro, respostas in casos:
+        perfil = perfis[perfil_cadastro]
+
+        inicio_modulo = time.perf_counter()
+        valores, _ = regras.valores_das_respostas(respostas, perfil)
+        triagem = regras.executar_triage(valores)
+        resultado['tempo_modulo'] += time.perf_counter() - inicio_modulo
+
+        inicio_pontuacao = time.perf_counter()
+        pontuacao = scoring_system.calculate_score(modulo, respostas, perfil)
+        resultado['tempo_pontuacao'] += time.perf_counter() - inicio_pontuacao
+
+        encaminha_modulo = triagem.action == 'ENCAMINHAR'
+        avaliacao = regras.avaliar(valores)
+        resultado['casos'] += 1
+        resultado['encaminha_modulo'] += encaminha_modulo
+        resultado['encaminha_pontuacao'] += pontuacao.encaminhamento
+        resultado['divergencias_regras'] += avaliacao.encaminhar != encaminha_modulo
+
+        if encaminha_modulo == pontuacao.encaminhamento:
+            continue
+        if encaminha_modulo:
+            resultado['so_modulo'] += 1
+            resultado['motivos_sem_critica'].update(avaliacao.motivos)
+        else:
+            resultado['so_pontuacao'] += 1
+            acionadas = [r['pergunta_id'] for r in respostas if r['pergunta_id'] in criticas and r['resposta'] == 'sim']
+            resultado['causas_pontuacao'].update(acionadas or ['limiar de pontuação'])
+        if len(resultado['exemplos']) < EXEMPLOS_POR_MODULO:
+            resultado['exemplos'].append({
+                'perfil': perfil_cadastro,
+                'modulo_encaminha': encaminha_modulo,
+                'motivos': avaliacao.motivos,
+                'pontuacao': round(pontuacao.total_score, 2),
+                'positivas': [r for r in respostas if r['resposta'] not in ('nao', dominios[r['pergunta_id']][0])],
+            })
+    return resultado
+
+
+def _somar(total, parcial):
+    for chave, valor in parcial.items():
+        if chave == 'modulo':
+            continue
+        if chave == 'exemplos':
+            total[chave].extend(valor[:EXEMPLOS_POR_MODULO - len(total[chave])])
+        elif isinstance(valor, Counter):
+            total.setdefault(chave, Counter()).update(valor)
+        else:
+            total[chave] = total.get(chave, 0) + valor
+
+
+def executar(modulos=None, casos=20000, exaustivo=0, processos=None, prob_sim=0.05, semente=42):
+    """Gera as tarefas, avalia no pool e devolve os totais por módulo e a duração"""
+    from services.triagem.regras_modulos import motor_regras
+    from utils.extractors.manifesto_perguntas import manifesto_perguntas
+
+    logging.disable(logging.WARNING)
+    modulos = modulos or list(manifesto_perguntas.modulos())
+    tarefas = []
+    for indice, modulo in enumerate(modulos):
+        if exaustivo:
+            regras = motor_regras.regras(modulo)
+            dominios = {p.id: dominio(regras, p) for p in regras.perguntas_visiveis}
+            total = contar_exaustivas(regras, dominios, exaustivo)
+            tarefas += [('exaustivo', modulo, exaustivo, i, min(i + TAMANHO_TAREFA, total))
+                        for i in range(0, total, TAMANHO_TAREFA)]
+        else:
+            tarefas += [('aleatorio', modulo, semente + indice * 100003 + i, min(TAMANHO_TAREFA, casos - i), prob_sim)
+                        for i in range(0, casos, TAMANHO_TAREFA)]
+
+    totais = {m: {'exemplos': []} for m in modulos}
+    processos = processos or os.cpu_count() or 1
+    inicio = time.perf_counter()
+    if processos == 1:
+        _inicializar_processo(modulos)
+        parciais = map(_avaliar_tarefa, tarefas)
+        for parcial in parciais:
+            _somar(totais[parcial['modulo']], parcial)
+    else:
+        with multiprocessing.Pool(processos, initializer=_inicializar_processo, initargs=(modulos,)) as pool:
+            for parcial in pool.imap_unordered(_avaliar_tarefa, tarefas):
+                _somar(totais[parcial['modulo']], parcial)
+    return totais, time.perf_counter() - inicio, processos
+
+
+def _taxa(parte, total):
+    return parte / total if total else 0.0
+
+
+def relatar(totais, duracao, processos):
+    print("=" * 100)
+    print("  FUZZING DA TRIAGEM: MÓDULOS x PONTUAÇÃO")
+    print("=" * 100)
+    print(f"{'Módulo':<26}{'Casos':>9}{'Enc.mód':>9}{'Enc.pont':>10}{'Diverg.':>9}"
+          f"{'Só mód':>9}{'Só pont':>9}{'Regras':>8}")
+    print("-" * 100)
+    casos = sum(t.get('casos', 0) for t in totais.values())
+    for modulo, t in totais.items():
+        n = t.get('casos', 0)
+        print(f"{modulo:<26}{n:>9}{_taxa(t.get('encaminha_modulo', 0), n):>9.1%}"
+              f"{_taxa(t.get('encaminha_pontuacao', 0), n):>10.1%}"
+              f"{_taxa(t.get('so_modulo', 0) + t.get('so_pontuacao', 0), n):>9.1%}"
+              f"{_taxa(t.get('so_modulo', 0), n):>9.1%}{_taxa(t.get('so_pontuacao', 0), n):>9.1%}"
+              f"{t.get('divergencias_regras', 0):>8}")
+
+    print("\nMotivos do módulo sem pergunta crítica correspondente (encaminha só o módulo):")
+    for modulo, t in totais.items():
+        motivos = t.get('motivos_sem_critica', Counter()).most_common(3)
+        if motivos:
+            print(f"   {modulo}: " + "; ".join(f"{m} ({c})" for m, c in motivos))
+    print("\nCausas de encaminhamento só pela pontuação:")
+    for modulo, t in totais.items():
+        causas = t.get('causas_pontuacao', Counter()).most_common(3)
+        if causas:
+            print(f"   {modulo}: " + "; ".join(f"{m} ({c})" for m, c in causas))
+
+    tempo_modulo = sum(t.get('tempo_modulo', 0.0) for t in totais.values())
+    tempo_pontuacao = sum(t.get('tempo_pontuacao', 0.0) for t in totais.values())
+    print("\n" + "-" * 100)
+    print(f"Casos: {casos} em {duracao:.2f}s com {processos} processo(s): {_taxa(casos, duracao):,.0f} casos/s")
+    print(f"Por núcleo: módulo {_taxa(casos, tempo_modulo):,.0f} avaliações/s | "
+          f"calculate_score {_taxa(casos, tempo_pontuacao):,.0f} avaliações/s")
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara o encaminhamento dos módulos com o da pontuação")
+    parser.add_argument('--modulo', action='append', help="Módulo a testar (pode repetir; padrão: todos)")
+    parser.add_argument('--casos', type=int, default=20000, help="Casos aleatórios por módulo")
+    parser.add_argument('--exaustivo', type=int, default=0,
+                        help="Enumerar todas as combinações com até K respostas fora da linha de base")
+    parser.add_argument('--prob-sim', type=float, default=0.05, help="Probabilidade de 'sim' no modo aleatório")
+    parser.add_argument('--processos', type=int, help="Processos do pool (padrão: número de CPUs)")
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--falhar-acima', type=float,
+                        help="Sair com código 1 se a divergência de algum módulo passar desta fração")
+    parser.add_argument('--json', help="Gravar os totais em JSON")
+    args = parser.parse_args()
+
+    try:
+        totais, duracao, processos = executar(args.modulo, args.casos, args.exaustivo, args.processos,
+                                              args.prob_sim, args.semente)
+        relatar(totais, duracao, processos)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump({'duracao': duracao, 'processos': processos, 'modulos': totais},
+                          f, ensure_ascii=False, indent=2)
+
+        falhas = [m for m, t in totais.items() if t.get('divergencias_regras', 0) or (
+            args.falhar_acima is not None
+            and _taxa(t.get('so_modulo', 0) + t.get('so_pontuacao', 0), t.get('casos', 0)) > args.falhar_acima
+        )]
+        if falhas:
+            print(f"\n❌ Divergência acima do limite em: {', '.join(falhas)}")
+            sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Erro durante o fuzzing: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de Inicialização da Busca Semântica
+=============================================
+
+Compara os modos de ``TFIDF_MODO`` ('sklearn' e 'leve'), cada um em um
+processo novo, medindo:
+
+- o tempo de import de ``services.recomendacoes_farmacologicas``;
+- o tempo da primeira busca (que importa o motor e ajusta o índice);
+- o tempo médio das buscas seguintes;
+- a memória residente máxima do processo.
+
+O catálogo é sintético (gerado a partir dos medicamentos simulados), para que
+o benchmark não dependa do banco de dados.
+
+Uso:
+    python utils/benchmarks/inicializacao_tfidf.py [--documentos 5000] [--consultas 200]
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, RAIZ)
+
+MODOS = ['sklearn', 'leve']
+
+
+def _memoria_maxima_mb() -> float:
+    """Memória residente máxima do processo (ru_maxrss é KB no Linux, bytes no macOS)"""
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+
+
+def medir_modo(documentos: int, consultas: int) -> dict:
+    """Executado no processo filho, com TFIDF_MODO já definido no ambiente"""
+    inicio = time.perf_counter()
+    from services.recomendacoes_farmacologicas import sistema_recomendacoes
+    from services.catalogo_medicamentos import indice_catalogo
+    tempo_import = time.perf_counter() - inicio
+
+    random.seed(42)
+    palavras = " ".join(
+        f"{m.nome_comercial} {m.nome_generico} {m.indicacao}"
+        for m in sistema_recomendacoes._get_medicamentos_simulados()
+    ).split()
+    textos = tuple(" ".join(random.choices(palavras, k=random.randint(3, 15))) for _ in range(documentos))
+    buscas = [" ".join(random.choices(palavras, k=random.randint(1, 8))) for _ in range(consultas)]
+
+    inicio = time.perf_counter()
+    indice_catalogo.buscar(buscas[0], textos, limiar=0.25, limite=50)
+    tempo_primeira = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for busca in buscas:
+        indice_catalogo.buscar(busca, textos, limiar=0.25, limite=50)
+    tempo_medio = (time.perf_counter() - inicio) / len(buscas)
+
+    return {
+        'import_s': tempo_import,
+        'primeira_busca_s': tempo_primeira,
+        'busca_media_ms': tempo_medio * 1000,
+        'memoria_mb': _memoria_maxima_mb(),
+        'sklearn_carregado': 'sklearn' in sys.modules,
+    }
+
+
+def executar_benchmark(documentos: int, consultas: int):
+    print("=" * 70)
+    print("  BENCHMARK - INICIALIZAÇÃO DA BUSCA SEMÂNTICA")
+    print("=" * 70)
+    print(f"Documentos: {documentos} | Consultas: {consultas}\n")
+    print(f"{'Modo':<10}{'Import (s)':>12}{'1ª busca (s)':>14}{'Busca (ms)':>12}{'RSS (MB)':>10}  sklearn")
+
+    for modo in MODOS:
+        ambiente = dict(os.environ, TFIDF_MODO=modo)
+        processo = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--filho',
+             '--documentos', str(documentos), '--consultas', str(consultas)],
+            env=ambiente, cwd=RAIZ, capture_output=True, text=True, check=True
+        )
+        r = json.loads(processo.stdout.strip().splitlines()[-1])
+        print(f"{modo:<10}{r['import_s']:>12.3f}{r['primeira_busca_s']:>14.3f}"
+              f"{r['busca_media_ms']:>12.3f}{r['memoria_mb']:>10.1f}  {'sim' if r['sklearn_carregado'] else 'não'}")
+
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização da busca semântica")
+    parser.add_argument('--documentos', type=int, default=5000, help="Tamanho do catálogo sintético")
+    parser.add_argument('--consultas', type=int, default=200, help="Buscas medidas após a primeira")
+    parser.add_argument('--filho', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    try:
+        if args.filho:
+            # Silenciar logs no filho: a última linha da saída é o resultado em JSON
+            import logging
+            logging.disable(logging.CRITICAL)
+            print(json.dumps(medir_modo(args.documentos, args.consultas)))
+        else:
+            executar_benchmark(args.documentos, args.consultas)
+    except Exception as e:
+        print(f"\n❌ Erro durante o benchmark: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
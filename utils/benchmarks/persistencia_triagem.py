@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de Persistência da Triagem
+====================================
+
+Mede triagens por segundo em ``POST /triagem/processar`` com 1, 4 e 16
+clientes simultâneos (threads com ``app.test_client()``), comparando:
+
+- 'anterior': o fluxo antigo, reproduzido aqui: commit da consulta, um
+  ``session.add`` por resposta e por recomendação e um segundo commit;
+- 'lote': ``_persistir_triagem`` (uma transação, flush para obter o id da
+  consulta e INSERTs em lote para respostas e recomendações).
+
+Todo o resto do endpoint (pontuação, recomendações, registro de perguntas) é
+o mesmo nos dois modos. O banco é um SQLite temporário em arquivo, com os
+medicamentos simulados, para que o commit inclua o custo real de sincronizar
+o arquivo.
+
+Uso:
+    python utils/benchmarks/persistencia_triagem.py [--triagens 40] [--clientes 1 4 16] [--modulo febre]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, RAIZ)
+
+from core.config import Config
+
+ARQUIVO_BANCO = os.path.join(tempfile.mkdtemp(prefix='bench_triagem_'), 'triagem.db')
+Config.SQLALCHEMY_DATABASE_URI = f'sqlite:///{ARQUIVO_BANCO}'
+
+import core.app as aplicacao
+from core.app import app
+from models.models import db, Consulta, ConsultaRecomendacao, ConsultaResposta, Medicamento, Paciente
+from services.pontuacao_consultas import registrar_pontuacao
+from utils.extractors.manifesto_perguntas import manifesto_perguntas
+
+
+def _persistir_anterior(paciente, modulo_usado, respostas, ids_por_slug, triagem_result, scoring_result):
+    """Fluxo de gravação anterior a _persistir_triagem (dois commits, um add por linha)"""
+    consulta = Consulta(id_paciente=paciente.id, data=datetime.now())
+    db.session.add(consulta)
+    db.session.commit()
+
+    for resposta_data in respostas:
+        pergunta_id_str = str(resposta_data['pergunta_id'])
+        db.session.add(ConsultaResposta(
+            id_consulta=consulta.id,
+            id_pergunta=int(pergunta_id_str) if pergunta_id_str.isdigit() else ids_por_slug[pergunta_id_str],
+            resposta=resposta_data['resposta']
+        ))
+
+    consulta.encaminhamento = triagem_result['encaminhamento_medico']
+    consulta.motivo_encaminhamento = triagem_result.get('motivo_encaminhamento')
+    consulta.observacoes = '\n'.join([f'MODULO: {modulo_usado}'] + triagem_result.get('observacoes', []))
+    registrar_pontuacao(consulta, modulo_usado, scoring_result)
+
+    for rec in triagem_result.get('recomendacoes_medicamentos', []):
+        db.session.add(ConsultaRecomendacao(id_consulta=consulta.id, tipo='medicamento',
+                                            descricao=rec['medicamento'], justificativa=rec['justificativa']))
+    for rec in triagem_result.get('recomendacoes_nao_farmacologicas', []):
+        db.session.add(ConsultaRecomendacao(id_consulta=consulta.id, tipo='nao_farmacologico',
+                                            descricao=rec['descricao'], justificativa=rec['justificativa']))
+    if triagem_result['encaminhamento_medico']:
+        db.session.add(ConsultaRecomendacao(id_consulta=consulta.id, tipo='encaminhamento',
+                                            descricao='Encaminhamento médico',
+                                            justificativa=triagem_result.get('motivo_encaminhamento')))
+    db.session.commit()
+    return consulta
+
+
+MODOS = {
+    'anterior': _persistir_anterior,
+    'lote': aplicacao._persistir_triagem,
+}
+
+
+def _preparar_banco(pacientes: int = 50):
+    from services.recomendacoes_farmacologicas import sistema_recomendacoes
+    with app.app_context():
+        db.create_all()
+        for m in sistema_recomendacoes._get_medicamentos_simulados():
+            db.session.add(Medicamento(nome_comercial=m.nome_comercial, nome_generico=m.nome_generico,
+                                       indicacao=m.indicacao, tipo='farmacologico', ativo=True))
+        for i in range(pacientes):
+            db.session.add(Paciente(nome=f'Paciente {i}', idade=random.randint(1, 90),
+                                    sexo=random.choice(['M', 'F']), cidade='Cidade', bairro='Centro'))
+        db.session.commit()
+
+
+def _payloads(modulo: str, quantidade: int, pacientes: int = 50) -> list:
+    """Triagens com respostas aleatórias às perguntas do módulo"""
+    perguntas = manifesto_perguntas.perguntas(modulo, filtrar=True)
+    payloads = []
+    for _ in range(quantidade):
+        respostas = []
+        for pergunta in perguntas:
+            if pergunta.get('tipo') == 'boolean':
+                resposta = random.choice(['sim', 'nao'])
+            else:
+                resposta = str(random.randint(0, 10))  # perguntas abertas dos módulos são numéricas
+            respostas.append({'pergunta_id': pergunta['id'], 'resposta': resposta})
+        payloads.append({'paciente_id': random.randint(1, pacientes), 'modulo': modulo, 'respostas': respostas})
+    return payloads
+
+
+def medir(modo: str, clientes: int, triagens: int, modulo: str) -> dict:
+    """Cada cliente envia ``triagens`` triagens em sequência; os clientes rodam em paralelo"""
+    aplicacao._persistir_triagem = MODOS[modo]
+    latencias, erros = [], []
+    lock = threading.Lock()
+    barreira = threading.Barrier(clientes + 1)
+
+    def cliente(payloads):
+        c = app.test_client()
+        with c.session_transaction() as sess:
+            sess['user_id'] = 1
+        barreira.wait()
+        for payload in payloads:
+            inicio = time.perf_counter()
+            resposta = c.post('/triagem/processar', json=payload)
+            duracao = time.perf_counter() - inicio
+            with lock:
+                if resposta.status_code == 200 and resposta.get_json().get('success'):
+                    latencias.append(duracao)
+                else:
+                    erros.append((resposta.get_json() or {}).get('error', resposta.status_code))
+
+    threads = [threading.Thread(target=cliente, args=(_payloads(modulo, triagens),)) for _ in range(clientes)]
+    for t in threads:
+        t.start()
+    barreira.wait()
+    inicio = time.perf_counter()
+    for t in threads:
+        t.join()
+    total = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        'modo': modo,
+        'clientes': clientes,
+        'triagens': len(latencias),
+        'erros': len(erros),
+        'exemplo_erro': str(erros[0]) if erros else None,
+        'triagens_por_s': len(latencias) / total if total else 0.0,
+        'latencia_p50_ms': statistics.median(latencias) * 1000 if latencias else None,
+        'latencia_p95_ms': latencias[int(len(latencias) * 0.95) - 1] * 1000 if latencias else None,
+    }
+
+
+def executar_benchmark(triagens: int, clientes: list, modulo: str, saida_json: bool = False):
+    random.seed(42)
+    _preparar_banco()
+    original = aplicacao._persistir_triagem
+
+    resultados = []
+    try:
+        # Aquecimento: registra as perguntas do módulo e carrega catálogos e caches
+        medir('lote', 1, 3, modulo)
+        for n in clientes:
+            for modo in MODOS:
+                resultados.append(medir(modo, n, triagens, modulo))
+    finally:
+        aplicacao._persistir_triagem = original
+
+    if saida_json:
+        print(json.dumps(resultados, ensure_ascii=False, indent=2))
+        return resultados
+
+    print("=" * 70)
+    print("  BENCHMARK - PERSISTÊNCIA DA TRIAGEM")
+    print("=" * 70)
+    print(f"Módulo: {modulo} | Triagens por cliente: {triagens} | Banco: {ARQUIVO_BANCO}\n")
+    print(f"{'Clientes':>8} {'Modo':<10} {'Triagens/s':>11} {'p50 (ms)':>9} {'p95 (ms)':>9} {'Erros':>6}")
+    print("-" * 70)
+    por_chave = {(r['clientes'], r['modo']): r for r in resultados}
+    for r in resultados:
+        print(f"{r['clientes']:>8} {r['modo']:<10} {r['triagens_por_s']:>11.1f} "
+              f"{r['latencia_p50_ms'] or 0:>9.1f} {r['latencia_p95_ms'] or 0:>9.1f} {r['erros']:>6}")
+        if r['exemplo_erro']:
+            print(f"{'':>8} erro: {r['exemplo_erro'][:60]}")
+        if r['modo'] == 'lote':
+            anterior = por_chave[(r['clientes'], 'anterior')]
+            if anterior['triagens_por_s']:
+                print(f"{'':>8} {'ganho':<10} {r['triagens_por_s'] / anterior['triagens_por_s']:>10.2f}x")
+    print("=" * 70)
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Triagens por segundo: gravação anterior x transação única em lote")
+    parser.add_argument('--triagens', type=int, default=40, help="Triagens enviadas por cliente")
+    parser.add_argument('--clientes', type=int, nargs='+', default=[1, 4, 16], help="Números de clientes simultâneos")
+    parser.add_argument('--modulo', default='febre', help="Módulo de triagem usado nas triagens")
+    parser.add_argument('--json', action='store_true', help="Imprimir os resultados em JSON")
+    args = parser.parse_args()
+
+    executar_benchmark(args.triagens, args.clientes, args.modulo, args.json)
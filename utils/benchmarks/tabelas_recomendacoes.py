@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark das Tabelas Fixas de Recomendações
+============================================
+
+Compara o custo por chamada de ``_gerar_recomendacoes_fixas_por_modulo``:
+
+- antes: a tabela inteira era um literal Python avaliado a cada chamada e as
+  recomendações eram construídas a partir dos dicionários. O benchmark
+  reproduz esse custo compilando o mesmo literal (gerado a partir de
+  ``data/recomendacoes_fixas.json``) e avaliando-o a cada iteração;
+- depois: cópia rasa dos modelos imutáveis pré-construídos.
+
+Uso:
+    python utils/benchmarks/tabelas_recomendacoes.py [--iteracoes 20000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.recomendacoes_farmacologicas import sistema_recomendacoes, RecomendacaoFarmacologica
+from services.tabelas_recomendacoes import carregar_tabelas
+
+MODULOS = ['tosse', 'febre', 'diarreia', 'infeccoes_fungicas']
+
+
+def _literal_tabela_fixas() -> str:
+    """Código-fonte equivalente ao literal que existia dentro do método"""
+    tabelas = carregar_tabelas()
+    return repr({modulo: [dict(rec) for rec in recs] for modulo, recs in tabelas.fixas.items()})
+
+
+def _gerar_fixas_antes(codigo, modulo):
+    """Reproduz o caminho antigo: avalia o literal e constrói as recomendações"""
+    recomendacoes_fixas = eval(codigo)
+    return [
+        RecomendacaoFarmacologica(
+            medicamento=rec['medicamento'],
+            principio_ativo=rec['principio_ativo'],
+            indicacao=rec['indicacao'],
+            posologia=rec['posologia'],
+            contraindicacoes="Verificar bula",
+            observacoes=rec['observacoes'],
+            prioridade=rec['prioridade'],
+            categoria=rec['categoria']
+        )
+        for rec in recomendacoes_fixas.get(modulo, [])
+    ]
+
+
+def executar_benchmark(iteracoes: int):
+    codigo = compile(_literal_tabela_fixas(), '<tabela_fixas>', 'eval')
+
+    print("=" * 70)
+    print("  BENCHMARK - TABELAS FIXAS DE RECOMENDAÇÕES")
+    print("=" * 70)
+    print(f"Iterações por módulo: {iteracoes}\n")
+    print(f"{'Módulo':<22}{'Antes (µs)':>14}{'Depois (µs)':>14}{'Ganho':>10}")
+
+    for modulo in MODULOS:
+        antes = timeit.timeit(lambda: _gerar_fixas_antes(codigo, modulo), number=iteracoes)
+        depois = timeit.timeit(lambda: sistema_recomendacoes._gerar_recomendacoes_fixas_por_modulo(modulo), number=iteracoes)
+        antes_us = antes / iteracoes * 1e6
+        depois_us = depois / iteracoes * 1e6
+        print(f"{modulo:<22}{antes_us:>14.2f}{depois_us:>14.2f}{antes_us / depois_us:>9.1f}x")
+
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark das tabelas fixas de recomendações")
+    parser.add_argument('--iteracoes', type=int, default=20000, help="Iterações por módulo")
+    args = parser.parse_args()
+
+    try:
+        executar_benchmark(args.iteracoes)
+    except Exception as e:
+        print(f"\n❌ Erro durante o benchmark: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
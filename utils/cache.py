@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache em Memória
+================
+
+Cache LRU com expiração por tempo (TTL) e contadores de acerto/falha,
+seguro para uso concorrente entre threads do servidor.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class CacheLRU:
+    """Cache LRU limitado com TTL opcional e estatísticas de uso"""
+
+    _AUSENTE = object()
+
+    def __init__(self, tamanho_maximo: int = 256, ttl_segundos: Optional[float] = None):
+        self.tamanho_maximo = tamanho_maximo
+        self.ttl_segundos = ttl_segundos
+        self._itens: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, chave: Hashable, padrao: Any = None) -> Any:
+        """Retorna o valor da chave ou ``padrao`` se ausente ou expirado"""
+        agora = time.monotonic()
+        with self._lock:
+            item = self._itens.get(chave, self._AUSENTE)
+            if item is not self._AUSENTE:
+                valor, expira_em = item
+                if expira_em is None or expira_em > agora:
+                    self._itens.move_to_end(chave)
+                    self.acertos += 1
+                    return valor
+                del self._itens[chave]
+            self.falhas += 1
+            return padrao
+
+    def definir(self, chave: Hashable, valor: Any):
+        """Armazena o valor, descartando o item menos usado se o cache estiver cheio"""
+        expira_em = time.monotonic() + self.ttl_segundos if self.ttl_segundos else None
+        with self._lock:
+            self._itens[chave] = (valor, expira_em)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho_maximo:
+                self._itens.popitem(last=False)
+
+    def limpar(self):
+        """Remove todos os itens (os contadores são mantidos)"""
+        with self._lock:
+            self._itens.clear()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Retorna tamanho, acertos, falhas e taxa de acerto"""
+        with self._lock:
+            total = self.acertos + self.falhas
+            return {
+                'itens': len(self._itens),
+                'tamanho_maximo': self.tamanho_maximo,
+                'ttl_segundos': self.ttl_segundos,
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'taxa_acerto': round(self.acertos / total, 4) if total else 0.0,
+            }
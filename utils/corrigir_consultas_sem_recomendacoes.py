@@ -4,8 +4,12 @@
 Script para Corrigir Consultas Sem Recomendações
 =================================================
 
-Adiciona recomendações não-farmacológicas nas consultas
-que ficaram sem recomendações devido a módulos sem medicamentos.
+Adiciona recomendações nas consultas que ficaram sem recomendações:
+farmacológicas, geradas em lote a partir das respostas gravadas
+(gerar_recomendacoes_batch), e não-farmacológicas de autocuidado.
+
+As estatísticas diárias (contagens de recomendações por dia) são refeitas a
+partir do dia da consulta corrigida mais antiga, na mesma transação.
 """
 
 import sys
@@ -14,7 +18,19 @@
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.app import app
-from models.models import db, Consulta, ConsultaRecomendacao
+from models.models import db, Consulta, ConsultaRecomendacao, ConsultaResposta, EstatisticaDiaria, Medicamento, Pergunta
+from services.recomendacoes_farmacologicas import sistema_recomendacoes
+from services.pontuacao_consultas import modulo_da_consulta, respostas_formatadas
+from services.estatisticas_diarias import reconstruir as reconstruir_estatisticas
+from utils.scoring.triagem_scoring import TriagemScoring
+from utils.extractors.perguntas_extractor import get_patient_profile_from_cadastro
+from utils.migracoes import garantir_colunas
+
+# Consultas por lote na geração de recomendações (limita a memória da busca)
+TAMANHO_LOTE = 500
+# Mesmo limite de medicamentos iniciais usado em processar_triagem
+MAXIMO_MEDICAMENTOS = 6
+
 
 def corrigir_consultas():
     """Corrige consultas sem recomendações"""
@@ -23,6 +39,9 @@ def corrigir_consultas():
         print("  CORRIGINDO CONSULTAS SEM RECOMENDAÇÕES")
         print("=" * 70)
         
+        for modelo in (Consulta, Pergunta, ConsultaResposta, ConsultaRecomendacao, Medicamento, EstatisticaDiaria):
+            garantir_colunas(modelo)
+        
         # Buscar consultas sem recomendações
         consultas = Consulta.query.all()
         consultas_sem_recomendacoes = [c for c in consultas if len(c.recomendacoes) == 0]
@@ -64,11 +83,22 @@ def corrigir_consultas():
         
         corrigidas = 0
         
+        # Recomendações farmacológicas para todas as consultas em lote:
+        # catálogo carregado uma vez e uma multiplicação de matrizes por lote
+        itens = []
         for consulta in consultas_sem_recomendacoes:
-            # Identificar módulo
-            modulo = 'geral'
-            if consulta.observacoes and 'MODULO:' in consulta.observacoes:
-                modulo = consulta.observacoes.split('MODULO:')[1].split('\n')[0].strip()
+            modulo = modulo_da_consulta(consulta) or 'geral'
+            itens.append({
+                'modulo': modulo,
+                'respostas': respostas_formatadas(consulta, modulo),
+                'paciente_profile': get_patient_profile_from_cadastro(consulta.paciente.to_dict()) if consulta.paciente else {}
+            })
+        
+        print(f"\nGerando recomendações farmacológicas em lotes de {TAMANHO_LOTE}...")
+        recomendacoes_farmacologicas = sistema_recomendacoes.gerar_recomendacoes_batch(itens, tamanho_lote=TAMANHO_LOTE)
+        
+        for consulta, item, farmacologicas in zip(consultas_sem_recomendacoes, itens, recomendacoes_farmacologicas):
+            modulo = item['modulo']
             
             # Obter recomendações para o módulo
             recomendacoes = recomendacoes_por_modulo.get(
@@ -78,6 +108,16 @@ def corrigir_consultas():
             
             print(f"\n  Corrigindo Consulta {consulta.id} (Módulo: {modulo})")
             
+            for rec in farmacologicas[:MAXIMO_MEDICAMENTOS]:
+                rec_texto = TriagemScoring.formatar_recomendacao_farmacologica(rec)
+                db.session.add(ConsultaRecomendacao(
+                    id_consulta=consulta.id,
+                    tipo='medicamento',
+                    descricao=rec_texto,
+                    justificativa='Recomendação gerada a partir das respostas registradas'
+                ))
+                print(f"    + [medicamento] {rec_texto}")
+            
             # Adicionar recomendações
             for rec_texto in recomendacoes:
                 recomendacao = ConsultaRecomendacao(
@@ -91,6 +131,13 @@ def corrigir_consultas():
             
             corrigidas += 1
         
+        # Recomendações novas entram nas estatísticas diárias dos dias afetados
+        datas = [consulta.data for consulta in consultas_sem_recomendacoes if consulta.data]
+        if datas:
+            db.session.flush()
+            linhas = reconstruir_estatisticas(min(datas).date())
+            print(f"\n✅ Estatísticas diárias refeitas desde {min(datas):%d/%m/%Y} ({linhas} linhas)")
+        
         # Commit das alterações
         db.session.commit()
         
@@ -4,4 +4,5 @@
 
 Este pacote contém os extratores de dados:
 - perguntas_extractor.py: Extrator de perguntas dos módulos
+- manifesto_perguntas.py: Manifesto pré-compilado das perguntas (invalidado por mtime/hash)
 """
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Manifesto Pré-compilado das Perguntas dos Módulos
+=================================================
+
+Mantém, para cada módulo de ``motor_de_perguntas``, as perguntas extraídas de
+``run_cli()``. Assim ``/api/triagem/perguntas``, o ``QACollector`` e os scripts
+não precisam ler o código-fonte nem percorrer o AST a cada chamada.
+
+Há dois níveis:
+
+- manifesto em disco (``instance/manifesto_perguntas.json``): texto e tipo das
+  perguntas de cada módulo, junto com ``mtime``, tamanho e SHA-256 do
+  arquivo-fonte. É gerado na inicialização ou como etapa de build
+  (``python -m utils.extractors.manifesto_perguntas``) e reaproveitado entre
+  processos;
+- variantes em memória: perguntas filtradas e não filtradas, já numeradas e com
+  os pesos da versão vigente de ``data/pesos_pontuacao.json``. São servidas por
+  consulta a dicionário.
+
+A cada acesso, o ``mtime`` e o tamanho do módulo são conferidos com ``os.stat``.
+Se mudaram mas o SHA-256 é o mesmo, só os metadados são atualizados; se o
+conteúdo mudou, o módulo é extraído de novo. As variantes também são refeitas
+quando muda a versão dos pesos.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from utils.extractors.perguntas_extractor import (
+    BASE_DIR, MOTOR_DIR, build_questions, extract_raw_questions, list_modules
+)
+
+logger = logging.getLogger(__name__)
+
+CAMINHO_MANIFESTO = os.path.join(BASE_DIR, 'instance', 'manifesto_perguntas.json')
+FORMATO_MANIFESTO = 1
+
+
+def _versao_pesos() -> int:
+    from utils.scoring.triagem_scoring import scoring_system
+    return scoring_system.tabela_pesos.versao
+
+
+class ManifestoPerguntas:
+    """Perguntas dos módulos extraídas uma vez e invalidadas por mtime/hash do arquivo"""
+
+    def __init__(self, caminho: str = CAMINHO_MANIFESTO, diretorio: str = MOTOR_DIR):
+        self.caminho = caminho
+        self.diretorio = diretorio
+        self._lock = threading.Lock()
+        # slug -> {'mtime_ns', 'tamanho', 'sha256', 'perguntas': [[texto, tipo], ...]}
+        self._entradas: Dict[str, dict] = {}
+        # (slug, filtrar) -> (versao_pesos, sha256, tuple de perguntas)
+        self._variantes: Dict[Tuple[str, bool], tuple] = {}
+        self._modulos: Optional[Tuple[int, frozenset]] = None
+        self._carregado = False
+        self.extracoes = 0
+
+    # ------------------------------------------------------------------ disco
+
+    def _carregar(self):
+        """Lê o manifesto em disco (ignorado se ausente, corrompido ou de outro formato)"""
+        self._carregado = True
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Manifesto de perguntas ignorado ({self.caminho}): {e}")
+            return
+        if dados.get('formato') == FORMATO_MANIFESTO:
+            self._entradas = dados.get('modulos', {})
+
+    def _salvar(self):
+        """Grava o manifesto de forma atômica (arquivo temporário + rename)"""
+        temporario = f"{self.caminho}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump({'formato': FORMATO_MANIFESTO, 'modulos': self._entradas}, f, ensure_ascii=False)
+            os.replace(temporario, self.caminho)
+        except OSError as e:
+            # Sem permissão de escrita: o manifesto continua valendo em memória
+            logger.warning(f"Não foi possível gravar o manifesto de perguntas: {e}")
+
+    # -------------------------------------------------------------- extração
+
+    def _slugs(self) -> frozenset:
+        """Módulos existentes, relidos só quando o diretório muda"""
+        mtime = os.stat(self.diretorio).st_mtime_ns
+        if self._modulos is None or self._modulos[0] != mtime:
+            self._modulos = (mtime, frozenset(m['slug'] for m in list_modules()))
+        return self._modulos[1]
+
+    def _entrada(self, slug: str) -> Tuple[dict, bool]:
+        """Entrada atualizada do módulo e se o manifesto em disco precisa ser regravado"""
+        caminho = os.path.join(self.diretorio, f'{slug}.py')
+        stat = os.stat(caminho)
+        entrada = self._entradas.get(slug)
+        if entrada and entrada['mtime_ns'] == stat.st_mtime_ns and entrada['tamanho'] == stat.st_size:
+            return entrada, False
+
+        with open(caminho, 'rb') as f:
+            conteudo = f.read()
+        sha256 = hashlib.sha256(conteudo).hexdigest()
+        if entrada and entrada['sha256'] == sha256:
+            # Arquivo tocado sem mudar o conteúdo
+            entrada = dict(entrada, mtime_ns=stat.st_mtime_ns, tamanho=stat.st_size)
+        else:
+            perguntas = extract_raw_questions(conteudo.decode('utf-8'))
+            entrada = {
+                'mtime_ns': stat.st_mtime_ns,
+                'tamanho': stat.st_size,
+                'sha256': sha256,
+                'perguntas': [list(p) for p in perguntas],
+            }
+            self.extracoes += 1
+            logger.info(f"Perguntas do módulo {slug} extraídas ({len(perguntas)})")
+        self._entradas[slug] = entrada
+        return entrada, True
+
+    # ----------------------------------------------------------------- acesso
+
+    def _variante(self, slug: str, filtrar: bool) -> tuple:
+        """(versao_pesos, sha256, perguntas) atualizada do módulo"""
+        with self._lock:
+            if not self._carregado:
+                self._carregar()
+            if slug not in self._slugs():
+                raise FileNotFoundError(f"Módulo não encontrado: {slug}")
+
+            entrada, alterada = self._entrada(slug)
+            if alterada:
+                self._salvar()
+
+            versao = _versao_pesos()
+            variante = self._variantes.get((slug, filtrar))
+            if variante is None or variante[0] != versao or variante[1] != entrada['sha256']:
+                perguntas = tuple(build_questions(slug, [tuple(p) for p in entrada['perguntas']], filtrar))
+                variante = (versao, entrada['sha256'], perguntas)
+                self._variantes[(slug, filtrar)] = variante
+            return variante
+
+    def perguntas(self, slug: str, filtrar: bool = True) -> Tuple[Dict[str, object], ...]:
+        """
+        Perguntas do módulo (compartilhadas entre chamadas: não alterar).
+
+        Raises:
+            FileNotFoundError: se o módulo não existir
+        """
+        return self._variante(slug, filtrar)[2]
+
+    def assinatura(self, slug: str, filtrar: bool = True) -> str:
+        """Identifica o conteúdo servido por ``perguntas`` (hash do módulo + versão dos pesos)"""
+        versao, sha256, _ = self._variante(slug, filtrar)
+        return f"{sha256}:{versao}:{int(filtrar)}"
+
+    def modulos(self) -> Tuple[str, ...]:
+        """Slugs dos módulos existentes, em ordem alfabética"""
+        with self._lock:
+            return tuple(sorted(self._slugs()))
+
+    def construir(self) -> Dict[str, int]:
+        """Extrai (se necessário) todos os módulos, pré-computa as variantes e grava o manifesto"""
+        resumo = {}
+        for slug in self.modulos():
+            for filtrar in (False, True):
+                resumo[slug] = len(self.perguntas(slug, filtrar))
+        return resumo
+
+    def estatisticas(self) -> Dict[str, object]:
+        return {
+            'modulos': len(self._entradas),
+            'variantes': len(self._variantes),
+            'extracoes': self.extracoes,
+            'caminho': self.caminho,
+        }
+
+
+# Instância global
+manifesto_perguntas = ManifestoPerguntas()
+
+
+if __name__ == '__main__':
+    import time
+
+    logging.basicConfig(level=logging.INFO)
+    inicio = time.perf_counter()
+    resumo = manifesto_perguntas.construir()
+    print("=" * 70)
+    print("  MANIFESTO DE PERGUNTAS")
+    print("=" * 70)
+    for slug, total in resumo.items():
+        print(f"   {slug:<28} {total:>3} perguntas (filtradas)")
+    print(f"\n{manifesto_perguntas.extracoes} módulos extraídos em {time.perf_counter() - inicio:.3f}s")
+    print(f"Manifesto: {manifesto_perguntas.caminho}")
+    print("=" * 70)
@@ -73,7 +73,7 @@ def _is_call_to(node: ast.AST, func_name: str) -> bool:
     )
 
 
-def _find_run_cli_function(tree: ast.AST) -> Optional[ast.FunctionDef]:
+def find_run_cli_function(tree: ast.AST) -> Optional[ast.FunctionDef]:
     for n in ast.walk(tree):
         if isinstance(n, ast.FunctionDef) and n.name == 'run_cli':
             return n
@@ -133,7 +133,7 @@ def _attach_parents(node: ast.AST):
         _attach_parents(child)
 
 
-def _is_unnecessary_question(texto: str) -> bool:
+def is_unnecessary_question(texto: str) -> bool:
     """Verifica se a pergunta é desnecessária pois o dado já está no cadastro do paciente."""
     texto_lower = texto.lower()
     
@@ -185,18 +185,8 @@ def _get_question_weight(slug: str, question_text: str, order: int) -> Dict[str,
         return {'peso': 1.0, 'categoria': 'sintoma', 'critica': False, 'indication': 'nao_farmacologico'}
 
 
-def extract_questions_for_module(slug: str, filter_unnecessary: bool = True) -> List[Dict[str, object]]:
-    """Extrai perguntas em ordem a partir de run_cli() de um módulo."""
-    source = _read_module_source(slug)
-    tree = ast.parse(source)
-    _attach_parents(tree)
-    run_cli_fn = _find_run_cli_function(tree)
-    if not run_cli_fn:
-        return []
-
-    questions: List[Dict[str, object]] = []
-
-    # Percorrer corpo em ordem e coletar chamadas relevantes
+def iter_question_calls(run_cli_fn: ast.FunctionDef):
+    """Percorre run_cli() em ordem e produz (statement, chamada, texto) de cada pergunta."""
     for stmt in run_cli_fn.body:
         # Ex.: atribuicoes: var = ask_bool("...") ou var = int(input("..."))
         if isinstance(stmt, ast.Assign) and isinstance(stmt.value, ast.AST):
@@ -213,36 +203,67 @@ def extract_questions_for_module(slug: str, filter_unnecessary: bool = True) ->
             texto = _extract_literal_from_call(call)
             if not texto:
                 continue
-            
-            # Filtrar perguntas desnecessárias se solicitado
-            if filter_unnecessary and _is_unnecessary_question(texto):
-                continue
-                
-            qtype = _infer_type_from_call(call)
-            order = len(questions) + 1
-            
-            # Obter informações de peso
-            weight_info = _get_question_weight(slug, texto, order)
-            
-            questions.append({
-                'id': f"{slug}_{order}",
-                'modulo': slug,
-                'ordem': order,
-                'texto': texto,
-                'tipo': qtype,
-                'required': True,
-                'placeholder': None,
-                'opcoes': None,
-                'grupo': 'etapa',
-                'peso': weight_info['peso'],
-                'categoria': weight_info['categoria'],
-                'critica': weight_info['critica'],
-                'indication': weight_info['indication']
-            })
+            yield stmt, call, texto
+
+
+def extract_raw_questions(source: str) -> List[Tuple[str, str]]:
+    """Extrai (texto, tipo) de todas as perguntas de run_cli(), em ordem, a partir do código-fonte."""
+    tree = ast.parse(source)
+    _attach_parents(tree)
+    run_cli_fn = find_run_cli_function(tree)
+    if not run_cli_fn:
+        return []
+
+    return [(texto, _infer_type_from_call(call)) for _, call, texto in iter_question_calls(run_cli_fn)]
+
+
+def build_questions(slug: str, raw_questions: List[Tuple[str, str]], filter_unnecessary: bool = True) -> List[Dict[str, object]]:
+    """Monta as perguntas do módulo (numeração, filtro de desnecessárias e pesos) a partir de extract_raw_questions."""
+    questions: List[Dict[str, object]] = []
+
+    for texto, qtype in raw_questions:
+        # Filtrar perguntas desnecessárias se solicitado
+        if filter_unnecessary and is_unnecessary_question(texto):
+            continue
+
+        order = len(questions) + 1
+
+        # Obter informações de peso
+        weight_info = _get_question_weight(slug, texto, order)
+
+        questions.append({
+            'id': f"{slug}_{order}",
+            'modulo': slug,
+            'ordem': order,
+            'texto': texto,
+            'tipo': qtype,
+            'required': True,
+            'placeholder': None,
+            'opcoes': None,
+            'grupo': 'etapa',
+            'peso': weight_info['peso'],
+            'categoria': weight_info['categoria'],
+            'critica': weight_info['critica'],
+            'indication': weight_info['indication'],
+            'scoring_info': weight_info
+        })
 
     return questions
 
 
+def extract_questions_for_module(slug: str, filter_unnecessary: bool = True) -> List[Dict[str, object]]:
+    """
+    Perguntas em ordem de run_cli() de um módulo.
+
+    Servidas pelo manifesto pré-compilado (utils/extractors/manifesto_perguntas.py);
+    o AST só é percorrido de novo quando o arquivo do módulo muda. Retorna cópias,
+    que o chamador pode alterar livremente.
+    """
+    from utils.extractors.manifesto_perguntas import manifesto_perguntas
+
+    return [dict(q) for q in manifesto_perguntas.perguntas(slug, filter_unnecessary)]
+
+
 if __name__ == '__main__':
     # Execução simples para depuração manual
     mods = list_modules()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache HTTP Condicional
+======================
+
+Respostas JSON com ETag forte, ``If-None-Match`` (304 Not Modified) e
+``Cache-Control``, para endpoints cujo conteúdo raramente muda (módulos e
+perguntas da triagem, sintomas, medicamentos).
+
+A ETag pode ser derivada de duas formas:
+
+- de uma versão barata do conteúdo (hash do módulo, versão dos pesos,
+  agregado do catálogo). Nesse caso uma revalidação sem mudança responde 304
+  sem montar nem serializar o corpo;
+- do próprio corpo serializado, quando não há versão disponível. Nesse caso
+  economiza-se só a transferência.
+
+Como as versões vêm do banco ou do conteúdo dos arquivos, e não de contadores
+do processo, a mesma resposta tem a mesma ETag em qualquer worker.
+"""
+
+import hashlib
+import json
+from typing import Any, Callable, Optional
+
+from flask import Response, current_app, jsonify, request
+
+
+def calcular_etag(*partes: Any) -> str:
+    """ETag estável a partir de partes serializáveis em JSON"""
+    serializado = json.dumps(partes, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(serializado.encode('utf-8')).hexdigest()[:32]
+
+
+def _cabecalhos(resposta: Response, etag: str, max_age: Optional[int]) -> Response:
+    resposta.set_etag(etag)
+    resposta.cache_control.private = True
+    if max_age is None:
+        # Sempre revalidar: o cliente guarda a cópia, mas confirma com If-None-Match
+        resposta.cache_control.no_cache = True
+    else:
+        resposta.cache_control.max_age = max_age
+    return resposta
+
+
+def _nao_modificado(etag: str, max_age: Optional[int]) -> Response:
+    return _cabecalhos(Response(status=304), etag, max_age)
+
+
+def json_condicional(gerar: Callable[[], Any], versao: Any = None, max_age: Optional[int] = None) -> Response:
+    """
+    Resposta JSON condicional.
+
+    Args:
+        gerar: Função que monta os dados da resposta (chamada só se necessário)
+        versao: Versão do conteúdo; se None, a ETag é o hash do corpo
+        max_age: Segundos de ``max-age``; None envia ``no-cache`` (revalidar sempre)
+    """
+    if versao is not None:
+        etag = calcular_etag(request.path, versao)
+        if request.if_none_match.contains_weak(etag):
+            return _nao_modificado(etag, max_age)
+        return _cabecalhos(jsonify(gerar()), etag, max_age)
+
+    resposta = jsonify(gerar())
+    etag = hashlib.sha256(resposta.get_data()).hexdigest()[:32]
+    if request.if_none_match.contains_weak(etag):
+        return _nao_modificado(etag, max_age)
+    return _cabecalhos(resposta, etag, max_age)
+
+
+def max_age_padrao() -> int:
+    """``max-age`` configurado para catálogos estáveis (Config.HTTP_CACHE_MAX_AGE)"""
+    return current_app.config.get('HTTP_CACHE_MAX_AGE', 300)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Utilitários de Migração de Esquema
+==================================
+
+O projeto não usa Alembic: as tabelas são criadas por ``db.create_all()``, que
+não altera tabelas existentes. Os scripts de migração em ``utils/`` usam
+``garantir_colunas`` para acrescentar as colunas e os índices incluídos no
+modelo depois da criação da tabela, de forma idempotente.
+"""
+
+from sqlalchemy import inspect, text
+
+from models.models import db
+
+
+def garantir_colunas(modelo) -> list:
+    """
+    Cria a tabela do modelo, se não existir, e adiciona as colunas e os índices que faltam.
+
+    Colunas são adicionadas só com o tipo (``ALTER TABLE ... ADD COLUMN``);
+    restrições de unicidade vêm dos índices únicos do modelo.
+
+    Returns:
+        Nomes das colunas adicionadas
+    """
+    tabela = modelo.__table__
+    tabela.create(db.engine, checkfirst=True)
+    inspetor = inspect(db.engine)
+    existentes = {coluna['name'] for coluna in inspetor.get_columns(tabela.name)}
+    indices_existentes = {indice['name'] for indice in inspetor.get_indexes(tabela.name)}
+    adicionadas = []
+    with db.engine.begin() as conexao:
+        for coluna in tabela.columns:
+            if coluna.name not in existentes:
+                tipo = coluna.type.compile(dialect=db.engine.dialect)
+                conexao.execute(text(f"ALTER TABLE {tabela.name} ADD COLUMN {coluna.name} {tipo}"))
+                adicionadas.append(coluna.name)
+                print(f"✅ Coluna {tabela.name}.{coluna.name} adicionada")
+    for indice in tabela.indexes:
+        if indice.name not in indices_existentes:
+            indice.create(db.engine, checkfirst=True)
+            print(f"✅ Índice {indice.name} criado")
+    return adicionadas
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migração: Índices das Consultas
+===============================
+
+Cria nas tabelas existentes os índices declarados nos modelos para os
+caminhos de consulta mais usados por ``core/app.py``:
+
+- ``consultas.data``: filtros por período (dashboard, estatísticas);
+- ``consultas (id_paciente, data)``: histórico do paciente e joins com pacientes;
+- ``consultas (modulo, data)``: estatísticas por sintoma no período;
+- ``consulta_respostas.id_consulta``: respostas de cada consulta;
+- ``consulta_recomendacoes (id_consulta, tipo)``: recomendações de cada
+  consulta, filtradas ou não por tipo.
+
+Em SQLite, executa ``ANALYZE`` ao final para atualizar as estatísticas do
+planejador. É idempotente. Para conferir os planos, use
+``utils/verificar_plano_consultas.py --banco-atual``.
+
+Uso:
+    python utils/migrar_indices_consultas.py
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from core.app import app
+from models.models import db, Consulta, ConsultaResposta, ConsultaRecomendacao
+from utils.migracoes import garantir_colunas
+
+
+def migrar():
+    with app.app_context():
+        print("=" * 70)
+        print("  MIGRAÇÃO: ÍNDICES DAS CONSULTAS")
+        print("=" * 70)
+
+        for modelo in (Consulta, ConsultaResposta, ConsultaRecomendacao):
+            garantir_colunas(modelo)
+
+        if db.engine.dialect.name == 'sqlite':
+            with db.engine.begin() as conexao:
+                conexao.execute(text("ANALYZE"))
+            print("✅ Estatísticas do planejador atualizadas (ANALYZE)")
+
+        print("\n✅ Migração concluída")
+
+
+if __name__ == "__main__":
+    try:
+        migrar()
+    except Exception as e:
+        print(f"\n❌ Erro durante a migração: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migração: Coluna updated_at em Medicamentos
+===========================================
+
+Adiciona a coluna ``medicamentos.updated_at`` (marca d'água usada pelo
+snapshot incremental do catálogo), preenche as linhas existentes com
+``created_at`` e cria o índice ``ix_medicamentos_updated_at``.
+
+O script é idempotente: pode ser executado mais de uma vez.
+
+Uso:
+    python utils/migrar_medicamentos_updated_at.py
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text
+
+from core.app import app
+from models.models import db
+
+
+def migrar():
+    """Adiciona, preenche e indexa medicamentos.updated_at"""
+    with app.app_context():
+        print("=" * 70)
+        print("  MIGRAÇÃO: medicamentos.updated_at")
+        print("=" * 70)
+
+        inspetor = inspect(db.engine)
+        if 'medicamentos' not in inspetor.get_table_names():
+            print("\nTabela 'medicamentos' não existe; será criada com a coluna pelo db.create_all()")
+            return
+
+        colunas = {coluna['name'] for coluna in inspetor.get_columns('medicamentos')}
+        with db.engine.begin() as conexao:
+            if 'updated_at' not in colunas:
+                conexao.execute(text("ALTER TABLE medicamentos ADD COLUMN updated_at TIMESTAMP"))
+                print("\n✅ Coluna updated_at adicionada")
+            else:
+                print("\nColuna updated_at já existe")
+
+            preenchidas = conexao.execute(text(
+                "UPDATE medicamentos SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) "
+                "WHERE updated_at IS NULL"
+            )).rowcount
+            print(f"✅ {preenchidas} linhas preenchidas com created_at")
+
+            conexao.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_medicamentos_updated_at ON medicamentos (updated_at)"
+            ))
+            print("✅ Índice ix_medicamentos_updated_at verificado")
+
+        print("\n" + "=" * 70)
+        print("  MIGRAÇÃO CONCLUÍDA")
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    try:
+        migrar()
+    except Exception as e:
+        print(f"\n❌ Erro durante a migração: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migração: Coluna de Módulo nas Consultas
+========================================
+
+Adiciona a coluna ``consultas.modulo`` e o índice ``(modulo, data)`` usados
+pelas estatísticas por sintoma, e preenche a coluna das consultas antigas a
+partir da linha "MODULO: x" das observações (ou, na falta dela, do módulo da
+pontuação estruturada).
+
+Cria antes a tabela de pontuações, se ainda não existir (bancos anteriores a
+``utils/migrar_pontuacoes_consultas.py``). É idempotente: só processa
+consultas com ``modulo`` nulo.
+
+Uso:
+    python utils/migrar_modulo_consultas.py [--lote 1000]
+"""
+
+import argparse
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import update
+
+from core.app import app
+from models.models import db, Consulta, ConsultaPontuacao
+from services.pontuacao_consultas import modulo_das_observacoes
+from utils.migracoes import garantir_colunas
+
+
+def migrar(tamanho_lote: int = 1000):
+    with app.app_context():
+        print("=" * 70)
+        print("  MIGRAÇÃO: COLUNA DE MÓDULO NAS CONSULTAS")
+        print("=" * 70)
+
+        for modelo in (Consulta, ConsultaPontuacao):
+            garantir_colunas(modelo)
+
+        pendentes = db.session.query(Consulta.id).filter(Consulta.modulo.is_(None)).count()
+        print(f"Consultas sem módulo: {pendentes}")
+
+        preenchidas = sem_modulo = 0
+        ultimo_id = 0
+        while True:
+            lote = db.session.query(
+                Consulta.id, Consulta.observacoes, ConsultaPontuacao.modulo
+            ).outerjoin(
+                ConsultaPontuacao, ConsultaPontuacao.id_consulta == Consulta.id
+            ).filter(
+                Consulta.modulo.is_(None), Consulta.id > ultimo_id
+            ).order_by(Consulta.id).limit(tamanho_lote).all()
+            if not lote:
+                break
+            ultimo_id = lote[-1][0]
+
+            atualizacoes = []
+            for id_consulta, observacoes, modulo_pontuacao in lote:
+                modulo = modulo_das_observacoes(observacoes) or modulo_pontuacao
+                if modulo:
+                    atualizacoes.append({'id': id_consulta, 'modulo': modulo[:50]})
+                else:
+                    sem_modulo += 1
+            if atualizacoes:
+                db.session.execute(update(Consulta), atualizacoes)
+            db.session.commit()
+            preenchidas += len(atualizacoes)
+            print(f"  ... {preenchidas} consultas preenchidas")
+
+        print(f"\n✅ Consultas preenchidas: {preenchidas}")
+        print(f"   Consultas sem módulo identificável: {sem_modulo}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Adiciona e preenche consultas.modulo a partir das observações")
+    parser.add_argument('--lote', type=int, default=1000, help="Consultas por lote (padrão: 1000)")
+    args = parser.parse_args()
+
+    try:
+        migrar(args.lote)
+    except Exception as e:
+        print(f"\n❌ Erro durante a migração: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
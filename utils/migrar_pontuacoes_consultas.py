@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migração: Pontuação Estruturada das Consultas
+=============================================
+
+Cria a tabela ``consulta_pontuacoes`` (se necessário) e a preenche para as
+consultas antigas, que só têm a pontuação como texto nas observações:
+
+- pontuação total, nível de risco e confiança são lidos das observações
+  ("Pontuação total: ...", "Nível de risco: ...", "Confiança: ...%"), que
+  guardam os valores exibidos na triagem original (origem 'observacoes');
+- as pontuações por categoria não eram gravadas e são recalculadas a partir
+  das respostas; consultas sem a pontuação nas observações são recalculadas
+  por inteiro (origem 'recalculo').
+
+Colunas e índices acrescentados aos modelos lidos (consultas, perguntas,
+respostas e pontuações) depois da criação das tabelas são adicionados com
+``ALTER TABLE``/``CREATE INDEX`` antes da leitura. O script é idempotente: só
+processa consultas ainda sem pontuação.
+
+Uso:
+    python utils/migrar_pontuacoes_consultas.py [--lote 500]
+"""
+
+import argparse
+import re
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.app import app, _detectar_modulo_das_perguntas
+from models.models import db, Consulta, ConsultaPontuacao, ConsultaResposta, Pergunta
+from services.pontuacao_consultas import calcular_pontuacao_consulta, modulo_da_consulta, registrar_pontuacao
+from utils.migracoes import garantir_colunas
+
+PADRAO_PONTUACAO = re.compile(r'Pontuação total: ([\d.]+)')
+PADRAO_NIVEL = re.compile(r'Nível de risco: (\w+)')
+PADRAO_CONFIANCA = re.compile(r'Confiança: ([\d.]+)%')
+
+
+def _garantir_colunas():
+    """
+    Adiciona às tabelas lidas e gravadas pela migração as colunas (e índices)
+    dos modelos que ainda não existem (ex.: ``consultas.modulo``, ``perguntas.slug``)
+    """
+    for modelo in (Consulta, Pergunta, ConsultaResposta, ConsultaPontuacao):
+        garantir_colunas(modelo)
+
+
+def _aplicar_observacoes(scoring_result, consulta) -> bool:
+    """Sobrescreve total, nível, confiança e encaminhamento com os valores da triagem original"""
+    observacoes = consulta.observacoes or ''
+    pontuacao = PADRAO_PONTUACAO.search(observacoes)
+    if not pontuacao:
+        return False
+
+    scoring_result.encaminhamento = bool(consulta.encaminhamento)
+    # Pesos da triagem original desconhecidos: --desatualizadas do reprocessamento as inclui
+    scoring_result.versao_pesos = None
+    scoring_result.total_score = float(pontuacao.group(1))
+    nivel = PADRAO_NIVEL.search(observacoes)
+    if nivel and nivel.group(1).lower() in ('baixo', 'medio', 'alto'):
+        scoring_result.risk_level = nivel.group(1).lower()
+    confianca = PADRAO_CONFIANCA.search(observacoes)
+    if confianca:
+        scoring_result.confidence = float(confianca.group(1)) / 100.0
+    return True
+
+
+def migrar(tamanho_lote: int):
+    """Cria a tabela e preenche a pontuação das consultas antigas em lotes"""
+    with app.app_context():
+        print("=" * 70)
+        print("  MIGRAÇÃO: PONTUAÇÃO ESTRUTURADA DAS CONSULTAS")
+        print("=" * 70)
+
+        ConsultaPontuacao.__table__.create(db.engine, checkfirst=True)
+        _garantir_colunas()
+
+        pendentes = db.session.query(Consulta.id).outerjoin(ConsultaPontuacao).filter(
+            ConsultaPontuacao.id.is_(None)
+        ).count()
+        print(f"\nConsultas sem pontuação estruturada: {pendentes}")
+
+        totais = {'observacoes': 0, 'recalculo': 0, 'erros': 0}
+        ultimo_id = 0
+
+        while True:
+            consultas = Consulta.query.outerjoin(ConsultaPontuacao).filter(
+                ConsultaPontuacao.id.is_(None),
+                Consulta.id > ultimo_id
+            ).order_by(Consulta.id).limit(tamanho_lote).all()
+            if not consultas:
+                break
+
+            for consulta in consultas:
+                ultimo_id = consulta.id
+                try:
+                    modulo = modulo_da_consulta(consulta) or _detectar_modulo_das_perguntas(consulta.respostas)
+                    scoring_result = calcular_pontuacao_consulta(consulta, modulo)
+                    origem = 'observacoes' if _aplicar_observacoes(scoring_result, consulta) else 'recalculo'
+                    registrar_pontuacao(consulta, modulo, scoring_result, origem=origem)
+                    totais[origem] += 1
+                except Exception as e:
+                    totais['erros'] += 1
+                    print(f"   ⚠️  Consulta #{consulta.id}: {e}")
+
+            db.session.commit()
+            db.session.expunge_all()
+            print(f"   Lote concluído até a consulta #{ultimo_id}")
+
+        print("\n" + "=" * 70)
+        print("  RESUMO")
+        print("=" * 70)
+        print(f"✅ Lidas das observações: {totais['observacoes']}")
+        print(f"✅ Recalculadas: {totais['recalculo']}")
+        if totais['erros']:
+            print(f"⚠️  Erros: {totais['erros']}")
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Preenche a pontuação estruturada das consultas antigas")
+    parser.add_argument('--lote', type=int, default=500, help="Consultas por transação")
+    args = parser.parse_args()
+
+    try:
+        migrar(args.lote)
+    except Exception as e:
+        print(f"\n❌ Erro durante a migração: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
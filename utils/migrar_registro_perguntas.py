@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migração: Registro Estável das Perguntas Dinâmicas
+==================================================
+
+As perguntas dos módulos (slug ``modulo_ordem``) eram gravadas em
+``perguntas`` com id derivado de ``hash()`` do slug. O hash de strings muda a
+cada processo, então a mesma pergunta acumulou uma linha por worker/reinício.
+
+Este script:
+
+- adiciona a coluna ``perguntas.slug`` e seu índice único (se necessário);
+- agrupa as linhas dinâmicas pelo texto (que guarda o slug) e mantém uma por
+  slug: a que já tem o slug ou, na falta dela, a de menor id;
+- aponta as respostas (``consulta_respostas.id_pergunta``) das duplicatas para
+  a linha mantida, remove as duplicatas e preenche ``slug`` da linha mantida.
+
+É idempotente. Reinicie os processos da aplicação depois de executá-lo, pois
+o registro (``services/registro_perguntas.py``) guarda o mapa slug -> id em
+memória.
+
+Uso:
+    python utils/migrar_registro_perguntas.py [--simular]
+"""
+
+import argparse
+import re
+import sys
+import os
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.app import app
+from models.models import db, Pergunta, ConsultaResposta
+from utils.migracoes import garantir_colunas
+
+# Slug gerado pelo extrator de perguntas: nome do módulo + "_" + ordem
+PADRAO_SLUG = re.compile(r'^[a-z][a-z0-9_]*_\d+$')
+
+
+def migrar(simular: bool = False):
+    with app.app_context():
+        print("=" * 70)
+        print("  MIGRAÇÃO: REGISTRO ESTÁVEL DAS PERGUNTAS DINÂMICAS")
+        print("=" * 70)
+
+        for modelo in (Pergunta, ConsultaResposta):
+            garantir_colunas(modelo)
+
+        grupos = defaultdict(list)
+        for pergunta in Pergunta.query.filter(Pergunta.ordem == 999).order_by(Pergunta.id):
+            if PADRAO_SLUG.match(pergunta.texto or '') and pergunta.slug in (None, pergunta.texto):
+                grupos[pergunta.texto].append(pergunta)
+
+        mantidas = removidas = respostas_movidas = 0
+        for slug, perguntas in grupos.items():
+            canonica = next((p for p in perguntas if p.slug == slug), perguntas[0])
+            duplicadas = [p.id for p in perguntas if p is not canonica]
+            if duplicadas:
+                respostas_movidas += ConsultaResposta.query.filter(
+                    ConsultaResposta.id_pergunta.in_(duplicadas)
+                ).update({ConsultaResposta.id_pergunta: canonica.id}, synchronize_session=False)
+                removidas += Pergunta.query.filter(Pergunta.id.in_(duplicadas)).delete(synchronize_session=False)
+            if canonica.slug != slug:
+                canonica.slug = slug
+                mantidas += 1
+
+        print(f"Slugs encontrados:        {len(grupos)}")
+        print(f"Slugs preenchidos:        {mantidas}")
+        print(f"Duplicatas removidas:     {removidas}")
+        print(f"Respostas redirecionadas: {respostas_movidas}")
+
+        if simular:
+            db.session.rollback()
+            print("\nSimulação: nenhuma alteração foi gravada")
+        else:
+            db.session.commit()
+            print("\n✅ Migração concluída. Reinicie os processos da aplicação.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Unifica as perguntas dinâmicas duplicadas e preenche perguntas.slug")
+    parser.add_argument('--simular', action='store_true', help="Mostrar o resultado sem gravar")
+    args = parser.parse_args()
+
+    try:
+        migrar(args.simular)
+    except Exception as e:
+        print(f"\n❌ Erro durante a migração: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -24,13 +24,16 @@
 from core.app import app
 from models.models import (
     db, Paciente, DoencaCronica, PacienteDoenca, 
-    Consulta, ConsultaResposta, ConsultaRecomendacao, Pergunta
+    Consulta, ConsultaResposta, ConsultaRecomendacao
 )
 from utils.extractors.perguntas_extractor import (
     extract_questions_for_module, 
     get_patient_profile_from_cadastro
 )
 from utils.scoring.triagem_scoring import scoring_system
+from services.registro_perguntas import registro_perguntas
+from services.pontuacao_consultas import registrar_pontuacao
+from services.estatisticas_diarias import reconstruir as reconstruir_estatisticas_diarias
 
 # ==========================================
 # CONFIGURAÇÕES E DADOS BASE
@@ -435,10 +438,17 @@ def criar_triagem_completa(paciente, data_consulta):
         # Gerar respostas
         respostas = gerar_respostas_para_modulo(modulo, perguntas, paciente, forcar_encaminhamento)
         
+        # Registrar as perguntas do módulo antes de abrir a transação da consulta
+        # (o registro grava as perguntas novas em transação própria)
+        ids_por_slug = registro_perguntas.ids(
+            str(r['pergunta_id']) for r in respostas if not str(r['pergunta_id']).isdigit()
+        )
+        
         # Criar consulta
         consulta = Consulta(
             id_paciente=paciente.id,
-            data=data_consulta
+            data=data_consulta,
+            modulo=modulo
         )
         db.session.add(consulta)
         db.session.flush()  # Para obter o ID
@@ -447,30 +457,7 @@ def criar_triagem_completa(paciente, data_consulta):
         for resposta_data in respostas:
             pergunta_id_str = str(resposta_data['pergunta_id'])
             resposta_texto = resposta_data['resposta']
-            
-            # Tentar converter para inteiro
-            try:
-                pergunta_id = int(pergunta_id_str)
-            except (ValueError, TypeError):
-                # Se não conseguiu, criar hash
-                import hashlib
-                pergunta_id_hash = abs(hash(pergunta_id_str)) % 1000000
-                
-                # Verificar se já existe
-                pergunta_existente = Pergunta.query.filter_by(id=pergunta_id_hash).first()
-                
-                if not pergunta_existente:
-                    nova_pergunta = Pergunta(
-                        id=pergunta_id_hash,
-                        texto=pergunta_id_str,
-                        tipo='sintoma',
-                        ordem=999,
-                        ativa=True
-                    )
-                    db.session.add(nova_pergunta)
-                    db.session.flush()
-                
-                pergunta_id = pergunta_id_hash
+            pergunta_id = int(pergunta_id_str) if pergunta_id_str.isdigit() else ids_por_slug[pergunta_id_str]
             
             # Criar resposta
             resp = ConsultaResposta(
@@ -517,6 +504,9 @@ def criar_triagem_completa(paciente, data_consulta):
             observacoes_list.append(f'Confiança: {scoring_result.confidence:.1%}')
             consulta.observacoes = '\n'.join(observacoes_list)
             
+            # Pontuação estruturada, lida pelas telas e estatísticas
+            registrar_pontuacao(consulta, modulo, scoring_result)
+            
             # Salvar recomendações de medicamentos
             for med in medicamentos_iniciais:
                 recomendacao = ConsultaRecomendacao(
@@ -657,6 +647,11 @@ def popular_banco():
         
         print(f"\n✅ {estatisticas['triagens_criadas']} triagens criadas com sucesso!")
         
+        # ETAPA 3: Estatísticas diárias agregadas (lidas pelos endpoints de estatísticas)
+        linhas = reconstruir_estatisticas_diarias()
+        db.session.commit()
+        print(f"✅ Estatísticas diárias reconstruídas ({linhas} linhas)")
+        
         return estatisticas
 
 
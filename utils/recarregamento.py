@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Recarregamento de Arquivos de Dados
+===================================
+
+Mantém em memória a versão compilada de um arquivo de dados (JSON de
+sinônimos, regras de contraindicação, etc.) e só a recompila quando o arquivo
+muda em disco, detectado pelo ``mtime`` e tamanho. Uma função ``aceitar``
+opcional pode recusar uma nova versão, mantendo a anterior.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RecursoArquivo:
+    """Arquivo compilado uma vez e recompilado automaticamente quando muda"""
+
+    def __init__(self, caminho: str, compilar: Callable[[str], Any], padrao: Any = None,
+                 aceitar: Optional[Callable[[Any, Any], bool]] = None):
+        """
+        Args:
+            caminho: Caminho do arquivo monitorado
+            compilar: Função que recebe o caminho e retorna a estrutura compilada
+            padrao: Valor usado enquanto o arquivo não existir ou não puder ser compilado
+            aceitar: Função (anterior, nova) -> bool chamada antes de trocar uma versão já carregada
+        """
+        self.caminho = caminho
+        self._compilar = compilar
+        self._aceitar = aceitar
+        self._padrao = padrao
+        self._lock = threading.Lock()
+        self._chave: Optional[Tuple[int, int]] = None
+        self._valor = padrao
+        self.recarregamentos = 0
+
+    def _chave_arquivo(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.caminho)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def obter(self) -> Any:
+        """Retorna a estrutura compilada, recompilando se o arquivo mudou"""
+        chave = self._chave_arquivo()
+        if chave == self._chave:
+            return self._valor
+
+        with self._lock:
+            if chave != self._chave:
+                if chave is None:
+                    logger.warning(f"Arquivo não encontrado: {self.caminho}")
+                    self._valor = self._padrao
+                else:
+                    try:
+                        novo = self._compilar(self.caminho)
+                        if self._valor is self._padrao or self._aceitar is None or self._aceitar(self._valor, novo):
+                            self._valor = novo
+                            self.recarregamentos += 1
+                            logger.info(f"Arquivo carregado: {self.caminho}")
+                    except Exception as e:
+                        # Mantém a última versão válida em caso de arquivo corrompido
+                        logger.error(f"Erro ao carregar {self.caminho}: {e}")
+                self._chave = chave
+            return self._valor
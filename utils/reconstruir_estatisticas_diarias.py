@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reconstrução das Estatísticas Diárias
+=====================================
+
+Cria a tabela ``estatisticas_diarias`` (se necessário) e refaz as linhas a
+partir das consultas, em uma única transação. Use ao implantar a tabela, depois
+de alterações em lote nas consultas (ex.: ``corrigir_consultas_sem_recomendacoes.py``,
+``migrar_modulo_consultas.py``) ou para alinhar sexo/idade/localização com o
+cadastro atual dos pacientes.
+
+Uso:
+    python utils/reconstruir_estatisticas_diarias.py [--desde AAAA-MM-DD]
+"""
+
+import argparse
+import sys
+import os
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.app import app
+from models.models import db, Consulta, ConsultaPontuacao, ConsultaRecomendacao, EstatisticaDiaria
+from services.estatisticas_diarias import reconstruir
+from utils.migracoes import garantir_colunas
+
+
+def executar(desde: str = None):
+    with app.app_context():
+        print("=" * 70)
+        print("  RECONSTRUÇÃO DAS ESTATÍSTICAS DIÁRIAS")
+        print("=" * 70)
+
+        for modelo in (Consulta, ConsultaPontuacao, ConsultaRecomendacao, EstatisticaDiaria):
+            garantir_colunas(modelo)
+        data_desde = datetime.strptime(desde, '%Y-%m-%d').date() if desde else None
+        print(f"Período: {'desde ' + desde if desde else 'todas as consultas'}")
+
+        inicio = time.perf_counter()
+        linhas = reconstruir(data_desde)
+        db.session.commit()
+        duracao = time.perf_counter() - inicio
+
+        total = db.session.query(db.func.coalesce(db.func.sum(EstatisticaDiaria.consultas), 0)).scalar()
+        print(f"\n✅ {linhas} linhas gravadas em {duracao:.2f}s ({total} consultas agregadas na tabela)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refaz a tabela estatisticas_diarias a partir das consultas")
+    parser.add_argument('--desde', help="Reconstruir apenas a partir desta data (AAAA-MM-DD)")
+    args = parser.parse_args()
+
+    try:
+        executar(args.desde)
+    except Exception as e:
+        print(f"\n❌ Erro durante a reconstrução: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reprocessamento da Pontuação das Consultas
+==========================================
+
+Recalcula em lote a pontuação de todas as consultas (ex.: depois de alterar
+pesos ou limiares em ``utils/scoring/triagem_scoring.py``) com o
+``PontuadorVetorizado`` e grava o resultado em ``consulta_pontuacoes``
+(origem 'reprocessamento'), um lote por transação.
+
+Para cada lote:
+- as consultas, o perfil do paciente e a pontuação atual vêm de uma consulta SQL;
+- as respostas vêm de uma segunda consulta SQL, já com o slug das perguntas;
+- a pontuação é calculada de uma vez, vetorialmente;
+- as linhas existentes são atualizadas e as ausentes inseridas em massa.
+
+``Consulta.encaminhamento`` não é alterado: ele registra a decisão tomada na
+triagem original. O encaminhamento recalculado fica em
+``ConsultaPontuacao.encaminhamento``.
+
+Com ``--desatualizadas``, só são reprocessadas as consultas cuja pontuação não
+foi calculada com a versão vigente de ``data/pesos_pontuacao.json``
+(``ConsultaPontuacao.versao_pesos``).
+
+Uso:
+    python utils/reprocessar_pontuacoes.py [--lote 2000] [--modulo tosse] [--desatualizadas] [--simular] [--comparar]
+"""
+
+import argparse
+import sys
+import os
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, or_, update
+
+from core.app import app
+from models.models import db, Consulta, ConsultaPontuacao, ConsultaResposta, Paciente, Pergunta
+from utils.extractors.perguntas_extractor import get_patient_profile_from_cadastro
+from utils.migrar_pontuacoes_consultas import _garantir_colunas
+from utils.scoring.pontuacao_lote import CATEGORIAS, PontuadorVetorizado
+from utils.scoring.triagem_scoring import scoring_system
+
+
+def _modulo(modulo_gravado, observacoes):
+    """Módulo da pontuação gravada ou, na falta dela, da linha MODULO das observações"""
+    if modulo_gravado:
+        return modulo_gravado
+    if observacoes and 'MODULO:' in observacoes:
+        return observacoes.split('MODULO:')[1].split('\n')[0].strip() or None
+    return None
+
+
+def _carregar_lote(ultimo_id, tamanho_lote, modulo_filtro, versao_vigente=None):
+    """Lê um lote de consultas (com perfil e pontuação atual) e suas respostas"""
+    consulta_lote = db.session.query(
+        Consulta.id, Consulta.observacoes, Paciente.idade, Paciente.sexo,
+        ConsultaPontuacao.id, ConsultaPontuacao.modulo,
+        ConsultaPontuacao.nivel_risco, ConsultaPontuacao.encaminhamento
+    ).join(
+        Paciente, Consulta.id_paciente == Paciente.id
+    ).outerjoin(
+        ConsultaPontuacao, ConsultaPontuacao.id_consulta == Consulta.id
+    ).filter(Consulta.id > ultimo_id)
+    if modulo_filtro:
+        consulta_lote = consulta_lote.filter(ConsultaPontuacao.modulo == modulo_filtro)
+    if versao_vigente is not None:
+        consulta_lote = consulta_lote.filter(or_(
+            ConsultaPontuacao.versao_pesos.is_(None),
+            ConsultaPontuacao.versao_pesos != versao_vigente
+        ))
+    linhas = consulta_lote.order_by(Consulta.id).limit(tamanho_lote).all()
+    if not linhas:
+        return [], {}
+
+    respostas = defaultdict(list)
+    for id_consulta, id_pergunta, resposta, texto in db.session.query(
+        ConsultaResposta.id_consulta, ConsultaResposta.id_pergunta, ConsultaResposta.resposta, Pergunta.texto
+    ).outerjoin(
+        Pergunta, Pergunta.id == ConsultaResposta.id_pergunta
+    ).filter(
+        ConsultaResposta.id_consulta.in_([linha[0] for linha in linhas])
+    ).order_by(ConsultaResposta.id_consulta, ConsultaResposta.id):
+        respostas[id_consulta].append((id_pergunta, resposta, texto))
+    return linhas, respostas
+
+
+def _respostas_do_motor(respostas, modulo):
+    """Mesmo formato de services.pontuacao_consultas.respostas_formatadas"""
+    formatadas = []
+    for id_pergunta, resposta, texto in respostas:
+        pergunta_id = str(id_pergunta)
+        if modulo and texto and texto.startswith(f"{modulo}_"):
+            pergunta_id = texto
+        formatadas.append({'pergunta_id': pergunta_id, 'resposta': resposta or ''})
+    return formatadas
+
+
+def reprocessar(tamanho_lote: int, modulo_filtro: str = None, simular: bool = False, comparar: bool = False,
+                desatualizadas: bool = False):
+    """Recalcula e grava a pontuação de todas as consultas em lotes"""
+    with app.app_context():
+        print("=" * 70)
+        print("  REPROCESSAMENTO DA PONTUAÇÃO DAS CONSULTAS")
+        print("=" * 70)
+        if simular:
+            print("Modo simulação: nada será gravado")
+
+        ConsultaPontuacao.__table__.create(db.engine, checkfirst=True)
+        _garantir_colunas()
+
+        pontuador = PontuadorVetorizado(scoring_system)
+        print(f"Versão dos pesos: {pontuador.versao_pesos}")
+        versao_filtro = pontuador.versao_pesos if desatualizadas else None
+        tempos = {'leitura': 0.0, 'pontuacao': 0.0, 'gravacao': 0.0, 'individual': 0.0}
+        totais = {'consultas': 0, 'respostas': 0, 'atualizadas': 0, 'inseridas': 0,
+                  'mudancas_nivel': 0, 'mudancas_encaminhamento': 0, 'divergencias': 0}
+        ultimo_id = 0
+        inicio_total = time.perf_counter()
+
+        while True:
+            inicio = time.perf_counter()
+            linhas, respostas = _carregar_lote(ultimo_id, tamanho_lote, modulo_filtro, versao_filtro)
+            tempos['leitura'] += time.perf_counter() - inicio
+            if not linhas:
+                break
+            ultimo_id = linhas[-1][0]
+
+            inicio = time.perf_counter()
+            modulos = [_modulo(linha[5], linha[1]) for linha in linhas]
+            lista_respostas = [
+                _respostas_do_motor(respostas.get(linha[0], []), modulo)
+                for linha, modulo in zip(linhas, modulos)
+            ]
+            perfis = [get_patient_profile_from_cadastro({'idade': linha[2] or 0, 'sexo': linha[3]}) for linha in linhas]
+            resultado = pontuador.pontuar_respostas(lista_respostas, perfis)
+            tempos['pontuacao'] += time.perf_counter() - inicio
+
+            if comparar:
+                inicio = time.perf_counter()
+                for i, (lista, perfil) in enumerate(zip(lista_respostas, perfis)):
+                    individual = scoring_system.calculate_score(modulos[i] or 'geral', lista, perfil)
+                    if (individual.total_score != resultado.pontuacao_total[i]
+                            or individual.risk_level != resultado.nivel_risco[i]
+                            or individual.encaminhamento != resultado.encaminhamento[i]):
+                        totais['divergencias'] += 1
+                tempos['individual'] += time.perf_counter() - inicio
+
+            atualizacoes, insercoes = [], []
+            for i, linha in enumerate(linhas):
+                valores = {
+                    'modulo': modulos[i],
+                    'pontuacao_total': float(resultado.pontuacao_total[i]),
+                    'nivel_risco': str(resultado.nivel_risco[i]),
+                    'confianca': float(resultado.confianca[i]),
+                    'encaminhamento': bool(resultado.encaminhamento[i]),
+                    'versao_pesos': resultado.versao_pesos,
+                    'origem': 'reprocessamento',
+                }
+                for j, categoria in enumerate(CATEGORIAS):
+                    valores[f'pontuacao_{categoria}'] = float(resultado.categorias[i, j])
+
+                if linha[4] is None:
+                    insercoes.append(dict(valores, id_consulta=linha[0]))
+                else:
+                    atualizacoes.append(dict(valores, id=linha[4]))
+                    totais['mudancas_nivel'] += linha[6] != valores['nivel_risco']
+                    totais['mudancas_encaminhamento'] += bool(linha[7]) != valores['encaminhamento']
+
+            inicio = time.perf_counter()
+            if not simular:
+                if atualizacoes:
+                    db.session.execute(update(ConsultaPontuacao), atualizacoes)
+                if insercoes:
+                    db.session.execute(insert(ConsultaPontuacao), insercoes)
+                db.session.commit()
+            tempos['gravacao'] += time.perf_counter() - inicio
+
+            totais['consultas'] += len(linhas)
+            totais['respostas'] += sum(len(lista) for lista in lista_respostas)
+            totais['atualizadas'] += len(atualizacoes)
+            totais['inseridas'] += len(insercoes)
+            print(f"   Lote concluído até a consulta #{ultimo_id} ({totais['consultas']} consultas)")
+
+        duracao = time.perf_counter() - inicio_total
+        print("\n" + "=" * 70)
+        print("  RESUMO")
+        print("=" * 70)
+        print(f"Consultas: {totais['consultas']} | Respostas: {totais['respostas']}")
+        print(f"Atualizadas: {totais['atualizadas']} | Inseridas: {totais['inseridas']}")
+        print(f"Mudanças de nível de risco: {totais['mudancas_nivel']}")
+        print(f"Mudanças de encaminhamento: {totais['mudancas_encaminhamento']}")
+        print(f"\nTempo total: {duracao:.2f}s "
+              f"(leitura {tempos['leitura']:.2f}s, pontuação {tempos['pontuacao']:.2f}s, gravação {tempos['gravacao']:.2f}s)")
+        if duracao > 0:
+            print(f"Vazão: {totais['consultas'] / duracao:,.0f} consultas/s no total")
+        if tempos['pontuacao'] > 0:
+            print(f"Pontuação vetorizada: {totais['consultas'] / tempos['pontuacao']:,.0f} consultas/s")
+        if comparar and tempos['individual'] > 0:
+            print(f"calculate_score individual: {totais['consultas'] / tempos['individual']:,.0f} consultas/s")
+            print(f"Divergências entre os dois cálculos: {totais['divergencias']}")
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reprocessa em lote a pontuação das consultas")
+    parser.add_argument('--lote', type=int, default=2000, help="Consultas por transação")
+    parser.add_argument('--modulo', help="Reprocessar apenas consultas deste módulo")
+    parser.add_argument('--desatualizadas', action='store_true',
+                        help="Reprocessar apenas consultas pontuadas com outra versão dos pesos")
+    parser.add_argument('--simular', action='store_true', help="Calcular sem gravar")
+    parser.add_argument('--comparar', action='store_true',
+                        help="Também executar calculate_score consulta a consulta e comparar vazão e resultados")
+    args = parser.parse_args()
+
+    try:
+        reprocessar(args.lote, args.modulo, args.simular, args.comparar, args.desatualizadas)
+    except Exception as e:
+        print(f"\n❌ Erro durante o reprocessamento: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -4,4 +4,6 @@
 
 Este pacote contém o sistema de pontuação para triagem:
 - triagem_scoring.py: Sistema de pontuação e recomendações
+- pesos_pontuacao.py: Tabela versionada de pesos (data/pesos_pontuacao.json)
+- pontuacao_lote.py: Pontuação vetorizada de lotes de consultas
 """
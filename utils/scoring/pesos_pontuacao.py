@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tabela Versionada de Pesos da Pontuação
+=======================================
+
+Os pesos das perguntas, os pesos das respostas e os limiares de classificação
+do ``TriagemScoring`` ficam em ``data/pesos_pontuacao.json``. Alterá-los não
+exige deploy: cada processo relê o arquivo quando ele muda em disco.
+
+O arquivo é compilado em uma ``TabelaPesos`` imutável. A troca é atômica: quem
+já obteve a tabela continua usando a mesma versão até o fim do cálculo.
+
+A ``versao`` do arquivo acompanha cada ``ScoringResult`` e é gravada em
+``ConsultaPontuacao.versao_pesos``. Com ela, ``utils/reprocessar_pontuacoes.py
+--desatualizadas`` reprocessa apenas as consultas pontuadas com outra versão.
+Por isso a versão deve ser incrementada a cada alteração. Um arquivo alterado
+sem mudança de versão é recusado, e a tabela anterior continua em uso.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+from utils.recarregamento import RecursoArquivo
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CAMINHO_PESOS = os.path.join(BASE_DIR, 'data', 'pesos_pontuacao.json')
+
+CATEGORIAS_PERGUNTA = ('sintoma', 'gravidade', 'duracao', 'historico', 'perfil')
+CATEGORIAS_RESPOSTA = ('positivo', 'negativo', 'neutro')
+INDICACOES_RESPOSTA = ('farmacologico', 'nao_farmacologico', 'encaminhamento')
+LIMIARES = ('baixo', 'medio', 'alto', 'encaminhamento')
+
+
+@dataclass(frozen=True)
+class TabelaPesos:
+    """Versão imutável dos pesos e limiares usados no cálculo da pontuação"""
+    versao: int
+    question_weights: Mapping[str, object]   # question_id -> QuestionWeight
+    answer_weights: Mapping[str, object]     # valor -> AnswerWeight
+    thresholds: Mapping[str, float]
+
+
+def _numero(valor, contexto: str) -> float:
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        raise ValueError(f"{contexto} deve ser numérico")
+    return float(valor)
+
+
+def carregar_tabela_pesos(caminho: str = CAMINHO_PESOS) -> TabelaPesos:
+    """Lê, valida e congela o arquivo de pesos"""
+    # Import tardio: triagem_scoring importa este módulo
+    from .triagem_scoring import AnswerWeight, QuestionWeight
+
+    with open(caminho, 'r', encoding='utf-8') as f:
+        dados = json.load(f)
+
+    versao = dados.get('versao')
+    if isinstance(versao, bool) or not isinstance(versao, int):
+        raise ValueError("versao deve ser um inteiro")
+
+    limiares = dados.get('limiares', {})
+    faltando = [nome for nome in LIMIARES if nome not in limiares]
+    if faltando:
+        raise ValueError(f"Limiares ausentes: {', '.join(faltando)}")
+    thresholds = {nome: _numero(limiares[nome], f"limiares.{nome}") for nome in LIMIARES}
+
+    question_weights = {}
+    for question_id, pergunta in dados.get('perguntas', {}).items():
+        if pergunta.get('categoria') not in CATEGORIAS_PERGUNTA:
+            raise ValueError(f"perguntas.{question_id}.categoria inválida: {pergunta.get('categoria')}")
+        question_weights[question_id] = QuestionWeight(
+            question_id,
+            str(pergunta.get('texto', question_id)),
+            _numero(pergunta.get('peso'), f"perguntas.{question_id}.peso"),
+            pergunta['categoria'],
+            critical=bool(pergunta.get('critica', False))
+        )
+
+    answer_weights = {}
+    for valor, resposta in dados.get('respostas', {}).items():
+        if resposta.get('categoria') not in CATEGORIAS_RESPOSTA:
+            raise ValueError(f"respostas.{valor}.categoria inválida: {resposta.get('categoria')}")
+        if resposta.get('indicacao') not in INDICACOES_RESPOSTA:
+            raise ValueError(f"respostas.{valor}.indicacao inválida: {resposta.get('indicacao')}")
+        answer_weights[valor] = AnswerWeight(
+            valor,
+            _numero(resposta.get('peso'), f"respostas.{valor}.peso"),
+            resposta['categoria'],
+            resposta['indicacao']
+        )
+
+    tabela = TabelaPesos(
+        versao=versao,
+        question_weights=MappingProxyType(question_weights),
+        answer_weights=MappingProxyType(answer_weights),
+        thresholds=MappingProxyType(thresholds),
+    )
+    logger.info(f"Pesos da pontuação carregados (versão {versao}, "
+                f"{len(question_weights)} perguntas, {len(answer_weights)} respostas)")
+    return tabela
+
+
+def _mesmo_conteudo(a: TabelaPesos, b: TabelaPesos) -> bool:
+    return (dict(a.question_weights) == dict(b.question_weights)
+            and dict(a.answer_weights) == dict(b.answer_weights)
+            and dict(a.thresholds) == dict(b.thresholds))
+
+
+def _aceitar_nova_versao(atual: TabelaPesos, nova: TabelaPesos) -> bool:
+    """Recusa alterações de pesos que não incrementaram a versão"""
+    if nova.versao == atual.versao:
+        if not _mesmo_conteudo(atual, nova):
+            logger.error(f"Pesos da pontuação alterados sem incrementar a versão ({atual.versao}); "
+                         f"alteração ignorada")
+        return False
+    logger.info(f"Pesos da pontuação: versão {atual.versao} -> {nova.versao}")
+    return True
+
+
+class PesosVersionados:
+    """Tabela de pesos vigente, trocada atomicamente quando o arquivo muda de versão"""
+
+    def __init__(self, caminho: str = CAMINHO_PESOS):
+        self._recurso = RecursoArquivo(caminho, carregar_tabela_pesos, aceitar=_aceitar_nova_versao)
+        self._atual = self._recurso.obter()
+        # Sem pesos não há pontuação: a primeira carga precisa dar certo
+        if self._atual is None:
+            raise RuntimeError(f"Não foi possível carregar os pesos da pontuação de {caminho}")
+
+    def obter(self) -> TabelaPesos:
+        """Tabela vigente; relê o arquivo se ele mudou em disco"""
+        tabela = self._recurso.obter()
+        # Arquivo removido ou ilegível: continuar com a última tabela válida
+        if tabela is not None:
+            self._atual = tabela
+        return self._atual
+
+    @property
+    def versao(self) -> int:
+        return self.obter().versao
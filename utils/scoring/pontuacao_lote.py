@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pontuação Vetorizada em Lote
+============================
+
+Reproduz ``TriagemScoring.calculate_score`` para milhares de consultas de uma
+vez. Os pesos de perguntas e respostas são compilados em vetores NumPy
+indexados por códigos inteiros; as respostas de todas as consultas formam uma
+matriz esparsa em formato de coordenadas (consulta, código da pergunta,
+código da resposta), e totais, categorias, sinais críticos, níveis de risco e
+encaminhamentos saem de poucas operações vetoriais.
+
+As somas usam ``numpy.bincount``, que acumula na ordem das respostas, então
+os resultados são idênticos (bit a bit) aos de ``calculate_score``.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .triagem_scoring import ScoringResult, TriagemScoring
+
+CATEGORIAS = ('sintoma', 'gravidade', 'duracao', 'historico', 'perfil')
+RESPOSTAS_AFIRMATIVAS = frozenset({'sim', 'yes', '1', 'true'})
+
+# Mesmos pesos usados por calculate_score para perguntas e respostas desconhecidas
+PESO_PERGUNTA_PADRAO = 1.0
+CATEGORIA_PERGUNTA_PADRAO = 'sintoma'
+PESO_RESPOSTA_PADRAO = 0.5
+
+
+@dataclass
+class ResultadoLote:
+    """Resultados vetoriais de um lote, na ordem das consultas recebidas"""
+    pontuacao_total: np.ndarray   # (n,)
+    categorias: np.ndarray        # (n, len(CATEGORIAS))
+    nivel_risco: np.ndarray       # (n,) 'baixo' / 'medio' / 'alto'
+    encaminhamento: np.ndarray    # (n,) bool
+    confianca: np.ndarray         # (n,)
+    versao_pesos: int
+
+    def __len__(self):
+        return len(self.pontuacao_total)
+
+    def resultado(self, i: int) -> ScoringResult:
+        """Converte a i-ésima consulta em ScoringResult (sem recomendações textuais)"""
+        return ScoringResult(
+            total_score=float(self.pontuacao_total[i]),
+            category_scores={c: float(self.categorias[i, j]) for j, c in enumerate(CATEGORIAS)},
+            recommendations={'farmacologico': [], 'nao_farmacologico': [], 'encaminhamento': []},
+            risk_level=str(self.nivel_risco[i]),
+            encaminhamento=bool(self.encaminhamento[i]),
+            confidence=float(self.confianca[i]),
+            versao_pesos=self.versao_pesos
+        )
+
+
+class PontuadorVetorizado:
+    """Compila os pesos de um ``TriagemScoring`` em vetores e pontua lotes de consultas"""
+
+    def __init__(self, scoring: TriagemScoring):
+        # Compila uma única versão dos pesos; o lote inteiro é pontuado com ela
+        tabela = scoring.tabela_pesos
+        self.versao_pesos = tabela.versao
+        self.thresholds = dict(tabela.thresholds)
+
+        # Perguntas conhecidas + um código reservado para perguntas desconhecidas
+        self.codigo_pergunta: Dict[str, int] = {}
+        pesos, categorias, criticas = [], [], []
+        for question_id, qw in tabela.question_weights.items():
+            self.codigo_pergunta[question_id] = len(pesos)
+            pesos.append(qw.weight)
+            categorias.append(CATEGORIAS.index(qw.category))
+            criticas.append(qw.critical)
+        self.pergunta_desconhecida = len(pesos)
+        pesos.append(PESO_PERGUNTA_PADRAO)
+        categorias.append(CATEGORIAS.index(CATEGORIA_PERGUNTA_PADRAO))
+        criticas.append(False)
+        self.peso_pergunta = np.asarray(pesos, dtype=np.float64)
+        self.categoria_pergunta = np.asarray(categorias, dtype=np.int64)
+        self.pergunta_critica = np.asarray(criticas, dtype=bool)
+
+        # Respostas conhecidas + desconhecidas (afirmativas ou não, para o teste crítico)
+        self.codigo_resposta: Dict[str, int] = {}
+        pesos, afirmativas = [], []
+        for valor, aw in tabela.answer_weights.items():
+            self.codigo_resposta[valor] = len(pesos)
+            pesos.append(aw.weight)
+            afirmativas.append(valor in RESPOSTAS_AFIRMATIVAS)
+        self.resposta_desconhecida = len(pesos)
+        self.resposta_desconhecida_afirmativa = len(pesos) + 1
+        pesos.extend([PESO_RESPOSTA_PADRAO, PESO_RESPOSTA_PADRAO])
+        afirmativas.extend([False, True])
+        self.peso_resposta = np.asarray(pesos, dtype=np.float64)
+        self.resposta_afirmativa = np.asarray(afirmativas, dtype=bool)
+
+    def _codificar_resposta(self, valor: str) -> int:
+        codigo = self.codigo_resposta.get(valor)
+        if codigo is not None:
+            return codigo
+        if valor in RESPOSTAS_AFIRMATIVAS:
+            return self.resposta_desconhecida_afirmativa
+        return self.resposta_desconhecida
+
+    def codificar(self, respostas_por_consulta: Iterable[List[Dict[str, str]]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """
+        Converte as respostas de cada consulta em códigos inteiros.
+
+        Returns:
+            (indice_consulta, codigo_pergunta, codigo_resposta, total_consultas)
+        """
+        indices, perguntas, respostas = [], [], []
+        total = 0
+        for i, lista in enumerate(respostas_por_consulta):
+            total = i + 1
+            for resposta in lista:
+                indices.append(i)
+                perguntas.append(self.codigo_pergunta.get(resposta['pergunta_id'], self.pergunta_desconhecida))
+                respostas.append(self._codificar_resposta(resposta['resposta'].lower().strip()))
+        return (
+            np.asarray(indices, dtype=np.int64),
+            np.asarray(perguntas, dtype=np.int64),
+            np.asarray(respostas, dtype=np.int64),
+            total
+        )
+
+    def pontuar(self, indice_consulta: np.ndarray, codigo_pergunta: np.ndarray, codigo_resposta: np.ndarray,
+                total_consultas: int, idoso_fragil: np.ndarray, gestante: np.ndarray) -> ResultadoLote:
+        """Pontua um lote já codificado (perfis como vetores booleanos por consulta)"""
+        n = total_consultas
+        pontos = self.peso_pergunta[codigo_pergunta] * self.peso_resposta[codigo_resposta]
+
+        total = np.bincount(indice_consulta, weights=pontos, minlength=n)
+        celulas = indice_consulta * len(CATEGORIAS) + self.categoria_pergunta[codigo_pergunta]
+        categorias = np.bincount(celulas, weights=pontos, minlength=n * len(CATEGORIAS)).reshape(n, len(CATEGORIAS))
+        criticas = self.pergunta_critica[codigo_pergunta] & self.resposta_afirmativa[codigo_resposta]
+        critico = np.bincount(indice_consulta, weights=criticas.astype(np.float64), minlength=n) > 0
+        respondidas = np.bincount(indice_consulta, minlength=n)
+
+        # Modificadores de perfil, na mesma ordem de calculate_score
+        idoso_fragil = np.asarray(idoso_fragil, dtype=bool)
+        gestante = np.asarray(gestante, dtype=bool)
+        total = np.where(idoso_fragil, total * 1.2, total)
+        categorias[:, CATEGORIAS.index('perfil')] += np.where(idoso_fragil, 5.0, 0.0)
+        total = np.where(gestante, total * 1.1, total)
+        categorias[:, CATEGORIAS.index('perfil')] += np.where(gestante, 3.0, 0.0)
+
+        encaminhamento = critico | (total >= self.thresholds['encaminhamento'])
+        nivel_risco = np.select(
+            [encaminhamento, total >= self.thresholds['alto'], total >= self.thresholds['medio']],
+            ['alto', 'alto', 'medio'],
+            default='baixo'
+        )
+        confianca = np.minimum(1.0, respondidas / 10.0)
+
+        return ResultadoLote(total, categorias, nivel_risco, encaminhamento, confianca, self.versao_pesos)
+
+    def pontuar_respostas(self, respostas_por_consulta: List[List[Dict[str, str]]],
+                          perfis: List[Dict]) -> ResultadoLote:
+        """Atalho: codifica e pontua listas de respostas com os perfis dos pacientes"""
+        indices, perguntas, respostas, total = self.codificar(respostas_por_consulta)
+        total = max(total, len(perfis))
+        idoso_fragil = np.fromiter((p.get('is_frail_elderly', False) for p in perfis), dtype=bool, count=len(perfis))
+        gestante = np.fromiter((p.get('is_pregnant_or_lactating', False) for p in perfis), dtype=bool, count=len(perfis))
+        return self.pontuar(indices, perguntas, respostas, total, idoso_fragil, gestante)
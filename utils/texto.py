@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Utilitários de Texto
+====================
+
+Funções de normalização de texto compartilhadas pelos serviços de busca
+(índice do catálogo de medicamentos, sinônimos, contraindicações).
+"""
+
+import re
+from unidecode import unidecode
+
+# Expressões pré-compiladas: a normalização roda para cada texto do catálogo
+_RE_NAO_ALFANUMERICO = re.compile(r'[^a-zA-Z0-9\s]')
+_RE_ESPACOS = re.compile(r'\s+')
+
+
+def normalizar_texto(texto: str) -> str:
+    """Normaliza texto removendo acentos, pontuação e convertendo para minúsculas"""
+    if not texto:
+        return ""
+
+    texto_normalizado = unidecode(texto).lower()
+    texto_normalizado = _RE_NAO_ALFANUMERICO.sub(' ', texto_normalizado)
+    texto_normalizado = _RE_ESPACOS.sub(' ', texto_normalizado)
+    return texto_normalizado.strip()
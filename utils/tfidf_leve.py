@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TF-IDF Leve
+===========
+
+Implementação enxuta de TF-IDF com similaridade de cosseno usando apenas
+NumPy e dicionários, para quando o scikit-learn não está instalado ou quando
+o modo de baixo consumo de memória está configurado (``TFIDF_MODO=leve``).
+
+Reproduz a configuração do ``TfidfVectorizer`` usada no catálogo:
+tokens ``\\b\\w+\\b`` em minúsculas, unigramas e bigramas, contagem bruta de
+termos, ``idf = ln((1 + n) / (1 + df)) + 1`` e normalização L2. Os
+documentos são guardados como listas invertidas (termo -> documentos e
+contagens), então uma consulta só percorre os termos que ela contém.
+
+Os scores são os de um ajuste feito sobre ``[consulta] + documentos``, como a
+busca fazia antes de o índice ser pré-ajustado: a consulta conta como mais um
+documento (``n + 1``), os termos dela têm ``df + 1`` e os termos fora do
+vocabulário entram na norma da consulta com ``df = 1``. Só os termos da
+consulta dependem dela, então a norma de cada documento é corrigida apenas
+nesses termos (``idf_consulta`` e ``delta_norma``).
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+_PADRAO_TOKEN = re.compile(r'\b\w+\b')
+
+
+def extrair_termos(texto: str) -> List[str]:
+    """Unigramas e bigramas do texto, na mesma ordem do TfidfVectorizer"""
+    tokens = _PADRAO_TOKEN.findall(texto.lower())
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def pesos_idf(frequencia_documentos: np.ndarray, total_documentos: int) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    IDFs do ajuste sobre ``[consulta] + documentos`` (``n + 1`` documentos).
+
+    Returns:
+        (idf dos termos ausentes da consulta, idf dos termos presentes nela,
+        idf de um termo da consulta fora do vocabulário)
+    """
+    total = total_documentos + 1
+    idf = np.log((1 + total) / (1 + frequencia_documentos)) + 1.0
+    idf_consulta = np.log((1 + total) / (2 + frequencia_documentos)) + 1.0
+    return idf, idf_consulta, math.log((1 + total) / 2) + 1.0
+
+
+class IndiceTfidfLeve:
+    """Índice TF-IDF em listas invertidas de contagens, com a norma de cada documento"""
+
+    def __init__(self, documentos: List[str]):
+        self.total_documentos = len(documentos)
+        contagens = [Counter(extrair_termos(documento)) for documento in documentos]
+
+        frequencia_documentos: Counter = Counter()
+        for contagem in contagens:
+            frequencia_documentos.update(contagem.keys())
+
+        self.vocabulario: Dict[str, int] = {
+            termo: indice for indice, termo in enumerate(sorted(frequencia_documentos))
+        }
+        df = np.fromiter((frequencia_documentos[t] for t in self.vocabulario), dtype=np.float64,
+                         count=len(self.vocabulario))
+        self.idf, self.idf_consulta, self.idf_fora_vocabulario = pesos_idf(df, self.total_documentos)
+        # Quanto o quadrado do peso de um termo cai quando a consulta também o contém
+        self.delta_norma = self.idf ** 2 - self.idf_consulta ** 2
+
+        # Triplas (termo, documento, contagem) ordenadas por termo -> listas invertidas
+        termos, docs, valores = [], [], []
+        self._normas2 = np.zeros(self.total_documentos, dtype=np.float64)
+        for documento, contagem in enumerate(contagens):
+            if not contagem:
+                continue
+            indices = np.fromiter((self.vocabulario[t] for t in contagem), dtype=np.int64, count=len(contagem))
+            quantidades = np.fromiter(contagem.values(), dtype=np.float64, count=len(contagem))
+            pesos = quantidades * self.idf[indices]
+            self._normas2[documento] = np.dot(pesos, pesos)
+            termos.append(indices)
+            docs.append(np.full(len(indices), documento, dtype=np.int32))
+            valores.append(quantidades)
+
+        if termos:
+            termos = np.concatenate(termos)
+            ordem = np.argsort(termos, kind='stable')
+            self._documentos = np.concatenate(docs)[ordem]
+            self._contagens = np.concatenate(valores)[ordem]
+            self._inicio = np.searchsorted(termos[ordem], np.arange(len(self.vocabulario) + 1))
+        else:
+            self._documentos = np.empty(0, dtype=np.int32)
+            self._contagens = np.empty(0, dtype=np.float64)
+            self._inicio = np.zeros(1, dtype=np.int64)
+
+    def vetorizar(self, consulta: str) -> Tuple[Dict[int, float], float]:
+        """
+        Pesos TF-IDF (não normalizados) dos termos da consulta presentes no
+        vocabulário e a norma da consulta, que inclui os termos fora dele.
+        """
+        vetor, norma2 = {}, 0.0
+        for termo, n in Counter(extrair_termos(consulta)).items():
+            indice = self.vocabulario.get(termo)
+            if indice is None:
+                norma2 += (n * self.idf_fora_vocabulario) ** 2
+            else:
+                vetor[indice] = n * self.idf_consulta[indice]
+                norma2 += vetor[indice] ** 2
+        return vetor, math.sqrt(norma2)
+
+    def similaridades(self, consultas: List[str]) -> np.ndarray:
+        """Matriz (consultas x documentos) de similaridades de cosseno"""
+        resultado = np.zeros((len(consultas), self.total_documentos), dtype=np.float64)
+        for linha, consulta in enumerate(consultas):
+            vetor, norma = self.vetorizar(consulta)
+            if not vetor:
+                continue
+            produto = np.zeros(self.total_documentos, dtype=np.float64)
+            correcao = np.zeros(self.total_documentos, dtype=np.float64)
+            for indice, peso in vetor.items():
+                inicio, fim = self._inicio[indice], self._inicio[indice + 1]
+                documentos, contagens = self._documentos[inicio:fim], self._contagens[inicio:fim]
+                # Cada documento aparece no máximo uma vez por termo
+                produto[documentos] += peso * self.idf_consulta[indice] * contagens
+                correcao[documentos] += self.delta_norma[indice] * contagens ** 2
+            encontrados = np.flatnonzero(produto)
+            resultado[linha, encontrados] = produto[encontrados] / (
+                norma * np.sqrt(self._normas2[encontrados] - correcao[encontrados])
+            )
+        return resultado
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Verificação dos Planos das Consultas Mais Usadas
+================================================
+
+Executa ``EXPLAIN QUERY PLAN`` (SQLite) nas consultas de maior volume de
+``core/app.py`` (dashboard e painel admin, histórico do paciente, página de
+resultado e estatísticas) e falha se alguma delas ler inteira uma das tabelas de
+consultas (``SCAN consultas``, ``SCAN consulta_respostas``...) em vez de usar
+um índice.
+
+Por padrão, usa um banco SQLite temporário criado a partir dos modelos, o que
+confere os índices declarados em ``models/models.py``. Com ``--banco-atual``,
+confere o banco configurado (ex.: depois de ``utils/migrar_indices_consultas.py``).
+
+Uso:
+    python utils/verificar_plano_consultas.py [--banco-atual] [--detalhar]
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+# Tabelas que crescem com cada triagem: não podem ser lidas por inteiro
+TABELAS_MONITORADAS = {'consultas', 'consulta_respostas', 'consulta_recomendacoes'}
+
+PADRAO_SCAN = re.compile(r'^SCAN (\w+)')
+
+# Consultas com ORDER BY ... LIMIT: percorrer o índice na ordem pedida e parar
+# no limite é o plano esperado
+PERMITE_SCAN_ORDENADO = re.compile(r'^SCAN \w+ USING (?:COVERING )?INDEX')
+
+
+def _consultas_monitoradas():
+    """(descrição, query, scan ordenado permitido) no formato usado pelos endpoints de core/app.py"""
+    from models.models import db, Consulta, ConsultaPontuacao, ConsultaRecomendacao, ConsultaResposta, Paciente
+    from services.painel import resumo_painel
+
+    agora = datetime.now()
+    inicio = agora - timedelta(days=30)
+    lote = list(range(1, 501))
+
+    # Dashboard e painel admin: as próprias queries do resumo em cache
+    painel = [
+        (f"index/admin: {nome.replace('_', ' ')}", query, nome == 'consultas_recentes')
+        for nome, query in resumo_painel.queries(agora).items()
+    ]
+    return painel + [
+        ("historico_paciente: consultas do paciente",
+         Consulta.query.filter_by(id_paciente=1).order_by(Consulta.data.desc())),
+        ("resultado_triagem: respostas da consulta",
+         ConsultaResposta.query.filter_by(id_consulta=1)),
+        ("resultado_triagem: recomendações da consulta por tipo",
+         ConsultaRecomendacao.query.filter_by(id_consulta=1, tipo='medicamento')),
+        ("estatisticas/consultas: consultas e encaminhamentos por dia",
+         db.session.query(
+             db.func.date(Consulta.data), db.func.count(Consulta.id),
+             db.func.sum(db.case((Consulta.encaminhamento == True, 1), else_=0))
+         ).filter(Consulta.data >= inicio).group_by(db.func.date(Consulta.data))),
+        ("estatisticas/medicamentos: recomendações de medicamento do período",
+         ConsultaRecomendacao.query.filter(
+             ConsultaRecomendacao.tipo == 'medicamento',
+             ConsultaRecomendacao.id_consulta.in_(db.session.query(Consulta.id).filter(Consulta.data >= inicio)))),
+        ("estatisticas/desempenho: pacientes atendidos no período",
+         db.session.query(db.func.count(db.distinct(Consulta.id_paciente))).filter(Consulta.data >= inicio)),
+        ("estatisticas/medicamentos-por-sintoma: consultas do sintoma no período",
+         db.session.query(
+             Consulta.id, ConsultaPontuacao.pontuacao_total, Consulta.encaminhamento, Paciente.sexo, Paciente.idade
+         ).join(
+             Paciente, Consulta.id_paciente == Paciente.id
+         ).outerjoin(
+             ConsultaPontuacao, ConsultaPontuacao.id_consulta == Consulta.id
+         ).filter(Consulta.data >= inicio, Consulta.modulo == 'febre')),
+        ("estatisticas/medicamentos-por-sintoma: recomendações de um lote de consultas",
+         db.session.query(ConsultaRecomendacao.id_consulta, ConsultaRecomendacao.descricao).filter(
+             ConsultaRecomendacao.id_consulta.in_(lote), ConsultaRecomendacao.tipo == 'medicamento')),
+        ("regras/pontuações em lote: respostas de um lote de consultas",
+         ConsultaResposta.query.filter(ConsultaResposta.id_consulta.in_(lote))),
+    ]
+
+
+def _plano(conexao, query) -> list:
+    """Linhas 'detail' do EXPLAIN QUERY PLAN da query"""
+    compilada = query.statement.compile(dialect=conexao.dialect, compile_kwargs={'render_postcompile': True})
+    parametros = compilada.construct_params()
+    valores = tuple(
+        str(valor) if isinstance(valor, datetime) else valor
+        for valor in (parametros[nome] for nome in compilada.positiontup)
+    )
+    return [linha[-1] for linha in conexao.exec_driver_sql(f"EXPLAIN QUERY PLAN {compilada}", valores)]
+
+
+def verificar(banco_atual: bool = False, detalhar: bool = False) -> bool:
+    """Confere os planos e retorna True se nenhuma consulta monitorada ler uma tabela inteira"""
+    if not banco_atual:
+        from core.config import Config
+        Config.SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='plano_'), 'plano.db')
+
+    from core.app import app
+    from models.models import db
+
+    with app.app_context():
+        if not banco_atual:
+            db.create_all()
+        if db.engine.dialect.name != 'sqlite':
+            print("⚠️  EXPLAIN QUERY PLAN só é verificado em SQLite")
+            return True
+
+        print("=" * 70)
+        print("  PLANOS DAS CONSULTAS MAIS USADAS")
+        print("=" * 70)
+
+        falhas = 0
+        with db.engine.connect() as conexao:
+            for descricao, query, *permite_ordenado in _consultas_monitoradas():
+                plano = _plano(conexao, query)
+                scans = [
+                    linha for linha in plano
+                    if (m := PADRAO_SCAN.match(linha)) and m.group(1) in TABELAS_MONITORADAS
+                    and not (permite_ordenado and PERMITE_SCAN_ORDENADO.match(linha))
+                ]
+                falhas += bool(scans)
+                print(f"{'❌' if scans else '✅'} {descricao}")
+                for linha in (plano if detalhar or scans else []):
+                    print(f"      {linha}")
+
+        print("\n" + "=" * 70)
+        print(f"  {'TODAS AS CONSULTAS USAM ÍNDICES' if not falhas else f'{falhas} CONSULTA(S) COM LEITURA COMPLETA'}")
+        print("=" * 70)
+        return not falhas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Falha se uma consulta frequente ler inteira uma tabela de consultas")
+    parser.add_argument('--banco-atual', action='store_true',
+                        help="Verificar o banco configurado em vez de um banco temporário criado pelos modelos")
+    parser.add_argument('--detalhar', action='store_true', help="Mostrar o plano de todas as consultas")
+    args = parser.parse_args()
+
+    try:
+        sys.exit(0 if verificar(args.banco_atual, args.detalhar) else 1)
+    except Exception as e:
+        print(f"\n❌ Erro durante a verificação: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
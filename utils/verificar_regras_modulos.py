@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Verificação das Regras Declarativas dos Módulos
+===============================================
+
+Compila as regras de todos os módulos de ``motor_de_perguntas``
+(``services/triagem/regras_modulos.py``) e confere:
+
+- se as perguntas das regras são as mesmas extraídas pelo manifesto (texto,
+  tipo e numeração ``modulo_N``);
+- se toda entrada das regras vem de uma pergunta de ``run_cli``;
+- se, em entradas aleatórias, as regras produzem o mesmo ``TriageResult``
+  que ``triage`` do próprio módulo (``--amostras``).
+
+Com ``--consultas``, também reavalia em lote as consultas gravadas a partir
+das respostas e compara o resultado com ``Consulta.encaminhamento``.
+
+Uso:
+    python utils/verificar_regras_modulos.py [--modulo febre] [--amostras 500] [--consultas] [--exportar regras.json]
+"""
+
+import argparse
+import json
+import sys
+import os
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.app import app
+from models.models import db, Consulta
+from services.triagem.regras_modulos import motor_regras, verificar_regras
+from utils.extractors.manifesto_perguntas import manifesto_perguntas
+
+
+def verificar(modulo_filtro: str = None, amostras: int = 500, consultas: bool = False,
+              exportar: str = None, detalhar: bool = False) -> bool:
+    """Verifica as regras e retorna True se não houver erros"""
+    with app.app_context():
+        print("=" * 70)
+        print("  VERIFICAÇÃO DAS REGRAS DECLARATIVAS DOS MÓDULOS")
+        print("=" * 70)
+
+        modulos = [modulo_filtro] if modulo_filtro else list(manifesto_perguntas.modulos())
+        total_erros, exportadas = 0, {}
+        for modulo in modulos:
+            regras = motor_regras.regras(modulo)
+            resultado = verificar_regras(regras, amostras=amostras)
+            total_erros += len(resultado['erros'])
+            status = "✅" if not resultado['erros'] else "❌"
+            print(f"{status} {modulo:<28} {len(regras.perguntas_visiveis):>3} perguntas | "
+                  f"{len(regras.sinais_alerta):>3} sinais de alerta | {len(resultado['avisos'])} avisos")
+            for erro in resultado['erros']:
+                print(f"      ERRO: {erro}")
+            if detalhar:
+                for aviso in resultado['avisos']:
+                    print(f"      aviso: {aviso}")
+            exportadas[modulo] = regras.to_dict()
+
+        if exportar:
+            with open(exportar, 'w', encoding='utf-8') as f:
+                json.dump(exportadas, f, ensure_ascii=False, indent=2)
+            print(f"\nRegras exportadas para {exportar}")
+
+        if consultas:
+            print("\n" + "-" * 70)
+            print("  REAVALIAÇÃO DAS CONSULTAS GRAVADAS")
+            print("-" * 70)
+            ids = [linha[0] for linha in db.session.query(Consulta.id).order_by(Consulta.id)]
+            inicio = time.perf_counter()
+            avaliacoes = motor_regras.avaliar_consultas(ids)
+            duracao = time.perf_counter() - inicio
+            if modulo_filtro:
+                avaliacoes = {i: a for i, a in avaliacoes.items() if a.modulo == modulo_filtro}
+
+            encaminhamentos = dict(db.session.query(Consulta.id, Consulta.encaminhamento).filter(
+                Consulta.id.in_(list(avaliacoes))
+            )) if avaliacoes else {}
+            contagem = Counter()
+            for id_consulta, avaliacao in avaliacoes.items():
+                contagem[avaliacao.acao or 'INDETERMINADO'] += 1
+                if avaliacao.encaminhar is not None and bool(encaminhamentos.get(id_consulta)) != avaliacao.encaminhar:
+                    contagem['divergentes'] += 1
+                if avaliacao.respostas_invalidas:
+                    contagem['com_respostas_invalidas'] += 1
+
+            print(f"Consultas avaliadas: {len(avaliacoes)} de {len(ids)} (as demais não usam um módulo de triagem)")
+            print(f"Encaminhar: {contagem['ENCAMINHAR']} | Autocuidado: {contagem['AUTOCUIDADO']} | "
+                  f"Indeterminadas: {contagem['INDETERMINADO']}")
+            print(f"Divergências com Consulta.encaminhamento (decisão pela pontuação): {contagem['divergentes']}")
+            print(f"Consultas com respostas inválidas: {contagem['com_respostas_invalidas']}")
+            if duracao > 0 and avaliacoes:
+                print(f"Tempo: {duracao:.2f}s ({len(avaliacoes) / duracao:,.0f} consultas/s)")
+
+        print("\n" + "=" * 70)
+        print(f"  {'SEM ERROS' if not total_erros else f'{total_erros} ERRO(S)'}")
+        print("=" * 70)
+        return not total_erros
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verifica as regras declarativas compiladas dos módulos de triagem")
+    parser.add_argument('--modulo', help="Verificar apenas este módulo")
+    parser.add_argument('--amostras', type=int, default=500,
+                        help="Entradas aleatórias comparadas com triage() do módulo (0 para não comparar)")
+    parser.add_argument('--consultas', action='store_true', help="Reavaliar também as consultas gravadas")
+    parser.add_argument('--exportar', help="Gravar a representação declarativa em JSON")
+    parser.add_argument('--detalhar', action='store_true', help="Listar também os avisos")
+    args = parser.parse_args()
+
+    try:
+        ok = verificar(args.modulo, args.amostras, args.consultas, args.exportar, args.detalhar)
+        sys.exit(0 if ok else 1)
+    except Exception as e:
+        print(f"\n❌ Erro durante a verificação: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)